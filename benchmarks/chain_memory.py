@@ -0,0 +1,170 @@
+"""
+Memory benchmark: option chain memory per ticker, full chain vs pruned.
+
+Builds yfinance-shaped chains (every column yfinance returns, float64,
+strikes from deep ITM to deep OTM) for chain sizes from a small cap up to
+SPY/TSLA-like, then measures with tracemalloc:
+
+- before: the full frames held while summarize_chain runs on them
+- after: frames pruned at ingestion (prune_chain), the full frames
+  released, then summarize_chain on the pruned ones
+
+Each path reports the traced memory held once ingestion is done, the peak
+while summarizing, and the ingest peak. yfinance builds the full frames
+either way, so the ingest peak (while they are alive) barely moves; what
+pruning saves is everything held from then on.
+
+Usage:
+    python -m benchmarks.chain_memory
+    python -m benchmarks.chain_memory --strikes 100 400 1600 --moneyness 0.2
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from options_bot.ingestion.options import prune_chain, summarize_chain
+
+from .run import environment
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+_SPOT = 550.0
+# Strikes per side: a small cap, a large cap, SPY/TSLA-like
+DEFAULT_STRIKES = (60, 400, 1200)
+
+
+def yahoo_chain(spot: float, strikes: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calls and puts shaped like yfinance's option_chain() frames.
+
+    Args:
+        spot: Spot price
+        strikes: Strikes per side, spread from 20% to 300% of spot
+        seed: Random seed
+
+    Returns:
+        Tuple of (calls, puts)
+    """
+    rng = np.random.default_rng(seed)
+    strike = np.round(np.linspace(spot * 0.2, spot * 3.0, strikes), 1)
+    moneyness = np.log(strike / spot)
+    traded = datetime(2025, 6, 27, 19, 59, tzinfo=timezone.utc)
+    frames = []
+    for kind, skew in (('C', -0.3), ('P', -0.6)):
+        iv = np.clip(0.35 + skew * moneyness + 1.5 * moneyness ** 2, 0.05, None)
+        weight = np.exp(-(moneyness / 0.1) ** 2)
+        intrinsic = np.maximum(spot - strike, 0) if kind == 'C' else np.maximum(strike - spot, 0)
+        price = intrinsic + spot * iv * 0.12 * weight
+        volume = (5000 * weight * rng.uniform(0.5, 1.5, strikes)).round()
+        volume[rng.random(strikes) < 0.3] = np.nan  # yfinance leaves untraded strikes NaN
+        frames.append(pd.DataFrame({
+            'contractSymbol': [f"SPY250801{kind}{int(k * 1000):08d}" for k in strike],
+            'lastTradeDate': [traded - timedelta(minutes=int(m)) for m in rng.integers(0, 5000, strikes)],
+            'strike': strike,
+            'lastPrice': price.round(2),
+            'bid': (price * 0.97).round(2),
+            'ask': (price * 1.03).round(2),
+            'change': rng.normal(0, 0.2, strikes).round(2),
+            'percentChange': rng.normal(0, 5, strikes).round(2),
+            'volume': volume,
+            'openInterest': (40000 * weight * rng.uniform(0.5, 1.5, strikes)).round(),
+            'impliedVolatility': iv,
+            'inTheMoney': intrinsic > 0,
+            'contractSize': 'REGULAR',
+            'currency': 'USD',
+        }))
+    return frames[0], frames[1]
+
+
+def _traced(build: Callable[[], Tuple[pd.DataFrame, pd.DataFrame]], process: Callable) -> dict:
+    """
+    Traced memory of one chain: building and ingesting it, then summarizing
+    whatever process() keeps (after the full frames are released).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        calls, puts = build()
+        kept = process(calls, puts)
+        del calls, puts
+        held, ingest_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        summarize_chain("SPY", *kept, _SPOT, 0.3)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'held_kb': round(held / 1024, 1), 'peak_kb': round(peak / 1024, 1),
+            'ingest_peak_kb': round(ingest_peak / 1024, 1)}
+
+
+def measure(strikes: int, moneyness: Optional[float] = None) -> dict:
+    """
+    Chain memory for one ticker, before and after pruning.
+
+    Args:
+        strikes: Strikes per side
+        moneyness: prune_chain window (CHAIN_MONEYNESS if None)
+
+    Returns:
+        Dict with held, peak and ingest-peak KB for both paths
+    """
+    build = lambda: yahoo_chain(_SPOT, strikes)
+    prune = lambda calls, puts: (prune_chain(calls, _SPOT, moneyness), prune_chain(puts, _SPOT, moneyness))
+
+    # Warm up lazy imports and caches so they are not counted
+    summarize_chain("SPY", *prune(*build()), _SPOT, 0.3)
+
+    before = _traced(build, lambda calls, puts: (calls, puts))
+    after = _traced(build, prune)
+
+    full = summarize_chain("SPY", *build(), _SPOT, 0.3)
+    pruned = summarize_chain("SPY", *prune(*build()), _SPOT, 0.3)
+    return {
+        'strikes': strikes,
+        'before': before,
+        'after': after,
+        'peak_ratio': round(after['peak_kb'] / before['peak_kb'], 3) if before['peak_kb'] else None,
+        # Pruning drops far strikes only; ATM IV and skew come from strikes inside the window
+        'same_atm_iv': _close(full.atm_iv_dte35, pruned.atm_iv_dte35),
+        'same_skew': _close(full.skew_25d_rr, pruned.skew_25d_rr),
+    }
+
+
+def _close(a: Optional[float], b: Optional[float]) -> bool:
+    """Equal within float32 precision (pruned chains keep float32 IVs)."""
+    if a is None or b is None:
+        return a is b
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure option chain memory before and after pruning")
+    parser.add_argument('--strikes', type=int, nargs='+', default=list(DEFAULT_STRIKES), help="Strikes per side")
+    parser.add_argument('--moneyness', type=float, help="Pruning window (default CHAIN_MONEYNESS)")
+    parser.add_argument('--output', type=Path, help="Results file (default benchmarks/results/chain_memory_<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for strikes in args.strikes:
+        result = measure(strikes, moneyness=args.moneyness)
+        results.append(result)
+        before, after = result['before'], result['after']
+        print(f"{strikes:>6} strikes  held {before['held_kb']:>9.1f} -> {after['held_kb']:>7.1f} KB  "
+              f"peak {before['peak_kb']:>9.1f} -> {after['peak_kb']:>7.1f} KB  "
+              f"ingest peak {before['ingest_peak_kb']:>9.1f} -> {after['ingest_peak_kb']:>9.1f} KB", flush=True)
+
+    output = args.output or RESULTS_DIR / f"chain_memory_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': environment(), 'moneyness': args.moneyness, 'results': results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Synthetic benchmark fixtures.
+
+The checked-in fixtures (``benchmarks/fixtures/*.csv.gz``) describe 100
+base tickers: fundamentals, catalysts, a year of daily OHLCV and one ~35
+DTE option chain each. Larger universes are built by tiling the base
+tickers with a deterministic per-copy jitter, so every run at a given size
+sees exactly the same inputs.
+
+Regenerate the files with ``python -m benchmarks.fixtures``.
+"""
+import argparse
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from options_bot.ingestion.options import calculate_hv, score_liquidity, summarize_chain
+from options_bot.models import Fundamentals, OptionsSnapshot, Catalyst
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+BASE_TICKERS = 100
+HISTORY_DAYS = 252
+SECTORS = ['Technology', 'Healthcare', 'Financial Services', 'Energy', 'Consumer Cyclical',
+           'Industrials', 'Utilities', 'Communication Services']
+HEADLINES = ['Shares surge after upgrade', 'Analyst cuts price target', 'Company announces buyback',
+             'Revenue misses estimates', 'New product launch', 'CEO to step down',
+             'Beats earnings expectations', 'Regulator opens probe']
+
+
+def generate(seed: int = 0, n: int = BASE_TICKERS, days: int = HISTORY_DAYS) -> Dict[str, pd.DataFrame]:
+    """
+    Build the base fixture tables.
+
+    Args:
+        seed: Random seed
+        n: Number of base tickers
+        days: Daily bars per ticker
+
+    Returns:
+        Dict of table name -> DataFrame ('fundamentals', 'catalysts', 'ohlcv', 'chains')
+    """
+    rng = np.random.default_rng(seed)
+    tickers = [f"B{i:03d}" for i in range(n)]
+
+    fundamentals = pd.DataFrame({
+        'ticker': tickers,
+        'market_cap': np.exp(rng.uniform(np.log(3e8), np.log(2e12), n)).round(-6),
+        'pe_ratio': np.where(rng.random(n) < 0.1, np.nan, rng.lognormal(3.0, 0.5, n).round(2)),
+        'forward_pe': rng.lognormal(2.9, 0.4, n).round(2),
+        'profit_margins': rng.normal(0.12, 0.1, n).round(4),
+        'debt_to_equity': rng.lognormal(-0.5, 0.8, n).round(3),
+        'sector': rng.choice(SECTORS, n),
+        'revenue_growth': rng.normal(0.08, 0.15, n).round(4),
+        'earnings_growth': rng.normal(0.1, 0.3, n).round(4),
+    })
+
+    days_to_earnings = rng.integers(0, 90, n)
+    catalysts = pd.DataFrame({
+        'ticker': tickers,
+        'days_to_earnings': days_to_earnings,
+        'earnings_bmo_amc': rng.choice(['BMO', 'AMC'], n),
+        'has_major_event_7d': (days_to_earnings <= 7) | (rng.random(n) < 0.05),
+        'sentiment_score': rng.uniform(-0.8, 0.8, n).round(3),
+        'headlines': ['|'.join(rng.choice(HEADLINES, rng.integers(0, 6), replace=False)) for _ in range(n)],
+    })
+
+    dates = pd.bdate_range(end='2025-06-30', periods=days)
+    ohlcv = []
+    chains = []
+    for i, ticker in enumerate(tickers):
+        vol = rng.uniform(0.15, 0.8)
+        start = rng.uniform(10, 500)
+        returns = rng.normal(0.0003, vol / np.sqrt(252), days)
+        close = start * np.exp(np.cumsum(returns))
+        spread = np.abs(rng.normal(0, vol / np.sqrt(252), days)) * close
+        open_ = close * (1 + rng.normal(0, vol / np.sqrt(252) / 2, days))
+        ohlcv.append(pd.DataFrame({
+            'ticker': ticker,
+            'date': dates,
+            'Open': open_.round(4),
+            'High': (np.maximum(open_, close) + spread).round(4),
+            'Low': (np.minimum(open_, close) - spread).round(4),
+            'Close': close.round(4),
+            'Volume': rng.lognormal(14, 1, days).astype(np.int64),
+        }))
+
+        # One ~35 DTE expiration with a put-skewed smile around the last close
+        spot = close[-1]
+        step = spot * 0.025
+        strikes = np.round(spot + step * np.arange(-12, 13), 2)
+        moneyness = np.log(strikes / spot)
+        atm_iv = vol * rng.uniform(0.8, 1.4)
+        liquidity = rng.lognormal(6, 1.5)
+        for kind, skew in (('call', -0.3), ('put', -0.6)):
+            iv = np.clip(atm_iv + skew * moneyness + 1.5 * moneyness ** 2, 0.05, None)
+            weight = np.exp(-(moneyness / 0.1) ** 2)
+            intrinsic = np.maximum(spot - strikes, 0) if kind == 'call' else np.maximum(strikes - spot, 0)
+            price = intrinsic + spot * iv * np.sqrt(35 / 365) * 0.4 * weight
+            chains.append(pd.DataFrame({
+                'ticker': ticker,
+                'type': kind,
+                'strike': strikes,
+                'lastPrice': price.round(2),
+                'bid': (price * 0.97).round(2),
+                'ask': (price * 1.03).round(2),
+                'volume': (liquidity * weight * rng.uniform(0.5, 1.5, len(strikes))).astype(np.int64),
+                'openInterest': (liquidity * 8 * weight * rng.uniform(0.5, 1.5, len(strikes))).astype(np.int64),
+                'impliedVolatility': iv.round(4),
+            }))
+
+    return {
+        'fundamentals': fundamentals,
+        'catalysts': catalysts,
+        'ohlcv': pd.concat(ohlcv, ignore_index=True),
+        'chains': pd.concat(chains, ignore_index=True),
+    }
+
+
+def write_fixtures(directory: Path = FIXTURE_DIR, seed: int = 0):
+    """Write the base fixture tables as gzipped CSV."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, df in generate(seed).items():
+        df.to_csv(directory / f"{name}.csv.gz", index=False, float_format='%.6g')
+
+
+def load_base(directory: Path = FIXTURE_DIR) -> Dict[str, pd.DataFrame]:
+    """Read the checked-in base fixture tables."""
+    tables = {
+        name: pd.read_csv(directory / f"{name}.csv.gz")
+        for name in ('fundamentals', 'catalysts', 'ohlcv', 'chains')
+    }
+    tables['catalysts']['headlines'] = tables['catalysts']['headlines'].fillna('')
+    tables['ohlcv']['date'] = pd.to_datetime(tables['ohlcv']['date'])
+    return tables
+
+
+@dataclass
+class BenchUniverse:
+    """Inputs for one benchmark universe size."""
+    tickers: List[str]
+    fundamentals: Dict[str, Fundamentals] = field(default_factory=dict)
+    catalysts: Dict[str, Catalyst] = field(default_factory=dict)
+    ohlcv: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    chains: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = field(default_factory=dict)
+    options: Dict[str, OptionsSnapshot] = field(default_factory=dict)
+
+
+def _none(value):
+    return None if pd.isna(value) else value
+
+
+def build_universe(size: int, base: Dict[str, pd.DataFrame] = None) -> BenchUniverse:
+    """
+    Tile the base fixtures into a universe of a given size.
+
+    Copy k of a base ticker is named ``<ticker>.<k>`` and has its prices
+    scaled by a fixed factor and its volumes by another, so copies are
+    distinct but reproducible.
+
+    Args:
+        size: Number of tickers
+        base: Tables from load_base() (read from disk if None)
+
+    Returns:
+        BenchUniverse with models, price history and chains per ticker
+    """
+    base = base or load_base()
+    fund_rows = base['fundamentals'].to_dict('records')
+    cat_rows = {r['ticker']: r for r in base['catalysts'].to_dict('records')}
+    ohlcv = {t: df.drop(columns='ticker').set_index('date') for t, df in base['ohlcv'].groupby('ticker')}
+    chains = {
+        t: (df[df['type'] == 'call'].drop(columns=['ticker', 'type']).reset_index(drop=True),
+            df[df['type'] == 'put'].drop(columns=['ticker', 'type']).reset_index(drop=True))
+        for t, df in base['chains'].groupby('ticker')
+    }
+    snapshots = {
+        t: summarize_chain(t, *chains[t], float(bars['Close'].iloc[-1]), calculate_hv(bars['Close'], window=30))
+        for t, bars in ohlcv.items()
+    }
+    # Column arrays of each base frame, so copies are built without pandas indexing
+    columns = {
+        t: tuple({col: df[col].to_numpy() for col in df.columns} for df in (ohlcv[t], *chains[t]))
+        for t in ohlcv
+    }
+    as_of = datetime(2025, 6, 30)
+
+    universe = BenchUniverse(tickers=[])
+    for i in range(size):
+        row = fund_rows[i % len(fund_rows)]
+        copy = i // len(fund_rows)
+        base_ticker = row['ticker']
+        ticker = base_ticker if copy == 0 else f"{base_ticker}.{copy}"
+        price_scale = 1.0 + 0.013 * copy
+        volume_scale = 1.0 + 0.029 * (copy % 7)
+
+        universe.tickers.append(ticker)
+        universe.fundamentals[ticker] = Fundamentals(
+            ticker=ticker,
+            market_cap=row['market_cap'] * price_scale,
+            pe_ratio=_none(row['pe_ratio']),
+            forward_pe=_none(row['forward_pe']),
+            profit_margins=_none(row['profit_margins']),
+            debt_to_equity=_none(row['debt_to_equity']),
+            sector=row['sector'],
+            revenue_growth=_none(row['revenue_growth']),
+            earnings_growth=_none(row['earnings_growth'])
+        )
+
+        cat = cat_rows[base_ticker]
+        universe.catalysts[ticker] = Catalyst(
+            ticker=ticker,
+            next_earnings_date=as_of + timedelta(days=int(cat['days_to_earnings'])),
+            earnings_bmo_amc=cat['earnings_bmo_amc'],
+            headlines=[h for h in cat['headlines'].split('|') if h],
+            sentiment_score=cat['sentiment_score'],
+            has_major_event_7d=bool(cat['has_major_event_7d']),
+            days_to_earnings=int(cat['days_to_earnings'])
+        )
+
+        bars = ohlcv[base_ticker]
+        calls, puts = chains[base_ticker]
+        snapshot = snapshots[base_ticker]
+        if copy:
+            bar_cols, call_cols, put_cols = columns[base_ticker]
+            bars = _scaled(bar_cols, bars.index, ['Open', 'High', 'Low', 'Close'], price_scale, ['Volume'], volume_scale)
+            calls, puts = (
+                _scaled(cols, df.index, ['strike', 'lastPrice', 'bid', 'ask'], price_scale,
+                        ['volume', 'openInterest'], volume_scale)
+                for cols, df in ((call_cols, calls), (put_cols, puts))
+            )
+            # Scaling prices leaves IVs and HV unchanged, so only spot and volumes move
+            call_volume, call_oi = (int((call_cols[c] * volume_scale).astype(np.int64).sum()) for c in ('volume', 'openInterest'))
+            put_volume, put_oi = (int((put_cols[c] * volume_scale).astype(np.int64).sum()) for c in ('volume', 'openInterest'))
+            snapshot = replace(
+                snapshot,
+                ticker=ticker,
+                spot_price=snapshot.spot_price * price_scale,
+                liq_calls_score=score_liquidity(call_volume, call_oi),
+                liq_puts_score=score_liquidity(put_volume, put_oi),
+                avg_option_volume=call_volume + put_volume,
+                open_interest=call_oi + put_oi
+            )
+        universe.ohlcv[ticker] = bars
+        universe.chains[ticker] = (calls, puts)
+        universe.options[ticker] = snapshot
+
+    return universe
+
+
+def _scaled(columns: Dict[str, np.ndarray], index: pd.Index, price_cols: List[str], price_scale: float,
+            volume_cols: List[str], volume_scale: float) -> pd.DataFrame:
+    """Frame built from column arrays with price and volume columns scaled."""
+    data = {}
+    for col, values in columns.items():
+        if col in price_cols:
+            values = values * price_scale
+        elif col in volume_cols:
+            values = (values * volume_scale).astype(np.int64)
+        data[col] = values
+    return pd.DataFrame(data, index=index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the benchmark fixtures")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_fixtures(seed=args.seed)
+    print(f"Fixtures written to {FIXTURE_DIR}")
@@ -0,0 +1,235 @@
+"""
+Load test: run_scan against the stand-in market server.
+
+Starts the stand-in server (benchmarks.standin) in its own process, then
+runs a full scan over a synthetic universe at each size in a fresh
+process, so peak RSS is measured per run. Reports throughput, per-ticker
+fetch latency percentiles, peak RSS and server request/error counts, and
+writes the results as JSON.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sizes 1000 --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+    python -m benchmarks.load_test --url http://127.0.0.1:8765 --sizes 5000 --workers 16
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+from .run import environment
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+DEFAULT_SIZES = (1000, 5000, 10000)
+FETCH_STAGES = ('fundamentals', 'options', 'catalysts')
+
+
+def synthetic_universe(size: int) -> List[str]:
+    """Made-up ticker symbols the stand-in server will serve."""
+    return [f"S{i:05d}" for i in range(size)]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if HAS_RESOURCE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    if HAS_PSUTIL:
+        memory = psutil.Process().memory_info()
+        return round(getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024), 1)
+    return None
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """Mean and tail percentiles in milliseconds."""
+    if not latencies:
+        return {}
+    values = np.asarray(latencies) * 1000
+    return {
+        'mean_ms': round(float(values.mean()), 2),
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+        'p99_ms': round(float(np.percentile(values, 99)), 2),
+        'max_ms': round(float(values.max()), 2),
+    }
+
+
+def run_load(size: int, url: str, workers: Optional[int] = None, persist: bool = False) -> dict:
+    """
+    Run one scan over a synthetic universe in this process.
+
+    Notifications and delta state are switched off, and the outbox and
+    feature store live in a temporary directory for the run.
+
+    Args:
+        size: Number of synthetic tickers
+        url: Stand-in server URL
+        workers: Fetch threads (PIPELINE_FETCH_WORKERS if None)
+        persist: Stream snapshots to the feature store as a real scan would
+
+    Returns:
+        Dict with throughput, latency percentiles and peak RSS
+    """
+    from options_bot.config import Settings
+    from options_bot.ingestion import transport
+    from options_bot.runner import scan
+    from options_bot.runner.profiler import start_profiling, stop_profiling
+
+    # Per-ticker info logs (and injected-error logs) would dominate the run
+    logging.getLogger('options_bot').setLevel(logging.CRITICAL)
+
+    Settings.USE_DISCORD = False
+    Settings.USE_EMAIL = False
+    Settings.DELTA_NOTIFICATIONS = False
+    Settings.PERSIST_SNAPSHOTS = persist
+    if workers:
+        Settings.PIPELINE_FETCH_WORKERS = workers
+    state_dir = tempfile.TemporaryDirectory(prefix='load_test_')
+    Settings.OUTBOX_PATH = str(Path(state_dir.name) / 'outbox.db')
+    Settings.FEATURE_STORE_DIR = str(Path(state_dir.name) / 'features')
+
+    transport.configure('standin', url=url)
+    tickers = synthetic_universe(size)
+    rss_before = peak_rss_mb()
+
+    profiler = start_profiling(f"Load test {size}")
+    start = time.perf_counter()
+    try:
+        ideas = scan.run_scan(f"Load test {size}", tickers)
+    finally:
+        elapsed = time.perf_counter() - start
+        stop_profiling(write=False)
+        state_dir.cleanup()
+
+    report = profiler.report()
+    latencies = [
+        sum(entry['stages'].get(stage, 0.0) for stage in FETCH_STAGES)
+        for entry in report['tickers'].values()
+    ]
+    return {
+        'size': size,
+        'workers': Settings.PIPELINE_FETCH_WORKERS,
+        'persist': persist,
+        'elapsed_s': round(elapsed, 3),
+        'cpu_s': round(profiler.cpu_time, 3),
+        'tickers_per_s': round(size / elapsed, 2) if elapsed else None,
+        'ideas': len(ideas),
+        'ticker_latency': latency_summary(latencies),
+        'stages': {name: stage['wall'] for name, stage in report['stages'].items()},
+        'coalescing': transport.coalescing_stats(),
+        'rss_before_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def start_standin(args) -> tuple:
+    """Launch the stand-in server process and wait for its URL."""
+    command = [
+        sys.executable, '-m', 'benchmarks.standin', '--port', '0',
+        '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+        '--slow-rate', str(args.slow_rate), '--error-rate', str(args.error_rate), '--seed', str(args.seed),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, cwd=Path(__file__).parent.parent)
+    line = process.stdout.readline().strip()
+    if not line.startswith("Stand-in server listening on "):
+        process.kill()
+        raise RuntimeError(f"Stand-in server failed to start: {line!r}")
+    return process, line.rsplit(' ', 1)[-1]
+
+
+def server_stats(url: str) -> dict:
+    try:
+        return requests.get(f"{url}/_stats", timeout=5).json()
+    except Exception:
+        return {}
+
+
+def run_child(size: int, url: str, workers: Optional[int], persist: bool) -> dict:
+    """Run one size in a fresh interpreter so peak RSS covers only that scan."""
+    command = [sys.executable, '-m', 'benchmarks.load_test', '--child', '--url', url, '--sizes', str(size)]
+    if workers:
+        command += ['--workers', str(workers)]
+    if persist:
+        command.append('--persist')
+    result = subprocess.run(command, capture_output=True, text=True, cwd=Path(__file__).parent.parent)
+    if result.returncode != 0:
+        raise RuntimeError(f"Load test at {size} tickers failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load-test run_scan against the stand-in market server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--workers', type=int, help="Fetch threads (default PIPELINE_FETCH_WORKERS)")
+    parser.add_argument('--persist', action='store_true', help="Stream snapshots to a temporary feature store")
+    parser.add_argument('--url', help="Use an already running stand-in server")
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--slow-rate', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help="Results file (default benchmarks/results/load_<timestamp>.json)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_load(args.sizes[0], args.url, args.workers, args.persist)))
+        return
+
+    server, url = (None, args.url) if args.url else start_standin(args)
+    results = []
+    try:
+        for size in args.sizes:
+            before = server_stats(url)
+            result = run_child(size, url, args.workers, args.persist)
+            after = server_stats(url)
+            result['server'] = {k: after.get(k, 0) - before.get(k, 0) for k in after}
+            results.append(result)
+
+            latency = result['ticker_latency']
+            print(f"{size:>7} tickers  {result['elapsed_s']:>8.1f}s  {result['tickers_per_s']:>8.1f}/s  "
+                  f"p50 {latency.get('p50_ms', 0):.0f}ms  p95 {latency.get('p95_ms', 0):.0f}ms  "
+                  f"p99 {latency.get('p99_ms', 0):.0f}ms  peak RSS {result['peak_rss_mb']} MB  "
+                  f"{result['server'].get('requests', 0)} requests", flush=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        'environment': environment(),
+        'server': {'url': url, 'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+                   'slow_rate': args.slow_rate, 'error_rate': args.error_rate, 'seed': args.seed},
+        'results': results,
+    }
+    output = args.output or RESULTS_DIR / f"load_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
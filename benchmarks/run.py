@@ -0,0 +1,246 @@
+"""
+Offline benchmarks for the scoring and analytics hot paths.
+
+Times each function over every ticker of a synthetic universe at several
+sizes (100, 1k and 10k by default) and writes the results as JSON so runs
+can be compared over time. No network access is needed.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 100 1000 --only premium_bias rank_candidates
+    python -m benchmarks.run --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from options_bot.ingestion import technical_analysis
+from options_bot.ingestion.options import calculate_hv, summarize_chain
+from options_bot.models import SignalBundle
+from options_bot.ranker.ranker import rank_candidates
+from options_bot.signals import fundamental_bias, premium_bias, catalyst_score
+from options_bot.strategy import pick_strategy
+
+from .fixtures import BenchUniverse, build_universe, load_base
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def _bench_fundamental_bias(u: BenchUniverse) -> Callable[[], None]:
+    funds = [u.fundamentals[t] for t in u.tickers]
+    return lambda: [fundamental_bias(f) for f in funds]
+
+
+def _bench_premium_bias(u: BenchUniverse) -> Callable[[], None]:
+    opts = [u.options[t] for t in u.tickers]
+    return lambda: [premium_bias(o) for o in opts]
+
+
+def _bench_catalyst_score(u: BenchUniverse) -> Callable[[], None]:
+    cats = [u.catalysts[t] for t in u.tickers]
+    return lambda: [catalyst_score(c) for c in cats]
+
+
+def _bench_pick_strategy(u: BenchUniverse) -> Callable[[], None]:
+    pairs = [
+        (SignalBundle(t, fundamental_bias(u.fundamentals[t]), premium_bias(u.options[t]),
+                      catalyst_score(u.catalysts[t])), u.options[t])
+        for t in u.tickers
+    ]
+    return lambda: [pick_strategy(signals, opts) for signals, opts in pairs]
+
+
+def _bench_rank_candidates(u: BenchUniverse) -> Callable[[], None]:
+    return lambda: rank_candidates(u.tickers, u.fundamentals, u.options, u.catalysts)
+
+
+def _bench_calculate_hv(u: BenchUniverse) -> Callable[[], None]:
+    # get_options_snapshot computes HV from 3 months of closes
+    closes = [u.ohlcv[t]['Close'].iloc[-63:] for t in u.tickers]
+    return lambda: [calculate_hv(c, window=30) for c in closes]
+
+
+def _bench_technical_summary(u: BenchUniverse) -> Callable[[], None]:
+    # get_technical_analysis works on 6 months of bars
+    frames = [u.ohlcv[t].iloc[-126:] for t in u.tickers]
+    return lambda: [technical_analysis.TechnicalAnalysis(df).generate_technical_summary() for df in frames]
+
+
+def _bench_chain_summary(u: BenchUniverse) -> Callable[[], None]:
+    inputs = [(t, *u.chains[t], u.options[t].spot_price, u.options[t].hv30) for t in u.tickers]
+    return lambda: [summarize_chain(*args) for args in inputs]
+
+
+BENCHMARKS: Dict[str, Callable[[BenchUniverse], Callable[[], None]]] = {
+    'fundamental_bias': _bench_fundamental_bias,
+    'premium_bias': _bench_premium_bias,
+    'catalyst_score': _bench_catalyst_score,
+    'pick_strategy': _bench_pick_strategy,
+    'rank_candidates': _bench_rank_candidates,
+    'calculate_hv': _bench_calculate_hv,
+    'technical_summary': _bench_technical_summary,
+    'chain_summary': _bench_chain_summary,
+}
+
+
+def _time(fn: Callable[[], None], repeat: int) -> List[float]:
+    """Wall times of repeated calls with the garbage collector paused."""
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).parent, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> dict:
+    """Versions and machine details recorded with each run."""
+    if technical_analysis.HAS_TALIB:
+        ta_backend = 'talib'
+    elif technical_analysis.HAS_PANDAS_TA:
+        ta_backend = 'pandas_ta'
+    else:
+        ta_backend = 'pandas'
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'ta_backend': ta_backend,
+    }
+
+
+def run_benchmarks(
+    sizes=DEFAULT_SIZES,
+    only: Optional[List[str]] = None,
+    repeat: int = 3,
+    progress: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        sizes: Universe sizes to time
+        only: Benchmark names to run (all if None)
+        repeat: Timed runs per benchmark and size (best and median are reported)
+        progress: Called with each result as it completes
+
+    Returns:
+        Dict with 'environment' and 'results' (one entry per benchmark and size)
+    """
+    names = only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    base = load_base()
+    results = []
+    for size in sizes:
+        universe = build_universe(size, base)
+        for name in names:
+            fn = BENCHMARKS[name](universe)
+            fn()  # Warm up caches and lazy imports
+            times = _time(fn, repeat)
+            result = {
+                'benchmark': name,
+                'size': size,
+                'repeat': repeat,
+                'best_s': round(min(times), 6),
+                'median_s': round(statistics.median(times), 6),
+                'per_ticker_us': round(min(times) / size * 1e6, 3),
+            }
+            results.append(result)
+            if progress:
+                progress(result)
+        del universe
+
+    return {'environment': environment(), 'results': results}
+
+
+def compare(current: dict, previous: dict) -> List[str]:
+    """
+    Lines comparing best times with an earlier run.
+
+    Args:
+        current: Results from run_benchmarks
+        previous: Results loaded from an earlier JSON file
+
+    Returns:
+        Table lines (ratio < 1 means faster now)
+    """
+    before = {(r['benchmark'], r['size']): r for r in previous.get('results', [])}
+    lines = [f"{'benchmark':<20}{'size':>7}{'before s':>12}{'now s':>12}{'ratio':>8}"]
+    for r in current['results']:
+        old = before.get((r['benchmark'], r['size']))
+        if old is None or not old['best_s']:
+            continue
+        ratio = r['best_s'] / old['best_s']
+        lines.append(f"{r['benchmark']:<20}{r['size']:>7}{old['best_s']:>12.4f}{r['best_s']:>12.4f}{ratio:>8.2f}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, help="Results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    # Scoring code logs per ticker; keep the benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('options_bot').setLevel(logging.ERROR)
+
+    def show(result: dict):
+        print(f"{result['benchmark']:<20}{result['size']:>7}  best {result['best_s']:.4f}s  "
+              f"median {result['median_s']:.4f}s  {result['per_ticker_us']:.1f} us/ticker", flush=True)
+
+    report = run_benchmarks(args.sizes, args.only, args.repeat, progress=show)
+
+    output = args.output or RESULTS_DIR / f"bench_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print()
+        print("\n".join(compare(report, previous)))
+
+
+if __name__ == "__main__":
+    main()
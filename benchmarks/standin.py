@@ -0,0 +1,453 @@
+"""
+Local stand-in market-data server.
+
+Serves synthetic quotes, price history, option chains, earnings calendars
+and news for any ticker symbol, plus SEC EDGAR, openFDA, NewsAPI, Finnhub
+(news, quotes) and Polygon (news, daily and grouped daily aggregates) responses, so a scan can run against thousands of made-up
+tickers without touching the real providers. Every ticker's data is
+derived from a hash of its symbol, so runs are reproducible. Latency,
+slow-request and error rates are configurable to exercise tail behaviour.
+
+Point the bot at it with TRANSPORT_MODE=standin and STANDIN_URL, or
+transport.configure('standin', url=...).
+
+Usage:
+    python -m benchmarks.standin --port 8765 --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .fixtures import HEADLINES, SECTORS
+
+PERIOD_DAYS = {'5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504}
+HISTORY_DAYS = 504
+# Synthetic tickers (S00000, S00001, ...) listed in the SEC bulk ticker file
+SEC_LISTED = 20000
+# Synthetic tickers in Polygon grouped daily responses (the whole "market")
+GROUPED_LISTED = 500
+
+
+class StandInMarket:
+    """Deterministic synthetic market data keyed by ticker symbol."""
+
+    def __init__(self, seed: int = 0, today: Optional[date] = None):
+        """
+        Args:
+            seed: Seed mixed into every ticker's generator
+            today: Last trading day served (the current date if None)
+        """
+        self.seed = seed
+        self._today = today
+        # Scans request each ticker's quote, history and chain back to back
+        self._profile = lru_cache(maxsize=16384)(self._profile)
+        self._bars = lru_cache(maxsize=4096)(self._bars)
+        self._dates = lru_cache(maxsize=4)(self._dates)
+
+    @property
+    def today(self) -> date:
+        return self._today or date.today()
+
+    def _rng(self, *parts) -> np.random.Generator:
+        key = '|'.join(str(p) for p in parts)
+        return np.random.default_rng([self.seed, zlib.crc32(key.encode())])
+
+    def _profile(self, ticker: str) -> dict:
+        rng = self._rng(ticker)
+        return {
+            'vol': float(rng.uniform(0.15, 0.8)),
+            'start': float(rng.uniform(10, 500)),
+            'sector': str(rng.choice(SECTORS)),
+            'shares': float(np.exp(rng.uniform(np.log(2e7), np.log(5e9)))),
+            'pe': None if rng.random() < 0.1 else round(float(rng.lognormal(3.0, 0.5)), 2),
+            'forward_pe': round(float(rng.lognormal(2.9, 0.4)), 2),
+            'margins': round(float(rng.normal(0.12, 0.1)), 4),
+            'debt_to_equity': round(float(rng.lognormal(-0.5, 0.8)) * 100, 2),
+            'revenue_growth': round(float(rng.normal(0.08, 0.15)), 4),
+            'earnings_growth': round(float(rng.normal(0.1, 0.3)), 4),
+            'earnings_in': int(rng.integers(1, 90)),
+            'liquidity': float(rng.lognormal(6, 1.5)),
+        }
+
+    def _dates(self, today: date) -> pd.DatetimeIndex:
+        return pd.bdate_range(end=today, periods=HISTORY_DAYS)
+
+    def _bars(self, ticker: str, today: date) -> pd.DataFrame:
+        profile = self._profile(ticker)
+        rng = self._rng(ticker, 'bars')
+        vol = profile['vol']
+        returns = rng.normal(0.0003, vol / np.sqrt(252), HISTORY_DAYS)
+        close = profile['start'] * np.exp(np.cumsum(returns))
+        spread = np.abs(rng.normal(0, vol / np.sqrt(252), HISTORY_DAYS)) * close
+        open_ = close * (1 + rng.normal(0, vol / np.sqrt(252) / 2, HISTORY_DAYS))
+        bars = pd.DataFrame({
+            'Open': open_.round(4),
+            'High': (np.maximum(open_, close) + spread).round(4),
+            'Low': (np.minimum(open_, close) - spread).round(4),
+            'Close': close.round(4),
+            'Volume': rng.lognormal(14, 1, HISTORY_DAYS).astype(np.int64),
+        }, index=self._dates(today))
+        return bars
+
+    def history(self, ticker: str, days: int) -> pd.DataFrame:
+        """Daily OHLCV bars ending on the last trading day."""
+        return self._bars(ticker, self.today).iloc[-days:]
+
+    def grouped_daily(self, day: date) -> List[dict]:
+        """Polygon grouped daily results for every GROUPED_LISTED ticker (empty off trading days)."""
+        stamp = pd.Timestamp(day)
+        if stamp not in self._dates(self.today):
+            return []
+        results = []
+        for i in range(GROUPED_LISTED):
+            ticker = f"S{i:05d}"
+            row = self._bars(ticker, self.today).loc[stamp]
+            results.append({'T': ticker, 'o': row.Open, 'h': row.High, 'l': row.Low, 'c': row.Close,
+                            'v': int(row.Volume), 't': int(stamp.tz_localize('America/New_York').timestamp() * 1000)})
+        return results
+
+    def spot(self, ticker: str) -> float:
+        return float(self._bars(ticker, self.today)['Close'].iat[-1])
+
+    def info(self, ticker: str) -> dict:
+        profile = self._profile(ticker)
+        spot = self.spot(ticker)
+        return {
+            'symbol': ticker,
+            'longName': f"{ticker} Holdings Inc.",
+            'quoteType': 'EQUITY',
+            'currentPrice': spot,
+            'regularMarketPrice': spot,
+            'marketCap': round(spot * profile['shares'], -3),
+            'trailingPE': profile['pe'],
+            'forwardPE': profile['forward_pe'],
+            'profitMargins': profile['margins'],
+            'debtToEquity': profile['debt_to_equity'],
+            'sector': profile['sector'],
+            'revenueGrowth': profile['revenue_growth'],
+            'earningsGrowth': profile['earnings_growth'],
+        }
+
+    def expirations(self) -> List[str]:
+        """Weekly Friday expirations for the next ten weeks."""
+        first = self.today + timedelta(days=(4 - self.today.weekday()) % 7 or 7)
+        return [(first + timedelta(weeks=i)).isoformat() for i in range(10)]
+
+    def option_chain(self, ticker: str, expiration: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Calls and puts with a put-skewed smile around spot."""
+        profile = self._profile(ticker)
+        rng = self._rng(ticker, 'chain', expiration)
+        spot = self.spot(ticker)
+        dte = max((date.fromisoformat(expiration) - self.today).days, 1)
+        strikes = np.round(spot + spot * 0.025 * np.arange(-12, 13), 2)
+        moneyness = np.log(strikes / spot)
+        atm_iv = profile['vol'] * rng.uniform(0.8, 1.4)
+        frames = []
+        for kind, skew in (('C', -0.3), ('P', -0.6)):
+            iv = np.clip(atm_iv + skew * moneyness + 1.5 * moneyness ** 2, 0.05, None)
+            weight = np.exp(-(moneyness / 0.1) ** 2)
+            intrinsic = np.maximum(spot - strikes, 0) if kind == 'C' else np.maximum(strikes - spot, 0)
+            price = intrinsic + spot * iv * np.sqrt(dte / 365) * 0.4 * weight
+            frames.append(pd.DataFrame({
+                'contractSymbol': [f"{ticker}{expiration.replace('-', '')[2:]}{kind}{int(k * 1000):08d}" for k in strikes],
+                'strike': strikes,
+                'lastPrice': price.round(2),
+                'bid': (price * 0.97).round(2),
+                'ask': (price * 1.03).round(2),
+                'volume': (profile['liquidity'] * weight * rng.uniform(0.5, 1.5, len(strikes))).astype(np.int64),
+                'openInterest': (profile['liquidity'] * 8 * weight * rng.uniform(0.5, 1.5, len(strikes))).astype(np.int64),
+                'impliedVolatility': iv.round(4),
+            }))
+        return frames[0], frames[1]
+
+    def earnings_date(self, ticker: str) -> date:
+        return self.today + timedelta(days=self._profile(ticker)['earnings_in'])
+
+    def headlines(self, ticker: str, source: str = 'yahoo') -> List[str]:
+        rng = self._rng(ticker, 'news', source, self.today)
+        picks = rng.choice(HEADLINES, int(rng.integers(0, 6)), replace=False)
+        return [f"{ticker}: {h}" for h in picks]
+
+    def is_healthcare(self, ticker: str) -> bool:
+        return self._profile(ticker)['sector'] == 'Healthcare'
+
+    def cik(self, ticker: str) -> int:
+        return zlib.crc32(ticker.encode()) % 10 ** 7
+
+    @lru_cache(maxsize=1)
+    def sec_tickers(self) -> dict:
+        """SEC's company_tickers.json for the synthetic universe."""
+        return {
+            str(i): {'cik_str': self.cik(ticker), 'ticker': ticker, 'title': f"{ticker} Holdings Inc."}
+            for i, ticker in enumerate(f"S{n:05d}" for n in range(SEC_LISTED))
+        }
+
+
+def _frame_payload(df: pd.DataFrame) -> dict:
+    return {'index': [d.isoformat() for d in df.index.date], 'columns': df.to_dict('list')}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes /yf/<ticker>/<member>, /http/<host>/<path> and /_stats."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real providers
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    server: 'StandInServer'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        route = parts.path.strip('/').split('/')
+
+        if route == ['_stats']:
+            return self._send(200, self.server.stats())
+
+        self.server.delay()
+        if self.server.inject_error():
+            return self._send(503, {'error': 'injected failure'})
+
+        try:
+            if route[0] == 'yf' and len(route) == 3:
+                status, body = self._yfinance(route[1], route[2], params)
+            elif route[0] == 'http' and len(route) >= 2:
+                status, body = self._provider(route[1], '/' + '/'.join(route[2:]), params)
+            else:
+                status, body = 404, {'error': f"unknown route {parts.path}"}
+        except Exception as e:
+            status, body = 500, {'error': str(e)}
+        self.server.count(route[0], status)
+        self._send(status, body)
+
+    def _send(self, status: int, body):
+        if isinstance(body, str):
+            data, content_type = body.encode(), 'text/html; charset=utf-8'
+        else:
+            data, content_type = json.dumps(body).encode(), 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _yfinance(self, ticker: str, member: str, params: Dict[str, str]):
+        market = self.server.market
+        if member == 'info':
+            return 200, market.info(ticker)
+        if member == 'fast_info':
+            return 200, {'lastPrice': market.spot(ticker)}
+        if member == 'history':
+            days = PERIOD_DAYS.get(params.get('period', '1mo'), 21)
+            bars = market.history(ticker, HISTORY_DAYS)
+            if 'start' in params:
+                bars = bars[bars.index >= pd.Timestamp(params['start'])]
+                if params.get('end'):
+                    bars = bars[bars.index < pd.Timestamp(params['end'])]
+            else:
+                bars = bars.iloc[-days:]
+            return 200, _frame_payload(bars)
+        if member == 'options':
+            return 200, market.expirations()
+        if member == 'option_chain':
+            expiration = params.get('date') or market.expirations()[0]
+            calls, puts = market.option_chain(ticker, expiration)
+            return 200, {'calls': calls.to_dict('list'), 'puts': puts.to_dict('list'),
+                         'underlying': {'regularMarketPrice': market.spot(ticker)}}
+        if member == 'calendar':
+            return 200, {'Earnings Date': [market.earnings_date(ticker).isoformat()]}
+        if member == 'news':
+            return 200, [{'title': h, 'publisher': 'Stand-in Wire'} for h in market.headlines(ticker)]
+        if member in ('splits', 'dividends'):
+            return 200, {'index': [], 'values': []}
+        return 404, {'error': f"unknown member {member}"}
+
+    def _provider(self, host: str, path: str, params: Dict[str, str]):
+        market = self.server.market
+        today = market.today.isoformat()
+
+        if host == 'www.sec.gov':
+            if path == '/files/company_tickers.json':
+                return 200, market.sec_tickers()
+            if 'company' in params:
+                ticker = params['company']
+                return 200, f'<span class="companyName">{ticker} Holdings Inc. CIK#: {market.cik(ticker):010d} (see all)</span>'
+            rows = ''.join(
+                f'<tr><td>{form}</td><td><a href="/Archives/edgar/data/{params.get("CIK", "0")}/{i}.htm">Documents</a>'
+                f'</td><td>{form} filing</td><td>{(market.today - timedelta(days=3 * i)).isoformat()}</td></tr>'
+                for i, form in enumerate(['8-K', '10-Q', '4', '8-K', 'SC 13G'])
+            )
+            return 200, f'<table class="tableFile2"><tr><th>Filings</th></tr>{rows}</table>'
+
+        if host == 'api.fda.gov':
+            search = params.get('search', '')
+            ticker = search.split('"')[1].split()[0] if '"' in search else ''
+            if not market.is_healthcare(ticker):
+                return 404, {'error': {'code': 'NOT_FOUND', 'message': 'No matches found!'}}
+            if path.endswith('event.json'):
+                results = [{'receivedate': today.replace('-', ''), 'serious': 1,
+                            'patient': {'reaction': [{'reactionmeddrapt': 'Nausea'}]}}]
+            elif path.endswith('drugsfda.json'):
+                results = [{'products': [{'brand_name': f"{ticker}-101", 'marketing_status_date': today,
+                                          'active_ingredients': [{'name': 'standinumab'}]}]}]
+            else:
+                results = [{'product_description': f"{ticker}-101 tablets", 'reason_for_recall': 'Labeling',
+                            'classification': 'Class III', 'recall_initiation_date': today, 'status': 'Ongoing'}]
+            return 200, {'results': results}
+
+        if host == 'newsapi.org':
+            ticker = params.get('q', '')
+            return 200, {'status': 'ok', 'articles': [
+                {'title': h, 'description': h, 'url': f"https://news.example/{ticker}/{i}", 'publishedAt': f"{today}T12:00:00Z"}
+                for i, h in enumerate(market.headlines(ticker, 'newsapi'))
+            ]}
+        if host == 'finnhub.io':
+            ticker = params.get('symbol', '')
+            if path.endswith('/quote'):
+                return 200, {'c': market.spot(ticker), 't': int(time.time())}
+            stamp = int(time.time())
+            return 200, [
+                {'headline': h, 'summary': h, 'url': f"https://news.example/{ticker}/{i}", 'datetime': stamp - 3600 * i}
+                for i, h in enumerate(market.headlines(ticker, 'finnhub'))
+            ]
+        if host == 'api.polygon.io':
+            if path.startswith('/v2/aggs/grouped/'):
+                results = market.grouped_daily(date.fromisoformat(path.split('/')[-1]))
+                return 200, {'status': 'OK', 'adjusted': True, 'resultsCount': len(results), 'results': results}
+            if path.startswith('/v2/aggs/ticker/'):
+                ticker, start, end = path.split('/')[4], path.split('/')[-2], path.split('/')[-1]
+                bars = market.history(ticker, HISTORY_DAYS).loc[start:end]
+                # Polygon stamps daily bars at midnight New York time
+                stamps = [int(day.timestamp() * 1000) for day in bars.index.tz_localize('America/New_York')]
+                return 200, {'status': 'OK', 'ticker': ticker, 'results': [
+                    {'t': stamp, 'o': row.Open, 'h': row.High, 'l': row.Low, 'c': row.Close, 'v': int(row.Volume)}
+                    for stamp, row in zip(stamps, bars.itertuples())
+                ]}
+            ticker = params.get('ticker', '')
+            return 200, {'status': 'OK', 'results': [
+                {'title': h, 'description': h, 'article_url': f"https://news.example/{ticker}/{i}",
+                 'published_utc': f"{today}T12:00:00Z"}
+                for i, h in enumerate(market.headlines(ticker, 'polygon'))
+            ]}
+        return 404, {'error': f"unknown provider {host}"}
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server with injected latency and failures."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], market: Optional[StandInMarket] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, slow_rate: float = 0.0,
+                 slow_factor: float = 10.0, error_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            address: (host, port) to bind (port 0 picks a free port)
+            market: Data source (a StandInMarket with the given seed if None)
+            latency_ms: Mean delay per request
+            jitter_ms: Uniform +/- spread around the mean delay
+            slow_rate: Fraction of requests delayed slow_factor times longer
+            slow_factor: Multiplier for slow requests
+            error_rate: Fraction of requests answered with HTTP 503
+            seed: Seed for data and for the latency/error draws
+        """
+        super().__init__(address, StandInHandler)
+        self.market = market or StandInMarket(seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {'requests': 0, 'errors': 0, 'injected_errors': 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self):
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            if self._random.random() < self.slow_rate:
+                delay *= self.slow_factor
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def inject_error(self) -> bool:
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            self._counts['requests'] += failed
+            self._counts['injected_errors'] += failed
+        return failed
+
+    def count(self, kind: str, status: int):
+        with self._lock:
+            self._counts['requests'] += 1
+            self._counts[kind] = self._counts.get(kind, 0) + 1
+            if status >= 500:
+                self._counts['errors'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **kwargs) -> StandInServer:
+    """
+    Start a stand-in server on a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        **kwargs: StandInServer latency/error options
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    server = StandInServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, name='standin-server', daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the stand-in market-data server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="Fraction of requests made slow")
+    parser.add_argument('--slow-factor', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failing with 503")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        (args.host, args.port), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate, slow_factor=args.slow_factor, error_rate=args.error_rate, seed=args.seed
+    )
+    # The load-test driver reads the bound address from this line
+    print(f"Stand-in server listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""Historical replay of archived scans."""
+from .engine import run_backtest, load_scan_panel, prepare_backtest, evaluate, BacktestResult
+from .sweep import run_sweep, build_grid, SweepResult
+
+__all__ = [
+    'run_backtest', 'load_scan_panel', 'prepare_backtest', 'evaluate', 'BacktestResult',
+    'run_sweep', 'build_grid', 'SweepResult'
+]
@@ -0,0 +1,37 @@
+"""
+Command line entry point for backtesting archived scans.
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+
+from .engine import run_backtest
+from . import sweep
+
+
+def main():
+    """Run a backtest and print the per-strategy summary ('sweep' runs a parameter sweep)."""
+    if len(sys.argv) > 1 and sys.argv[1] == 'sweep':
+        sweep.main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Replay archived scans against forward returns")
+    parser.add_argument('--start', type=date.fromisoformat, help="First scan date (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, help="Last scan date (YYYY-MM-DD)")
+    parser.add_argument('--horizon', type=int, default=5, help="Holding period in trading days")
+    parser.add_argument('--top-k', type=int, default=None, help="Picks per day (0 = all scored)")
+    parser.add_argument('--trades', help="Optional CSV path for the selected trades")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    result = run_backtest(args.start, args.end, horizon=args.horizon, top_k=args.top_k)
+    print(result.summary().to_string(float_format=lambda x: f"{x:.4f}"))
+
+    if args.trades:
+        result.trades.to_csv(args.trades, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Vectorized replay of the ranker and strategy picker over archived scans.
+
+Archived scans are pivoted into a (days x tickers) panel per field, every
+signal is computed for the whole panel at once with the *_vec scoring
+functions, and forward returns come from the local bar store.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import Settings
+from ..signals import fundamental_bias_vec, premium_bias_vec, catalyst_score_vec
+from ..ranker import calculate_overall_score_vec
+from ..strategy import pick_strategy_codes, STRATEGY_NAMES
+from ..storage import FeatureStore, BarStore
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = [
+    'market_cap', 'pe_ratio', 'forward_pe', 'profit_margins', 'debt_to_equity',
+    'revenue_growth', 'earnings_growth',
+    'spot_price', 'hv30', 'atm_iv_dte35', 'iv_rank_1y', 'skew_25d_rr', 'term_slope_iv',
+    'liq_calls_score', 'liq_puts_score',
+    'days_to_earnings', 'has_major_event_7d', 'sentiment_score', 'headline_count',
+]
+
+BULLISH_STRATEGIES = ("BULL PUT SPREAD", "LONG CALL", "CALL DEBIT SPREAD")
+BEARISH_STRATEGIES = ("BEAR CALL SPREAD", "LONG PUT", "PUT DEBIT SPREAD")
+SHORT_VOL_STRATEGIES = ("IRON CONDOR", "SHORT STRANGLE", "CALENDAR SPREAD")
+LONG_VOL_STRATEGIES = ("LONG STRADDLE",)
+
+# Outcome class per strategy code: 0 bullish, 1 bearish, 2 short vol, 3 long vol
+_OUTCOME_CLASS = np.array([
+    0 if name in BULLISH_STRATEGIES else
+    1 if name in BEARISH_STRATEGIES else
+    2 if name in SHORT_VOL_STRATEGIES else 3
+    for name in STRATEGY_NAMES
+], dtype=np.int8)
+
+
+@dataclass
+class ScanPanel:
+    """Archived scan inputs as (days x tickers) float arrays."""
+    dates: np.ndarray  # datetime64[D], one per replayed scan day
+    tickers: np.ndarray  # ticker symbols, one per column
+    fields: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.dates), len(self.tickers))
+
+
+@dataclass
+class BacktestData:
+    """Everything about a replay that does not depend on weights or thresholds."""
+    panel: ScanPanel
+    horizon: int
+    fund_bias: np.ndarray
+    premium_bias: np.ndarray
+    catalyst_score: np.ndarray
+    liquidity_score: np.ndarray
+    eligible: np.ndarray  # True where the live ranker would have scored the ticker
+    strategies: np.ndarray  # Codes into STRATEGY_NAMES
+    forward_return: np.ndarray
+    strategy_return: np.ndarray
+
+
+@dataclass
+class BacktestResult:
+    """Trades selected by a replay and their outcomes."""
+    trades: pd.DataFrame
+    horizon: int
+
+    def summary(self) -> pd.DataFrame:
+        """Per-strategy hit rate and return distribution (plus an ALL row)."""
+        return summarize_trades(self.trades)
+
+
+def load_scan_panel(
+    store: Optional[FeatureStore] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    run: str = 'first'
+) -> ScanPanel:
+    """
+    Load archived scans as a (days x tickers) panel.
+
+    Args:
+        store: Feature store to read (default location if None)
+        start: First scan date
+        end: Last scan date
+        run: Which scan to keep when a day has several ('first' or 'last')
+
+    Returns:
+        ScanPanel with one row per scan day
+    """
+    store = store or FeatureStore()
+    df = store.load(columns=['date', 'scan_time', 'ticker'] + PANEL_FIELDS, start=start, end=end)
+    if df.empty:
+        return ScanPanel(np.array([], dtype='datetime64[D]'), np.array([], dtype=object),
+                         {name: np.empty((0, 0)) for name in PANEL_FIELDS})
+
+    # Keep a single scan per day so each day is one decision point
+    pick = df.groupby('date')['scan_time'].transform('min' if run == 'first' else 'max')
+    df = df[df['scan_time'] == pick]
+
+    day_idx, days = pd.factorize(df['date'], sort=True)
+    tick_idx, tickers = pd.factorize(df['ticker'], sort=True)
+
+    fields = {}
+    for name in PANEL_FIELDS:
+        values = np.full((len(days), len(tickers)), np.nan)
+        values[day_idx, tick_idx] = df[name].astype('float64').values
+        fields[name] = values
+
+    return ScanPanel(np.asarray(days, dtype='datetime64[D]'), np.asarray(tickers, dtype=object), fields)
+
+
+def forward_returns(
+    dates: np.ndarray,
+    tickers: np.ndarray,
+    horizon: int,
+    bar_store: Optional[BarStore] = None
+) -> np.ndarray:
+    """
+    Close-to-close returns from each scan day over the next `horizon` sessions.
+
+    Entry is the first close on or after the scan date.
+
+    Args:
+        dates: Scan dates (datetime64[D])
+        tickers: Column tickers
+        horizon: Holding period in trading days
+        bar_store: Bar store to read (default location if None)
+
+    Returns:
+        (days x tickers) array of returns, NaN where bars are missing
+    """
+    shape = (len(dates), len(tickers))
+    if not len(dates) or not len(tickers):
+        return np.full(shape, np.nan)
+
+    bar_store = bar_store or BarStore()
+    first = pd.Timestamp(dates.min()).date()
+    last = pd.Timestamp(dates.max()).date() + timedelta(days=horizon * 2 + 10)
+    closes = bar_store.close_panel(list(tickers), start=first, end=last)
+    if closes.empty:
+        return np.full(shape, np.nan)
+
+    bar_dates = np.asarray(pd.to_datetime(closes.index).values, dtype='datetime64[D]')
+    prices = closes.values.astype(float)
+
+    entry = np.searchsorted(bar_dates, dates, side='left')
+    exit_ = entry + horizon
+    valid = exit_ < len(bar_dates)
+    entry = np.minimum(entry, len(bar_dates) - 1)
+    exit_ = np.minimum(exit_, len(bar_dates) - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices[exit_] / prices[entry] - 1.0
+    returns[~valid] = np.nan
+    return returns
+
+
+def strategy_returns(
+    strategies: np.ndarray,
+    fwd_return: np.ndarray,
+    atm_iv: np.ndarray,
+    hv30: np.ndarray,
+    horizon: int
+) -> np.ndarray:
+    """
+    Underlying-based outcome proxy for each strategy.
+
+    Directional strategies earn the signed move. Premium-selling
+    strategies earn the implied move (ATM IV, else HV, scaled to the
+    horizon) minus the realized absolute move; long straddles earn the
+    reverse. This measures whether the picked view was right, not option
+    P&L.
+
+    Args:
+        strategies: Strategy codes (see pick_strategy_codes)
+        fwd_return: Forward returns
+        atm_iv: ATM implied volatility
+        hv30: Historical volatility (used when IV is missing)
+        horizon: Holding period in trading days
+
+    Returns:
+        Array of strategy returns (positive = view was right)
+    """
+    vol = np.where(np.isnan(atm_iv), hv30, atm_iv)
+    expected_move = vol * np.sqrt(horizon / 252.0)
+    move = np.abs(fwd_return)
+    outcome = _OUTCOME_CLASS[strategies]
+
+    return np.choose(outcome, [fwd_return, -fwd_return, expected_move - move, move - expected_move])
+
+
+def prepare_backtest(
+    panel: ScanPanel,
+    horizon: int = 5,
+    bar_store: Optional[BarStore] = None
+) -> BacktestData:
+    """
+    Compute all weight-independent signals and outcomes for a panel.
+
+    Args:
+        panel: Archived scans
+        horizon: Holding period in trading days
+        bar_store: Bar store for forward returns
+
+    Returns:
+        BacktestData ready for evaluate()
+    """
+    p = panel
+    fund = fundamental_bias_vec(p['pe_ratio'], p['forward_pe'], p['profit_margins'],
+                                p['debt_to_equity'], p['revenue_growth'], p['earnings_growth'])
+    prem = premium_bias_vec(p['atm_iv_dte35'], p['hv30'], p['iv_rank_1y'],
+                            p['skew_25d_rr'], p['term_slope_iv'])
+    cat = catalyst_score_vec(p['days_to_earnings'], p['has_major_event_7d'],
+                             p['sentiment_score'], p['headline_count'])
+    liquidity = (np.nan_to_num(p['liq_calls_score']) + np.nan_to_num(p['liq_puts_score'])) / 2
+
+    # The live ranker skips tickers missing fundamentals, options or catalysts
+    eligible = ~np.isnan(p['market_cap']) & ~np.isnan(p['spot_price']) & ~np.isnan(p['headline_count'])
+
+    strategies = pick_strategy_codes(fund, prem, cat)
+    fwd = forward_returns(p.dates, p.tickers, horizon, bar_store)
+    strat_ret = strategy_returns(strategies, fwd, p['atm_iv_dte35'], p['hv30'], horizon)
+
+    return BacktestData(
+        panel=panel,
+        horizon=horizon,
+        fund_bias=fund,
+        premium_bias=prem,
+        catalyst_score=cat,
+        liquidity_score=liquidity,
+        eligible=eligible,
+        strategies=strategies,
+        forward_return=fwd,
+        strategy_return=strat_ret
+    )
+
+
+def score_panel(data: BacktestData, **params) -> np.ndarray:
+    """
+    Overall scores for the panel (NaN where the ticker was not eligible).
+
+    Args:
+        data: Prepared backtest data
+        **params: Overrides passed to calculate_overall_score_vec
+            (weight_fundamental, weight_premium, weight_catalyst,
+            min_liquidity_score, min_market_cap)
+
+    Returns:
+        (days x tickers) score array
+    """
+    scores = calculate_overall_score_vec(
+        data.fund_bias, data.premium_bias, data.catalyst_score,
+        data.liquidity_score, np.nan_to_num(data.panel['market_cap']),
+        **params
+    )
+    return np.where(data.eligible, scores, np.nan)
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Mask of the k best scores in each row.
+
+    Args:
+        scores: (days x tickers) scores, NaN = not rankable
+        k: Picks per day
+
+    Returns:
+        Boolean mask with at most k True values per row
+    """
+    if scores.size == 0:
+        return np.zeros(scores.shape, dtype=bool)
+    k = min(k, scores.shape[1])
+    order = np.argsort(-np.where(np.isnan(scores), -np.inf, scores), axis=1, kind='stable')[:, :k]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, order, True, axis=1)
+    return mask & ~np.isnan(scores)
+
+
+def evaluate(data: BacktestData, top_k: Optional[int] = None, **params) -> BacktestResult:
+    """
+    Replay ranking and strategy selection for every day at once.
+
+    Args:
+        data: Prepared backtest data
+        top_k: Picks per day (Settings.MAX_PICKS if None; 0 keeps all scored)
+        **params: Scoring overrides passed to score_panel
+
+    Returns:
+        BacktestResult with one row per selected (day, ticker)
+    """
+    scores = score_panel(data, **params)
+    k = Settings.MAX_PICKS if top_k is None else top_k
+    mask = select_top_k(scores, k) if k else ~np.isnan(scores)
+
+    day_idx, tick_idx = np.nonzero(mask)
+    trades = pd.DataFrame({
+        'date': data.panel.dates[day_idx],
+        'ticker': data.panel.tickers[tick_idx],
+        'score': scores[day_idx, tick_idx],
+        'strategy': np.asarray(STRATEGY_NAMES)[data.strategies[day_idx, tick_idx]],
+        'fund_bias': data.fund_bias[day_idx, tick_idx],
+        'premium_bias': data.premium_bias[day_idx, tick_idx],
+        'catalyst_score': data.catalyst_score[day_idx, tick_idx],
+        'forward_return': data.forward_return[day_idx, tick_idx],
+        'strategy_return': data.strategy_return[day_idx, tick_idx],
+    })
+    trades['hit'] = trades['strategy_return'] > 0
+    return BacktestResult(trades=trades, horizon=data.horizon)
+
+
+def summarize_trades(trades: pd.DataFrame) -> pd.DataFrame:
+    """
+    Hit rate and return distribution per strategy.
+
+    Trades without a forward return (bars missing or too recent) are
+    excluded.
+
+    Args:
+        trades: Trades from evaluate()
+
+    Returns:
+        DataFrame indexed by strategy, with an ALL row
+    """
+    done = trades.dropna(subset=['strategy_return'])
+    columns = ['trades', 'hit_rate', 'mean', 'std', 'p05', 'p25', 'median', 'p75', 'p95']
+    if done.empty:
+        return pd.DataFrame(columns=columns)
+
+    def stats(returns: pd.Series) -> pd.Series:
+        q = returns.quantile([0.05, 0.25, 0.5, 0.75, 0.95]).values
+        return pd.Series([len(returns), (returns > 0).mean(), returns.mean(), returns.std(),
+                          q[0], q[1], q[2], q[3], q[4]], index=columns)
+
+    summary = done.groupby('strategy')['strategy_return'].apply(stats).unstack()
+    summary.loc['ALL'] = stats(done['strategy_return'])
+    summary['trades'] = summary['trades'].astype(int)
+    return summary[columns]
+
+
+def run_backtest(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    horizon: int = 5,
+    top_k: Optional[int] = None,
+    feature_store: Optional[FeatureStore] = None,
+    bar_store: Optional[BarStore] = None,
+    **params
+) -> BacktestResult:
+    """
+    Replay archived scans and measure forward outcomes.
+
+    Args:
+        start: First scan date
+        end: Last scan date
+        horizon: Holding period in trading days
+        top_k: Picks per day (Settings.MAX_PICKS if None; 0 keeps all scored)
+        feature_store: Archived scans (default location if None)
+        bar_store: Daily bars for forward returns (default location if None)
+        **params: Scoring overrides passed to score_panel
+
+    Returns:
+        BacktestResult
+    """
+    panel = load_scan_panel(feature_store, start, end)
+    logger.info(f"Replaying {panel.shape[0]} scan days x {panel.shape[1]} tickers")
+    data = prepare_backtest(panel, horizon, bar_store)
+    return evaluate(data, top_k, **params)
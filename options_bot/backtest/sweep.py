@@ -0,0 +1,296 @@
+"""
+Parallel sweep of scoring weights and thresholds over archived scans.
+
+Signals, strategies and forward outcomes do not depend on the weights,
+so they are computed once (prepare_backtest) and shipped to each worker
+process a single time. Workers then only re-score, re-select the daily
+top-K and reduce to per-day totals for each parameter combination.
+Walk-forward folds are evaluated from those per-day totals: each fold
+chooses a combination on its training window alone and scores it on the
+following test window.
+"""
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import Settings
+from ..storage import FeatureStore, BarStore
+from .engine import BacktestData, load_scan_panel, prepare_backtest, score_panel, select_top_k
+
+logger = logging.getLogger(__name__)
+
+PARAM_NAMES = ['weight_fundamental', 'weight_premium', 'weight_catalyst', 'min_liquidity_score']
+
+# Set in each worker by _init_worker
+_DATA: Optional[BacktestData] = None
+_TOP_K: int = 0
+
+
+@dataclass
+class SweepResult:
+    """Outcome of a parameter sweep."""
+    results: pd.DataFrame  # One row per combination: parameters and their metrics over the whole period
+    walk_forward: pd.DataFrame  # One row per fold: parameters chosen in-sample and their next-window metrics
+    objective: str
+
+
+def build_grid(
+    weight_step: float = 0.05,
+    min_liquidity_scores: Sequence[float] = (1.0, 2.0, 3.0, 4.0, 5.0),
+    min_weight: float = 0.0
+) -> List[Dict[str, float]]:
+    """
+    Grid of scoring weights and liquidity thresholds.
+
+    Only the fundamental, premium and catalyst weights affect
+    calculate_overall_score, so those are swept with a total of at most
+    1.0 (the remainder is what WEIGHT_TECHNICAL and WEIGHT_NEWS_SENTIMENT
+    would take).
+
+    Args:
+        weight_step: Grid spacing for each weight
+        min_liquidity_scores: MIN_LIQUIDITY_SCORE values to try
+        min_weight: Smallest weight allowed for each component
+
+    Returns:
+        List of parameter dictionaries
+    """
+    steps = np.round(np.arange(min_weight, 1.0 + 1e-9, weight_step), 6)
+    grid = []
+    for w_fund, w_prem, w_cat in itertools.product(steps, steps, steps):
+        if w_fund + w_prem + w_cat > 1.0 + 1e-9 or w_fund + w_prem + w_cat == 0:
+            continue
+        for min_liq in min_liquidity_scores:
+            grid.append({
+                'weight_fundamental': float(w_fund),
+                'weight_premium': float(w_prem),
+                'weight_catalyst': float(w_cat),
+                'min_liquidity_score': float(min_liq),
+            })
+    return grid
+
+
+def walk_forward_folds(n_days: int, train_days: int, test_days: int, purge: int = 0) -> List[Tuple[slice, slice]]:
+    """
+    Rolling (train, test) day windows.
+
+    Args:
+        n_days: Number of scan days
+        train_days: Days in each in-sample window
+        test_days: Days in each following out-of-sample window
+        purge: Days skipped between the two windows, so outcomes of the
+            last training days (horizon days ahead) end before testing starts
+
+    Returns:
+        List of (train, test) slices over the day axis
+    """
+    if train_days <= 0 or test_days <= 0:
+        raise ValueError(f"train_days and test_days must be positive (got {train_days}, {test_days})")
+    if purge < 0:
+        raise ValueError(f"purge must not be negative (got {purge})")
+
+    folds = []
+    start = 0
+    while start + train_days + purge + test_days <= n_days:
+        train = slice(start, start + train_days)
+        test = slice(start + train_days + purge, start + train_days + purge + test_days)
+        folds.append((train, test))
+        start += test_days
+    return folds
+
+
+def _init_worker(data: BacktestData, top_k: int):
+    """Receive the prepared panel once per worker process."""
+    global _DATA, _TOP_K
+    _DATA = data
+    _TOP_K = top_k
+
+
+def evaluate_daily(data: BacktestData, params: Dict[str, float], top_k: int) -> np.ndarray:
+    """
+    Per-day totals for one parameter combination.
+
+    Args:
+        data: Prepared backtest data
+        params: Scoring overrides for calculate_overall_score_vec
+        top_k: Picks per day (0 keeps all scored)
+
+    Returns:
+        (3, days) array of [sum of strategy returns, hits, trades with outcomes]
+    """
+    scores = score_panel(data, **params)
+    # Same selection (and tie-break) as evaluate, so results reproduce run_backtest
+    picks = select_top_k(scores, top_k) if top_k else ~np.isnan(scores)
+    mask = picks & ~np.isnan(data.strategy_return)
+
+    returns = np.where(mask, data.strategy_return, 0.0)
+    return np.stack([
+        returns.sum(axis=1),
+        (mask & (data.strategy_return > 0)).sum(axis=1),
+        mask.sum(axis=1),
+    ]).astype(float)
+
+
+def _evaluate_chunk(combos: List[Dict[str, float]]) -> np.ndarray:
+    """Worker entry point: per-day totals for a chunk of combinations."""
+    return np.stack([evaluate_daily(_DATA, params, _TOP_K) for params in combos])
+
+
+def _window_metrics(daily: np.ndarray, window: slice) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mean strategy return, hit rate and trade count over a day window for every combination."""
+    totals = daily[:, :, window].sum(axis=2)
+    trades = totals[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_return = np.where(trades > 0, totals[:, 0] / trades, np.nan)
+        hit_rate = np.where(trades > 0, totals[:, 1] / trades, np.nan)
+    return mean_return, hit_rate, trades
+
+
+def run_sweep(
+    grid: Optional[List[Dict[str, float]]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    horizon: int = 5,
+    top_k: Optional[int] = None,
+    train_days: int = 126,
+    test_days: int = 21,
+    objective: str = 'mean_return',
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    feature_store: Optional[FeatureStore] = None,
+    bar_store: Optional[BarStore] = None
+) -> SweepResult:
+    """
+    Evaluate every parameter combination against archived scans.
+
+    Args:
+        grid: Parameter combinations (build_grid() if None)
+        start: First scan date
+        end: Last scan date
+        horizon: Holding period in trading days
+        top_k: Picks per day (Settings.MAX_PICKS if None; 0 keeps all scored)
+        train_days: In-sample window length for walk-forward folds
+        test_days: Out-of-sample window length for walk-forward folds (the
+            two windows are separated by horizon days)
+        objective: 'mean_return' or 'hit_rate', used to choose each fold's
+            combination and to order the results
+        workers: Worker processes (CPU count if None; 1 runs in-process)
+        chunk_size: Combinations per task sent to a worker
+        feature_store: Archived scans (default location if None)
+        bar_store: Daily bars (default location if None)
+
+    Returns:
+        SweepResult
+    """
+    if objective not in ('mean_return', 'hit_rate'):
+        raise ValueError(f"Unknown objective: {objective}")
+    if train_days <= 0 or test_days <= 0:
+        raise ValueError(f"train_days and test_days must be positive (got {train_days}, {test_days})")
+
+    grid = grid if grid is not None else build_grid()
+    top_k = Settings.MAX_PICKS if top_k is None else top_k
+    workers = workers or os.cpu_count() or 1
+
+    panel = load_scan_panel(feature_store, start, end)
+    data = prepare_backtest(panel, horizon, bar_store)
+    n_days = panel.shape[0]
+    logger.info(f"Sweeping {len(grid)} combinations over {n_days} days x {panel.shape[1]} tickers "
+                f"with {workers} workers")
+
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+    if workers == 1 or len(chunks) == 1:
+        _init_worker(data, top_k)
+        daily = np.concatenate([_evaluate_chunk(chunk) for chunk in chunks]) if chunks else np.empty((0, 3, n_days))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data, top_k)) as pool:
+            daily = np.concatenate(list(pool.map(_evaluate_chunk, chunks)))
+
+    results = pd.DataFrame(grid, columns=PARAM_NAMES)
+    mean_return, hit_rate, trades = _window_metrics(daily, slice(0, n_days))
+    results['trades'] = trades.astype(int)
+    results['mean_return'] = mean_return
+    results['hit_rate'] = hit_rate
+
+    results = results.sort_values(objective, ascending=False, na_position='last')
+
+    # Walk-forward: pick the best combination in each training window and
+    # record how it does in the window that follows. Only these rows are
+    # out-of-sample; the ranking above is over the whole period.
+    folds = walk_forward_folds(n_days, train_days, test_days, purge=horizon)
+    wf_rows = []
+    for train, test in folds:
+        is_mean, is_hit, _ = _window_metrics(daily, train)
+        oos_mean, oos_hit, oos_trades = _window_metrics(daily, test)
+        is_metric = is_mean if objective == 'mean_return' else is_hit
+
+        if np.all(np.isnan(is_metric)):
+            continue
+        best = int(np.nanargmax(is_metric))
+        wf_rows.append({
+            'train_start': panel.dates[train.start],
+            'test_start': panel.dates[test.start],
+            'test_end': panel.dates[test.stop - 1],
+            **grid[best],
+            f'is_{objective}': is_metric[best],
+            'oos_mean_return': oos_mean[best],
+            'oos_hit_rate': oos_hit[best],
+            'oos_trades': int(oos_trades[best]),
+        })
+
+    return SweepResult(
+        results=results.reset_index(drop=True),
+        walk_forward=pd.DataFrame(wf_rows),
+        objective=objective
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run a parameter sweep and print the best combinations."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m options_bot.backtest sweep",
+        description="Sweep scoring weights and thresholds over archived scans"
+    )
+    parser.add_argument('--start', type=date.fromisoformat, help="First scan date (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, help="Last scan date (YYYY-MM-DD)")
+    parser.add_argument('--horizon', type=int, default=5, help="Holding period in trading days")
+    parser.add_argument('--top-k', type=int, default=None, help="Picks per day (0 = all scored)")
+    parser.add_argument('--weight-step', type=float, default=0.05, help="Grid spacing for each weight")
+    parser.add_argument('--min-liquidity', type=float, nargs='+', default=[1.0, 2.0, 3.0, 4.0, 5.0],
+                        help="MIN_LIQUIDITY_SCORE values to try")
+    parser.add_argument('--train-days', type=int, default=126, help="In-sample window (scan days)")
+    parser.add_argument('--test-days', type=int, default=21, help="Out-of-sample window (scan days)")
+    parser.add_argument('--objective', choices=['mean_return', 'hit_rate'], default='mean_return')
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--top', type=int, default=20, help="Combinations to print")
+    parser.add_argument('--out', help="Optional CSV path for the full results")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    result = run_sweep(
+        build_grid(args.weight_step, args.min_liquidity),
+        args.start, args.end,
+        horizon=args.horizon,
+        top_k=args.top_k,
+        train_days=args.train_days,
+        test_days=args.test_days,
+        objective=args.objective,
+        workers=args.workers
+    )
+    fmt = lambda x: f"{x:.4f}"
+    print(result.results.head(args.top).to_string(float_format=fmt))
+    if not result.walk_forward.empty:
+        print()
+        print(result.walk_forward.to_string(float_format=fmt))
+
+    if args.out:
+        result.results.to_csv(args.out, index=False)
@@ -17,8 +17,16 @@ class Settings:
     # Paths
     BASE_DIR = Path(__file__).parent.parent.parent
     UNIVERSE_CSV = os.getenv('UNIVERSE_CSV', 'config/universe.csv')
+    UNIVERSE_META_PATH = os.getenv('UNIVERSE_META_PATH', 'data/universe_meta.csv')  # Ticker metadata index
+    UNIVERSE_META_MAX_AGE_DAYS = float(os.getenv('UNIVERSE_META_MAX_AGE_DAYS', '7'))  # Refresh index entries older than this
+    UNIVERSE_META_REFRESH = os.getenv('UNIVERSE_META_REFRESH', 'true').lower() == 'true'  # Refresh stale entries when loading the universe
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data/options_bot.db')
     LOG_FILE = os.getenv('LOG_FILE', 'logs/options_bot.log')
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'logs')  # Scan profiler reports
+    FEATURE_STORE_DIR = os.getenv('FEATURE_STORE_DIR', 'data/features')
+    BAR_STORE_DIR = os.getenv('BAR_STORE_DIR', 'data/bars')
+    BAR_SEED_PROGRESS = os.getenv('BAR_SEED_PROGRESS', 'data/bar_seed_progress.json')  # Days already loaded by seed_bars_grouped
+    POLYGON_REQUESTS_PER_MINUTE = float(os.getenv('POLYGON_REQUESTS_PER_MINUTE', '5'))  # Grouped daily pacing (0 = none)
     
     # Timezone
     TIMEZONE = pytz.timezone(os.getenv('TIMEZONE', 'America/New_York'))
@@ -26,6 +34,8 @@ class Settings:
     # Discord
     DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL')
     USE_DISCORD = os.getenv('USE_DISCORD', 'true').lower() == 'true'
+    DISCORD_TIMEOUT = float(os.getenv('DISCORD_TIMEOUT', '10'))  # Seconds per webhook request
+    DISCORD_MAX_RETRIES = int(os.getenv('DISCORD_MAX_RETRIES', '3'))  # Retries after 429/5xx/network errors
     
     # Email
     SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
@@ -35,6 +45,12 @@ class Settings:
     EMAIL_TO = os.getenv('EMAIL_TO')
     USE_EMAIL = os.getenv('USE_EMAIL', 'false').lower() == 'true'
     
+    # Notification delivery (durable outbox + background worker)
+    OUTBOX_PATH = os.getenv('OUTBOX_PATH', 'data/outbox.db')
+    NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', '8'))  # Attempts before a message is marked failed
+    NOTIFY_RETRY_BASE = float(os.getenv('NOTIFY_RETRY_BASE', '5'))  # First retry delay in seconds, doubles per attempt
+    NOTIFY_FLUSH_TIMEOUT = float(os.getenv('NOTIFY_FLUSH_TIMEOUT', '60'))  # Seconds a CLI run waits for delivery
+    
     # Feature Flags
     USE_FINBERT = os.getenv('USE_FINBERT', 'false').lower() == 'true'
     USE_TECHNICAL_ANALYSIS = os.getenv('USE_TECHNICAL_ANALYSIS', 'true').lower() == 'true'
@@ -42,6 +58,7 @@ class Settings:
     USE_SEC_FILINGS = os.getenv('USE_SEC_FILINGS', 'true').lower() == 'true'
     USE_FDA_TRACKING = os.getenv('USE_FDA_TRACKING', 'true').lower() == 'true'
     USE_PAID_OPTIONS_API = os.getenv('USE_PAID_OPTIONS_API', 'false').lower() == 'true'
+    PERSIST_SNAPSHOTS = os.getenv('PERSIST_SNAPSHOTS', 'true').lower() == 'true'
     
     # API Keys
     POLYGON_API_KEY = os.getenv('POLYGON_API_KEY')
@@ -52,10 +69,25 @@ class Settings:
     BENZINGA_API_KEY = os.getenv('BENZINGA_API_KEY')
     TRADIER_API_KEY = os.getenv('TRADIER_API_KEY')
     TRADIER_SANDBOX = os.getenv('TRADIER_SANDBOX', 'true').lower() == 'true'
+    TRADIER_CHAIN_WORKERS = int(os.getenv('TRADIER_CHAIN_WORKERS', '8'))  # Concurrent expiration requests
+    
+    # Sentiment (FinBERT, with lexicon fallback)
+    FINBERT_MODEL = os.getenv('FINBERT_MODEL', 'ProsusAI/finbert')  # Hub id or local model directory
+    FINBERT_BATCH_SIZE = int(os.getenv('FINBERT_BATCH_SIZE', '32'))
+    FINBERT_NUM_THREADS = int(os.getenv('FINBERT_NUM_THREADS', '0'))  # 0 = torch default
+    FINBERT_MAX_LENGTH = int(os.getenv('FINBERT_MAX_LENGTH', '64'))  # Tokens per headline
+    SENTIMENT_CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH', 'data/sentiment_cache.db')
+    SENTIMENT_TIME_BUDGET = float(os.getenv('SENTIMENT_TIME_BUDGET', '30'))  # Seconds before lexicon fallback
     
     # Scheduling
     RUN_PREMARKET = os.getenv('RUN_PREMARKET', '05:30')
     RUN_MIDMORNING = os.getenv('RUN_MIDMORNING', '09:45')
+    INCREMENTAL_MIDMORNING = os.getenv('INCREMENTAL_MIDMORNING', 'true').lower() == 'true'  # Refresh only intraday fields
+    MARKET_OPEN = os.getenv('MARKET_OPEN', '09:30')
+    MARKET_CLOSE = os.getenv('MARKET_CLOSE', '16:00')
+    CONTINUOUS_CADENCE = float(os.getenv('CONTINUOUS_CADENCE', '300'))  # Seconds per universe cycle
+    CONTINUOUS_NEWS_EVERY = int(os.getenv('CONTINUOUS_NEWS_EVERY', '3'))  # Refetch news every N cycles
+    CONTINUOUS_SNAPSHOT_EVERY = int(os.getenv('CONTINUOUS_SNAPSHOT_EVERY', '12'))  # Live snapshot every N cycles (0 = never)
     
     # Scoring Weights
     WEIGHT_FUNDAMENTAL = float(os.getenv('WEIGHT_FUNDAMENTAL', '0.40'))
@@ -68,6 +100,50 @@ class Settings:
     MAX_PICKS = int(os.getenv('MAX_PICKS', '10'))
     MIN_LIQUIDITY_SCORE = float(os.getenv('MIN_LIQUIDITY_SCORE', '3.0'))
     MIN_MARKET_CAP = float(os.getenv('MIN_MARKET_CAP', '1000000000'))  # 1B default
+    DELTA_NOTIFICATIONS = os.getenv('DELTA_NOTIFICATIONS', 'true').lower() == 'true'  # Send only changes since last delivery
+    DELTA_SCORE_BUCKET = float(os.getenv('DELTA_SCORE_BUCKET', '1.0'))  # Score moves within a bucket are not changes
+    DELTA_SHOW_UNCHANGED = os.getenv('DELTA_SHOW_UNCHANGED', 'true').lower() == 'true'
+    DELTA_STATE_PATH = os.getenv('DELTA_STATE_PATH', 'data/delivered_ideas.json')
+    PIPELINE_FETCH_WORKERS = int(os.getenv('PIPELINE_FETCH_WORKERS', '4'))  # Concurrent ticker fetches
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '64'))  # Tickers buffered between stages
+    PIPELINE_FETCH_BATCH = int(os.getenv('PIPELINE_FETCH_BATCH', '50'))  # Tickers per bulk quote/bar/chain/fundamentals fetch
+    PIPELINE_ANALYZE_WAIT = float(os.getenv('PIPELINE_ANALYZE_WAIT', '1.0'))  # Seconds a partial sentiment batch waits for more headlines
+    SCAN_PROCESSES = int(os.getenv('SCAN_PROCESSES', '1'))  # Worker processes per scan (1 = in-process)
+    COORDINATOR_LISTEN = os.getenv('COORDINATOR_LISTEN', '127.0.0.1:8900')  # Multi-node scan coordinator address
+    COORDINATOR_TOKEN = os.getenv('COORDINATOR_TOKEN')  # Shared secret workers send to the coordinator
+    DISTRIBUTED_SCAN_TIMEOUT = float(os.getenv('DISTRIBUTED_SCAN_TIMEOUT', '1800'))  # Seconds before a coordinated scan gives up (0 = never)
+    COORDINATOR_URL = os.getenv('COORDINATOR_URL', 'http://127.0.0.1:8900')  # Coordinator workers lease from
+    LEASE_SIZE = int(os.getenv('LEASE_SIZE', '10'))  # Tickers per worker lease
+    LEASE_TIMEOUT = float(os.getenv('LEASE_TIMEOUT', '120'))  # Seconds before a silent worker's lease is reassigned
+    LEASE_MAX_RENEWALS = int(os.getenv('LEASE_MAX_RENEWALS', '3'))  # Heartbeats in a row without results before reassignment
+    
+    # Record/replay of external data requests
+    TRANSPORT_MODE = os.getenv('TRANSPORT_MODE', 'live')  # live, record or replay
+    CASSETTE_PATH = os.getenv('CASSETTE_PATH', 'data/cassettes/scan.db')
+    REPLAY_LATENCY = os.getenv('REPLAY_LATENCY', '')  # Seconds per replayed response, or 'recorded'
+    STANDIN_URL = os.getenv('STANDIN_URL', 'http://127.0.0.1:8765')  # Stand-in market server for load tests
+    
+    # Hedged requests: quotes, history and news go to an alternate provider
+    # (when its key is set) if yfinance has not answered by its observed p95
+    HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', 'true').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))
+    HEDGE_DEFAULT_DELAY = float(os.getenv('HEDGE_DEFAULT_DELAY', '1.0'))  # Seconds, until a provider has enough samples
+    
+    # Concurrent identical provider requests share one response
+    COALESCE_REQUESTS = os.getenv('COALESCE_REQUESTS', 'true').lower() == 'true'
+    
+    # Adaptive concurrency limit for Yahoo Finance requests
+    YF_ADAPTIVE_LIMIT = os.getenv('YF_ADAPTIVE_LIMIT', 'true').lower() == 'true'
+    YF_CONCURRENCY_INITIAL = float(os.getenv('YF_CONCURRENCY_INITIAL', '4'))  # Starting limit when none is saved
+    YF_CONCURRENCY_MIN = int(os.getenv('YF_CONCURRENCY_MIN', '1'))
+    YF_CONCURRENCY_MAX = int(os.getenv('YF_CONCURRENCY_MAX', '32'))
+    YF_LATENCY_TARGET = float(os.getenv('YF_LATENCY_TARGET', '3.0'))  # Mean seconds per request above which the limit stops growing
+    YF_LIMITER_STATE = os.getenv('YF_LIMITER_STATE', 'data/yf_limiter.json')  # Learned limit kept across restarts
+    
+    # Option Chain Settings
+    CHAIN_MONEYNESS = float(os.getenv('CHAIN_MONEYNESS', '0.25'))  # Keep strikes within this fraction of spot (0 = all)
+    CHAIN_MIN_DTE = int(os.getenv('CHAIN_MIN_DTE', '7'))  # Expirations considered for the ~35 DTE chain
+    CHAIN_MAX_DTE = int(os.getenv('CHAIN_MAX_DTE', '90'))
     
     # Technical Analysis Settings
     TA_LOOKBACK_DAYS = int(os.getenv('TA_LOOKBACK_DAYS', '90'))
@@ -114,7 +190,12 @@ class Settings:
     @classmethod
     def get_universe_path(cls) -> Path:
         """Get full path to universe CSV."""
-        path = Path(cls.UNIVERSE_CSV)
+        return cls.resolve_path(cls.UNIVERSE_CSV)
+    
+    @classmethod
+    def resolve_path(cls, path: str) -> Path:
+        """Resolve a configured path relative to the project root."""
+        path = Path(path)
         if not path.is_absolute():
             path = cls.BASE_DIR / path
         return path
@@ -0,0 +1,228 @@
+"""
+Daily bar backfill into the local bar store.
+"""
+import json
+import logging
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from ..config import Settings
+from ..storage.bar_store import BarStore
+from . import transport
+from .market_data import polygon_grouped_daily
+from .providers import MarketDataPlanner, PolygonGroupedProvider, get_planner, trading_days
+
+logger = logging.getLogger(__name__)
+
+
+def download_bars(tickers: List[str], start: date, end: Optional[date] = None) -> pd.DataFrame:
+    """
+    Download adjusted daily bars for many tickers in one yfinance call.
+
+    Args:
+        tickers: Ticker symbols
+        start: First date to fetch
+        end: Last date to fetch (today if None)
+
+    Returns:
+        Long DataFrame with columns ticker, date, open, high, low, close, volume
+    """
+    raw = transport.download(
+        tickers,
+        start=start,
+        end=end,
+        group_by='ticker',
+        auto_adjust=True,
+        progress=False,
+        threads=True
+    )
+    if raw is None or raw.empty:
+        return pd.DataFrame(columns=['ticker', 'date', 'open', 'high', 'low', 'close', 'volume'])
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        raw.columns = pd.MultiIndex.from_product([[tickers[0]], raw.columns])
+
+    frames = []
+    for ticker in raw.columns.get_level_values(0).unique():
+        bars = raw[ticker].dropna(how='all')
+        if bars.empty:
+            continue
+        frames.append(pd.DataFrame({
+            'ticker': ticker,
+            'date': bars.index.date,
+            'open': bars['Open'].values,
+            'high': bars['High'].values,
+            'low': bars['Low'].values,
+            'close': bars['Close'].values,
+            'volume': bars['Volume'].values,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=['ticker', 'date', 'open', 'high', 'low', 'close', 'volume'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def backfill_bars(
+    tickers: List[str],
+    start: date,
+    end: Optional[date] = None,
+    store: Optional[BarStore] = None,
+    chunk_size: int = 200,
+    planner: Optional[MarketDataPlanner] = None
+) -> int:
+    """
+    Fill the bar store for tickers from the cheapest bar provider.
+
+    When Polygon's grouped days are cheapest they are loaded first, and
+    tickers they did not cover are then fetched from the other providers.
+
+    Args:
+        tickers: Ticker symbols
+        start: First date to fetch
+        end: Last date to fetch (today if None)
+        store: Target store (default location if None)
+        chunk_size: Tickers per planner call
+        planner: Provider planner (process-wide one if None)
+
+    Returns:
+        Number of bars written
+    """
+    store = store or BarStore()
+    planner = planner or get_planner()
+    plan = planner.plan('bars', len(tickers), days=len(trading_days(start, end)))
+    written = 0
+    if plan and isinstance(plan[0][0], PolygonGroupedProvider):
+        # Whole-market days beat per-ticker requests; load them resumably
+        written = seed_bars_grouped(tickers, start, end, store)
+        loaded = set(store.load(tickers, start, end, columns=[])['ticker'])
+        tickers = [t for t in tickers if t not in loaded]
+        planner = MarketDataPlanner([p for p in planner.providers if not isinstance(p, PolygonGroupedProvider)])
+
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        try:
+            for source, bars in planner.bars_by_provider(chunk, start, end).items():
+                written += store.append(bars, source=source)
+        except Exception as e:
+            logger.error(f"Error backfilling bars for {chunk[0]}..{chunk[-1]}: {e}")
+
+    logger.info(f"Backfilled {written} bars for {len(tickers)} tickers")
+    return written
+
+
+class SeedProgress:
+    """
+    Trading days loaded by seed_bars_grouped, kept in a JSON file.
+
+    Each finished day records the tickers it was loaded for (as indexes
+    into a short list of ticker sets, since a universe rarely changes), so
+    adding tickers only requests days again for the new ones and removing
+    tickers requests nothing.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Progress file (created on the first finished day)
+        """
+        self.path = Path(path)
+        self.ticker_sets: List[FrozenSet[str]] = []
+        self.days: Dict[date, List[int]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    saved = json.load(f)
+                self.ticker_sets = [frozenset(tickers) for tickers in saved.get('ticker_sets', [])]
+                self.days = {date.fromisoformat(day): ids for day, ids in saved.get('days', {}).items()}
+            except Exception as e:
+                logger.error(f"Error reading bar seed progress {self.path}: {e}")
+
+    def missing(self, day: date, tickers: Iterable[str]) -> List[str]:
+        """Tickers not yet loaded for day."""
+        loaded = [self.ticker_sets[i] for i in self.days.get(day, [])]
+        return [ticker for ticker in tickers if not any(ticker in covered for covered in loaded)]
+
+    def mark(self, day: date, tickers: Iterable[str]):
+        """Record a day as loaded for tickers and write the file (atomically)."""
+        covered = frozenset(tickers)
+        if covered not in self.ticker_sets:
+            self.ticker_sets.append(covered)
+        index = self.ticker_sets.index(covered)
+        if index not in self.days.setdefault(day, []):
+            self.days[day].append(index)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({
+                'ticker_sets': [sorted(tickers) for tickers in self.ticker_sets],
+                'days': {day.isoformat(): ids for day, ids in sorted(self.days.items())},
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+            }, f)
+        os.replace(tmp, self.path)
+
+
+def seed_bars_grouped(
+    tickers: List[str],
+    start: date,
+    end: Optional[date] = None,
+    store: Optional[BarStore] = None,
+    progress_path: Optional[Union[str, Path]] = None,
+    requests_per_minute: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep
+) -> int:
+    """
+    Fill the bar store from Polygon's grouped daily bars, one request per trading day.
+
+    Each day's whole-market response is filtered to the tickers it has not
+    been loaded for yet and written before the day is marked done, so an
+    interrupted run picks up at the first day not yet loaded and a grown
+    universe only fetches days again for its new tickers. Past days without
+    results (holidays) are marked done too; today, whose bars are not
+    final, is requested again by the next run. A year is about 252 requests
+    whatever the number of tickers.
+
+    Args:
+        tickers: Ticker symbols to keep
+        start: First date to load
+        end: Last date to load (today if None)
+        store: Target store (default location if None)
+        progress_path: Progress file (BAR_SEED_PROGRESS if None)
+        requests_per_minute: Request pacing (POLYGON_REQUESTS_PER_MINUTE if
+            None; 0 for none)
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        Number of bars written
+    """
+    store = store or BarStore()
+    progress = SeedProgress(Settings.resolve_path(progress_path or Settings.BAR_SEED_PROGRESS))
+    rate = Settings.POLYGON_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+    interval = 60.0 / rate if rate > 0 else 0.0
+    wanted = sorted(set(tickers))
+    all_days = trading_days(start, end)
+    days = {day: missing for day in all_days if (missing := progress.missing(day, wanted))}
+    logger.info(f"Loading {len(days)} trading days of grouped bars for {len(wanted)} tickers "
+                f"({len(all_days) - len(days)} already done)")
+
+    written = 0
+    last_request = None
+    for day, missing in days.items():
+        if last_request is not None and interval:
+            sleep(max(0.0, last_request + interval - time.monotonic()))
+        last_request = time.monotonic()
+        try:
+            bars = polygon_grouped_daily(day)
+            written += store.append(bars[bars['ticker'].isin(missing)], source='polygon')
+            if day < date.today():
+                progress.mark(day, wanted)
+        except Exception as e:
+            logger.error(f"Error loading grouped bars for {day}: {e}")
+
+    logger.info(f"Seeded {written} bars for {len(wanted)} tickers ({len(days)} requests)")
+    return written
@@ -1,18 +1,29 @@
 """
 Catalyst data ingestion (earnings, news, events).
 """
-import yfinance as yf
 import feedparser
-import requests
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
 
 from ..models import Catalyst
 from ..config import Settings
+from .freshness import merge_fresh
+from . import transport
+from .market_data import get_headlines
+from .universe import ticker_meta
+from .sentiment import get_sentiment_service
+from .lexicon_sentiment import get_lexicon_engine
 
 logger = logging.getLogger(__name__)
 
+# FinBERT runs off-thread so a slow model can be abandoned for the lexicon
+_finbert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='finbert')
+_finbert_running: Optional[Future] = None
+_finbert_lock = threading.Lock()
+
 
 def get_earnings_date(ticker: str) -> tuple[Optional[datetime], Optional[str]]:
     """
@@ -25,7 +36,7 @@ def get_earnings_date(ticker: str) -> tuple[Optional[datetime], Optional[str]]:
         Tuple of (earnings_date, timing)
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         calendar = stock.calendar
         
         if calendar is not None and 'Earnings Date' in calendar:
@@ -51,6 +62,9 @@ def get_news_headlines(ticker: str, max_headlines: int = 5) -> List[str]:
     """
     Fetch recent news headlines for a ticker.
     
+    yfinance news first, hedged to Finnhub and Polygon when they are
+    configured.
+    
     Args:
         ticker: Stock ticker symbol
         max_headlines: Maximum number of headlines to return
@@ -58,25 +72,47 @@ def get_news_headlines(ticker: str, max_headlines: int = 5) -> List[str]:
     Returns:
         List of headline strings
     """
-    headlines = []
+    return get_headlines(ticker, max_headlines)
+
+
+def score_headlines(headlines: List[str]) -> List[float]:
+    """
+    Score headlines with FinBERT, falling back to the lexicon engine.
     
-    try:
-        # Try yfinance news first
-        stock = yf.Ticker(ticker)
-        news = stock.news
-        
-        if news:
-            for item in news[:max_headlines]:
-                title = item.get('title', '')
-                if title:
-                    headlines.append(title)
+    FinBERT is used when USE_FINBERT is on and it answers within
+    SENTIMENT_TIME_BUDGET seconds. A run that overshoots keeps going in
+    the background so its scores still reach the cache for the next scan;
+    until it finishes, later calls use the lexicon instead of queueing
+    behind it.
     
-    except Exception as e:
-        logger.debug(f"Error fetching news for {ticker}: {e}")
+    Args:
+        headlines: List of headline strings
+        
+    Returns:
+        Scores from -1 (bearish) to 1 (bullish), aligned with the input
+    """
+    global _finbert_running
+    future = None
+    if Settings.USE_FINBERT:
+        with _finbert_lock:
+            if _finbert_running is None or _finbert_running.done():
+                future = _finbert_running = _finbert_executor.submit(
+                    lambda: get_sentiment_service().score_headlines(headlines)
+                )
+        if future is None:
+            logger.debug("FinBERT still busy with an abandoned run, using lexicon sentiment")
     
-    # Could add additional news sources here (RSS feeds, news APIs, etc.)
+    if future is not None:
+        try:
+            return future.result(timeout=Settings.SENTIMENT_TIME_BUDGET)
+        except FuturesTimeout:
+            logger.warning(
+                f"FinBERT exceeded {Settings.SENTIMENT_TIME_BUDGET}s budget, using lexicon sentiment"
+            )
+        except Exception as e:
+            logger.error(f"FinBERT sentiment failed, using lexicon sentiment: {e}")
     
-    return headlines
+    return get_lexicon_engine().score_headlines(headlines).tolist()
 
 
 def analyze_sentiment(headlines: List[str]) -> Optional[float]:
@@ -89,40 +125,66 @@ def analyze_sentiment(headlines: List[str]) -> Optional[float]:
     Returns:
         Sentiment score -1 (bearish) to 1 (bullish) or None
     """
-    if not headlines or not Settings.USE_FINBERT:
+    if not headlines:
         return None
     
     try:
-        # Placeholder for FinBERT sentiment analysis
-        # This would require the transformers library and FinBERT model
-        # For now, return None
-        # 
-        # from transformers import pipeline
-        # sentiment_analyzer = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-        # results = sentiment_analyzer(headlines)
-        # scores = [r['score'] if r['label'] == 'positive' else -r['score'] for r in results]
-        # return sum(scores) / len(scores)
-        
-        return None
+        scores = score_headlines(headlines)
+        return sum(scores) / len(scores)
         
     except Exception as e:
         logger.debug(f"Error analyzing sentiment: {e}")
         return None
 
 
-def get_catalyst(ticker: str) -> Optional[Catalyst]:
+def apply_sentiment(catalysts: Dict[str, Catalyst]) -> None:
+    """
+    Score headlines for a whole scan in one batched pass.
+    
+    Every ticker's headlines are scored together so inference runs in a
+    few large batches instead of one call per ticker. Each catalyst's
+    sentiment_score is set to the mean of its headlines.
+    
+    Args:
+        catalysts: Dict mapping ticker to Catalyst (updated in place)
+    """
+    headlines = [h for cat in catalysts.values() for h in cat.headlines]
+    if not headlines:
+        return
+    
+    try:
+        scores = score_headlines(headlines)
+    except Exception as e:
+        logger.error(f"Error analyzing sentiment: {e}")
+        return
+    
+    pos = 0
+    for cat in catalysts.values():
+        n = len(cat.headlines)
+        if n:
+            cat.sentiment_score = sum(scores[pos:pos + n]) / n
+            pos += n
+
+
+def get_catalyst(ticker: str, score_sentiment: bool = True) -> Optional[Catalyst]:
     """
     Fetch catalyst information for a ticker.
     
     Args:
         ticker: Stock ticker symbol
+        score_sentiment: Score headlines now; pass False when the caller
+            batches sentiment for the whole scan via apply_sentiment
         
     Returns:
         Catalyst object or None if error
     """
     try:
-        # Get earnings date
-        earnings_date, timing = get_earnings_date(ticker)
+        # Get earnings date (funds have none)
+        meta = ticker_meta(ticker)
+        if meta is not None and meta.is_fund:
+            earnings_date, timing = None, None
+        else:
+            earnings_date, timing = get_earnings_date(ticker)
         
         # Calculate days to earnings
         days_to_earnings = None
@@ -140,7 +202,7 @@ def get_catalyst(ticker: str) -> Optional[Catalyst]:
         headlines = get_news_headlines(ticker)
         
         # Analyze sentiment
-        sentiment = analyze_sentiment(headlines)
+        sentiment = analyze_sentiment(headlines) if score_sentiment else None
         
         # Check for major events in next 7 days
         has_major_event = False
@@ -167,3 +229,33 @@ def get_catalyst(ticker: str) -> Optional[Catalyst]:
         logger.error(f"Error fetching catalysts for {ticker}: {e}")
         return None
 
+
+def refresh_catalyst(previous: Catalyst, score_sentiment: bool = True) -> Catalyst:
+    """
+    Refetch the intraday fields (news) of an earlier catalyst.
+    
+    Earnings dates and event flags are carried over from the previous
+    catalyst; only headlines and their sentiment are refreshed.
+    
+    Args:
+        previous: Catalyst from the day's full scan
+        score_sentiment: Score headlines now; pass False when the caller
+            batches sentiment for the whole scan via apply_sentiment
+        
+    Returns:
+        Updated Catalyst (the previous one if the refresh fails)
+    """
+    try:
+        headlines = get_news_headlines(previous.ticker)
+        fresh = Catalyst(
+            ticker=previous.ticker,
+            next_earnings_date=None,
+            earnings_bmo_amc=None,
+            headlines=headlines,
+            sentiment_score=analyze_sentiment(headlines) if score_sentiment else None
+        )
+        return merge_fresh(previous, fresh)
+        
+    except Exception as e:
+        logger.error(f"Error refreshing catalysts for {previous.ticker}: {e}")
+        return previous
@@ -0,0 +1,92 @@
+"""
+Single-flight coalescing of concurrent identical requests.
+
+When several threads ask for the same resource at once (the same
+ticker's info, calendar or news from different ingestion stages), only
+the first request goes out; the others wait for it and share its result
+or its exception. Nothing is cached: a request made after the first one
+finished goes out again.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CoalesceStats:
+    """Counters since the SingleFlight was created."""
+    requests: int = 0
+    executed: int = 0  # Requests that went out
+    coalesced: int = 0  # Requests that waited on an identical one instead
+    by_provider: Dict[str, int] = field(default_factory=dict)  # Provider -> coalesced requests
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'by_provider': dict(self.by_provider),
+        }
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one request per key at a time and shares its outcome."""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[str, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = CoalesceStats()
+
+    def do(self, provider: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Run fetch, or wait for an identical request already in flight.
+
+        Args:
+            provider: Provider name (for stats)
+            key: Identifies the resource and parameters within the provider
+            fetch: Zero-argument function making the request
+
+        Returns:
+            The request's result (its exception is raised in every caller)
+        """
+        with self._lock:
+            self.stats.requests += 1
+            flight = self._flights.get((provider, key))
+            leader = flight is None
+            if leader:
+                flight = self._flights[provider, key] = _Flight()
+                self.stats.executed += 1
+            else:
+                self.stats.coalesced += 1
+                self.stats.by_provider[provider] = self.stats.by_provider.get(provider, 0) + 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[provider, key]
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        """Distinct requests currently running."""
+        with self._lock:
+            return len(self._flights)
@@ -1,11 +1,13 @@
 """
 FDA trials and approvals tracker for biotech/pharma catalysts.
 """
-import requests
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 
+from . import transport
+from .universe import ticker_meta
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +36,7 @@ class FDATracker:
                 'limit': limit
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             
             if response.status_code == 404:
                 return []  # No results found
@@ -74,7 +76,7 @@ class FDATracker:
                 'limit': 10
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             
             if response.status_code == 404:
                 return []
@@ -116,7 +118,7 @@ class FDATracker:
                 'limit': 10
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             
             if response.status_code == 404:
                 return []
@@ -145,6 +147,8 @@ def get_fda_catalysts(ticker: str, company_name: str = None) -> Dict[str, any]:
     """
     Get FDA-related catalysts for a ticker.
     
+    Tickers the universe index places outside healthcare are not searched.
+    
     Args:
         ticker: Stock ticker symbol
         company_name: Company name (will try to derive from ticker if not provided)
@@ -152,11 +156,16 @@ def get_fda_catalysts(ticker: str, company_name: str = None) -> Dict[str, any]:
     Returns:
         Dictionary with FDA catalyst information
     """
+    meta = ticker_meta(ticker)
+    if meta is not None:
+        if meta.sector and not meta.is_healthcare:
+            return _no_fda_activity(ticker, company_name or meta.name or ticker)
+        company_name = company_name or meta.name
+    
     if not company_name:
         # Try to get company name from ticker
         try:
-            import yfinance as yf
-            stock = yf.Ticker(ticker)
+            stock = transport.ticker(ticker)
             company_name = stock.info.get('longName', ticker)
         except:
             company_name = ticker
@@ -192,7 +201,23 @@ def get_fda_catalysts(ticker: str, company_name: str = None) -> Dict[str, any]:
         'has_recent_approval': len(approvals) > 0,
         'has_recall': len(recalls) > 0,
         'catalyst_score': min(catalyst_score, 10),
-        'note': self._generate_fda_note(approvals, recalls)
+        'note': _generate_fda_note(approvals, recalls)
+    }
+
+
+def _no_fda_activity(ticker: str, company_name: str) -> Dict[str, any]:
+    """FDA result for a company outside healthcare, without querying openFDA."""
+    return {
+        'ticker': ticker,
+        'company_name': company_name,
+        'approvals': [],
+        'recalls': [],
+        'adverse_events_count': 0,
+        'has_fda_activity': False,
+        'has_recent_approval': False,
+        'has_recall': False,
+        'catalyst_score': 0,
+        'note': _generate_fda_note([], [])
     }
 
 
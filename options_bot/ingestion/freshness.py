@@ -0,0 +1,84 @@
+"""
+Freshness classes for ingested fields.
+
+DAILY fields (fundamentals, earnings dates, historical volatility) do not
+meaningfully change within a trading day, so an incremental scan reuses
+them from the day's first full scan. INTRADAY fields (spot price, option
+chain metrics, news) are refetched on every scan.
+"""
+import dataclasses
+from typing import Dict, List, TypeVar
+
+from ..models import Fundamentals, OptionsSnapshot, Catalyst
+
+DAILY = 'daily'
+INTRADAY = 'intraday'
+
+FIELD_FRESHNESS: Dict[type, Dict[str, str]] = {
+    Fundamentals: {
+        'ticker': DAILY,
+        'market_cap': DAILY,
+        'pe_ratio': DAILY,
+        'forward_pe': DAILY,
+        'profit_margins': DAILY,
+        'debt_to_equity': DAILY,
+        'sector': DAILY,
+        'revenue_growth': DAILY,
+        'earnings_growth': DAILY,
+    },
+    OptionsSnapshot: {
+        'ticker': DAILY,
+        'spot_price': INTRADAY,
+        'hv30': DAILY,  # Daily closes only
+        'atm_iv_dte35': INTRADAY,
+        'iv_rank_1y': INTRADAY,
+        'skew_25d_rr': INTRADAY,
+        'term_slope_iv': INTRADAY,
+        'liq_calls_score': INTRADAY,
+        'liq_puts_score': INTRADAY,
+        'avg_option_volume': INTRADAY,
+        'open_interest': INTRADAY,
+    },
+    Catalyst: {
+        'ticker': DAILY,
+        'next_earnings_date': DAILY,
+        'earnings_bmo_amc': DAILY,
+        'headlines': INTRADAY,
+        'sentiment_score': INTRADAY,
+        'has_major_event_7d': DAILY,
+        'event_description': DAILY,
+        'days_to_earnings': DAILY,
+    },
+}
+
+T = TypeVar('T')
+
+
+def fields_with_freshness(cls: type, freshness: str) -> List[str]:
+    """
+    Names of a model's fields in a freshness class.
+
+    Args:
+        cls: Fundamentals, OptionsSnapshot or Catalyst
+        freshness: DAILY or INTRADAY
+
+    Returns:
+        List of field names
+    """
+    return [name for name, value in FIELD_FRESHNESS[cls].items() if value == freshness]
+
+
+def merge_fresh(previous: T, fresh: T) -> T:
+    """
+    Combine a cached record with a partial refetch.
+
+    Args:
+        previous: Record from the day's full scan (DAILY fields are kept)
+        fresh: Newly fetched record (INTRADAY fields are taken)
+
+    Returns:
+        New record of the same type
+    """
+    cls = type(previous)
+    updates = {name: getattr(fresh, name) for name in fields_with_freshness(cls, INTRADAY)}
+    return dataclasses.replace(previous, **updates)
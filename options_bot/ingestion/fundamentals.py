@@ -1,11 +1,12 @@
 """
 Fundamental data ingestion using yfinance.
 """
-import yfinance as yf
 from typing import Optional
 import logging
 
 from ..models import Fundamentals
+from . import transport
+from .market_data import get_history
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ def get_fundamentals(ticker: str) -> Optional[Fundamentals]:
         Fundamentals object or None if data unavailable
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         info = stock.info
         
         # Extract fundamental metrics
@@ -48,6 +49,8 @@ def get_price_history(ticker: str, period: str = "1y") -> Optional[any]:
     """
     Fetch price history for volatility calculations.
     
+    Hedged to alternate bar providers when they are configured.
+    
     Args:
         ticker: Stock ticker symbol
         period: Period for historical data (default: 1y)
@@ -56,9 +59,7 @@ def get_price_history(ticker: str, period: str = "1y") -> Optional[any]:
         DataFrame with price history or None
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
-        return hist
+        return get_history(ticker, period)
         
     except Exception as e:
         logger.error(f"Error fetching price history for {ticker}: {e}")
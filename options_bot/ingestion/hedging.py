@@ -0,0 +1,186 @@
+"""
+Hedged requests across redundant providers.
+
+A request goes to the primary provider first. If it has not produced a
+valid answer by that provider's observed p95 latency (or it fails), the
+same request goes to the next provider. The first valid answer wins and
+the requests still pending are cancelled (or, if already running,
+abandoned and their results discarded). Latencies are tracked per
+(resource, provider), so each hedge delay follows what that provider
+actually does.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+Attempt = Tuple[str, Callable[[], Any]]
+
+
+class LatencyTracker:
+    """Recent successful request latencies per (resource, provider)."""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: Latencies kept per (resource, provider)
+        """
+        self._samples: Dict[Tuple[str, str], Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, resource: str, provider: str, seconds: float):
+        with self._lock:
+            self._samples[resource, provider].append(seconds)
+
+    def quantile(self, resource: str, provider: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Latency quantile, or None with fewer than min_samples observations.
+
+        Args:
+            resource: Resource name ('quote', 'history', 'news')
+            provider: Provider name
+            q: Quantile in [0, 1]
+            min_samples: Observations needed for an estimate
+        """
+        with self._lock:
+            samples = sorted(self._samples.get((resource, provider), ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@dataclass
+class HedgeStats:
+    """Counters since the hedger was created."""
+    requests: int = 0
+    hedged: int = 0  # Requests that went to a second provider
+    failed: int = 0  # No provider gave a valid answer
+    wins: Dict[str, int] = field(default_factory=dict)  # Provider -> requests it answered
+
+
+class Hedger:
+    """Runs requests against a primary provider with delayed fallbacks."""
+
+    def __init__(self, quantile: Optional[float] = None, default_delay: Optional[float] = None,
+                 min_samples: int = 20, max_workers: int = 32):
+        """
+        Args:
+            quantile: Latency quantile that triggers a hedge (HEDGE_PERCENTILE / 100 if None)
+            default_delay: Hedge delay in seconds until a provider has
+                min_samples latencies (HEDGE_DEFAULT_DELAY if None)
+            min_samples: Observations before the quantile is trusted
+            max_workers: Threads running provider requests
+        """
+        self.quantile = Settings.HEDGE_PERCENTILE / 100 if quantile is None else quantile
+        self.default_delay = Settings.HEDGE_DEFAULT_DELAY if default_delay is None else default_delay
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+        self.stats = HedgeStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+    def delay(self, resource: str, provider: str) -> float:
+        """Seconds to wait on a provider before hedging."""
+        observed = self.latency.quantile(resource, provider, self.quantile, self.min_samples)
+        return self.default_delay if observed is None else observed
+
+    def _timed(self, resource: str, provider: str, fetch: Callable[[], Any], valid: Callable[[Any], bool]) -> Tuple[bool, Any]:
+        start = time.perf_counter()
+        value = fetch()
+        ok = valid(value)
+        if ok:
+            self.latency.record(resource, provider, time.perf_counter() - start)
+        return ok, value
+
+    def _won(self, provider: str, hedged: bool):
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.hedged += hedged
+            self.stats.wins[provider] = self.stats.wins.get(provider, 0) + 1
+
+    def fetch(self, resource: str, attempts: Sequence[Attempt], valid: Callable[[Any], bool] = bool) -> Any:
+        """
+        First valid answer from the providers, primary first.
+
+        Args:
+            resource: Resource name, for latency tracking ('quote', 'history', 'news')
+            attempts: (provider, zero-argument fetch) pairs, primary first
+            valid: Whether an answer is usable (errors never are)
+
+        Returns:
+            The winning answer, or None if no provider gave a valid one
+        """
+        if len(attempts) == 1:
+            provider, fetch = attempts[0]
+            try:
+                ok, value = self._timed(resource, provider, fetch, valid)
+            except Exception as e:
+                logger.debug(f"{provider} {resource} request failed: {e}")
+                ok, value = False, None
+            if ok:
+                self._won(provider, hedged=False)
+                return value
+            with self._lock:
+                self.stats.requests += 1
+                self.stats.failed += 1
+            return None
+
+        pending: Dict[Future, str] = {}
+        queued: List[Attempt] = list(attempts)
+        deadline = 0.0
+
+        def launch():
+            nonlocal deadline
+            provider, fetch = queued.pop(0)
+            pending[self._executor.submit(self._timed, resource, provider, fetch, valid)] = provider
+            deadline = time.monotonic() + self.delay(resource, provider)
+
+        launch()
+        try:
+            while pending or queued:
+                timeout = max(0.0, deadline - time.monotonic()) if queued else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                failed = False
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        ok, value = future.result()
+                    except Exception as e:
+                        logger.debug(f"{provider} {resource} request failed: {e}")
+                        ok, value = False, None
+                    if ok:
+                        self._won(provider, hedged=len(queued) < len(attempts) - 1)
+                        return value
+                    failed = True
+                # Hedge when the latest provider is past its p95, or right away if one failed
+                if queued and (failed or not pending or time.monotonic() >= deadline):
+                    launch()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.hedged += 1
+            self.stats.failed += 1
+        return None
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    """Process-wide hedger."""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
@@ -0,0 +1,148 @@
+"""
+Finance lexicon sentiment scoring for headlines.
+
+A low-latency alternative to FinBERT: all headlines are tokenized once,
+tokens are mapped to vocabulary ids in a single pass and the per-headline
+scores are computed with numpy.
+"""
+import logging
+import re
+import threading
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+# Word weights from -1 (bearish) to 1 (bullish), tuned for market headlines
+FINANCE_LEXICON: Dict[str, float] = {
+    # Bullish
+    'beat': 0.8, 'beats': 0.8, 'tops': 0.7, 'topped': 0.7, 'exceeds': 0.7, 'exceeded': 0.7,
+    'surge': 0.9, 'surges': 0.9, 'surged': 0.9, 'soar': 0.9, 'soars': 0.9, 'soared': 0.9,
+    'jump': 0.7, 'jumps': 0.7, 'jumped': 0.7, 'rally': 0.7, 'rallies': 0.7, 'rallied': 0.7,
+    'gain': 0.5, 'gains': 0.5, 'gained': 0.5, 'rise': 0.4, 'rises': 0.4, 'rose': 0.4,
+    'climb': 0.5, 'climbs': 0.5, 'climbed': 0.5, 'rebound': 0.5, 'rebounds': 0.5,
+    'record': 0.5, 'high': 0.3, 'highs': 0.4, 'strong': 0.6, 'stronger': 0.6, 'robust': 0.6,
+    'upgrade': 0.8, 'upgrades': 0.8, 'upgraded': 0.8, 'outperform': 0.7, 'overweight': 0.5,
+    'buy': 0.4, 'bullish': 0.8, 'optimistic': 0.6, 'upbeat': 0.6, 'positive': 0.5,
+    'growth': 0.4, 'grow': 0.4, 'grows': 0.4, 'expands': 0.4, 'expansion': 0.4,
+    'profit': 0.4, 'profitable': 0.6, 'profits': 0.4, 'raises': 0.5, 'raised': 0.5,
+    'boost': 0.6, 'boosts': 0.6, 'boosted': 0.6, 'approval': 0.7, 'approved': 0.7,
+    'approves': 0.7, 'wins': 0.6, 'win': 0.5, 'won': 0.5, 'breakthrough': 0.8,
+    'buyback': 0.6, 'repurchase': 0.5, 'dividend': 0.3, 'partnership': 0.4, 'deal': 0.3,
+    'acquire': 0.2, 'acquires': 0.2, 'launch': 0.3, 'launches': 0.3, 'momentum': 0.4,
+    'accelerates': 0.5, 'improves': 0.5, 'improved': 0.5, 'recovery': 0.5, 'tailwind': 0.5,
+    # Bearish
+    'miss': -0.8, 'misses': -0.8, 'missed': -0.8, 'falls': -0.5, 'fell': -0.5, 'fall': -0.5,
+    'plunge': -0.9, 'plunges': -0.9, 'plunged': -0.9, 'plummets': -0.9, 'tumble': -0.8,
+    'tumbles': -0.8, 'tumbled': -0.8, 'sink': -0.7, 'sinks': -0.7, 'sank': -0.7,
+    'drop': -0.6, 'drops': -0.6, 'dropped': -0.6, 'slide': -0.5, 'slides': -0.5,
+    'slump': -0.7, 'slumps': -0.7, 'crash': -1.0, 'crashes': -1.0, 'decline': -0.5,
+    'declines': -0.5, 'declined': -0.5, 'low': -0.3, 'lows': -0.4, 'weak': -0.6,
+    'weaker': -0.6, 'weakness': -0.6, 'downgrade': -0.8, 'downgrades': -0.8,
+    'downgraded': -0.8, 'underperform': -0.7, 'underweight': -0.5, 'sell': -0.4,
+    'bearish': -0.8, 'pessimistic': -0.6, 'negative': -0.5, 'loss': -0.6, 'losses': -0.6,
+    'cut': -0.5, 'cuts': -0.5, 'slashes': -0.7, 'lowers': -0.5, 'lowered': -0.5,
+    'warning': -0.7, 'warns': -0.7, 'warned': -0.7, 'lawsuit': -0.6, 'sued': -0.6,
+    'probe': -0.6, 'investigation': -0.6, 'fraud': -1.0, 'recall': -0.7, 'recalls': -0.7,
+    'layoffs': -0.6, 'bankruptcy': -1.0, 'default': -0.8, 'delay': -0.5, 'delays': -0.5,
+    'delayed': -0.5, 'halt': -0.6, 'halts': -0.6, 'rejects': -0.7, 'rejected': -0.7,
+    'rejection': -0.7, 'headwind': -0.5, 'headwinds': -0.5, 'fears': -0.5, 'concerns': -0.4,
+    'risk': -0.3, 'risks': -0.3, 'volatile': -0.2, 'dilution': -0.6, 'downturn': -0.6,
+    'disappoints': -0.7, 'disappointing': -0.7,
+}
+
+# 'fails'/'failed' only negate ("fails to beat"); weighting them too would count the miss twice
+NEGATORS = frozenset({
+    'not', 'no', 'never', 'without', 'neither', 'nor', "isn't", "wasn't", "aren't",
+    "doesn't", "didn't", "don't", "won't", "can't", 'cannot', 'fails', 'failed', 'unable',
+})
+
+
+class LexiconSentiment:
+    """Vectorized finance lexicon scorer with negation handling."""
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, float]] = None,
+        negators: Optional[Iterable[str]] = None,
+        negation_window: int = 3,
+        alpha: float = 4.0
+    ):
+        """
+        Args:
+            lexicon: Word -> weight mapping (defaults to FINANCE_LEXICON)
+            negators: Words that flip the polarity of the words after them
+            negation_window: How many following tokens a negator affects
+            alpha: Normalization constant; larger values compress scores
+        """
+        lexicon = FINANCE_LEXICON if lexicon is None else lexicon
+        negators = NEGATORS if negators is None else frozenset(negators)
+
+        # Vocabulary ids start at 1; id 0 is every out-of-vocabulary token
+        vocab = sorted(set(lexicon) | set(negators))
+        self.vocab = {word: i for i, word in enumerate(vocab, 1)}
+        self.weights = np.zeros(len(vocab) + 1)
+        self.is_negator = np.zeros(len(vocab) + 1, dtype=bool)
+        for word, i in self.vocab.items():
+            self.weights[i] = lexicon.get(word, 0.0)
+            self.is_negator[i] = word in negators
+
+        self.negation_window = negation_window
+        self.alpha = alpha
+
+    def score_headlines(self, headlines: List[str]) -> np.ndarray:
+        """
+        Score headlines.
+
+        Args:
+            headlines: Headline strings
+
+        Returns:
+            Array of scores from -1 (bearish) to 1 (bullish), aligned with the input
+        """
+        n = len(headlines)
+        if n == 0:
+            return np.zeros(0)
+
+        # Tokenize every headline once into one flat token list
+        token_lists = [TOKEN_RE.findall(h.lower()) for h in headlines]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=n)
+        tokens = [t for tl in token_lists for t in tl]
+        if not tokens:
+            return np.zeros(n)
+
+        ids = np.fromiter(map(self.vocab.get, tokens, repeat(0)), dtype=np.int64, count=len(tokens))
+        doc = np.repeat(np.arange(n), lengths)
+
+        weights = self.weights[ids]
+        negator = self.is_negator[ids]
+
+        # A token is negated when a negator from the same headline precedes it
+        # within the window; an odd number of negators flips polarity
+        flips = np.zeros(len(ids), dtype=np.int64)
+        for k in range(1, self.negation_window + 1):
+            if k >= len(ids):
+                break
+            hit = negator[:-k] & (doc[:-k] == doc[k:])
+            flips[k:] += hit
+        weights = np.where(flips % 2 == 1, -weights, weights)
+
+        totals = np.bincount(doc, weights=weights, minlength=n)
+        return totals / np.sqrt(totals * totals + self.alpha)
+
+
+_engine: Optional[LexiconSentiment] = None
+_engine_lock = threading.Lock()
+
+
+def get_lexicon_engine() -> LexiconSentiment:
+    """Return the process-wide lexicon scorer."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LexiconSentiment()
+        return _engine
@@ -0,0 +1,246 @@
+"""
+Adaptive (AIMD) concurrency limit for Yahoo Finance requests.
+
+Yahoo answers bursts of parallel requests with 429s, timeouts and crumb
+failures. Every yfinance call made through the transport takes a slot
+from an AdaptiveLimiter: while requests succeed quickly the limit grows
+by one per window of completions (additive increase), and a throttled
+request halves it (multiplicative decrease). The learned limit is saved
+so the next run starts where the last one left off.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import requests
+
+from ..config import Settings
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # yfinance before 0.2.54
+    YFRateLimitError = None
+
+logger = logging.getLogger(__name__)
+
+# Responses Yahoo sends when it wants clients to slow down
+THROTTLE_STATUS = {429, 503}
+_THROTTLE_MESSAGES = ('too many requests', 'rate limit', 'invalid crumb', 'timed out', 'timeout')
+
+
+def is_throttle(error: BaseException) -> bool:
+    """
+    Whether a failed request means "slow down" rather than "no data".
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        True for rate limiting, timeouts and crumb failures
+    """
+    if YFRateLimitError is not None and isinstance(error, YFRateLimitError):
+        return True
+    if isinstance(error, requests.Timeout):
+        return True
+    response = getattr(error, 'response', None)
+    if getattr(response, 'status_code', None) in THROTTLE_STATUS:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in _THROTTLE_MESSAGES)
+
+
+@dataclass
+class LimiterStats:
+    """Counters since the limiter was created."""
+    calls: int = 0
+    errors: int = 0
+    throttled: int = 0
+    increases: int = 0
+    decreases: int = 0
+    peak_in_flight: int = 0
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that grows additively and backs off multiplicatively."""
+
+    def __init__(self, initial: Optional[float] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, latency_target: Optional[float] = None,
+                 backoff: float = 0.5, max_error_rate: float = 0.1,
+                 state_path: Union[str, Path, None] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            initial: Starting limit when no state is saved (YF_CONCURRENCY_INITIAL if None)
+            min_limit: Lowest limit (YF_CONCURRENCY_MIN if None)
+            max_limit: Highest limit (YF_CONCURRENCY_MAX if None)
+            latency_target: Mean seconds per request above which the limit
+                stops growing (YF_LATENCY_TARGET if None)
+            backoff: Factor applied to the limit when a request is throttled
+            max_error_rate: Share of failed requests in a window above which
+                the limit stops growing
+            state_path: JSON file the learned limit is kept in (None to not persist)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.min_limit = max(1, Settings.YF_CONCURRENCY_MIN if min_limit is None else min_limit)
+        self.max_limit = max(self.min_limit, Settings.YF_CONCURRENCY_MAX if max_limit is None else max_limit)
+        self.latency_target = Settings.YF_LATENCY_TARGET if latency_target is None else latency_target
+        self.backoff = backoff
+        self.max_error_rate = max_error_rate
+        self.state_path = Path(state_path) if state_path else None
+        self._clock = clock
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.stats = LimiterStats()
+        # Completions since the last adjustment, and the most requests in
+        # flight meanwhile (growth only counts when the limit was reached)
+        self._window_count = 0
+        self._window_errors = 0
+        self._window_latency = 0.0
+        self._window_peak = 0
+        # Requests started before a back-off do not trigger another one
+        self._last_decrease = float('-inf')
+
+        saved = self._load()
+        start = saved if saved is not None else (Settings.YF_CONCURRENCY_INITIAL if initial is None else initial)
+        self.limit = self._clamp(start)
+
+    def _clamp(self, limit: float) -> float:
+        return float(min(self.max_limit, max(self.min_limit, limit)))
+
+    @property
+    def slots(self) -> int:
+        """Requests allowed in flight right now."""
+        return int(self.limit)
+
+    def _load(self) -> Optional[float]:
+        if self.state_path is None or not self.state_path.exists():
+            return None
+        try:
+            with open(self.state_path) as f:
+                limit = float(json.load(f)['limit'])
+            logger.info(f"Yahoo concurrency limit restored at {limit:.1f}")
+            return limit
+        except Exception as e:
+            logger.error(f"Error reading limiter state {self.state_path}: {e}")
+            return None
+
+    def save(self):
+        """Write the current limit to state_path (atomically)."""
+        if self.state_path is None:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({'limit': round(self.limit, 3), 'saved_at': datetime.now().isoformat(timespec='seconds')}, f)
+            os.replace(tmp, self.state_path)
+        except Exception as e:
+            logger.error(f"Error saving limiter state {self.state_path}: {e}")
+
+    def acquire(self) -> float:
+        """
+        Wait for a free slot.
+
+        Returns:
+            Start time to pass to release()
+        """
+        with self._cond:
+            while self.in_flight >= self.slots:
+                self._cond.wait()
+            self.in_flight += 1
+            self.stats.calls += 1
+            self._window_peak = max(self._window_peak, self.in_flight)
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.in_flight)
+            return self._clock()
+
+    def release(self, started: float, ok: bool = True, throttled: bool = False):
+        """
+        Return a slot and adjust the limit from the request's outcome.
+
+        Args:
+            started: Value returned by acquire()
+            ok: The request succeeded
+            throttled: The request was rate limited, timed out or lost its crumb
+        """
+        now = self._clock()
+        before = self.slots
+        with self._cond:
+            self.in_flight -= 1
+            if not ok:
+                self.stats.errors += 1
+            if throttled:
+                self.stats.throttled += 1
+                if started >= self._last_decrease:
+                    self._decrease(now)
+            else:
+                self._window_count += 1
+                self._window_errors += not ok
+                self._window_latency += now - started
+                if self._window_count >= self.slots:
+                    self._end_window()
+            after = self.slots
+            self._cond.notify_all()
+
+        if after != before:
+            logger.info(f"Yahoo concurrency limit {before} -> {after}")
+            self.save()
+
+    def _decrease(self, now: float):
+        self.limit = self._clamp(self.limit * self.backoff)
+        self.stats.decreases += 1
+        self._last_decrease = now
+        self._reset_window()
+
+    def _end_window(self):
+        error_rate = self._window_errors / self._window_count
+        latency = self._window_latency / self._window_count
+        saturated = self._window_peak >= self.slots
+        if saturated and error_rate <= self.max_error_rate and latency <= self.latency_target and self.limit < self.max_limit:
+            self.limit = self._clamp(self.limit + 1)
+            self.stats.increases += 1
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_count = 0
+        self._window_errors = 0
+        self._window_latency = 0.0
+        self._window_peak = self.in_flight
+
+    def call(self, fetch: Callable[[], Any]) -> Any:
+        """
+        Run one request inside a slot.
+
+        Args:
+            fetch: Zero-argument function making the request
+
+        Returns:
+            fetch()'s result (its exceptions propagate)
+        """
+        started = self.acquire()
+        try:
+            value = fetch()
+        except Exception as e:
+            self.release(started, ok=False, throttled=is_throttle(e))
+            raise
+        self.release(started)
+        return value
+
+
+_yahoo_limiter: Optional[AdaptiveLimiter] = None
+_yahoo_lock = threading.Lock()
+
+
+def get_yahoo_limiter() -> Optional[AdaptiveLimiter]:
+    """Process-wide Yahoo limiter persisted at YF_LIMITER_STATE (None if YF_ADAPTIVE_LIMIT is off)."""
+    global _yahoo_limiter
+    if not Settings.YF_ADAPTIVE_LIMIT:
+        return None
+    with _yahoo_lock:
+        if _yahoo_limiter is None:
+            _yahoo_limiter = AdaptiveLimiter(state_path=Settings.resolve_path(Settings.YF_LIMITER_STATE))
+        return _yahoo_limiter
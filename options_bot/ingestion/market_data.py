@@ -0,0 +1,210 @@
+"""
+Quotes, price history and news headlines with hedged requests.
+
+yfinance stays the primary source. When API keys for alternate providers
+are configured (Finnhub, Tradier, Alpha Vantage for quotes; Polygon and
+Alpha Vantage for history; Finnhub and Polygon for news), a request that
+outlives the primary's p95 latency is also sent to the next provider and
+the first valid answer is used (see hedging.Hedger).
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, List, Optional
+
+import pandas as pd
+
+from ..config import Settings
+from . import transport
+from .hedging import Attempt, get_hedger
+from .news_fetcher import NewsAggregator
+
+logger = logging.getLogger(__name__)
+
+# Calendar days per yfinance period, for providers that take date ranges
+PERIOD_DAYS = {'5d': 7, '1mo': 31, '3mo': 92, '6mo': 183, '1y': 366, '2y': 731}
+_BAR_COLUMNS = {'o': 'Open', 'h': 'High', 'l': 'Low', 'c': 'Close', 'v': 'Volume'}
+
+
+def tradier_base_url() -> str:
+    return "https://sandbox.tradier.com" if Settings.TRADIER_SANDBOX else "https://api.tradier.com"
+
+
+def tradier_headers() -> dict:
+    return {'Authorization': f"Bearer {Settings.TRADIER_API_KEY}", 'Accept': 'application/json'}
+
+
+def finnhub_quote(ticker: str) -> Optional[float]:
+    """Last price from Finnhub."""
+    response = transport.http_get("https://finnhub.io/api/v1/quote",
+                                  params={'symbol': ticker, 'token': Settings.FINNHUB_API_KEY}, timeout=10)
+    response.raise_for_status()
+    return response.json().get('c') or None
+
+
+def tradier_quote(ticker: str) -> Optional[float]:
+    """Last price from Tradier."""
+    response = transport.http_get(f"{tradier_base_url()}/v1/markets/quotes", params={'symbols': ticker},
+                                  headers=tradier_headers(), timeout=10)
+    response.raise_for_status()
+    quote = (response.json().get('quotes') or {}).get('quote') or {}
+    return quote.get('last') or None
+
+
+def alpha_vantage_quote(ticker: str) -> Optional[float]:
+    """Last price from Alpha Vantage."""
+    response = transport.http_get("https://www.alphavantage.co/query", params={
+        'function': 'GLOBAL_QUOTE', 'symbol': ticker, 'apikey': Settings.ALPHA_VANTAGE_API_KEY
+    }, timeout=10)
+    response.raise_for_status()
+    price = response.json().get('Global Quote', {}).get('05. price')
+    return float(price) if price else None
+
+
+def polygon_history(ticker: str, period: str) -> pd.DataFrame:
+    """Daily bars from Polygon's aggregates endpoint, shaped like yfinance history()."""
+    end = datetime.now().date()
+    start = end - timedelta(days=PERIOD_DAYS.get(period, 366))
+    response = transport.http_get(
+        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start.isoformat()}/{end.isoformat()}",
+        params={'adjusted': 'true', 'sort': 'asc', 'limit': 50000, 'apiKey': Settings.POLYGON_API_KEY},
+        timeout=10
+    )
+    response.raise_for_status()
+    results = response.json().get('results') or []
+    if not results:
+        return pd.DataFrame()
+    bars = pd.DataFrame(results)
+    index = pd.to_datetime(bars['t'], unit='ms', utc=True).dt.tz_convert(Settings.TIMEZONE).dt.normalize()
+    bars = bars[list(_BAR_COLUMNS)].rename(columns=_BAR_COLUMNS)
+    bars.index = pd.DatetimeIndex(index, name='Date')
+    return bars
+
+
+def polygon_grouped_daily(day: date) -> pd.DataFrame:
+    """
+    Every US stock's bar for one day from Polygon's grouped daily endpoint.
+
+    Args:
+        day: Trading day
+
+    Returns:
+        Long DataFrame with columns ticker, date, open, high, low, close,
+        volume (empty for holidays and weekends)
+    """
+    response = transport.http_get(
+        f"https://api.polygon.io/v2/aggs/grouped/locale/us/market/stocks/{day.isoformat()}",
+        params={'adjusted': 'true', 'apiKey': Settings.POLYGON_API_KEY},
+        timeout=30
+    )
+    response.raise_for_status()
+    results = response.json().get('results') or []
+    bars = pd.DataFrame(results, columns=['T', 'o', 'h', 'l', 'c', 'v'])
+    return pd.DataFrame({
+        'ticker': bars['T'], 'date': day, 'open': bars['o'], 'high': bars['h'],
+        'low': bars['l'], 'close': bars['c'], 'volume': bars['v'],
+    })
+
+
+def alpha_vantage_history(ticker: str, period: str) -> pd.DataFrame:
+    """Daily bars from Alpha Vantage (compact output: about 100 trading days)."""
+    response = transport.http_get("https://www.alphavantage.co/query", params={
+        'function': 'TIME_SERIES_DAILY', 'symbol': ticker, 'outputsize': 'compact',
+        'apikey': Settings.ALPHA_VANTAGE_API_KEY
+    }, timeout=10)
+    response.raise_for_status()
+    series = response.json().get('Time Series (Daily)') or {}
+    if not series:
+        return pd.DataFrame()
+    bars = pd.DataFrame.from_dict(series, orient='index').astype(float)
+    bars.columns = [name.split('. ', 1)[1].capitalize() for name in bars.columns]
+    bars.index = pd.DatetimeIndex(pd.to_datetime(bars.index), name='Date').tz_localize(Settings.TIMEZONE)
+    bars = bars.sort_index()
+    start = bars.index[-1] - timedelta(days=PERIOD_DAYS.get(period, 366))
+    return bars[bars.index > start]
+
+
+def _valid_price(value: Any) -> bool:
+    return value is not None and value > 0
+
+
+def _valid_history(value: Any) -> bool:
+    return isinstance(value, pd.DataFrame) and not value.empty and 'Close' in value
+
+
+def _hedged(resource: str, primary: Callable[[], Any], alternates: List[Attempt], valid: Callable[[Any], bool]) -> Any:
+    attempts = [('yfinance', primary)]
+    if Settings.HEDGE_REQUESTS:
+        attempts += alternates
+    return get_hedger().fetch(resource, attempts, valid)
+
+
+def get_quote(ticker: str, primary: Optional[Callable[[], Optional[float]]] = None) -> Optional[float]:
+    """
+    Current price, hedged across quote providers.
+
+    Args:
+        ticker: Ticker symbol
+        primary: yfinance lookup to use (fast_info lastPrice if None)
+
+    Returns:
+        Price or None if no provider had one
+    """
+    if primary is None:
+        primary = lambda: transport.ticker(ticker).fast_info.get('lastPrice')
+    alternates = []
+    if Settings.FINNHUB_API_KEY:
+        alternates.append(('finnhub', lambda: finnhub_quote(ticker)))
+    if Settings.TRADIER_API_KEY:
+        alternates.append(('tradier', lambda: tradier_quote(ticker)))
+    if Settings.ALPHA_VANTAGE_API_KEY:
+        alternates.append(('alphavantage', lambda: alpha_vantage_quote(ticker)))
+    return _hedged('quote', primary, alternates, _valid_price)
+
+
+def get_history(ticker: str, period: str = '1y',
+                primary: Optional[Callable[[], pd.DataFrame]] = None) -> Optional[pd.DataFrame]:
+    """
+    Daily price history, hedged across bar providers.
+
+    Args:
+        ticker: Ticker symbol
+        period: yfinance period ('3mo', '1y', ...)
+        primary: yfinance lookup to use (Ticker.history if None)
+
+    Returns:
+        DataFrame with Open/High/Low/Close/Volume, or None if no provider had bars
+    """
+    if primary is None:
+        primary = lambda: transport.ticker(ticker).history(period=period)
+    alternates = []
+    if Settings.POLYGON_API_KEY:
+        alternates.append(('polygon', lambda: polygon_history(ticker, period)))
+    if Settings.ALPHA_VANTAGE_API_KEY and PERIOD_DAYS.get(period, 366) <= 140:
+        alternates.append(('alphavantage', lambda: alpha_vantage_history(ticker, period)))
+    return _hedged('history', primary, alternates, _valid_history)
+
+
+def get_headlines(ticker: str, max_headlines: int = 5,
+                  primary: Optional[Callable[[], List[str]]] = None) -> List[str]:
+    """
+    Recent headlines, hedged across news providers.
+
+    Args:
+        ticker: Ticker symbol
+        max_headlines: Headlines to return
+        primary: yfinance lookup to use (Ticker.news titles if None)
+
+    Returns:
+        List of headline strings (empty if no provider had news)
+    """
+    if primary is None:
+        primary = lambda: [item.get('title') for item in (transport.ticker(ticker).news or [])[:max_headlines]
+                           if item.get('title')]
+    titles = lambda articles: [a['title'] for a in articles[:max_headlines] if a.get('title')]
+    aggregator = NewsAggregator(finnhub_api_key=Settings.FINNHUB_API_KEY)
+    alternates = []
+    if Settings.FINNHUB_API_KEY:
+        alternates.append(('finnhub', lambda: titles(aggregator.fetch_finnhub(ticker, Settings.NEWS_LOOKBACK_DAYS))))
+    if Settings.POLYGON_API_KEY:
+        alternates.append(('polygon', lambda: titles(aggregator.fetch_polygon(ticker, Settings.POLYGON_API_KEY, max_headlines))))
+    return _hedged('news', primary, alternates, bool) or []
@@ -1,11 +1,12 @@
 """
 Advanced news fetching from multiple sources.
 """
-import requests
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import logging
 
+from . import transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +35,7 @@ class NewsAggregator:
                 'apiKey': self.news_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -75,7 +76,7 @@ class NewsAggregator:
                 'token': self.finnhub_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             response.raise_for_status()
             
             articles = response.json()
@@ -111,7 +112,7 @@ class NewsAggregator:
                 'apiKey': polygon_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.http_get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
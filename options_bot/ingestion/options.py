@@ -1,17 +1,34 @@
 """
 Options data ingestion and analysis.
 """
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+from dataclasses import replace
 
+from ..config import Settings
 from ..models import OptionsSnapshot
+from .freshness import merge_fresh
+from . import tradier, transport
+from .market_data import get_history, get_quote
+from .providers import OptionChain
 
 logger = logging.getLogger(__name__)
 
+# Chain columns summarize_chain reads, and the dtypes they are kept in
+CHAIN_DTYPES = {
+    'strike': np.float32,
+    'impliedVolatility': np.float32,
+    'volume': np.int32,
+    'openInterest': np.int32,
+}
+# Extra columns kept from vendor chains (Tradier)
+VENDOR_CHAIN_DTYPES = {
+    'delta': np.float32,
+}
+
 
 def calculate_hv(prices: pd.Series, window: int = 30) -> float:
     """
@@ -29,6 +46,42 @@ def calculate_hv(prices: pd.Series, window: int = 30) -> float:
     return volatility.iloc[-1] if not pd.isna(volatility.iloc[-1]) else None
 
 
+class RollingHV:
+    """
+    Incremental 30-day historical volatility.
+    
+    Seeded once from daily closes; each intraday update only adds the
+    provisional return from the last close to the current spot, so the
+    result matches calculate_hv over closes + [spot] in O(1).
+    """
+    
+    def __init__(self, closes: pd.Series, window: int = 30):
+        self.window = window
+        returns = np.log(closes / closes.shift(1)).dropna().values[-(window - 1):]
+        self.last_close = float(closes.iloc[-1])
+        self._n = len(returns)
+        self._sum = float(returns.sum())
+        self._sum_sq = float((returns ** 2).sum())
+    
+    def value(self, spot: float) -> Optional[float]:
+        """
+        Annualized volatility including today's move to spot.
+        
+        Args:
+            spot: Current price
+            
+        Returns:
+            Annualized historical volatility or None with too little history
+        """
+        if self._n < self.window - 1 or not spot or spot <= 0:
+            return None
+        r = np.log(spot / self.last_close)
+        n = self._n + 1
+        total = self._sum + r
+        variance = (self._sum_sq + r * r - total * total / n) / (n - 1)
+        return float(np.sqrt(max(variance, 0.0)) * np.sqrt(252))
+
+
 def calculate_iv_rank(iv_history: pd.Series, current_iv: float) -> float:
     """
     Calculate IV rank (percentile over period).
@@ -75,6 +128,306 @@ def score_liquidity(volume: int, open_interest: int) -> float:
         return 1.0
 
 
+def nearest_expiration(expirations, target_dte: int = 35, today: Optional[datetime] = None,
+                       min_dte: Optional[int] = None, max_dte: Optional[int] = None) -> Optional[str]:
+    """
+    Expiration closest to a target days-to-expiry.
+    
+    Args:
+        expirations: Expiration dates as 'YYYY-MM-DD' strings
+        target_dte: Target days to expiry
+        today: Reference date (now if None)
+        min_dte: Ignore expirations sooner than this many days
+        max_dte: Ignore expirations later than this many days
+        
+    Returns:
+        Closest expiration string, or None if none is inside the DTE window
+    """
+    today = today or datetime.now()
+    target_date = today + timedelta(days=target_dte)
+    candidates = []
+    for expiration in expirations:
+        dte = (datetime.strptime(expiration, '%Y-%m-%d') - today).days
+        if (min_dte is None or dte >= min_dte) and (max_dte is None or dte <= max_dte):
+            candidates.append(expiration)
+    if not candidates:
+        return None
+    return min(
+        candidates,
+        key=lambda x: abs((datetime.strptime(x, '%Y-%m-%d') - target_date).days)
+    )
+
+
+def prune_chain(chain: pd.DataFrame, spot: float, moneyness: Optional[float] = None) -> pd.DataFrame:
+    """
+    Cut an option chain down to the strikes and columns summarize_chain uses.
+    
+    Only rows inside the moneyness window are copied, straight into
+    compact dtypes; missing volume and open interest become 0.
+    
+    Args:
+        chain: Calls or puts as returned by yfinance
+        spot: Spot price
+        moneyness: Keep strikes within this fraction of spot
+            (CHAIN_MONEYNESS if None; 0 keeps every strike)
+        
+    Returns:
+        New DataFrame with the CHAIN_DTYPES and VENDOR_CHAIN_DTYPES
+        columns present in chain
+    """
+    moneyness = Settings.CHAIN_MONEYNESS if moneyness is None else moneyness
+    strikes = chain['strike'].to_numpy()
+    if moneyness > 0:
+        keep = (strikes >= spot * (1 - moneyness)) & (strikes <= spot * (1 + moneyness))
+    else:
+        keep = slice(None)
+    
+    columns = {}
+    for name, dtype in {**CHAIN_DTYPES, **VENDOR_CHAIN_DTYPES}.items():
+        if name not in chain:
+            continue
+        values = chain[name].to_numpy()[keep]
+        if np.issubdtype(dtype, np.integer):
+            values = np.nan_to_num(values.astype(np.float64, copy=False), nan=0.0)
+        columns[name] = values.astype(dtype, copy=False)
+    return pd.DataFrame(columns)
+
+
+def chain_totals(chain: pd.DataFrame) -> Tuple[float, float]:
+    """
+    Volume and open interest summed over every strike of a chain.
+    
+    Taken before prune_chain, so liquidity covers the whole expiration
+    and not only the strikes kept for IV and skew.
+    
+    Args:
+        chain: Calls or puts as returned by yfinance
+        
+    Returns:
+        Tuple of (volume, open interest); missing values count as 0
+    """
+    return tuple(
+        float(np.nansum(chain[name].to_numpy(dtype=np.float64))) if name in chain else 0.0
+        for name in ('volume', 'openInterest')
+    )
+
+
+def summarize_chain(
+    ticker: str,
+    calls: pd.DataFrame,
+    puts: pd.DataFrame,
+    current_price: float,
+    hv30: Optional[float],
+    call_totals: Optional[Tuple[float, float]] = None,
+    put_totals: Optional[Tuple[float, float]] = None
+) -> OptionsSnapshot:
+    """
+    Reduce one expiration's option chain to snapshot metrics.
+    
+    Pure function of its inputs (no network access, inputs not modified).
+    Works on column arrays, so no filtered copies of the chain are made.
+    
+    Args:
+        ticker: Stock ticker symbol
+        calls: Call chain with strike, impliedVolatility, volume, openInterest
+            and, from vendor chains, delta
+        puts: Put chain with the same columns
+        current_price: Spot price
+        hv30: 30-day historical volatility
+        call_totals: (volume, open interest) of the full call chain when
+            calls was pruned (chain_totals); summed from calls if None
+        put_totals: Same for the put chain
+        
+    Returns:
+        OptionsSnapshot
+    """
+    call_strikes = calls['strike'].to_numpy()
+    put_strikes = puts['strike'].to_numpy()
+    has_iv = 'impliedVolatility' in calls and 'impliedVolatility' in puts
+    call_ivs = calls['impliedVolatility'].to_numpy() if has_iv else None
+    put_ivs = puts['impliedVolatility'].to_numpy() if has_iv else None
+    
+    # Find ATM options
+    atm_call = int(np.abs(call_strikes - current_price).argmin())
+    atm_put = int(np.abs(put_strikes - current_price).argmin())
+    
+    # ATM IV (average of call and put)
+    atm_iv = None
+    if has_iv:
+        call_iv = float(call_ivs[atm_call])
+        put_iv = float(put_ivs[atm_put])
+        if call_iv > 0 and put_iv > 0:
+            atm_iv = (call_iv + put_iv) / 2
+    
+    # Calculate IV rank (simplified - using current vs HV as proxy)
+    iv_rank = 50.0  # Default
+    if atm_iv and hv30:
+        if atm_iv > hv30:
+            iv_rank = 60.0 + min((atm_iv / hv30 - 1) * 100, 40.0)
+        else:
+            iv_rank = 60.0 - min((1 - atm_iv / hv30) * 100, 60.0)
+    
+    # Skew calculation (25-delta risk reversal)
+    call_deltas = calls['delta'].to_numpy() if 'delta' in calls else None
+    put_deltas = puts['delta'].to_numpy() if 'delta' in puts else None
+    if (call_deltas is not None and put_deltas is not None
+            and np.isfinite(call_deltas).any() and np.isfinite(put_deltas).any()):
+        # Vendor deltas: the contracts nearest +/-0.25 delta
+        calls_otm = [int(np.nanargmin(np.abs(call_deltas - 0.25)))]
+        puts_otm = [int(np.nanargmin(np.abs(put_deltas + 0.25)))]
+    else:
+        # Use 5% OTM options as proxy
+        calls_otm = np.flatnonzero(call_strikes >= current_price * 1.05)
+        puts_otm = np.flatnonzero(put_strikes <= current_price * 0.95)
+    
+    skew = None
+    if len(calls_otm) and len(puts_otm) and has_iv:
+        call_iv_otm = float(call_ivs[calls_otm[0]])
+        put_iv_otm = float(put_ivs[puts_otm[-1]])
+        if put_iv_otm > 0 and call_iv_otm > 0:
+            skew = put_iv_otm - call_iv_otm  # Positive = put skew
+    
+    # Liquidity scoring (over the whole expiration)
+    call_volume, call_oi = call_totals or (calls['volume'].sum(), calls['openInterest'].sum())
+    put_volume, put_oi = put_totals or (puts['volume'].sum(), puts['openInterest'].sum())
+    call_liq = score_liquidity(call_volume, call_oi)
+    put_liq = score_liquidity(put_volume, put_oi)
+    
+    # Term structure slope (simplified - would need multiple expirations)
+    term_slope = None  # Placeholder for now
+    
+    return OptionsSnapshot(
+        ticker=ticker,
+        spot_price=current_price,
+        hv30=hv30,
+        atm_iv_dte35=atm_iv,
+        iv_rank_1y=iv_rank,
+        skew_25d_rr=skew,
+        term_slope_iv=term_slope,
+        liq_calls_score=call_liq,
+        liq_puts_score=put_liq,
+        avg_option_volume=int(call_volume + put_volume),
+        open_interest=int(call_oi + put_oi)
+    )
+
+
+def _chain_snapshot(stock, ticker: str, current_price: float, hv30: Optional[float]) -> Optional[OptionsSnapshot]:
+    """
+    Build a snapshot from the ~35 DTE option chain.
+    
+    Args:
+        stock: yfinance Ticker
+        ticker: Stock ticker symbol
+        current_price: Spot price
+        hv30: 30-day historical volatility
+        
+    Returns:
+        OptionsSnapshot object or None if the chain is unavailable
+    """
+    # Get options chain
+    try:
+        expiration_dates = stock.options
+        if not expiration_dates:
+            logger.warning(f"No options available for {ticker}")
+            return None
+        
+        # Find expiration closest to 35 DTE inside the configured window
+        expiration = nearest_expiration(expiration_dates, min_dte=Settings.CHAIN_MIN_DTE,
+                                        max_dte=Settings.CHAIN_MAX_DTE)
+        if expiration is None:
+            logger.warning(f"No expiration within {Settings.CHAIN_MIN_DTE}-{Settings.CHAIN_MAX_DTE} DTE for {ticker}")
+            return None
+        
+        # Keep only the near-the-money strikes and used columns, and let go
+        # of the full frames before summarizing (liquidity totals are taken
+        # over every strike first)
+        opt_chain = stock.option_chain(expiration)
+        totals = chain_totals(opt_chain.calls), chain_totals(opt_chain.puts)
+        calls = prune_chain(opt_chain.calls, current_price)
+        puts = prune_chain(opt_chain.puts, current_price)
+        del opt_chain
+        if calls.empty or puts.empty:
+            logger.warning(f"No strikes within {Settings.CHAIN_MONEYNESS:.0%} of spot for {ticker}")
+            return None
+        
+        return summarize_chain(ticker, calls, puts, current_price, hv30, *totals)
+        
+    except Exception as e:
+        logger.error(f"Error processing options chain for {ticker}: {e}")
+        return None
+
+
+def snapshot_from_chains(ticker: str, chains: List[OptionChain], current_price: float,
+                         hv30: Optional[float]) -> Optional[OptionsSnapshot]:
+    """
+    Build a snapshot from already fetched chains (any provider).
+    
+    The first chain gives the ~35 DTE metrics; a second one, when given,
+    gives the IV term slope (its ATM IV minus the first one's).
+    
+    Args:
+        ticker: Stock ticker symbol
+        chains: Chains front month first, as returned by a MarketDataProvider
+        current_price: Spot price
+        hv30: 30-day historical volatility
+        
+    Returns:
+        OptionsSnapshot object or None if no strikes are near spot
+    """
+    if not chains:
+        return None
+    pruned = [(prune_chain(chain.calls, current_price), prune_chain(chain.puts, current_price)) for chain in chains]
+    calls, puts = pruned[0]
+    if calls.empty or puts.empty:
+        logger.warning(f"No strikes within {Settings.CHAIN_MONEYNESS:.0%} of spot for {ticker}")
+        return None
+    
+    snapshot = summarize_chain(ticker, calls, puts, current_price, hv30,
+                               chain_totals(chains[0].calls), chain_totals(chains[0].puts))
+    if len(pruned) > 1 and snapshot.atm_iv_dte35 and not pruned[1][0].empty and not pruned[1][1].empty:
+        back_iv = summarize_chain(ticker, *pruned[1], current_price, hv30).atm_iv_dte35
+        if back_iv:
+            snapshot = replace(snapshot, term_slope_iv=back_iv - snapshot.atm_iv_dte35)
+    return snapshot
+
+
+def _vendor_snapshot(ticker: str, current_price: float, hv30: Optional[float]) -> Optional[OptionsSnapshot]:
+    """
+    Build a snapshot from Tradier chains, using the vendor's IV and deltas.
+    
+    The front month gives the ~35 DTE metrics; a back month, when listed,
+    gives the IV term slope (back-month ATM IV minus front-month ATM IV).
+    
+    Args:
+        ticker: Stock ticker symbol
+        current_price: Spot price
+        hv30: 30-day historical volatility
+        
+    Returns:
+        OptionsSnapshot object or None if the chain is unavailable
+    """
+    try:
+        chains = tradier.get_tradier_provider().snapshot_chains(ticker)
+        if not chains:
+            logger.warning(f"No Tradier expiration within {Settings.CHAIN_MIN_DTE}-{Settings.CHAIN_MAX_DTE} DTE for {ticker}")
+            return None
+        return snapshot_from_chains(ticker, chains, current_price, hv30)
+        
+    except Exception as e:
+        logger.error(f"Error processing Tradier chain for {ticker}: {e}")
+        return None
+
+
+def _snapshot(stock, ticker: str, current_price: float, hv30: Optional[float]) -> Optional[OptionsSnapshot]:
+    """Tradier snapshot when enabled, falling back to the yfinance chain when it gives none."""
+    if tradier.enabled():
+        snapshot = _vendor_snapshot(ticker, current_price, hv30)
+        if snapshot is not None:
+            return snapshot
+        logger.info(f"Falling back to the yfinance chain for {ticker}")
+    return _chain_snapshot(stock, ticker, current_price, hv30)
+
+
 def get_options_snapshot(ticker: str) -> Optional[OptionsSnapshot]:
     """
     Fetch options structure data for a ticker.
@@ -86,115 +439,65 @@ def get_options_snapshot(ticker: str) -> Optional[OptionsSnapshot]:
         OptionsSnapshot object or None if data unavailable
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         
         # Get current price
-        current_price = stock.info.get('currentPrice') or stock.info.get('regularMarketPrice')
+        current_price = get_quote(ticker, lambda: stock.info.get('currentPrice') or stock.info.get('regularMarketPrice'))
         if not current_price:
             logger.warning(f"No current price for {ticker}")
             return None
         
         # Calculate historical volatility
-        hist = stock.history(period="3mo")
-        if hist.empty:
+        hist = get_history(ticker, "3mo", lambda: stock.history(period="3mo"))
+        if hist is None:
             logger.warning(f"No price history for {ticker}")
             return None
             
         hv30 = calculate_hv(hist['Close'], window=30)
         
-        # Get options chain
-        try:
-            expiration_dates = stock.options
-            if not expiration_dates:
-                logger.warning(f"No options available for {ticker}")
-                return None
-            
-            # Find expiration closest to 35 DTE
-            target_date = datetime.now() + timedelta(days=35)
-            closest_exp = min(
-                expiration_dates,
-                key=lambda x: abs((datetime.strptime(x, '%Y-%m-%d') - target_date).days)
-            )
-            
-            opt_chain = stock.option_chain(closest_exp)
-            calls = opt_chain.calls
-            puts = opt_chain.puts
-            
-            # Find ATM options
-            calls['dist'] = abs(calls['strike'] - current_price)
-            puts['dist'] = abs(puts['strike'] - current_price)
-            
-            atm_call = calls.loc[calls['dist'].idxmin()]
-            atm_put = puts.loc[puts['dist'].idxmin()]
-            
-            # ATM IV (average of call and put)
-            atm_iv = None
-            if 'impliedVolatility' in atm_call and 'impliedVolatility' in atm_put:
-                call_iv = atm_call['impliedVolatility']
-                put_iv = atm_put['impliedVolatility']
-                if call_iv > 0 and put_iv > 0:
-                    atm_iv = (call_iv + put_iv) / 2
-            
-            # Calculate IV rank (simplified - using current vs HV as proxy)
-            iv_rank = 50.0  # Default
-            if atm_iv and hv30:
-                if atm_iv > hv30:
-                    iv_rank = 60.0 + min((atm_iv / hv30 - 1) * 100, 40.0)
-                else:
-                    iv_rank = 60.0 - min((1 - atm_iv / hv30) * 100, 60.0)
-            
-            # Skew calculation (25-delta risk reversal approximation)
-            # Use 25% OTM options as proxy
-            otm_strike_call = current_price * 1.05
-            otm_strike_put = current_price * 0.95
-            
-            calls_otm = calls[calls['strike'] >= otm_strike_call]
-            puts_otm = puts[puts['strike'] <= otm_strike_put]
-            
-            skew = None
-            if not calls_otm.empty and not puts_otm.empty:
-                otm_call = calls_otm.iloc[0]
-                otm_put = puts_otm.iloc[-1]
-                if 'impliedVolatility' in otm_call and 'impliedVolatility' in otm_put:
-                    put_iv_otm = otm_put['impliedVolatility']
-                    call_iv_otm = otm_call['impliedVolatility']
-                    if put_iv_otm > 0 and call_iv_otm > 0:
-                        skew = put_iv_otm - call_iv_otm  # Positive = put skew
-            
-            # Liquidity scoring
-            call_liq = score_liquidity(
-                calls['volume'].sum(),
-                calls['openInterest'].sum()
-            )
-            put_liq = score_liquidity(
-                puts['volume'].sum(),
-                puts['openInterest'].sum()
-            )
-            
-            # Term structure slope (simplified - would need multiple expirations)
-            term_slope = None  # Placeholder for now
-            
-            snapshot = OptionsSnapshot(
-                ticker=ticker,
-                spot_price=current_price,
-                hv30=hv30,
-                atm_iv_dte35=atm_iv,
-                iv_rank_1y=iv_rank,
-                skew_25d_rr=skew,
-                term_slope_iv=term_slope,
-                liq_calls_score=call_liq,
-                liq_puts_score=put_liq,
-                avg_option_volume=int(calls['volume'].sum() + puts['volume'].sum()),
-                open_interest=int(calls['openInterest'].sum() + puts['openInterest'].sum())
-            )
-            
-            return snapshot
-            
-        except Exception as e:
-            logger.error(f"Error processing options chain for {ticker}: {e}")
-            return None
+        return _snapshot(stock, ticker, current_price, hv30)
             
     except Exception as e:
         logger.error(f"Error fetching options data for {ticker}: {e}")
         return None
 
+
+def refresh_options_snapshot(previous: OptionsSnapshot, hv_state: Optional[RollingHV] = None) -> Optional[OptionsSnapshot]:
+    """
+    Refetch the intraday fields of an earlier snapshot.
+    
+    Only the spot price and the option chain are requested; daily fields
+    such as hv30 are carried over from the previous snapshot.
+    
+    Args:
+        previous: Snapshot from the day's full scan
+        hv_state: Optional incremental HV; when given, hv30 is updated to
+            include today's move to the new spot
+        
+    Returns:
+        Updated OptionsSnapshot or None if data unavailable
+    """
+    ticker = previous.ticker
+    try:
+        stock = transport.ticker(ticker)
+        
+        # fast_info avoids the full quote summary request behind stock.info
+        current_price = get_quote(ticker, lambda: stock.fast_info.get('lastPrice'))
+        if not current_price:
+            logger.warning(f"No current price for {ticker}")
+            return None
+        
+        hv30 = previous.hv30
+        if hv_state is not None:
+            hv30 = hv_state.value(current_price) or previous.hv30
+        
+        fresh = _snapshot(stock, ticker, current_price, hv30)
+        if not fresh:
+            return None
+        
+        snapshot = merge_fresh(previous, fresh)
+        return replace(snapshot, hv30=hv30) if hv_state is not None else snapshot
+        
+    except Exception as e:
+        logger.error(f"Error refreshing options data for {ticker}: {e}")
+        return None
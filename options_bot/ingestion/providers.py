@@ -0,0 +1,371 @@
+"""
+Pluggable market-data providers with bulk-first methods.
+
+A provider answers four bulk requests, each for many tickers at once:
+quotes, daily bars, option chains and fundamentals. Each also says how
+many round trips a request would cost it, so MarketDataPlanner can send
+every request to the provider with the fewest round trips and fall back
+to the next one for tickers it could not answer.
+
+YFinanceProvider is always available; TradierOptionsProvider (tradier.py)
+is preferred when paid option data is enabled, and PolygonGroupedProvider
+wins bar requests covering more tickers than trading days. FakeProvider serves in-memory data
+and counts the round trips it was asked for, for tests.
+
+Scans (scan.fetch_tickers) get quotes, daily bars, chains and
+fundamentals for each batch of tickers through the planner, as do bar
+backfills (bars.backfill_bars).
+"""
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..config import Settings
+from ..models import Fundamentals
+from ..storage.bar_store import BAR_COLUMNS
+from . import transport
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('quotes', 'bars', 'chains', 'fundamentals')
+
+
+@dataclass
+class OptionChain:
+    """One expiration of a ticker's option chain (yfinance column names)."""
+    ticker: str
+    expiration: str
+    calls: pd.DataFrame
+    puts: pd.DataFrame
+    # Vendor Greeks and IV are in the frames (delta, gamma, theta, vega columns)
+    has_greeks: bool = False
+
+
+def empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(columns=BAR_COLUMNS)
+
+
+class MarketDataProvider:
+    """
+    A source of some of: quotes, daily bars, option chains and fundamentals.
+
+    A provider implements get_<method> for each method it lists in
+    batch_sizes, and the planner only calls methods it supports:
+
+        get_quotes(tickers) -> {ticker: last price}
+        get_bars(tickers, start, end=None) -> long frame of BAR_COLUMNS
+        get_chains(tickers, expirations=None) -> {ticker: [OptionChain]}, where
+            expirations maps tickers to the YYYY-MM-DD expirations to fetch
+            and other tickers get the one nearest 35 DTE within
+            CHAIN_MIN_DTE..CHAIN_MAX_DTE
+        get_fundamentals(tickers) -> {ticker: Fundamentals}
+
+    Tickers without data are left out of the results.
+    """
+
+    name = 'provider'
+    # Tickers per call for each supported method (None: any number)
+    batch_sizes: Dict[str, Optional[int]] = {}
+
+    def supports(self, method: str) -> bool:
+        return method in self.batch_sizes and callable(getattr(self, f"get_{method}", None))
+
+    def batches(self, method: str, tickers: Sequence[str]) -> List[List[str]]:
+        """Split tickers into calls of at most batch_sizes[method]."""
+        size = self.batch_sizes[method]
+        tickers = list(tickers)
+        if not size:
+            return [tickers] if tickers else []
+        return [tickers[i:i + size] for i in range(0, len(tickers), size)]
+
+    def round_trips(self, method: str, tickers: int, expirations: int = 1, days: int = 1) -> int:
+        """
+        Requests needed to answer a bulk call.
+
+        The default is one request per batch, and per expiration for chains.
+
+        Args:
+            method: 'quotes', 'bars', 'chains' or 'fundamentals'
+            tickers: Number of tickers
+            expirations: Expirations per ticker (chains)
+            days: Trading days covered (bars)
+        """
+        size = self.batch_sizes[method]
+        calls = math.ceil(tickers / size) if size else min(tickers, 1)
+        return calls * expirations if method == 'chains' else calls
+
+
+class YFinanceProvider(MarketDataProvider):
+    """yfinance through the transport: one Yahoo request per ticker (and expiration)."""
+
+    name = 'yfinance'
+    batch_sizes = {'quotes': 200, 'bars': 200, 'chains': 1, 'fundamentals': 1}
+
+    def round_trips(self, method: str, tickers: int, expirations: int = 1, days: int = 1) -> int:
+        # yf.download takes many tickers but still requests each one;
+        # chains also need the ticker's expiration list
+        if method == 'chains':
+            return tickers * (expirations + 1)
+        return tickers
+
+    def get_quotes(self, tickers: Sequence[str]) -> Dict[str, float]:
+        from .bars import download_bars
+
+        # One yf.download for the batch; the latest daily close (today's
+        # bar during the session) is the last price
+        bars = download_bars(list(tickers), date.today() - timedelta(days=7))
+        if bars.empty:
+            return {}
+        last = bars.sort_values('date').groupby('ticker')['close'].last()
+        return {ticker: float(price) for ticker, price in last.items() if price > 0}
+
+    def get_bars(self, tickers: Sequence[str], start: date, end: Optional[date] = None) -> pd.DataFrame:
+        from .bars import download_bars
+
+        return download_bars(list(tickers), start, end)
+
+    def get_chains(self, tickers: Sequence[str],
+                   expirations: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[OptionChain]]:
+        from .options import nearest_expiration
+
+        chains = {}
+        for ticker in tickers:
+            try:
+                stock = transport.ticker(ticker)
+                wanted = (expirations or {}).get(ticker)
+                if wanted is None:
+                    nearest = nearest_expiration(stock.options, min_dte=Settings.CHAIN_MIN_DTE,
+                                                 max_dte=Settings.CHAIN_MAX_DTE)
+                    wanted = [nearest] if nearest else []
+                chains[ticker] = [
+                    OptionChain(ticker, expiration, chain.calls, chain.puts)
+                    for expiration in wanted
+                    for chain in [stock.option_chain(expiration)]
+                ]
+            except Exception as e:
+                logger.error(f"Error fetching option chains for {ticker}: {e}")
+        return {ticker: found for ticker, found in chains.items() if found}
+
+    def get_fundamentals(self, tickers: Sequence[str]) -> Dict[str, Fundamentals]:
+        from .fundamentals import get_fundamentals
+
+        found = {ticker: get_fundamentals(ticker) for ticker in tickers}
+        return {ticker: fund for ticker, fund in found.items() if fund is not None}
+
+
+def trading_days(start: date, end: Optional[date] = None) -> List[date]:
+    """Weekdays from start to end (today if None); holidays are not excluded."""
+    return [day.date() for day in pd.bdate_range(start, end or date.today())]
+
+
+class PolygonGroupedProvider(MarketDataProvider):
+    """Polygon grouped daily bars: every ticker for one day per request."""
+
+    name = 'polygon'
+    batch_sizes = {'bars': None}
+
+    def round_trips(self, method: str, tickers: int, expirations: int = 1, days: int = 1) -> int:
+        return days if tickers else 0
+
+    def get_bars(self, tickers: Sequence[str], start: date, end: Optional[date] = None) -> pd.DataFrame:
+        from .market_data import polygon_grouped_daily
+
+        wanted = set(tickers)
+        frames = []
+        for day in trading_days(start, end):
+            bars = polygon_grouped_daily(day)
+            frames.append(bars[bars['ticker'].isin(wanted)])
+        return pd.concat(frames, ignore_index=True) if frames else empty_bars()
+
+
+class FakeProvider(MarketDataProvider):
+    """In-memory provider for tests; records every request it serves."""
+
+    def __init__(self, name: str = 'fake', batch_sizes: Optional[Dict[str, Optional[int]]] = None,
+                 quotes: Optional[Dict[str, float]] = None, bars: Optional[pd.DataFrame] = None,
+                 chains: Optional[Dict[str, List[OptionChain]]] = None,
+                 fundamentals: Optional[Dict[str, Fundamentals]] = None):
+        """
+        Args:
+            name: Provider name
+            batch_sizes: Tickers per call per supported method (default:
+                every method, any number of tickers in one call)
+            quotes: Price per ticker
+            bars: Long bar frame
+            chains: Chains per ticker
+            fundamentals: Fundamentals per ticker
+        """
+        self.name = name
+        self.batch_sizes = dict(batch_sizes) if batch_sizes is not None else {method: None for method in METHODS}
+        self.quotes = quotes or {}
+        self.bars = bars if bars is not None else empty_bars()
+        self.chains = chains or {}
+        self.fundamentals = fundamentals or {}
+        self.requests: List[Tuple[str, Tuple[str, ...]]] = []
+        self._lock = threading.Lock()
+
+    def _served(self, method: str, tickers: Sequence[str]):
+        with self._lock:
+            self.requests.append((method, tuple(tickers)))
+
+    def get_quotes(self, tickers: Sequence[str]) -> Dict[str, float]:
+        self._served('quotes', tickers)
+        return {t: self.quotes[t] for t in tickers if t in self.quotes}
+
+    def get_bars(self, tickers: Sequence[str], start: date, end: Optional[date] = None) -> pd.DataFrame:
+        self._served('bars', tickers)
+        dates = pd.to_datetime(self.bars['date']).dt.date
+        keep = self.bars['ticker'].isin(list(tickers)) & (dates >= start) & ((dates <= end) if end else True)
+        return self.bars[keep].reset_index(drop=True)
+
+    def get_chains(self, tickers: Sequence[str],
+                   expirations: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[OptionChain]]:
+        self._served('chains', tickers)
+        found = {}
+        for ticker in tickers:
+            wanted = (expirations or {}).get(ticker)
+            chains = [c for c in self.chains.get(ticker, []) if wanted is None or c.expiration in wanted]
+            if chains:
+                found[ticker] = chains if wanted is not None else chains[:1]
+        return found
+
+    def get_fundamentals(self, tickers: Sequence[str]) -> Dict[str, Fundamentals]:
+        self._served('fundamentals', tickers)
+        return {t: self.fundamentals[t] for t in tickers if t in self.fundamentals}
+
+
+class MarketDataPlanner:
+    """Routes each bulk request to the provider with the fewest round trips."""
+
+    def __init__(self, providers: Optional[List[MarketDataProvider]] = None):
+        """
+        Args:
+            providers: Candidates in order of preference when costs tie
+                (configured_providers() if None)
+        """
+        self.providers = providers if providers is not None else configured_providers()
+
+    def plan(self, method: str, tickers: int, expirations: int = 1, days: int = 1) -> List[Tuple[MarketDataProvider, int]]:
+        """
+        Providers able to serve a request, cheapest first.
+
+        Args:
+            method: 'quotes', 'bars', 'chains' or 'fundamentals'
+            tickers: Number of tickers
+            expirations: Expirations per ticker (chains)
+            days: Trading days covered (bars)
+
+        Returns:
+            List of (provider, round trips)
+        """
+        costs = [
+            (provider, provider.round_trips(method, tickers, expirations=expirations, days=days))
+            for provider in self.providers if provider.supports(method)
+        ]
+        return sorted(costs, key=lambda item: item[1])
+
+    def _run(self, method: str, tickers: Sequence[str], call: Callable[[MarketDataProvider, List[str]], Iterable[str]],
+             **cost) -> List[str]:
+        """Call providers cheapest first until every ticker is answered; returns tickers left unanswered."""
+        remaining = list(dict.fromkeys(tickers))
+        for provider, trips in self.plan(method, len(remaining), **cost):
+            if not remaining:
+                break
+            logger.debug(f"{method} for {len(remaining)} tickers from {provider.name} ({trips} round trips)")
+            answered = set()
+            for batch in provider.batches(method, remaining):
+                try:
+                    answered.update(call(provider, batch))
+                except Exception as e:
+                    logger.error(f"Error fetching {method} from {provider.name}: {e}")
+            remaining = [t for t in remaining if t not in answered]
+        return remaining
+
+    def get_quotes(self, tickers: Sequence[str]) -> Dict[str, float]:
+        quotes = {}
+
+        def call(provider, batch):
+            found = provider.get_quotes(batch)
+            quotes.update(found)
+            return found
+        self._run('quotes', tickers, call)
+        return quotes
+
+    def get_bars(self, tickers: Sequence[str], start: date, end: Optional[date] = None) -> pd.DataFrame:
+        frames = list(self.bars_by_provider(tickers, start, end).values())
+        return pd.concat(frames, ignore_index=True) if frames else empty_bars()
+
+    def bars_by_provider(self, tickers: Sequence[str], start: date,
+                         end: Optional[date] = None) -> Dict[str, pd.DataFrame]:
+        """Like get_bars, keyed by the provider that served each part."""
+        frames: Dict[str, List[pd.DataFrame]] = {}
+        days = len(trading_days(start, end))
+
+        def call(provider, batch):
+            bars = provider.get_bars(batch, start, end)
+            if bars is None or bars.empty:
+                return []
+            frames.setdefault(provider.name, []).append(bars)
+            return bars['ticker'].unique()
+        self._run('bars', tickers, call, days=days)
+        return {name: pd.concat(parts, ignore_index=True) for name, parts in frames.items()}
+
+    def get_chains(self, tickers: Sequence[str],
+                   expirations: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[OptionChain]]:
+        chains = {}
+        per_ticker = max((len(v) for v in (expirations or {}).values()), default=1)
+
+        def call(provider, batch):
+            found = provider.get_chains(batch, {t: expirations[t] for t in batch if t in expirations} if expirations else None)
+            chains.update(found)
+            return found
+        self._run('chains', tickers, call, expirations=per_ticker)
+        return chains
+
+    def get_fundamentals(self, tickers: Sequence[str]) -> Dict[str, Fundamentals]:
+        fundamentals = {}
+
+        def call(provider, batch):
+            found = provider.get_fundamentals(batch)
+            fundamentals.update(found)
+            return found
+        self._run('fundamentals', tickers, call)
+        return fundamentals
+
+
+def configured_providers() -> List[MarketDataProvider]:
+    """Providers enabled by the current settings, in order of preference."""
+    from . import tradier
+
+    providers: List[MarketDataProvider] = []
+    if tradier.enabled():
+        providers.append(tradier.get_tradier_provider())
+    providers.append(YFinanceProvider())
+    if Settings.POLYGON_API_KEY:
+        providers.append(PolygonGroupedProvider())
+    return providers
+
+
+_planner: Optional[MarketDataPlanner] = None
+_planner_lock = threading.Lock()
+
+
+def get_planner() -> MarketDataPlanner:
+    """Process-wide planner over configured_providers()."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = MarketDataPlanner()
+        return _planner
+
+
+def reset_planner():
+    """Drop the process-wide planner so the next use rereads settings."""
+    global _planner
+    with _planner_lock:
+        _planner = None
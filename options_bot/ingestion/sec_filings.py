@@ -1,12 +1,14 @@
 """
 SEC EDGAR filings tracker.
 """
-import requests
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import logging
 from bs4 import BeautifulSoup
 
+from . import transport
+from .universe import ticker_meta
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,7 +53,7 @@ class SECFilingsTracker:
                 'search_text': ''
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = transport.http_get(url, params=params, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             # Parse filings
@@ -65,6 +67,10 @@ class SECFilingsTracker:
     
     def _get_cik(self, ticker: str) -> Optional[str]:
         """Get CIK number for a ticker."""
+        meta = ticker_meta(ticker)
+        if meta is not None and meta.cik:
+            return meta.cik
+        
         try:
             # Use SEC's ticker lookup
             url = f"{self.base_url}/cgi-bin/browse-edgar"
@@ -77,7 +83,7 @@ class SECFilingsTracker:
                 'count': 1
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = transport.http_get(url, params=params, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             cik_elem = soup.find('span', class_='companyName')
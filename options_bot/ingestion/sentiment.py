@@ -0,0 +1,178 @@
+"""
+FinBERT headline sentiment with batched inference and a persistent cache.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def headline_hash(headline: str, model: str = "") -> str:
+    """
+    Build the cache key for a headline.
+
+    The model id is part of the key so that switching models never
+    serves scores produced by a different one.
+
+    Args:
+        headline: Headline text
+        model: Model id or path the score belongs to
+
+    Returns:
+        Hex digest identifying the (model, headline) pair
+    """
+    normalized = " ".join(headline.split())
+    return hashlib.sha1(f"{model}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """SQLite-backed memo of headline hash -> sentiment score."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS headline_sentiment ("
+            "hash TEXT PRIMARY KEY, score REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, float]:
+        """Return cached scores for the given hashes (misses are omitted)."""
+        hashes = list(hashes)
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, score FROM headline_sentiment WHERE hash IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        """Store scores keyed by headline hash."""
+        if not scores:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO headline_sentiment (hash, score) VALUES (?, ?)",
+                list(scores.items())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class FinBertSentiment:
+    """FinBERT scorer that loads the model once and batches inference."""
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        num_threads: Optional[int] = None,
+        max_length: Optional[int] = None,
+        cache: Optional[SentimentCache] = None
+    ):
+        self.model = model or Settings.FINBERT_MODEL
+        self.batch_size = batch_size or Settings.FINBERT_BATCH_SIZE
+        self.num_threads = Settings.FINBERT_NUM_THREADS if num_threads is None else num_threads
+        self.max_length = max_length or Settings.FINBERT_MAX_LENGTH
+        self.cache = cache if cache is not None else SentimentCache(
+            Settings.resolve_path(Settings.SENTIMENT_CACHE_PATH)
+        )
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def _get_pipeline(self):
+        """Load the classification pipeline on first use."""
+        if self._pipeline is None:
+            import torch
+            from transformers import pipeline
+
+            if self.num_threads > 0:
+                torch.set_num_threads(self.num_threads)
+
+            logger.info(f"Loading sentiment model {self.model}")
+            self._pipeline = pipeline(
+                "text-classification",
+                model=self.model,
+                tokenizer=self.model,
+                device=-1,
+                top_k=None
+            )
+        return self._pipeline
+
+    def _infer(self, headlines: List[str]) -> List[float]:
+        """Run the model over headlines, returning P(positive) - P(negative)."""
+        classifier = self._get_pipeline()
+        results = classifier(
+            headlines,
+            batch_size=self.batch_size,
+            truncation=True,
+            max_length=self.max_length
+        )
+
+        scores = []
+        for labels in results:
+            probs = {r['label'].lower(): r['score'] for r in labels}
+            scores.append(probs.get('positive', 0.0) - probs.get('negative', 0.0))
+        return scores
+
+    def score_headlines(self, headlines: List[str]) -> List[float]:
+        """
+        Score headlines, running the model only on ones not seen before.
+
+        Args:
+            headlines: Headline strings (duplicates allowed)
+
+        Returns:
+            Scores from -1 (bearish) to 1 (bullish), aligned with the input
+        """
+        keys = [headline_hash(h, self.model) for h in headlines]
+        scores = self.cache.get_many(set(keys))
+
+        pending = {}
+        for key, headline in zip(keys, headlines):
+            if key not in scores:
+                pending[key] = headline
+
+        if pending:
+            # Sort by length so each batch pads to a similar size
+            items = sorted(pending.items(), key=lambda kv: len(kv[1]))
+            with self._lock:
+                fresh = self._infer([text for _, text in items])
+            new_scores = {key: float(score) for (key, _), score in zip(items, fresh)}
+            self.cache.put_many(new_scores)
+            scores.update(new_scores)
+            logger.debug(f"Scored {len(new_scores)} new headlines ({len(keys) - len(pending)} cached)")
+
+        return [scores[key] for key in keys]
+
+
+_service: Optional[FinBertSentiment] = None
+_service_lock = threading.Lock()
+
+
+def get_sentiment_service() -> FinBertSentiment:
+    """Return the process-wide FinBERT service, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FinBertSentiment()
+        return _service
@@ -1,12 +1,12 @@
 """
 Stock splits and corporate actions tracker.
 """
-import yfinance as yf
-import requests
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import logging
 
+from . import transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +21,7 @@ def get_split_history(ticker: str) -> List[Dict]:
         List of split events
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         splits = stock.splits
         
         if splits.empty:
@@ -54,7 +54,7 @@ def get_dividend_history(ticker: str, years: int = 1) -> List[Dict]:
         List of dividend events
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         dividends = stock.dividends
         
         if dividends.empty:
@@ -159,7 +159,7 @@ def get_corporate_actions(ticker: str) -> Dict[str, any]:
         Dictionary with corporate actions
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = transport.ticker(ticker)
         info = stock.info
         
         current_price = info.get('currentPrice') or info.get('regularMarketPrice', 0)
@@ -1,5 +1,5 @@
 """
-Technical analysis using TA-Lib and pandas-ta.
+Technical analysis using TA-Lib or pandas-ta (plain pandas fallbacks if neither is installed).
 """
 import pandas as pd
 import numpy as np
@@ -13,11 +13,54 @@ except ImportError:
     HAS_TALIB = False
     logging.warning("TA-Lib not installed. Some indicators will be unavailable.")
 
-import pandas_ta as pta
+try:
+    import pandas_ta as pta
+    HAS_PANDAS_TA = True
+except ImportError:
+    HAS_PANDAS_TA = False
 
 logger = logging.getLogger(__name__)
 
 
+# Plain pandas indicators, used when neither TA-Lib nor pandas-ta is installed
+
+def _wilder(series: pd.Series, length: int) -> pd.Series:
+    """Wilder's smoothing (RMA)."""
+    return series.ewm(alpha=1.0 / length, adjust=False, min_periods=length).mean()
+
+
+def _rsi(close: pd.Series, length: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = _wilder(delta.clip(lower=0), length)
+    loss = _wilder(-delta.clip(upper=0), length)
+    return 100 - 100 / (1 + gain / loss)
+
+
+def _macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+    macd = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    macd_signal = macd.ewm(span=signal, adjust=False).mean()
+    return macd.values, macd_signal.values, (macd - macd_signal).values
+
+
+def _bbands(close: pd.Series, length: int = 20, std: float = 2):
+    middle = close.rolling(length).mean()
+    width = close.rolling(length).std(ddof=0) * std
+    return (middle + width).values, middle.values, (middle - width).values
+
+
+def _adx(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
+    up = high.diff()
+    down = -low.diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0)
+    minus_dm = down.where((down > up) & (down > 0), 0.0)
+    true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    atr = _wilder(true_range, length)
+    plus_di = 100 * _wilder(plus_dm, length) / atr
+    minus_di = 100 * _wilder(minus_dm, length) / atr
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    return _wilder(dx, length)
+
+
 class TechnicalAnalysis:
     """Technical analysis calculations."""
     
@@ -36,8 +79,10 @@ class TechnicalAnalysis:
         try:
             if HAS_TALIB:
                 rsi = talib.RSI(self.df['Close'].values, timeperiod=period)
-            else:
+            elif HAS_PANDAS_TA:
                 rsi = pta.rsi(self.df['Close'], length=period)
+            else:
+                rsi = _rsi(self.df['Close'], length=period)
             
             current_rsi = rsi.iloc[-1] if isinstance(rsi, pd.Series) else rsi[-1]
             return float(current_rsi) if not pd.isna(current_rsi) else 50.0
@@ -55,11 +100,13 @@ class TechnicalAnalysis:
                     slowperiod=26,
                     signalperiod=9
                 )
-            else:
+            elif HAS_PANDAS_TA:
                 macd_df = pta.macd(self.df['Close'])
                 macd = macd_df['MACD_12_26_9'].values
                 signal = macd_df['MACDs_12_26_9'].values
                 hist = macd_df['MACDh_12_26_9'].values
+            else:
+                macd, signal, hist = _macd(self.df['Close'])
             
             return {
                 'macd': float(macd[-1]) if not pd.isna(macd[-1]) else 0.0,
@@ -109,11 +156,13 @@ class TechnicalAnalysis:
                     nbdevup=std,
                     nbdevdn=std
                 )
-            else:
+            elif HAS_PANDAS_TA:
                 bb = pta.bbands(self.df['Close'], length=period, std=std)
                 upper = bb[f'BBU_{period}_{std}.0'].values
                 middle = bb[f'BBM_{period}_{std}.0'].values
                 lower = bb[f'BBL_{period}_{std}.0'].values
+            else:
+                upper, middle, lower = _bbands(self.df['Close'], length=period, std=std)
             
             current_price = self.df['Close'].iloc[-1]
             
@@ -187,9 +236,11 @@ class TechnicalAnalysis:
                     timeperiod=14
                 )
                 current_adx = adx[-1]
-            else:
+            elif HAS_PANDAS_TA:
                 adx_df = pta.adx(self.df['High'], self.df['Low'], self.df['Close'])
                 current_adx = adx_df['ADX_14'].iloc[-1] if 'ADX_14' in adx_df else 25.0
+            else:
+                current_adx = _adx(self.df['High'], self.df['Low'], self.df['Close']).iloc[-1]
             
             # Determine trend strength
             if current_adx > 50:
@@ -287,8 +338,8 @@ def get_technical_analysis(ticker: str, df: pd.DataFrame = None) -> Optional[Dic
     """
     try:
         if df is None:
-            import yfinance as yf
-            stock = yf.Ticker(ticker)
+            from . import transport
+            stock = transport.ticker(ticker)
             df = stock.history(period="6mo")
         
         if df.empty or len(df) < 50:
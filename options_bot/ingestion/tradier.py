@@ -0,0 +1,180 @@
+"""
+Tradier option chains with vendor Greeks and IV.
+
+Enabled by USE_PAID_OPTIONS_API with a TRADIER_API_KEY. Chains come back
+with Tradier's implied volatility (ORATS mid IV) and Greeks per contract,
+so snapshots need no local IV or delta estimates. Expirations of a
+ticker are fetched concurrently over one pooled keep-alive session.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import Settings
+from . import transport
+from .market_data import tradier_base_url, tradier_headers
+from .providers import MarketDataProvider, OptionChain
+
+logger = logging.getLogger(__name__)
+
+# Days to expiry of the back month used for the IV term slope
+BACK_MONTH_DTE = 90
+# Tradier field -> yfinance-style chain column
+_COLUMNS = {
+    'symbol': 'contractSymbol', 'strike': 'strike', 'last': 'lastPrice', 'bid': 'bid', 'ask': 'ask',
+    'volume': 'volume', 'open_interest': 'openInterest',
+}
+_GREEKS = ('delta', 'gamma', 'theta', 'vega')
+
+
+def enabled() -> bool:
+    """Whether option chains should come from Tradier."""
+    return Settings.USE_PAID_OPTIONS_API and bool(Settings.TRADIER_API_KEY)
+
+
+def _as_list(value) -> list:
+    # Tradier returns a bare object instead of a one-element list
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def chain_frames(options: List[dict]) -> Dict[str, pd.DataFrame]:
+    """
+    Split Tradier chain contracts into call and put frames.
+
+    Args:
+        options: Contracts from the chains endpoint
+
+    Returns:
+        Dict with 'call' and 'put' DataFrames in yfinance column names, plus
+        impliedVolatility and delta/gamma/theta/vega (NaN without Greeks)
+    """
+    frames = {}
+    for option_type in ('call', 'put'):
+        rows = []
+        for contract in options:
+            if contract.get('option_type') != option_type:
+                continue
+            greeks = contract.get('greeks') or {}
+            row = {column: contract.get(field) for field, column in _COLUMNS.items()}
+            row['impliedVolatility'] = greeks.get('mid_iv') or greeks.get('smv_vol')
+            row.update({name: greeks.get(name) for name in _GREEKS})
+            rows.append(row)
+        frame = pd.DataFrame(rows, columns=list(_COLUMNS.values()) + ['impliedVolatility', *_GREEKS])
+        numeric = frame.columns.drop('contractSymbol')
+        frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+        frames[option_type] = frame.sort_values('strike', ignore_index=True)
+    return frames
+
+
+class TradierOptionsProvider(MarketDataProvider):
+    """Quotes (many symbols per request) and option chains with Greeks from Tradier."""
+
+    name = 'tradier'
+    batch_sizes = {'quotes': 100, 'chains': 1}
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Concurrent chain requests, and connections kept in the
+                session pool (TRADIER_CHAIN_WORKERS if None)
+        """
+        workers = workers or Settings.TRADIER_CHAIN_WORKERS
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tradier')
+
+    def round_trips(self, method: str, tickers: int, expirations: int = 1, days: int = 1) -> int:
+        if method == 'chains':
+            # Plus the ticker's expiration list
+            return tickers * (expirations + 1)
+        return super().round_trips(method, tickers, expirations, days)
+
+    def _get(self, path: str, params: dict) -> dict:
+        response = transport.http_get(f"{tradier_base_url()}{path}", params=params, headers=tradier_headers(),
+                                      timeout=10, session=self.session)
+        response.raise_for_status()
+        return response.json()
+
+    def expirations(self, ticker: str) -> List[str]:
+        """Listed expirations (YYYY-MM-DD), nearest first."""
+        data = self._get('/v1/markets/options/expirations', {'symbol': ticker})
+        return sorted(_as_list((data.get('expirations') or {}).get('date')))
+
+    def chain(self, ticker: str, expiration: str) -> OptionChain:
+        """One expiration's chain with Greeks."""
+        data = self._get('/v1/markets/options/chains', {'symbol': ticker, 'expiration': expiration, 'greeks': 'true'})
+        frames = chain_frames(_as_list((data.get('options') or {}).get('option')))
+        has_greeks = bool(frames['call']['delta'].notna().any() or frames['put']['delta'].notna().any())
+        return OptionChain(ticker, expiration, frames['call'], frames['put'], has_greeks=has_greeks)
+
+    def chains(self, ticker: str, expirations: Sequence[str]) -> List[OptionChain]:
+        """Several expirations of one ticker, requested concurrently (in the given order)."""
+        return list(self._executor.map(lambda expiration: self.chain(ticker, expiration), expirations))
+
+    def snapshot_chains(self, ticker: str, today: Optional[datetime] = None) -> List[OptionChain]:
+        """
+        Chains for an options snapshot: the ~35 DTE expiration, then the one
+        nearest BACK_MONTH_DTE after it (for the IV term slope) if listed.
+
+        Args:
+            ticker: Ticker symbol
+            today: Reference date (now if None)
+
+        Returns:
+            List of OptionChain, front month first (empty if no expiration
+            is inside CHAIN_MIN_DTE..CHAIN_MAX_DTE)
+        """
+        from .options import nearest_expiration
+
+        listed = self.expirations(ticker)
+        front = nearest_expiration(listed, today=today, min_dte=Settings.CHAIN_MIN_DTE,
+                                   max_dte=Settings.CHAIN_MAX_DTE)
+        if front is None:
+            return []
+        back = nearest_expiration([e for e in listed if e > front], target_dte=BACK_MONTH_DTE, today=today)
+        return self.chains(ticker, [front] + ([back] if back else []))
+
+    def get_quotes(self, tickers: Sequence[str]) -> Dict[str, float]:
+        data = self._get('/v1/markets/quotes', {'symbols': ','.join(tickers)})
+        quotes = _as_list((data.get('quotes') or {}).get('quote'))
+        return {q['symbol']: float(q['last']) for q in quotes if q.get('symbol') and q.get('last')}
+
+    def get_chains(self, tickers: Sequence[str],
+                   expirations: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[OptionChain]]:
+        from .options import nearest_expiration
+
+        found = {}
+        for ticker in tickers:
+            try:
+                wanted = (expirations or {}).get(ticker)
+                if wanted is None:
+                    nearest = nearest_expiration(self.expirations(ticker), min_dte=Settings.CHAIN_MIN_DTE,
+                                                 max_dte=Settings.CHAIN_MAX_DTE)
+                    wanted = [nearest] if nearest else []
+                chains = [chain for chain in self.chains(ticker, wanted) if not chain.calls.empty]
+                if chains:
+                    found[ticker] = chains
+            except Exception as e:
+                logger.error(f"Error fetching Tradier chains for {ticker}: {e}")
+        return found
+
+
+_provider: Optional[TradierOptionsProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_tradier_provider() -> TradierOptionsProvider:
+    """Process-wide Tradier provider (one session pool and worker pool)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = TradierOptionsProvider()
+        return _provider
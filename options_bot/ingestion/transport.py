@@ -0,0 +1,628 @@
+"""
+Single entry point for external data requests, with record/replay.
+
+Every provider call made during a scan goes through here: yfinance via
+ticker() and download(), and the plain HTTP APIs (SEC, openFDA, NewsAPI,
+Finnhub, Polygon, Tradier) via http_get(). In record mode each response is stored
+in a compact SQLite cassette; in replay mode responses are served back
+from it, optionally with injected latency, so a scan can run offline and
+deterministically. In standin mode every request goes to the local
+stand-in market server (benchmarks.standin) for load testing.
+
+yfinance is recorded at the Ticker level (properties and method results)
+rather than as raw HTTP, because its cookie/crumb handshake makes raw
+Yahoo traffic unreplayable. Outside replay, yfinance calls can also be
+held to an adaptive concurrency limit (limiter.AdaptiveLimiter), and
+identical requests in flight at the same time are coalesced into one
+(coalesce.SingleFlight).
+"""
+import hashlib
+import json
+import logging
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+import yfinance as yf
+
+from ..config import Settings
+from .coalesce import CoalesceStats, SingleFlight
+from .limiter import AdaptiveLimiter, get_yahoo_limiter
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay', 'standin')
+
+# Credentials never become part of a cassette key
+_SECRET_PARAMS = {'apikey', 'api_key', 'token', 'access_token'}
+# ... nor of a recorded error message (URLs in exceptions keep their query string)
+_SECRET_QUERY = re.compile(r'([?&](?:%s)=)[^&\s\'"]*' % '|'.join(_SECRET_PARAMS), re.IGNORECASE)
+_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+)?')
+# Tells Ticker methods from properties without constructing a Ticker
+_TICKER_CLASS = yf.Ticker
+
+
+class CassetteMiss(LookupError):
+    """Replay requested a response that was never recorded."""
+
+
+class RecordedError(Exception):
+    """A request that failed while recording, raised again on replay."""
+
+
+class RecordedResponse:
+    """Replayable stand-in for a requests.Response."""
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 headers: Optional[Dict[str, str]] = None, encoding: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding or 'utf-8'
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> 'RecordedResponse':
+        headers = {k: v for k, v in response.headers.items() if k.lower() == 'content-type'}
+        # The query string may carry API keys; keep them out of the cassette
+        return cls(response.url.split('?')[0], response.status_code, response.content, headers, response.encoding)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def _scrub(text: str) -> str:
+    """Mask credential query parameters in a URL or message."""
+    return _SECRET_QUERY.sub(r'\1***', text)
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-friendly form of request arguments with a stable ordering."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))
+                if str(k).lower() not in _SECRET_PARAMS}
+    if isinstance(value, (list, tuple, set)):
+        items = [_canonical(v) for v in value]
+        return sorted(items, key=str) if isinstance(value, set) else items
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def request_keys(source: str, request: Any) -> Tuple[str, str, str]:
+    """
+    Cassette keys for a request.
+
+    Args:
+        source: Provider name (e.g. 'yfinance', 'http')
+        request: Request description (name, args, params...)
+
+    Returns:
+        Tuple of (exact key, date-insensitive key, canonical request text).
+        The loose key lets a cassette recorded on one day replay requests
+        whose parameters embed "today" (news lookback windows, bar ranges).
+    """
+    text = json.dumps([source, _canonical(request)], sort_keys=True, default=str)
+    loose = _DATE_PATTERN.sub('<date>', text)
+    return hashlib.sha1(text.encode()).hexdigest(), hashlib.sha1(loose.encode()).hexdigest(), text
+
+
+def _portable(value: Any) -> Any:
+    """Make yfinance results picklable (option_chain returns a local namedtuple)."""
+    if isinstance(value, tuple) and hasattr(value, '_asdict'):
+        return SimpleNamespace(**value._asdict())
+    return value
+
+
+class Cassette:
+    """SQLite store of recorded responses (pickled, zlib-compressed)."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Cassette database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                loose_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                request TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                elapsed REAL NOT NULL,
+                recorded_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_loose ON responses(loose_key)")
+        self._conn.commit()
+
+    def put(self, source: str, request: Any, value: Any, elapsed: float):
+        """
+        Store a response, replacing any earlier recording of the same request.
+
+        Args:
+            source: Provider name
+            request: Request description
+            value: Response value (or RecordedError)
+            elapsed: Seconds the live request took
+        """
+        key, loose_key, text = request_keys(source, request)
+        payload = zlib.compress(pickle.dumps(_portable(value), protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, loose_key, source, text, payload, elapsed, datetime.now().isoformat())
+            )
+            self._pending += 1
+            if self._pending >= 100:
+                self._conn.commit()
+                self._pending = 0
+
+    def get(self, source: str, request: Any) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a recorded response.
+
+        Args:
+            source: Provider name
+            request: Request description
+
+        Returns:
+            Tuple of (value, recorded seconds) or None if not recorded
+        """
+        key, loose_key, _ = request_keys(source, request)
+        with self._lock:
+            row = self._conn.execute("SELECT payload, elapsed FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT payload, elapsed FROM responses WHERE loose_key = ? ORDER BY recorded_at DESC LIMIT 1",
+                    (loose_key,)
+                ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(zlib.decompress(row[0])), row[1]
+
+    def stats(self) -> dict:
+        """Response count, stored bytes and recorded latency per source."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, COUNT(*), SUM(LENGTH(payload)), AVG(elapsed) FROM responses GROUP BY source"
+            ).fetchall()
+        return {
+            source: {'responses': count, 'bytes': size or 0, 'mean_elapsed': round(elapsed or 0.0, 4)}
+            for source, count, size, elapsed in rows
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+class _CassetteFastInfo:
+    """fast_info stand-in that records each key lookup."""
+
+    def __init__(self, owner: '_CassetteTicker'):
+        self._owner = owner
+
+    def get(self, key: str, default=None):
+        try:
+            value = self[key]
+        except (KeyError, CassetteMiss):
+            return default
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        owner = self._owner
+        return owner._transport._call(
+            'yfinance', [owner.ticker, 'fast_info', key],
+            lambda: owner._live().fast_info[key]
+        )
+
+
+class _CassetteTicker:
+    """yf.Ticker stand-in that records, replays or rate limits properties and method calls."""
+
+    def __init__(self, ticker: str, transport: 'Transport'):
+        self.ticker = ticker
+        self._transport = transport
+        self._ticker = None
+        self._properties: Dict[str, Any] = {}
+
+    def _live(self) -> yf.Ticker:
+        if self._ticker is None:
+            self._ticker = yf.Ticker(self.ticker)
+        return self._ticker
+
+    @property
+    def fast_info(self) -> _CassetteFastInfo:
+        return _CassetteFastInfo(self)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        member = getattr(_TICKER_CLASS, name, None)
+        if member is None:
+            raise AttributeError(name)
+
+        if callable(member):
+            def call(*args, **kwargs):
+                return self._transport._call(
+                    'yfinance', [self.ticker, name, list(args), kwargs],
+                    lambda: getattr(self._live(), name)(*args, **kwargs)
+                )
+            return call
+
+        # yfinance caches properties per Ticker; do the same so repeated
+        # reads (stock.info twice) cost one lookup
+        if name not in self._properties:
+            self._properties[name] = self._transport._call(
+                'yfinance', [self.ticker, name], lambda: getattr(self._live(), name)
+            )
+        return self._properties[name]
+
+
+class _StandInTicker:
+    """yf.Ticker stand-in backed by the stand-in market server."""
+
+    def __init__(self, ticker: str, transport: 'Transport'):
+        self.ticker = ticker
+        self._transport = transport
+        self._properties: Dict[str, Any] = {}
+
+    def _get(self, member: str, **params):
+        return self._transport._standin_get(f"yf/{self.ticker}/{member}", params).json()
+
+    def _property(self, member: str, decode: Callable[[Any], Any] = lambda value: value):
+        if member not in self._properties:
+            self._properties[member] = decode(self._get(member))
+        return self._properties[member]
+
+    @property
+    def info(self) -> dict:
+        return self._property('info')
+
+    @property
+    def fast_info(self) -> dict:
+        return self._get('fast_info')
+
+    @property
+    def options(self) -> tuple:
+        return self._property('options', tuple)
+
+    @property
+    def calendar(self) -> dict:
+        return self._property('calendar', lambda cal: {
+            'Earnings Date': [date.fromisoformat(d) for d in cal.get('Earnings Date', [])]
+        })
+
+    @property
+    def news(self) -> list:
+        return self._property('news')
+
+    @property
+    def splits(self) -> pd.Series:
+        return self._property('splits', lambda body: pd.Series(body['values'], index=pd.to_datetime(body['index']), dtype=float))
+
+    @property
+    def dividends(self) -> pd.Series:
+        return self._property('dividends', lambda body: pd.Series(body['values'], index=pd.to_datetime(body['index']), dtype=float))
+
+    def history(self, period: str = '1mo', start=None, end=None, **kwargs) -> pd.DataFrame:
+        params = {'start': str(start), 'end': str(end or '')} if start else {'period': period}
+        body = self._get('history', **params)
+        return pd.DataFrame(body['columns'], index=pd.DatetimeIndex(pd.to_datetime(body['index']), name='Date'))
+
+    def option_chain(self, date: Optional[str] = None):
+        body = self._get('option_chain', **({'date': date} if date else {}))
+        return SimpleNamespace(calls=pd.DataFrame(body['calls']), puts=pd.DataFrame(body['puts']),
+                               underlying=body['underlying'])
+
+
+class Transport:
+    """Routes provider requests live, through a recorder, from a cassette, or to a stand-in server."""
+
+    def __init__(self, mode: str = 'live', cassette: Optional[Cassette] = None,
+                 latency: Union[float, str, None] = None, sleep: Callable[[float], None] = time.sleep,
+                 standin_url: Optional[str] = None, limiter: Optional[AdaptiveLimiter] = None,
+                 coalesce: bool = False):
+        """
+        Args:
+            mode: 'live', 'record', 'replay' or 'standin'
+            cassette: Cassette to record into or replay from (required
+                for record and replay)
+            latency: Replay delay per response: seconds, 'recorded' to
+                reproduce the original request time, or None for none
+            sleep: Sleep function (injectable for tests)
+            standin_url: Stand-in server base URL (required for standin)
+            limiter: Concurrency limit for yfinance requests (not used
+                in replay)
+            coalesce: Share one request between concurrent identical
+                callers (not used in replay)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown transport mode {mode!r} (expected one of {', '.join(MODES)})")
+        if mode in ('record', 'replay') and cassette is None:
+            raise ValueError(f"Transport mode {mode!r} needs a cassette")
+        if mode == 'standin' and not standin_url:
+            raise ValueError("Transport mode 'standin' needs a server URL")
+        self.mode = mode
+        self.cassette = cassette
+        self.latency = latency
+        self.standin_url = standin_url.rstrip('/') if standin_url else None
+        self.limiter = limiter if mode != 'replay' else None
+        self.singleflight = SingleFlight() if coalesce and mode != 'replay' else None
+        self._sleep = sleep
+        self._sessions = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    def _delay(self, recorded: float):
+        if self.latency == 'recorded':
+            delay = recorded
+        else:
+            delay = float(self.latency or 0.0)
+        if delay > 0:
+            self._sleep(delay)
+
+    def _standin_get(self, path: str, params: Optional[dict] = None, timeout: float = 10) -> requests.Response:
+        # One keep-alive session per thread, as requests sessions are not thread-safe
+        session = getattr(self._sessions, 'session', None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+        if path.startswith('yf/'):
+            provider = 'yfinance'
+
+            def fetch():
+                response = session.get(f"{self.standin_url}/{path}", params=params, timeout=timeout)
+                response.raise_for_status()
+                return response
+            if self.limiter:
+                limited = fetch
+                fetch = lambda: self.limiter.call(limited)
+        else:
+            provider = path.split('/')[1]
+            fetch = lambda: session.get(f"{self.standin_url}/{path}", params=params, timeout=timeout)
+
+        if self.singleflight is None:
+            return fetch()
+        return self.singleflight.do(provider, request_keys(provider, [path, params or {}])[0], fetch)
+
+    def _call(self, source: str, request: Any, fetch: Callable[[], Any]) -> Any:
+        if self.mode == 'replay':
+            found = self.cassette.get(source, request)
+            if found is None:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {source} response for {_canonical(request)}")
+            self.hits += 1
+            value, elapsed = found
+            self._delay(elapsed)
+            if isinstance(value, RecordedError):
+                raise value
+            return value
+
+        if self.limiter is not None and source == 'yfinance':
+            limited = fetch
+            fetch = lambda: self.limiter.call(limited)
+        if self.singleflight is None:
+            return self._fetch(source, request, fetch)
+        provider = urlsplit(request[0]).netloc if source == 'http' else source
+        return self.singleflight.do(provider, request_keys(source, request)[0],
+                                    lambda: self._fetch(source, request, fetch))
+
+    def _fetch(self, source: str, request: Any, fetch: Callable[[], Any]) -> Any:
+        """Make a live request, recording it in record mode."""
+        if self.mode == 'live':
+            return fetch()
+
+        start = time.perf_counter()
+        try:
+            value = fetch()
+        except Exception as e:
+            self.cassette.put(source, request, RecordedError(_scrub(f"{type(e).__name__}: {e}")),
+                              time.perf_counter() - start)
+            self.recorded += 1
+            raise
+        self.cassette.put(source, request, value, time.perf_counter() - start)
+        self.recorded += 1
+        return value
+
+    def ticker(self, ticker: str):
+        """yf.Ticker, or a recording/replaying/rate-limited/coalescing stand-in."""
+        if self.mode == 'live' and self.limiter is None and self.singleflight is None:
+            return yf.Ticker(ticker)
+        if self.mode == 'standin':
+            return _StandInTicker(ticker, self)
+        return _CassetteTicker(ticker, self)
+
+    def download(self, tickers, **kwargs):
+        """yf.download through the transport."""
+        if self.mode == 'standin':
+            # Per-ticker histories in yf.download's group_by='ticker' layout
+            frames = {}
+            for symbol in (tickers.split() if isinstance(tickers, str) else tickers):
+                try:
+                    frames[symbol] = self.ticker(symbol).history(start=kwargs.get('start'), end=kwargs.get('end'))
+                except Exception as e:
+                    logger.debug(f"Stand-in download failed for {symbol}: {e}")
+            return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+        return self._call('yfinance', ['download', tickers, kwargs], lambda: yf.download(tickers, **kwargs))
+
+    def http_get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                 timeout: float = 10, session: Optional[requests.Session] = None):
+        """
+        HTTP GET through the transport.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers (not part of the cassette key)
+            timeout: Seconds before the request is abandoned
+            session: Pooled session for live and record requests
+                (a new connection per request if None)
+
+        Returns:
+            requests.Response when live or standin, otherwise a RecordedResponse
+        """
+        client = session or requests
+        if self.mode == 'live':
+            return self._call('http', [url, params or {}],
+                              lambda: client.get(url, params=params, headers=headers, timeout=timeout))
+        if self.mode == 'standin':
+            parts = urlsplit(url)
+            return self._standin_get(f"http/{parts.netloc}{parts.path}", params, timeout)
+        return self._call(
+            'http', [url, params or {}],
+            lambda: RecordedResponse.from_response(
+                client.get(url, params=params, headers=headers, timeout=timeout)
+            )
+        )
+
+    def coalescing_stats(self) -> dict:
+        """Single-flight counters (zeros when coalescing is off)."""
+        stats = self.singleflight.stats if self.singleflight is not None else CoalesceStats()
+        return stats.as_dict()
+
+    def close(self):
+        if self.cassette is not None:
+            self.cassette.close()
+
+
+def _parse_latency(value: Optional[str]) -> Union[float, str, None]:
+    if value is None or value == '':
+        return None
+    if value == 'recorded':
+        return value
+    return float(value)
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def configure(mode: Optional[str] = None, path: Optional[Union[str, Path]] = None,
+              latency: Union[float, str, None] = None, url: Optional[str] = None) -> Transport:
+    """
+    Replace the process-wide transport.
+
+    Args:
+        mode: 'live', 'record', 'replay' or 'standin' (TRANSPORT_MODE if None)
+        path: Cassette file (CASSETTE_PATH if None)
+        latency: Replay delay (REPLAY_LATENCY if None)
+        url: Stand-in server URL (STANDIN_URL if None)
+
+    Returns:
+        The new Transport
+    """
+    global _transport
+    mode = mode or Settings.TRANSPORT_MODE
+    if latency is None:
+        latency = _parse_latency(Settings.REPLAY_LATENCY)
+    cassette = None
+    if mode in ('record', 'replay'):
+        cassette = Cassette(path or Settings.resolve_path(Settings.CASSETTE_PATH))
+    standin_url = (url or Settings.STANDIN_URL) if mode == 'standin' else None
+    # Only real Yahoo traffic is limited; the stand-in server is for load tests
+    limiter = get_yahoo_limiter() if mode in ('live', 'record') else None
+    transport = Transport(mode, cassette, latency, standin_url=standin_url, limiter=limiter,
+                          coalesce=Settings.COALESCE_REQUESTS)
+
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    if previous is not None:
+        previous.close()
+    if cassette is not None:
+        logger.info(f"Transport in {mode} mode using cassette {cassette.path}")
+    elif standin_url:
+        logger.info(f"Transport in standin mode using {standin_url}")
+    return transport
+
+
+def get_transport() -> Transport:
+    """Process-wide transport (configured from settings on first use)."""
+    if _transport is None:
+        return configure()
+    return _transport
+
+
+@contextmanager
+def cassette(mode: str, path: Union[str, Path], latency: Union[float, str, None] = None):
+    """
+    Record or replay external requests for the duration of a block.
+
+    Args:
+        mode: 'record' or 'replay'
+        path: Cassette file
+        latency: Replay delay per response (seconds or 'recorded')
+
+    Yields:
+        The active Transport
+    """
+    transport = configure(mode, path, latency)
+    try:
+        yield transport
+    finally:
+        configure()
+        if mode == 'replay' and transport.misses:
+            logger.warning(f"Replay missed {transport.misses} requests not in {path}")
+
+
+def ticker(symbol: str):
+    """yf.Ticker through the process-wide transport."""
+    return get_transport().ticker(symbol)
+
+
+def download(tickers, **kwargs):
+    """yf.download through the process-wide transport."""
+    return get_transport().download(tickers, **kwargs)
+
+
+def http_get(url: str, params: Optional[dict] = None, headers: Optional[dict] = None, timeout: float = 10,
+             session: Optional[requests.Session] = None):
+    """HTTP GET through the process-wide transport."""
+    return get_transport().http_get(url, params=params, headers=headers, timeout=timeout, session=session)
+
+
+def coalescing_stats() -> dict:
+    """Single-flight counters of the process-wide transport."""
+    return get_transport().coalescing_stats()
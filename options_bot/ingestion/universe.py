@@ -0,0 +1,276 @@
+"""
+Universe metadata index.
+
+Static per-ticker facts (company name, SEC CIK, sector, quote type, size
+and whether options are listed) are kept in a CSV and refreshed in bulk
+when entries go stale, so scans read them from memory instead of looking
+them up one ticker at a time. Pipelines use them to skip work that does
+not apply (fundamentals and earnings for ETFs, openFDA outside healthcare).
+"""
+import csv
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import Settings
+from ..models import Fundamentals
+from . import transport
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ['ticker', 'name', 'cik', 'sector', 'quote_type', 'market_cap', 'has_options', 'updated']
+SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SEC_HEADERS = {'User-Agent': 'Options Bot contact@example.com'}  # SEC requires a user agent
+
+# Quote types without company fundamentals or earnings
+FUND_QUOTE_TYPES = {'ETF', 'MUTUALFUND', 'INDEX'}
+
+
+@dataclass
+class TickerMeta:
+    """Static metadata for one ticker."""
+    ticker: str
+    name: Optional[str] = None
+    cik: Optional[str] = None  # Zero-padded to 10 digits
+    sector: Optional[str] = None
+    quote_type: Optional[str] = None  # EQUITY, ETF, ...
+    market_cap: Optional[float] = None  # Total assets for funds
+    has_options: Optional[bool] = None
+    updated: Optional[datetime] = None
+
+    @property
+    def is_fund(self) -> bool:
+        """ETF or other fund: no fundamentals or earnings to fetch."""
+        return (self.quote_type or '').upper() in FUND_QUOTE_TYPES
+
+    @property
+    def is_healthcare(self) -> bool:
+        return self.sector == 'Healthcare'
+
+    def fundamentals(self) -> Fundamentals:
+        """Fundamentals from the index alone (size and sector, no ratios)."""
+        return Fundamentals(
+            ticker=self.ticker,
+            market_cap=self.market_cap or 0,
+            pe_ratio=None,
+            forward_pe=None,
+            profit_margins=None,
+            debt_to_equity=None,
+            sector=self.sector
+        )
+
+
+def _parse_row(row: dict) -> TickerMeta:
+    has_options = row.get('has_options', '').lower()
+    return TickerMeta(
+        ticker=row['ticker'],
+        name=row.get('name') or None,
+        cik=row.get('cik') or None,
+        sector=row.get('sector') or None,
+        quote_type=row.get('quote_type') or None,
+        market_cap=float(row['market_cap']) if row.get('market_cap') else None,
+        has_options=None if has_options == '' else has_options == 'true',
+        updated=datetime.fromisoformat(row['updated']) if row.get('updated') else None
+    )
+
+
+def _format_row(meta: TickerMeta) -> dict:
+    return {
+        'ticker': meta.ticker,
+        'name': meta.name or '',
+        'cik': meta.cik or '',
+        'sector': meta.sector or '',
+        'quote_type': meta.quote_type or '',
+        'market_cap': '' if meta.market_cap is None else f"{meta.market_cap:.0f}",
+        'has_options': '' if meta.has_options is None else str(meta.has_options).lower(),
+        'updated': meta.updated.isoformat(timespec='seconds') if meta.updated else '',
+    }
+
+
+def fetch_sec_tickers() -> Dict[str, dict]:
+    """
+    SEC's ticker -> CIK and company name map, in one request.
+
+    Returns:
+        Dict mapping ticker to {'cik', 'name'} (empty on failure)
+    """
+    try:
+        response = transport.http_get(SEC_TICKERS_URL, headers=SEC_HEADERS, timeout=30)
+        response.raise_for_status()
+        return {
+            entry['ticker'].upper(): {'cik': str(entry['cik_str']).zfill(10), 'name': entry.get('title')}
+            for entry in response.json().values()
+        }
+    except Exception as e:
+        logger.error(f"Error fetching SEC ticker list: {e}")
+        return {}
+
+
+def lookup_ticker(ticker: str, sec: Optional[Dict[str, dict]] = None,
+                  previous: Optional[TickerMeta] = None) -> Optional[TickerMeta]:
+    """
+    Look up one ticker's metadata.
+
+    An empty expiration list is also what a throttled quote service
+    returns, so one alone leaves has_options unknown (None); a ticker is
+    only marked without options when the previous lookup found none too.
+
+    Args:
+        ticker: Ticker symbol
+        sec: Result of fetch_sec_tickers (CIK and fallback name)
+        previous: The ticker's current index entry, if any
+
+    Returns:
+        TickerMeta or None if the quote lookup failed
+    """
+    try:
+        stock = transport.ticker(ticker)
+        info = stock.info or {}
+        filing = (sec or {}).get(ticker, {})
+        quote_type = info.get('quoteType')
+        if quote_type is None and not info:
+            return None
+        if stock.options:
+            has_options = True
+        elif previous is not None and previous.updated is not None and previous.has_options is not True:
+            has_options = False
+        else:
+            has_options = None
+        return TickerMeta(
+            ticker=ticker,
+            name=info.get('longName') or info.get('shortName') or filing.get('name'),
+            cik=filing.get('cik'),
+            sector=info.get('sector'),
+            quote_type=quote_type,
+            market_cap=info.get('marketCap') or info.get('totalAssets'),
+            has_options=has_options,
+            updated=datetime.now()
+        )
+    except Exception as e:
+        logger.error(f"Error looking up metadata for {ticker}: {e}")
+        return None
+
+
+class UniverseIndex:
+    """Ticker metadata kept in a CSV and refreshed in bulk."""
+
+    def __init__(self, path: Optional[Path] = None, max_age_days: Optional[float] = None):
+        """
+        Args:
+            path: CSV file (UNIVERSE_META_PATH if None)
+            max_age_days: Entries older than this are refreshed
+                (UNIVERSE_META_MAX_AGE_DAYS if None)
+        """
+        self.path = Path(path or Settings.UNIVERSE_META_PATH)
+        if not self.path.is_absolute():
+            self.path = Settings.BASE_DIR / self.path
+        self.max_age = timedelta(days=Settings.UNIVERSE_META_MAX_AGE_DAYS if max_age_days is None else max_age_days)
+        self._entries: Dict[str, TickerMeta] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> Dict[str, TickerMeta]:
+        """Read the index from disk (an empty index if there is none)."""
+        entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', newline='') as f:
+                    for row in csv.DictReader(f):
+                        entries[row['ticker']] = _parse_row(row)
+            except Exception as e:
+                logger.error(f"Error reading universe index {self.path}: {e}")
+        with self._lock:
+            self._entries = entries
+        return entries
+
+    def save(self):
+        """Write the index atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with self._lock:
+            rows = [_format_row(meta) for _, meta in sorted(self._entries.items())]
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, self.path)
+
+    def get(self, ticker: str) -> Optional[TickerMeta]:
+        return self._entries.get(ticker)
+
+    def stale(self, tickers: Iterable[str]) -> List[str]:
+        """Tickers with no entry, one older than max_age, or options not yet known."""
+        cutoff = datetime.now() - self.max_age
+        return [
+            ticker for ticker in tickers
+            if (meta := self._entries.get(ticker)) is None or meta.updated is None or meta.updated < cutoff
+            or meta.has_options is None
+        ]
+
+    def refresh(self, tickers: Iterable[str], force: bool = False, workers: Optional[int] = None) -> int:
+        """
+        Refresh missing and stale entries in one batch.
+
+        CIKs and company names come from SEC's bulk ticker file; quote type,
+        sector, size and optionability from one quote lookup per stale ticker,
+        run concurrently. Entries whose lookup fails are kept as they were.
+
+        Args:
+            tickers: Universe tickers
+            force: Refresh every ticker, not only stale ones
+            workers: Concurrent lookups (PIPELINE_FETCH_WORKERS if None)
+
+        Returns:
+            Number of entries updated
+        """
+        tickers = list(tickers)
+        todo = tickers if force else self.stale(tickers)
+        if not todo:
+            return 0
+
+        logger.info(f"Refreshing universe metadata for {len(todo)} tickers")
+        sec = fetch_sec_tickers()
+        with ThreadPoolExecutor(max_workers=workers or Settings.PIPELINE_FETCH_WORKERS) as pool:
+            looked_up = pool.map(lambda t: lookup_ticker(t, sec, self._entries.get(t)), todo)
+            found = [meta for meta in looked_up if meta is not None]
+
+        with self._lock:
+            for meta in found:
+                self._entries[meta.ticker] = meta
+        if found:
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"Error saving universe index {self.path}: {e}")
+        logger.info(f"Universe metadata: {len(found)} of {len(todo)} refreshed")
+        return len(found)
+
+
+_index: Optional[UniverseIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_universe_index() -> UniverseIndex:
+    """Process-wide index (read from UNIVERSE_META_PATH on first use)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = UniverseIndex()
+        return _index
+
+
+def reset_universe_index():
+    """Drop the process-wide index so the next use rereads settings and disk."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def ticker_meta(ticker: str) -> Optional[TickerMeta]:
+    """Indexed metadata for a ticker, or None if it is not indexed (no network access)."""
+    return get_universe_index().get(ticker)
@@ -0,0 +1,204 @@
+"""
+Delta between consecutive scans' delivered ideas.
+
+Ideas are compared with the last delivered set by ticker, strategy and
+score bucket, so notifications only carry what actually changed. The
+last delivered set is kept in a small JSON file so the comparison
+survives restarts.
+"""
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config import Settings
+from ..models import RankedIdea
+from . import outbox
+
+logger = logging.getLogger(__name__)
+
+
+def score_bucket(score: float, bucket_size: float) -> int:
+    """Bucket index of a score (moves within a bucket are not material)."""
+    return int(math.floor(score / bucket_size)) if bucket_size > 0 else 0
+
+
+@dataclass
+class IdeaDelta:
+    """Differences between a scan's ideas and the last delivered set."""
+    new: List[Tuple[int, RankedIdea]] = field(default_factory=list)  # (rank, idea)
+    changed: List[Tuple[int, RankedIdea, dict]] = field(default_factory=list)  # (rank, idea, previous)
+    dropped: List[dict] = field(default_factory=list)  # Previous entries no longer in the list
+    unchanged: List[Tuple[int, RankedIdea]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """True if anything is new, changed or dropped."""
+        return bool(self.new or self.changed or self.dropped)
+
+    @property
+    def changed_ideas(self) -> List[Tuple[int, RankedIdea]]:
+        """New and changed ideas in rank order."""
+        items = self.new + [(rank, idea) for rank, idea, _ in self.changed]
+        return sorted(items, key=lambda item: item[0])
+
+
+def compute_delta(ideas: List[RankedIdea], previous: Dict[str, dict], bucket_size: float) -> IdeaDelta:
+    """
+    Compare ranked ideas with the previously delivered ones.
+
+    Args:
+        ideas: Ideas from this scan, best first
+        previous: Ticker -> {'strategy', 'score', 'rank'} from the last delivery
+        bucket_size: Score bucket width; a move to another bucket is a change
+
+    Returns:
+        IdeaDelta
+    """
+    delta = IdeaDelta()
+    current = set()
+
+    for rank, idea in enumerate(ideas, 1):
+        current.add(idea.ticker)
+        before = previous.get(idea.ticker)
+        if before is None:
+            delta.new.append((rank, idea))
+        elif (before['strategy'] != idea.strategy or
+              score_bucket(before['score'], bucket_size) != score_bucket(idea.score, bucket_size)):
+            delta.changed.append((rank, idea, before))
+        else:
+            delta.unchanged.append((rank, idea))
+
+    delta.dropped = [
+        dict(entry, ticker=ticker)
+        for ticker, entry in sorted(previous.items(), key=lambda item: item[1].get('rank', 0))
+        if ticker not in current
+    ]
+    return delta
+
+
+class DeltaTracker:
+    """
+    Persistent record of the last delivered ideas.
+
+    Ideas whose notifications are still queued are kept as 'pending' with
+    their outbox message ids. Once every message is sent they become the
+    delivered set; if any message is given up on they are discarded, so
+    the next scan sends its changes against what actually arrived.
+    """
+
+    def __init__(self, path: Optional[Path] = None, bucket_size: Optional[float] = None,
+                 delivery_status: Optional[Callable[[List[int]], str]] = None):
+        """
+        Args:
+            path: State file (DELTA_STATE_PATH if None)
+            bucket_size: Score bucket width (DELTA_SCORE_BUCKET if None)
+            delivery_status: Message ids -> 'sent', 'pending' or 'failed'
+                (the notification outbox if None)
+        """
+        self.path = Path(path) if path else Settings.resolve_path(Settings.DELTA_STATE_PATH)
+        self.bucket_size = Settings.DELTA_SCORE_BUCKET if bucket_size is None else bucket_size
+        self.delivery_status = delivery_status or outbox.delivery_status
+
+    def _read(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading delta state {self.path}: {e}")
+            return {}
+
+    def _write(self, state: dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp name first so a crash never leaves a partial file
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.error(f"Error saving delta state {self.path}: {e}")
+
+    def load(self) -> Dict[str, dict]:
+        """
+        Load the last delivered ideas.
+
+        Pending ideas are promoted once their notifications were sent and
+        dropped if any failed; while still queued they are returned, so the
+        same changes are not queued twice.
+
+        Returns:
+            Ticker -> {'strategy', 'score', 'rank'} (empty if none or unreadable)
+        """
+        state = self._read()
+        pending = state.get('pending')
+        if not pending:
+            return state.get('ideas', {})
+
+        status = self.delivery_status(pending.get('message_ids', []))
+        if status == outbox.PENDING:
+            return pending.get('ideas', {})
+
+        if status == outbox.SENT:
+            state = {
+                'scan_name': pending.get('scan_name', ''),
+                'delivered_at': datetime.now(Settings.TIMEZONE).isoformat(),
+                'ideas': pending.get('ideas', {}),
+            }
+        else:
+            logger.warning(f"Notifications for {pending.get('scan_name', 'a scan')} were not delivered, "
+                           f"keeping the previous delta state")
+            state.pop('pending')
+        self._write(state)
+        return state.get('ideas', {})
+
+    def diff(self, ideas: List[RankedIdea]) -> IdeaDelta:
+        """
+        Compare ideas with the last delivered set.
+
+        Args:
+            ideas: Ideas from this scan, best first
+
+        Returns:
+            IdeaDelta
+        """
+        return compute_delta(ideas, self.load(), self.bucket_size)
+
+    def save(self, ideas: List[RankedIdea], scan_name: str = "",
+             message_ids: Optional[List[int]] = None) -> None:
+        """
+        Record ideas as delivered, or as pending until their notifications are.
+
+        Args:
+            ideas: Ideas that were sent, best first
+            scan_name: Name of the scan
+            message_ids: Outbox ids of their notifications (delivered now if None)
+        """
+        entries = {
+            idea.ticker: {'strategy': idea.strategy, 'score': round(idea.score, 4), 'rank': rank}
+            for rank, idea in enumerate(ideas, 1)
+        }
+        if message_ids is None:
+            self._write({
+                'scan_name': scan_name,
+                'delivered_at': datetime.now(Settings.TIMEZONE).isoformat(),
+                'ideas': entries,
+            })
+            return
+
+        state = self._read()
+        # Messages of an earlier scan still in the outbox must arrive too,
+        # since this scan's delta was taken against their ideas
+        earlier = (state.get('pending') or {}).get('message_ids', [])
+        state['pending'] = {
+            'scan_name': scan_name,
+            'queued_at': datetime.now(Settings.TIMEZONE).isoformat(),
+            'ideas': entries,
+            'message_ids': earlier + list(message_ids),
+        }
+        self._write(state)
\ No newline at end of file
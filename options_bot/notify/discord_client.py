@@ -0,0 +1,236 @@
+"""
+Rate-limit aware Discord webhook client.
+
+One persistent session per webhook. Rate-limit buckets are learned from
+the X-RateLimit-* response headers so requests wait just long enough
+instead of tripping 429s; a 429 that still happens is retried after the
+server's retry_after.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+
+
+def embed_size(embed: dict) -> int:
+    """
+    Characters that count towards Discord's per-message embed limit.
+
+    Args:
+        embed: Discord embed dict
+
+    Returns:
+        Total length of title, description, field names/values, footer and author
+    """
+    size = len(embed.get('title', '')) + len(embed.get('description', ''))
+    for f in embed.get('fields', []):
+        size += len(f.get('name', '')) + len(f.get('value', ''))
+    size += len(embed.get('footer', {}).get('text', ''))
+    size += len(embed.get('author', {}).get('name', ''))
+    return size
+
+
+def pack_embeds(
+    embeds: List[dict],
+    max_embeds: int = MAX_EMBEDS_PER_MESSAGE,
+    max_chars: int = MAX_EMBED_CHARS_PER_MESSAGE
+) -> List[List[dict]]:
+    """
+    Split embeds into as few messages as the limits allow, keeping order.
+
+    Args:
+        embeds: Embeds in display order
+        max_embeds: Embeds allowed per message
+        max_chars: Embed characters allowed per message
+
+    Returns:
+        List of embed batches, one per message
+    """
+    batches = []
+    batch, chars = [], 0
+    for embed in embeds:
+        size = embed_size(embed)
+        if batch and (len(batch) >= max_embeds or chars + size > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(embed)
+        chars += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_posts(content: str, embeds: List[dict], continued: Optional[str] = None) -> List[dict]:
+    """
+    Messages (webhook payloads) for content plus embeds.
+
+    Args:
+        content: Content of the first message
+        embeds: Embeds in display order
+        continued: Content of later messages (first content if None)
+
+    Returns:
+        List of {'content', 'embeds'} dicts, one per message
+    """
+    batches = pack_embeds(embeds) or [[]]
+    return [
+        {'content': content if i == 0 or continued is None else continued, 'embeds': batch}
+        for i, batch in enumerate(batches)
+    ]
+
+
+@dataclass
+class RateLimitBucket:
+    """Remaining requests in a Discord rate-limit bucket."""
+    remaining: int
+    reset_at: float  # Monotonic time when the bucket refills
+
+
+class DiscordWebhookClient:
+    """Posts messages to one webhook, pacing requests by its rate-limit bucket."""
+
+    def __init__(
+        self,
+        webhook_url: str,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.webhook_url = webhook_url
+        self.session = session or requests.Session()
+        self.timeout = Settings.DISCORD_TIMEOUT if timeout is None else timeout
+        self.max_retries = Settings.DISCORD_MAX_RETRIES if max_retries is None else max_retries
+        self._sleep = sleep
+        self._clock = clock
+        self._bucket: Optional[RateLimitBucket] = None
+        self._global_reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_capacity(self):
+        """Sleep until the bucket (or a global limit) allows another request."""
+        now = self._clock()
+        wait = self._global_reset_at - now
+        if self._bucket and self._bucket.remaining <= 0:
+            wait = max(wait, self._bucket.reset_at - now)
+        if wait > 0:
+            logger.debug(f"Discord rate limit: waiting {wait:.2f}s")
+            self._sleep(wait)
+
+    def _update_bucket(self, response: requests.Response):
+        """Record the bucket state from response headers."""
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is None or reset_after is None:
+            return
+        try:
+            self._bucket = RateLimitBucket(int(remaining), self._clock() + float(reset_after))
+        except ValueError:
+            pass
+
+    def _retry_after(self, response: requests.Response) -> Tuple[float, bool]:
+        """Seconds to wait after a 429 and whether the limit is global."""
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        retry_after = body.get('retry_after') or response.headers.get('Retry-After') or 1.0
+        is_global = bool(body.get('global')) or response.headers.get('X-RateLimit-Global') == 'true'
+        return float(retry_after), is_global
+
+    def post(self, content: str = "", embeds: Optional[List[dict]] = None) -> bool:
+        """
+        Post one message, waiting on rate limits and retrying 429/5xx.
+
+        Args:
+            content: Message content (truncated to 2000 characters)
+            embeds: Up to 10 embeds
+
+        Returns:
+            True if Discord accepted the message
+        """
+        payload = {"content": content[:MAX_CONTENT_CHARS]}
+        if embeds:
+            payload["embeds"] = embeds
+
+        with self._lock:
+            for attempt in range(self.max_retries + 1):
+                self._wait_for_capacity()
+                try:
+                    response = self.session.post(self.webhook_url, json=payload, timeout=self.timeout)
+                except requests.RequestException as e:
+                    logger.warning(f"Discord request failed (attempt {attempt + 1}): {e}")
+                    self._sleep(min(2 ** attempt, 30))
+                    continue
+
+                self._update_bucket(response)
+
+                if response.status_code == 429:
+                    retry_after, is_global = self._retry_after(response)
+                    logger.warning(f"Discord rate limited, retrying after {retry_after:.2f}s")
+                    reset_at = self._clock() + retry_after
+                    if is_global:
+                        self._global_reset_at = reset_at
+                    else:
+                        self._bucket = RateLimitBucket(0, reset_at)
+                    continue
+
+                if response.status_code >= 500:
+                    logger.warning(f"Discord server error {response.status_code} (attempt {attempt + 1})")
+                    self._sleep(min(2 ** attempt, 30))
+                    continue
+
+                if response.status_code >= 400:
+                    logger.error(f"Discord rejected message: {response.status_code} {response.text[:200]}")
+                    return False
+
+                return True
+
+        logger.error(f"Discord message not delivered after {self.max_retries + 1} attempts")
+        return False
+
+    def send_embeds(self, content: str, embeds: List[dict], continued: Optional[str] = None) -> bool:
+        """
+        Send embeds in as few messages as the limits allow.
+
+        Every batch is attempted even if an earlier one fails.
+
+        Args:
+            content: Content of the first message
+            embeds: Embeds in display order
+            continued: Content of later messages (first content if None)
+
+        Returns:
+            True if every message was delivered
+        """
+        posts = build_posts(content, embeds, continued)
+        delivered = sum(1 for post in posts if self.post(post['content'], post['embeds']))
+
+        if delivered < len(posts):
+            logger.error(f"Delivered {delivered}/{len(posts)} Discord messages")
+        return delivered == len(posts)
+
+
+_clients: Dict[str, DiscordWebhookClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_discord_client(webhook_url: str) -> DiscordWebhookClient:
+    """Shared client (and session) for a webhook URL."""
+    with _clients_lock:
+        if webhook_url not in _clients:
+            _clients[webhook_url] = DiscordWebhookClient(webhook_url)
+        return _clients[webhook_url]
@@ -1,10 +1,12 @@
 """
 Discord webhook notification.
 """
-import requests
 import logging
 from typing import List
 from ..models import RankedIdea
+from .discord_client import get_discord_client, build_posts
+from .delta import IdeaDelta
+from .formatter import delta_summary_lines, delta_marker
 
 logger = logging.getLogger(__name__)
 
@@ -22,117 +24,172 @@ def send_discord(webhook_url: str, content: str, embeds: List[dict] = None) -> b
         True if successful, False otherwise
     """
     try:
-        payload = {"content": content}
-        
         if embeds:
-            payload["embeds"] = embeds
-        
-        response = requests.post(webhook_url, json=payload)
-        response.raise_for_status()
+            success = get_discord_client(webhook_url).send_embeds(content, embeds)
+        else:
+            success = get_discord_client(webhook_url).post(content)
         
-        logger.info("Discord notification sent successfully")
-        return True
+        if success:
+            logger.info("Discord notification sent successfully")
+        return success
         
     except Exception as e:
         logger.error(f"Error sending Discord notification: {e}")
         return False
 
 
-def send_ideas_to_discord(webhook_url: str, ideas: List[RankedIdea], scan_name: str) -> bool:
+def _idea_embed(idea: RankedIdea, i: int, marker: str = "") -> dict:
     """
-    Send ranked ideas to Discord with rich formatting.
+    Build the embed for one idea.
+    
+    Args:
+        idea: RankedIdea to format
+        i: Rank shown before the ticker
+        marker: Optional prefix for the title (e.g. "🆕 ")
+        
+    Returns:
+        Discord embed dict
+    """
+    # Determine color and emoji based on bias
+    if idea.bias_direction == "BULLISH":
+        color = 0x00ff00  # Green
+        emoji = "🟢"
+    elif idea.bias_direction == "BEARISH":
+        color = 0xff0000  # Red
+        emoji = "🔴"
+    else:
+        color = 0xaaaaaa  # Gray
+        emoji = "⚪"
+    
+    # Build description
+    iv_hv = idea.options.iv_hv_ratio
+    iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
+    
+    liquidity_label = "High" if idea.options.liquidity_score >= 7 else \
+                     "Medium" if idea.options.liquidity_score >= 4 else "Low"
+    
+    catalyst_text = "None"
+    if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
+        catalyst_text = idea.catalyst.event_description
+    elif idea.catalyst.days_to_earnings:
+        catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
+    
+    # Build description with clear strategy display
+    iv_rank_text = f"(IV Rank: {idea.options.iv_rank_1y:.0f}%)" if idea.options.iv_rank_1y else ""
+    
+    description = (
+        f"🎯 **STRATEGY: {idea.strategy}**\n\n"
+        f"📊 **Fundamentals:** P/E {idea.fundamentals.pe_ratio:.1f}" if idea.fundamentals.pe_ratio else "P/E N/A"
+        f" | Bias: {idea.signals.fund_bias:+.1f}/10\n"
+        f"📈 **Options:** IV/HV {iv_hv_str} {iv_rank_text} | Liq: {liquidity_label}\n"
+        f"📰 **Catalyst:** {catalyst_text}\n"
+        f"💡 **Notes:** {idea.notes}"
+    )
+    
+    embed = {
+        "title": f"{marker}{emoji} {i}. {idea.ticker} - {idea.bias_direction} (Score: {idea.score:.1f}/10)",
+        "description": description,
+        "color": color,
+        "fields": [
+            {
+                "name": "Fundamentals",
+                "value": f"P/E: {idea.fundamentals.pe_ratio:.1f}" if idea.fundamentals.pe_ratio else "P/E: N/A",
+                "inline": True
+            },
+            {
+                "name": "Premium",
+                "value": f"Bias: {idea.signals.premium_bias:.1f}",
+                "inline": True
+            },
+            {
+                "name": "Catalyst Score",
+                "value": f"{idea.signals.catalyst_score:.1f}/10",
+                "inline": True
+            }
+        ]
+    }
+    
+    return embed
+
+
+def ideas_discord_posts(ideas: List[RankedIdea], scan_name: str) -> List[dict]:
+    """
+    Webhook payloads for a full list of ranked ideas.
     
     Args:
-        webhook_url: Discord webhook URL
         ideas: List of RankedIdea objects
         scan_name: Name/title for the scan
         
     Returns:
-        True if successful, False otherwise
+        List of {'content', 'embeds'} dicts, one per message
     """
     if not ideas:
-        return send_discord(webhook_url, f"📊 {scan_name}\n\n❌ No ideas found in this scan.")
+        return [{'content': f"📊 {scan_name}\n\n❌ No ideas found in this scan.", 'embeds': []}]
     
     # Create embeds for each idea
     embeds = []
     
     for i, idea in enumerate(ideas, 1):
-        # Determine color and emoji based on bias
-        if idea.bias_direction == "BULLISH":
-            color = 0x00ff00  # Green
-            emoji = "🟢"
-        elif idea.bias_direction == "BEARISH":
-            color = 0xff0000  # Red
-            emoji = "🔴"
-        else:
-            color = 0xaaaaaa  # Gray
-            emoji = "⚪"
-        
-        # Build description
-        iv_hv = idea.options.iv_hv_ratio
-        iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
-        
-        liquidity_label = "High" if idea.options.liquidity_score >= 7 else \
-                         "Medium" if idea.options.liquidity_score >= 4 else "Low"
-        
-        catalyst_text = "None"
-        if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
-            catalyst_text = idea.catalyst.event_description
-        elif idea.catalyst.days_to_earnings:
-            catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
-        
-        # Build description with clear strategy display
-        iv_rank_text = f"(IV Rank: {idea.options.iv_rank_1y:.0f}%)" if idea.options.iv_rank_1y else ""
-        
-        description = (
-            f"🎯 **STRATEGY: {idea.strategy}**\n\n"
-            f"📊 **Fundamentals:** P/E {idea.fundamentals.pe_ratio:.1f}" if idea.fundamentals.pe_ratio else "P/E N/A"
-            f" | Bias: {idea.signals.fund_bias:+.1f}/10\n"
-            f"📈 **Options:** IV/HV {iv_hv_str} {iv_rank_text} | Liq: {liquidity_label}\n"
-            f"📰 **Catalyst:** {catalyst_text}\n"
-            f"💡 **Notes:** {idea.notes}"
-        )
-        
-        embed = {
-            "title": f"{emoji} {i}. {idea.ticker} - {idea.bias_direction} (Score: {idea.score:.1f}/10)",
-            "description": description,
-            "color": color,
-            "fields": [
-                {
-                    "name": "Fundamentals",
-                    "value": f"P/E: {idea.fundamentals.pe_ratio:.1f}" if idea.fundamentals.pe_ratio else "P/E: N/A",
-                    "inline": True
-                },
-                {
-                    "name": "Premium",
-                    "value": f"Bias: {idea.signals.premium_bias:.1f}",
-                    "inline": True
-                },
-                {
-                    "name": "Catalyst Score",
-                    "value": f"{idea.signals.catalyst_score:.1f}/10",
-                    "inline": True
-                }
-            ]
-        }
-        
-        embeds.append(embed)
+        embeds.append(_idea_embed(idea, i))
     
-    # Discord has a limit of 10 embeds per message
-    # If more ideas, split into multiple messages
-    max_embeds_per_msg = 10
+    # Packed by Discord's 10-embed and 6000-character limits per message
+    content = f"📊 **{scan_name}**\n🕐 {ideas[0].timestamp.strftime('%Y-%m-%d %H:%M ET')}"
+    return build_posts(content, embeds, f"📊 **{scan_name}** (continued...)")
+
+
+def delta_discord_posts(delta: IdeaDelta, scan_name: str, show_unchanged: bool = True) -> List[dict]:
+    """
+    Webhook payloads for new, changed and dropped ideas.
     
-    for i in range(0, len(embeds), max_embeds_per_msg):
-        batch = embeds[i:i + max_embeds_per_msg]
-        
-        if i == 0:
-            content = f"📊 **{scan_name}**\n🕐 {ideas[0].timestamp.strftime('%Y-%m-%d %H:%M ET')}"
-        else:
-            content = f"📊 **{scan_name}** (continued...)"
+    Args:
+        delta: Differences from the last delivered ideas
+        scan_name: Name/title for the scan
+        show_unchanged: Add a compact line listing unchanged ideas
         
-        success = send_discord(webhook_url, content, batch)
-        if not success:
-            return False
+    Returns:
+        List of {'content', 'embeds'} dicts, one per message
+    """
+    embeds = [_idea_embed(idea, i, delta_marker(delta, idea.ticker)) for i, idea in delta.changed_ideas]
+    summary = "\n".join(delta_summary_lines(delta, show_unchanged))
+    header = f"📊 **{scan_name}** (changes since last update)"
+    
+    content = f"{header}\n{summary}" if summary else header
+    return build_posts(content, embeds, f"📊 **{scan_name}** (continued...)")
+
+
+def _send_posts(webhook_url: str, posts: List[dict]) -> bool:
+    """Post every message, returning True only if all were delivered."""
+    client = get_discord_client(webhook_url)
+    delivered = sum(1 for post in posts if client.post(post['content'], post['embeds']))
+    return delivered == len(posts)
+
+
+def send_ideas_to_discord(webhook_url: str, ideas: List[RankedIdea], scan_name: str) -> bool:
+    """
+    Send ranked ideas to Discord with rich formatting.
     
-    return True
+    Args:
+        webhook_url: Discord webhook URL
+        ideas: List of RankedIdea objects
+        scan_name: Name/title for the scan
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    return _send_posts(webhook_url, ideas_discord_posts(ideas, scan_name))
 
+
+def send_delta_to_discord(webhook_url: str, delta: IdeaDelta, scan_name: str, show_unchanged: bool = True) -> bool:
+    """
+    Send only new, changed and dropped ideas to Discord.
+    
+    Args:
+        webhook_url: Discord webhook URL
+        delta: Differences from the last delivered ideas
+        scan_name: Name/title for the scan
+        show_unchanged: Add a compact line listing unchanged ideas
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    return _send_posts(webhook_url, delta_discord_posts(delta, scan_name, show_unchanged))
@@ -5,10 +5,36 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+def build_message(from_email: str, to_email: str, subject: str, body: str, html: bool = False) -> MIMEMultipart:
+    """
+    Build a MIME message.
+    
+    Args:
+        from_email: Sender address
+        to_email: Recipient email address
+        subject: Email subject
+        body: Email body
+        html: If True, body is HTML formatted
+        
+    Returns:
+        MIMEMultipart message
+    """
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = from_email
+    msg['To'] = to_email
+    
+    # Attach body
+    mime_type = 'html' if html else 'plain'
+    msg.attach(MIMEText(body, mime_type))
+    return msg
+
+
 def send_email(
     smtp_host: str,
     smtp_port: int,
@@ -36,14 +62,7 @@ def send_email(
         True if successful, False otherwise
     """
     try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = smtp_user
-        msg['To'] = to_email
-        
-        # Attach body
-        mime_type = 'html' if html else 'plain'
-        msg.attach(MIMEText(body, mime_type))
+        msg = build_message(smtp_user, to_email, subject, body, html)
         
         # Send email
         with smtplib.SMTP(smtp_host, smtp_port) as server:
@@ -58,3 +77,55 @@ def send_email(
         logger.error(f"Error sending email: {e}")
         return False
 
+
+class SmtpSession:
+    """SMTP connection kept open across messages (STARTTLS and login once)."""
+    
+    def __init__(self, host: str, port: int, user: str, password: str, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+    
+    def _is_alive(self) -> bool:
+        try:
+            return self._server is not None and self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def send(self, to_email: str, subject: str, body: str, html: bool = False):
+        """
+        Send one message, reconnecting if the server dropped the connection.
+        
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body: Email body
+            html: If True, body is HTML formatted
+            
+        Raises:
+            smtplib.SMTPException or OSError if delivery fails
+        """
+        msg = build_message(self.user, to_email, subject, body, html)
+        if not self._is_alive():
+            self.close()
+            self._server = self._connect()
+        self._server.send_message(msg)
+        logger.info(f"Email sent successfully to {to_email}")
+    
+    def close(self):
+        """Quit the connection if open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
@@ -3,6 +3,106 @@ Output formatting for notifications.
 """
 from typing import List
 from ..models import RankedIdea
+from .delta import IdeaDelta
+
+HTML_HEAD = """<head>
+        <style>
+            body { font-family: Arial, sans-serif; }
+            .idea { margin-bottom: 20px; padding: 15px; border-left: 4px solid #ccc; }
+            .bullish { border-left-color: #00ff00; }
+            .bearish { border-left-color: #ff0000; }
+            .neutral { border-left-color: #aaaaaa; }
+            .ticker { font-size: 18px; font-weight: bold; }
+            .score { color: #666; }
+            .detail { margin: 5px 0; }
+        </style>
+    </head>"""
+
+
+def _idea_lines(idea: RankedIdea, i: int, marker: str = "") -> List[str]:
+    """
+    Text block for one idea.
+    
+    Args:
+        idea: RankedIdea to format
+        i: Rank shown before the ticker
+        marker: Optional prefix for the title line (e.g. "NEW ")
+        
+    Returns:
+        List of lines ending with a blank line
+    """
+    lines = []
+    
+    # Direction emoji
+    if idea.bias_direction == "BULLISH":
+        emoji = "🟢"
+    elif idea.bias_direction == "BEARISH":
+        emoji = "🔴"
+    else:
+        emoji = "⚪"
+    
+    # IV/HV
+    iv_hv = idea.options.iv_hv_ratio
+    iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
+    
+    # Liquidity
+    liq = idea.options.liquidity_score
+    liq_label = "High" if liq >= 7 else "Medium" if liq >= 4 else "Low"
+    
+    # Catalyst
+    catalyst_text = "None"
+    if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
+        catalyst_text = idea.catalyst.event_description
+    elif idea.catalyst.days_to_earnings:
+        catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
+    
+    lines.append(f"{marker}{emoji} {i}. {idea.ticker} - {idea.bias_direction} (Score: {idea.score:.1f}/10)")
+    lines.append(f"   📈 IV/HV: {iv_hv_str} (IV Rank: {idea.options.iv_rank_1y:.0f}%)" if idea.options.iv_rank_1y else f"   📈 IV/HV: {iv_hv_str}")
+    lines.append(f"   💧 Liquidity: {liq_label}")
+    lines.append(f"   📰 Catalyst: {catalyst_text}")
+    lines.append(f"   🎯 Strategy: {idea.strategy}")
+    lines.append(f"   📝 {idea.notes}")
+    lines.append("")
+    
+    return lines
+
+
+def _idea_html(idea: RankedIdea, i: int, marker: str = "") -> str:
+    """
+    HTML block for one idea.
+    
+    Args:
+        idea: RankedIdea to format
+        i: Rank shown before the ticker
+        marker: Optional prefix for the title (e.g. "NEW ")
+        
+    Returns:
+        HTML string
+    """
+    bias_class = idea.bias_direction.lower()
+    iv_hv = idea.options.iv_hv_ratio
+    iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
+    
+    liq = idea.options.liquidity_score
+    liq_label = "High" if liq >= 7 else "Medium" if liq >= 4 else "Low"
+    
+    catalyst_text = "None"
+    if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
+        catalyst_text = idea.catalyst.event_description
+    elif idea.catalyst.days_to_earnings:
+        catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
+    
+    return f"""
+    <div class="idea {bias_class}">
+        <div class="ticker">{marker}{i}. {idea.ticker} - {idea.bias_direction}</div>
+        <div class="score">Score: {idea.score:.1f}/10</div>
+        <div class="detail"><strong>IV/HV:</strong> {iv_hv_str}</div>
+        <div class="detail"><strong>Liquidity:</strong> {liq_label}</div>
+        <div class="detail"><strong>Catalyst:</strong> {catalyst_text}</div>
+        <div class="detail"><strong>Strategy:</strong> {idea.strategy}</div>
+        <div class="detail">{idea.notes}</div>
+    </div>
+    """
 
 
 def format_brief(ideas: List[RankedIdea], scan_name: str) -> str:
@@ -26,36 +126,7 @@ def format_brief(ideas: List[RankedIdea], scan_name: str) -> str:
     ]
     
     for i, idea in enumerate(ideas, 1):
-        # Direction emoji
-        if idea.bias_direction == "BULLISH":
-            emoji = "🟢"
-        elif idea.bias_direction == "BEARISH":
-            emoji = "🔴"
-        else:
-            emoji = "⚪"
-        
-        # IV/HV
-        iv_hv = idea.options.iv_hv_ratio
-        iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
-        
-        # Liquidity
-        liq = idea.options.liquidity_score
-        liq_label = "High" if liq >= 7 else "Medium" if liq >= 4 else "Low"
-        
-        # Catalyst
-        catalyst_text = "None"
-        if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
-            catalyst_text = idea.catalyst.event_description
-        elif idea.catalyst.days_to_earnings:
-            catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
-        
-        lines.append(f"{emoji} {i}. {idea.ticker} - {idea.bias_direction} (Score: {idea.score:.1f}/10)")
-        lines.append(f"   📈 IV/HV: {iv_hv_str} (IV Rank: {idea.options.iv_rank_1y:.0f}%)" if idea.options.iv_rank_1y else f"   📈 IV/HV: {iv_hv_str}")
-        lines.append(f"   💧 Liquidity: {liq_label}")
-        lines.append(f"   📰 Catalyst: {catalyst_text}")
-        lines.append(f"   🎯 Strategy: {idea.strategy}")
-        lines.append(f"   📝 {idea.notes}")
-        lines.append("")
+        lines.extend(_idea_lines(idea, i))
     
     return "\n".join(lines)
 
@@ -76,48 +147,85 @@ def format_html(ideas: List[RankedIdea], scan_name: str) -> str:
     
     html = f"""
     <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; }}
-            .idea {{ margin-bottom: 20px; padding: 15px; border-left: 4px solid #ccc; }}
-            .bullish {{ border-left-color: #00ff00; }}
-            .bearish {{ border-left-color: #ff0000; }}
-            .neutral {{ border-left-color: #aaaaaa; }}
-            .ticker {{ font-size: 18px; font-weight: bold; }}
-            .score {{ color: #666; }}
-            .detail {{ margin: 5px 0; }}
-        </style>
-    </head>
+    {HTML_HEAD}
     <body>
         <h2>{scan_name}</h2>
         <p>{ideas[0].timestamp.strftime('%Y-%m-%d %H:%M ET')}</p>
     """
     
     for i, idea in enumerate(ideas, 1):
-        bias_class = idea.bias_direction.lower()
-        iv_hv = idea.options.iv_hv_ratio
-        iv_hv_str = f"{iv_hv:.2f}" if iv_hv else "N/A"
-        
-        liq = idea.options.liquidity_score
-        liq_label = "High" if liq >= 7 else "Medium" if liq >= 4 else "Low"
+        html += _idea_html(idea, i)
+    
+    html += """
+    </body>
+    </html>
+    """
+    
+    return html
+
+
+def delta_summary_lines(delta: IdeaDelta, show_unchanged: bool) -> List[str]:
+    """Compact lines for dropped and unchanged ideas."""
+    lines = []
+    if delta.dropped:
+        dropped = ", ".join(f"{d['ticker']} ({d['strategy']})" for d in delta.dropped)
+        lines.append(f"➖ Dropped: {dropped}")
+    if show_unchanged and delta.unchanged:
+        unchanged = ", ".join(f"{rank}. {idea.ticker}" for rank, idea in delta.unchanged)
+        lines.append(f"⏸️ Unchanged: {unchanged}")
+    return lines
+
+
+def delta_marker(delta: IdeaDelta, ticker: str) -> str:
+    """Title prefix for a new or changed idea."""
+    return "🆕 " if any(idea.ticker == ticker for _, idea in delta.new) else "🔄 "
+
+
+def format_delta_brief(delta: IdeaDelta, scan_name: str, show_unchanged: bool = True) -> str:
+    """
+    Format only what changed since the last delivered scan.
+    
+    Args:
+        delta: Differences from the last delivered ideas
+        scan_name: Name of the scan
+        show_unchanged: Add a compact line listing unchanged ideas
         
-        catalyst_text = "None"
-        if idea.catalyst.has_major_event_7d and idea.catalyst.event_description:
-            catalyst_text = idea.catalyst.event_description
-        elif idea.catalyst.days_to_earnings:
-            catalyst_text = f"Earnings in {idea.catalyst.days_to_earnings} days"
+    Returns:
+        Formatted string report
+    """
+    lines = [f"📊 {scan_name} (changes since last update)", ""]
+    
+    for i, idea in delta.changed_ideas:
+        lines.extend(_idea_lines(idea, i, delta_marker(delta, idea.ticker)))
+    
+    lines.extend(delta_summary_lines(delta, show_unchanged))
+    return "\n".join(lines)
+
+
+def format_delta_html(delta: IdeaDelta, scan_name: str, show_unchanged: bool = True) -> str:
+    """
+    Format only what changed since the last delivered scan as HTML.
+    
+    Args:
+        delta: Differences from the last delivered ideas
+        scan_name: Name of the scan
+        show_unchanged: Add a compact line listing unchanged ideas
         
-        html += f"""
-        <div class="idea {bias_class}">
-            <div class="ticker">{i}. {idea.ticker} - {idea.bias_direction}</div>
-            <div class="score">Score: {idea.score:.1f}/10</div>
-            <div class="detail"><strong>IV/HV:</strong> {iv_hv_str}</div>
-            <div class="detail"><strong>Liquidity:</strong> {liq_label}</div>
-            <div class="detail"><strong>Catalyst:</strong> {catalyst_text}</div>
-            <div class="detail"><strong>Strategy:</strong> {idea.strategy}</div>
-            <div class="detail">{idea.notes}</div>
-        </div>
-        """
+    Returns:
+        HTML formatted string
+    """
+    html = f"""
+    <html>
+    {HTML_HEAD}
+    <body>
+        <h2>{scan_name} (changes since last update)</h2>
+    """
+    
+    for i, idea in delta.changed_ideas:
+        html += _idea_html(idea, i, delta_marker(delta, idea.ticker))
+    
+    for line in delta_summary_lines(delta, show_unchanged):
+        html += f"<p>{line}</p>"
     
     html += """
     </body>
@@ -125,4 +233,3 @@ def format_html(ideas: List[RankedIdea], scan_name: str) -> str:
     """
     
     return html
-
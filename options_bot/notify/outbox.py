@@ -0,0 +1,406 @@
+"""
+Durable notification outbox and background delivery worker.
+
+Scans only render and queue their messages; a worker thread delivers
+them. Every channel is drained concurrently, messages within a channel
+go out in order, and failures are retried with exponential backoff. The
+outbox is a SQLite file, so anything queued survives a restart.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+@dataclass
+class OutboxMessage:
+    """A queued notification."""
+    id: int
+    channel: str
+    payload: dict
+    attempts: int
+    next_attempt_at: float
+
+
+class Outbox:
+    """SQLite-backed queue of notification payloads."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Settings.resolve_path(Settings.OUTBOX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "channel TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "next_attempt_at REAL NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "last_error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, channel, id)")
+        self._conn.commit()
+
+    def enqueue(self, channel: str, payloads: List[dict]) -> List[int]:
+        """
+        Queue payloads for a channel in delivery order.
+
+        Args:
+            channel: Channel name ('discord' or 'email')
+            payloads: JSON-serializable message payloads
+
+        Returns:
+            Ids of the queued messages
+        """
+        now = time.time()
+        ids = []
+        with self._lock:
+            for payload in payloads:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox (channel, payload, status, next_attempt_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (channel, json.dumps(payload), PENDING, now, now)
+                )
+                ids.append(cursor.lastrowid)
+            self._conn.commit()
+        return ids
+
+    def pending(self, channel: Optional[str] = None) -> List[OutboxMessage]:
+        """Pending messages (optionally for one channel) in queue order."""
+        query = "SELECT id, channel, payload, attempts, next_attempt_at FROM outbox WHERE status = ?"
+        params = [PENDING]
+        if channel is not None:
+            query += " AND channel = ?"
+            params.append(channel)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [OutboxMessage(r[0], r[1], json.loads(r[2]), r[3], r[4]) for r in rows]
+
+    def pending_channels(self) -> List[str]:
+        """Channels with pending messages."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT channel FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, status: str = PENDING) -> int:
+        """Number of messages with a status."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE status = ?", (status,)).fetchone()[0]
+
+    def status(self, message_ids: List[int]) -> str:
+        """
+        Combined delivery status of a group of messages.
+
+        Args:
+            message_ids: Ids returned by enqueue
+
+        Returns:
+            FAILED if any message was given up on, PENDING if any is still
+            queued, otherwise SENT (purged rows were sent)
+        """
+        if not message_ids:
+            return SENT
+        placeholders = ','.join('?' * len(message_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT status FROM outbox WHERE id IN ({placeholders})", list(message_ids)
+            ).fetchall()
+        statuses = {r[0] for r in rows}
+        for status in (FAILED, PENDING):
+            if status in statuses:
+                return status
+        return SENT
+
+    def mark_sent(self, message_id: int):
+        """Record a delivered message."""
+        self._update(message_id, SENT, None, None)
+
+    def mark_retry(self, message_id: int, error: str, delay: float):
+        """Record a failed attempt and schedule the next one."""
+        self._update(message_id, PENDING, error, time.time() + delay)
+
+    def mark_failed(self, message_id: int, error: str):
+        """Give up on a message."""
+        self._update(message_id, FAILED, error, None)
+
+    def _update(self, message_id: int, status: str, error: Optional[str], next_attempt_at: Optional[float]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, "
+                "attempts = attempts + (CASE WHEN ? = ? THEN 0 ELSE 1 END), "
+                "last_error = COALESCE(?, last_error), "
+                "next_attempt_at = COALESCE(?, next_attempt_at) WHERE id = ?",
+                (status, status, SENT, error, next_attempt_at, message_id)
+            )
+            self._conn.commit()
+
+    def purge(self, older_than_days: float = 7.0) -> int:
+        """Delete sent messages older than the given age."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND created_at < ?", (SENT, cutoff)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class NotificationWorker:
+    """Background thread that drains the outbox."""
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        senders: Dict[str, Callable[[dict], bool]],
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: float = 900.0,
+        poll_interval: float = 5.0,
+        on_idle: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            outbox: Queue to drain
+            senders: Channel name -> callable that delivers one payload
+                (returns True on success; may raise)
+            max_attempts: Attempts before a message is marked failed
+            retry_base: First retry delay in seconds (doubles per attempt)
+            retry_max: Longest retry delay in seconds
+            poll_interval: Seconds between outbox checks when idle
+            on_idle: Called with a channel name once its queue is drained
+                (e.g. to close an SMTP connection)
+        """
+        self.outbox = outbox
+        self.senders = senders
+        self.max_attempts = max_attempts or Settings.NOTIFY_MAX_ATTEMPTS
+        self.retry_base = Settings.NOTIFY_RETRY_BASE if retry_base is None else retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.on_idle = on_idle
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max(len(senders), 1), thread_name_prefix='notify')
+
+    def start(self):
+        """Start the worker thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='notification-worker', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Check the outbox now instead of waiting for the next poll."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the worker thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until nothing is pending or the timeout passes.
+
+        Args:
+            timeout: Seconds to wait (NOTIFY_FLUSH_TIMEOUT if None)
+
+        Returns:
+            True if the outbox drained
+        """
+        timeout = Settings.NOTIFY_FLUSH_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self.start()
+        while True:
+            self.wake()
+            with self._idle:
+                self._idle.wait(timeout=0.1)
+                drained = not self._busy and self.outbox.count(PENDING) == 0
+            if drained:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(f"{self.outbox.count(PENDING)} notifications still pending after {timeout}s")
+                return False
+
+    def run_once(self):
+        """Deliver everything currently due, all channels concurrently."""
+        channels = self.outbox.pending_channels()
+        if not channels:
+            return
+        futures = [self._executor.submit(self._deliver_channel, channel) for channel in channels]
+        for future in futures:
+            future.result()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._idle:
+                self._busy = True
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Notification worker error: {e}")
+            finally:
+                with self._idle:
+                    self._busy = False
+                    self._idle.notify_all()
+            self._wake.wait(self.poll_interval)
+
+    def _deliver_channel(self, channel: str):
+        """Deliver one channel's due messages in order, stopping at the first failure."""
+        sender = self.senders.get(channel)
+        for message in self.outbox.pending(channel):
+            if message.next_attempt_at > time.time():
+                return  # Later messages wait behind the one being retried
+
+            if sender is None:
+                self.outbox.mark_failed(message.id, f"Channel '{channel}' is not configured")
+                continue
+
+            try:
+                ok, error = sender(message.payload), "delivery failed"
+            except Exception as e:
+                ok, error = False, str(e)
+
+            if ok:
+                self.outbox.mark_sent(message.id)
+                continue
+
+            attempts = message.attempts + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"Giving up on {channel} notification {message.id} after {attempts} attempts: {error}")
+                self.outbox.mark_failed(message.id, error)
+                continue
+
+            delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+            logger.warning(f"{channel} notification {message.id} failed ({error}), retrying in {delay:.0f}s")
+            self.outbox.mark_retry(message.id, error, delay)
+            return
+
+        if self.on_idle:
+            self.on_idle(channel)
+
+
+def _default_channels() -> Tuple[Dict[str, Callable[[dict], bool]], Callable[[str], None]]:
+    """Senders for the channels configured in Settings, plus an idle hook."""
+    from .discord_client import get_discord_client
+    from .email_notifier import SmtpSession
+
+    senders = {}
+    smtp = None
+
+    if Settings.USE_DISCORD and Settings.DISCORD_WEBHOOK_URL:
+        client = get_discord_client(Settings.DISCORD_WEBHOOK_URL)
+        senders['discord'] = lambda payload: client.post(payload['content'], payload.get('embeds'))
+
+    if Settings.USE_EMAIL:
+        smtp = SmtpSession(Settings.SMTP_HOST, Settings.SMTP_PORT, Settings.SMTP_USER, Settings.SMTP_PASS)
+
+        def send_email(payload: dict) -> bool:
+            try:
+                smtp.send(payload['to'], payload['subject'], payload['body'], payload.get('html', False))
+                return True
+            except Exception:
+                smtp.close()
+                raise
+
+        senders['email'] = send_email
+
+    def on_idle(channel: str):
+        # The SMTP connection is reused while mail is queued, then released
+        if channel == 'email' and smtp is not None:
+            smtp.close()
+
+    return senders, on_idle
+
+
+_worker: Optional[NotificationWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_notification_worker() -> NotificationWorker:
+    """Shared worker for the configured channels, started on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            senders, on_idle = _default_channels()
+            outbox = Outbox()
+            outbox.purge()
+            _worker = NotificationWorker(outbox, senders, on_idle=on_idle)
+            _worker.start()
+        return _worker
+
+
+def queue_notifications(messages: Dict[str, List[dict]]) -> List[int]:
+    """
+    Queue rendered messages and wake the worker.
+
+    Args:
+        messages: Channel name -> payloads in delivery order
+
+    Returns:
+        Ids of the queued messages (empty if nothing was queued)
+    """
+    worker = get_notification_worker()
+    queued = []
+    for channel, payloads in messages.items():
+        queued += worker.outbox.enqueue(channel, payloads)
+    if queued:
+        worker.wake()
+    return queued
+
+
+def delivery_status(message_ids: List[int]) -> str:
+    """
+    Delivery status of queued notifications (see Outbox.status).
+
+    Args:
+        message_ids: Ids returned by queue_notifications
+
+    Returns:
+        SENT, PENDING or FAILED
+    """
+    return get_notification_worker().outbox.status(message_ids)
+
+
+def flush_notifications(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for queued notifications to be delivered (call before exiting).
+
+    Args:
+        timeout: Seconds to wait (NOTIFY_FLUSH_TIMEOUT if None)
+
+    Returns:
+        True if the outbox drained
+    """
+    if _worker is None:
+        return True
+    return _worker.flush(timeout)
@@ -1,5 +1,5 @@
 """Ranking module."""
-from .ranker import rank_candidates
+from .ranker import rank_candidates, score_candidates, calculate_overall_score_vec
 
-__all__ = ['rank_candidates']
+__all__ = ['rank_candidates', 'score_candidates', 'calculate_overall_score_vec']
 
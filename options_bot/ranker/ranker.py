@@ -2,6 +2,7 @@
 Ranking and scoring logic for combining signals.
 """
 import logging
+import numpy as np
 from typing import List, Optional
 from ..models import Fundamentals, OptionsSnapshot, Catalyst, SignalBundle, RankedIdea
 from ..signals import fundamental_bias, premium_bias, catalyst_score
@@ -69,14 +70,65 @@ def calculate_overall_score(
     return final_score
 
 
-def rank_candidates(
+def calculate_overall_score_vec(
+    fund_bias,
+    premium_bias,
+    catalyst_score,
+    liquidity_score,
+    market_cap,
+    weight_fundamental: Optional[float] = None,
+    weight_premium: Optional[float] = None,
+    weight_catalyst: Optional[float] = None,
+    min_liquidity_score: Optional[float] = None,
+    min_market_cap: Optional[float] = None
+) -> np.ndarray:
+    """
+    Vectorized calculate_overall_score over arrays of any shape.
+    
+    Weights and thresholds default to Settings so the result matches the
+    scalar version; pass them explicitly to evaluate alternatives.
+    
+    Args:
+        fund_bias: Fundamental bias scores
+        premium_bias: Premium bias scores
+        catalyst_score: Catalyst scores
+        liquidity_score: OptionsSnapshot.liquidity_score values
+        market_cap: Market caps
+        weight_fundamental: Weight of |fund_bias|
+        weight_premium: Weight of |premium_bias|
+        weight_catalyst: Weight of catalyst_score
+        min_liquidity_score: Liquidity below this is penalized
+        min_market_cap: Market cap below this is penalized
+        
+    Returns:
+        Array of overall scores from 0 to 10
+    """
+    w_fund = Settings.WEIGHT_FUNDAMENTAL if weight_fundamental is None else weight_fundamental
+    w_prem = Settings.WEIGHT_PREMIUM if weight_premium is None else weight_premium
+    w_cat = Settings.WEIGHT_CATALYST if weight_catalyst is None else weight_catalyst
+    min_liq = Settings.MIN_LIQUIDITY_SCORE if min_liquidity_score is None else min_liquidity_score
+    min_mcap = Settings.MIN_MARKET_CAP if min_market_cap is None else min_market_cap
+    
+    liq = np.asarray(liquidity_score, dtype=float)
+    base_score = (
+        np.abs(np.asarray(fund_bias, dtype=float)) * w_fund +
+        np.abs(np.asarray(premium_bias, dtype=float)) * w_prem +
+        np.asarray(catalyst_score, dtype=float) * w_cat
+    )
+    liquidity_penalty = np.where(liq < min_liq, (min_liq - liq) * 0.5, 0.0)
+    mcap_penalty = np.where(np.asarray(market_cap, dtype=float) < min_mcap, 1.0, 0.0)
+    
+    return np.clip(base_score - liquidity_penalty - mcap_penalty, 0.0, 10.0)
+
+
+def score_candidates(
     tickers: List[str],
     fundamentals: dict[str, Fundamentals],
     options: dict[str, OptionsSnapshot],
     catalysts: dict[str, Catalyst]
 ) -> List[RankedIdea]:
     """
-    Rank all candidate tickers and return sorted list of ideas.
+    Score every candidate ticker that has complete data.
     
     Args:
         tickers: List of ticker symbols
@@ -85,7 +137,7 @@ def rank_candidates(
         catalysts: Dict mapping ticker to Catalyst
         
     Returns:
-        Sorted list of RankedIdea objects (best first)
+        All scored RankedIdea objects sorted best first (not truncated)
     """
     ideas = []
     
@@ -139,6 +191,29 @@ def rank_candidates(
     # Sort by score (descending)
     ideas.sort(key=lambda x: x.score, reverse=True)
     
+    return ideas
+
+
+def rank_candidates(
+    tickers: List[str],
+    fundamentals: dict[str, Fundamentals],
+    options: dict[str, OptionsSnapshot],
+    catalysts: dict[str, Catalyst]
+) -> List[RankedIdea]:
+    """
+    Rank all candidate tickers and return sorted list of ideas.
+    
+    Args:
+        tickers: List of ticker symbols
+        fundamentals: Dict mapping ticker to Fundamentals
+        options: Dict mapping ticker to OptionsSnapshot
+        catalysts: Dict mapping ticker to Catalyst
+        
+    Returns:
+        Sorted list of RankedIdea objects (best first)
+    """
+    ideas = score_candidates(tickers, fundamentals, options, catalysts)
+    
     # Limit to MAX_PICKS
     ideas = ideas[:Settings.MAX_PICKS]
     
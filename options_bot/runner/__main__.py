@@ -3,12 +3,17 @@ Main entry point for running scans.
 """
 import sys
 from .scan import run_scan
+from ..notify.outbox import flush_notifications
 
 if __name__ == "__main__":
-    # Allow command line argument for scan name
-    scan_name = None
-    if len(sys.argv) > 1:
-        scan_name = " ".join(sys.argv[1:])
+    # Allow command line argument for scan name, plus --profile/--cprofile
+    args = [arg for arg in sys.argv[1:] if arg not in ('--profile', '--cprofile')]
+    use_cprofile = '--cprofile' in sys.argv
+    profile = use_cprofile or '--profile' in sys.argv
+    scan_name = " ".join(args) if args else None
     
-    run_scan(scan_name=scan_name)
+    run_scan(scan_name=scan_name, profile=profile, use_cprofile=use_cprofile)
+    
+    # Notifications are delivered in the background; wait before exiting
+    flush_notifications()
 
@@ -0,0 +1,105 @@
+"""
+Same-day baseline reused by incremental scans.
+
+The day's last full scan is kept in memory (the scheduler is a single
+long-running process). If the process restarted since, the latest run of
+the day is rebuilt from the feature store.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from ..config import Settings
+from ..models import Fundamentals, OptionsSnapshot, Catalyst
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanBaseline:
+    """Inputs fetched by a full scan."""
+    day: date
+    scan_time: datetime
+    fundamentals: Dict[str, Fundamentals] = field(default_factory=dict)
+    options: Dict[str, OptionsSnapshot] = field(default_factory=dict)
+    catalysts: Dict[str, Catalyst] = field(default_factory=dict)
+
+
+_baseline: Optional[ScanBaseline] = None
+
+
+def remember_baseline(
+    scan_time: datetime,
+    fundamentals: Dict[str, Fundamentals],
+    options: Dict[str, OptionsSnapshot],
+    catalysts: Dict[str, Catalyst]
+) -> None:
+    """
+    Keep a full scan's inputs for later incremental scans the same day.
+
+    Args:
+        scan_time: When the scan started (timezone-aware)
+        fundamentals: Dict mapping ticker to Fundamentals
+        options: Dict mapping ticker to OptionsSnapshot
+        catalysts: Dict mapping ticker to Catalyst
+    """
+    global _baseline
+    _baseline = ScanBaseline(
+        day=scan_time.astimezone(Settings.TIMEZONE).date(),
+        scan_time=scan_time,
+        fundamentals=dict(fundamentals),
+        options=dict(options),
+        catalysts=dict(catalysts)
+    )
+
+
+def load_baseline(day: date) -> Optional[ScanBaseline]:
+    """
+    Rebuild the latest stored scan of a day from the feature store.
+
+    Args:
+        day: Scan date
+
+    Returns:
+        ScanBaseline or None if nothing was stored that day
+    """
+    if not Settings.PERSIST_SNAPSHOTS:
+        return None
+
+    try:
+        from ..storage.feature_store import FeatureStore, snapshot_models
+
+        df = FeatureStore().load_run(day)
+        if df.empty:
+            return None
+
+        fundamentals, options, catalysts = snapshot_models(df)
+        scan_time = df['scan_time'].iloc[0].to_pydatetime()
+        logger.info(f"Loaded baseline for {day} from feature store ({len(df)} tickers)")
+        return ScanBaseline(day, scan_time, fundamentals, options, catalysts)
+
+    except Exception as e:
+        logger.error(f"Error loading baseline from feature store: {e}")
+        return None
+
+
+def get_baseline(day: date) -> Optional[ScanBaseline]:
+    """
+    Baseline for a trading day, from memory or the feature store.
+
+    Args:
+        day: Scan date
+
+    Returns:
+        ScanBaseline or None if no full scan ran that day
+    """
+    if _baseline is not None and _baseline.day == day:
+        return _baseline
+    return load_baseline(day)
+
+
+def clear_baseline() -> None:
+    """Forget the in-memory baseline."""
+    global _baseline
+    _baseline = None
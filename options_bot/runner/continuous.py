@@ -0,0 +1,299 @@
+"""
+Continuous intraday scanning.
+
+Cycles through the universe during market hours, re-scoring each ticker as
+soon as its data refreshes and keeping a live ranked list in memory. Each
+cycle reuses the day's baseline (fundamentals, earnings, daily history) and
+refreshes only spot, the option chain and, less often, news; historical
+volatility is updated incrementally from the seeded daily closes.
+"""
+import argparse
+import logging
+import threading
+import time
+from datetime import date, datetime, time as dtime
+from typing import Callable, Dict, List, Optional
+
+from ..config import Settings
+from ..models import RankedIdea
+from ..ingestion import get_options_snapshot, get_catalyst
+from ..ingestion.catalysts import refresh_catalyst
+from ..ingestion.fundamentals import get_price_history
+from ..ingestion.options import RollingHV, refresh_options_snapshot
+from ..ranker import score_candidates
+from ..storage import save_scan_snapshot, LIVE_RUN
+from ..notify.outbox import flush_notifications
+from .baseline import ScanBaseline, get_baseline, remember_baseline
+from .scan import load_universe, fetch_data, notify_ideas
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_time(value: str) -> dtime:
+    hour, minute = map(int, value.split(':'))
+    return dtime(hour, minute)
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """
+    Whether regular market hours are in session (Mon-Fri, no holiday calendar).
+
+    Args:
+        now: Time to check (current time if None)
+
+    Returns:
+        True between MARKET_OPEN and MARKET_CLOSE on a weekday
+    """
+    now = (now or datetime.now(Settings.TIMEZONE)).astimezone(Settings.TIMEZONE)
+    if now.weekday() >= 5:
+        return False
+    return _parse_time(Settings.MARKET_OPEN) <= now.time() < _parse_time(Settings.MARKET_CLOSE)
+
+
+class LiveRanking:
+    """Thread-safe ranked list of the latest idea per ticker."""
+
+    def __init__(self):
+        self._ideas: Dict[str, RankedIdea] = {}
+        self._lock = threading.Lock()
+
+    def update(self, idea: RankedIdea):
+        """Replace a ticker's idea."""
+        with self._lock:
+            self._ideas[idea.ticker] = idea
+
+    def remove(self, ticker: str):
+        """Drop a ticker that no longer scores."""
+        with self._lock:
+            self._ideas.pop(ticker, None)
+
+    def top(self, n: Optional[int] = None) -> List[RankedIdea]:
+        """
+        Best ideas first.
+
+        Args:
+            n: Number of ideas (all if None)
+
+        Returns:
+            List of RankedIdea sorted by score
+        """
+        with self._lock:
+            ideas = sorted(self._ideas.values(), key=lambda idea: idea.score, reverse=True)
+        return ideas if n is None else ideas[:n]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ideas)
+
+
+class ContinuousScanner:
+    """Re-scores the universe ticker by ticker at a fixed cadence."""
+
+    def __init__(
+        self,
+        universe: Optional[List[str]] = None,
+        cadence: Optional[float] = None,
+        news_every: Optional[int] = None,
+        snapshot_every: Optional[int] = None,
+        scan_name: str = "Live Scan",
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            universe: Tickers to cycle through (universe CSV if None)
+            cadence: Target seconds per full cycle (CONTINUOUS_CADENCE if None)
+            news_every: Refetch news every N cycles (CONTINUOUS_NEWS_EVERY if None)
+            snapshot_every: Save a live snapshot every N cycles
+                (CONTINUOUS_SNAPSHOT_EVERY if None; 0 = never)
+            scan_name: Name used in notifications
+            sleep: Sleep function (injectable for tests)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.universe = universe
+        self.cadence = Settings.CONTINUOUS_CADENCE if cadence is None else cadence
+        self.news_every = max(1, news_every or Settings.CONTINUOUS_NEWS_EVERY)
+        self.snapshot_every = Settings.CONTINUOUS_SNAPSHOT_EVERY if snapshot_every is None else snapshot_every
+        self.scan_name = scan_name
+        self.ranking = LiveRanking()
+        self.baseline: Optional[ScanBaseline] = None
+        self.cycle = 0
+        self._hv: Dict[str, RollingHV] = {}
+        self._sleep = sleep
+        self._clock = clock
+
+    def ensure_baseline(self, now: datetime) -> ScanBaseline:
+        """
+        Today's baseline, running a full fetch once if no scan ran yet.
+
+        Args:
+            now: Current time (timezone-aware)
+
+        Returns:
+            ScanBaseline for the day
+        """
+        day = now.astimezone(Settings.TIMEZONE).date()
+        if self.baseline is not None and self.baseline.day == day:
+            return self.baseline
+
+        if not self.universe:
+            self.universe = load_universe()
+
+        self._hv.clear()
+        self.ranking = LiveRanking()
+        self.cycle = 0
+
+        baseline = get_baseline(day)
+        if baseline is None:
+            logger.info("No baseline for today, running full fetch")
+            remember_baseline(now, *fetch_data(self.universe))
+            baseline = get_baseline(day)
+
+        # Work on copies so the shared baseline keeps the full scan's data
+        self.baseline = ScanBaseline(
+            baseline.day, baseline.scan_time,
+            dict(baseline.fundamentals), dict(baseline.options), dict(baseline.catalysts)
+        )
+        return self.baseline
+
+    def _hv_state(self, ticker: str, day: date) -> Optional[RollingHV]:
+        """Incremental HV seeded once per day from completed daily closes."""
+        if ticker not in self._hv:
+            state = None
+            hist = get_price_history(ticker, period="3mo")
+            if hist is not None and not hist.empty:
+                # During the session the last row is today's partial bar
+                closes = hist['Close']
+                closes = closes[[idx.date() < day for idx in closes.index]]
+                if len(closes) > 1:
+                    state = RollingHV(closes, window=30)
+            self._hv[ticker] = state
+        return self._hv[ticker]
+
+    def refresh_ticker(self, ticker: str, day: date, refresh_news: bool) -> Optional[RankedIdea]:
+        """
+        Refresh one ticker's intraday data and re-score it.
+
+        Args:
+            ticker: Ticker symbol
+            day: Trading day
+            refresh_news: Refetch headlines and sentiment this cycle
+
+        Returns:
+            The ticker's RankedIdea, or None if it no longer qualifies
+        """
+        baseline = self.baseline
+
+        previous = baseline.options.get(ticker)
+        if previous:
+            opts = refresh_options_snapshot(previous, self._hv_state(ticker, day))
+        else:
+            opts = get_options_snapshot(ticker)
+        if opts:
+            baseline.options[ticker] = opts
+
+        if refresh_news:
+            previous = baseline.catalysts.get(ticker)
+            cat = refresh_catalyst(previous) if previous else get_catalyst(ticker)
+            if cat:
+                baseline.catalysts[ticker] = cat
+
+        scored = score_candidates([ticker], baseline.fundamentals, baseline.options, baseline.catalysts)
+        if scored:
+            self.ranking.update(scored[0])
+            return scored[0]
+
+        self.ranking.remove(ticker)
+        return None
+
+    def run_cycle(self, now: Optional[datetime] = None) -> List[RankedIdea]:
+        """
+        Refresh and re-score every ticker once, paced across the cadence.
+
+        Args:
+            now: Cycle start time (current time if None)
+
+        Returns:
+            Top MAX_PICKS ideas after the cycle
+        """
+        now = now or datetime.now(Settings.TIMEZONE)
+        day = now.astimezone(Settings.TIMEZONE).date()
+        self.ensure_baseline(now)
+
+        refresh_news = self.cycle % self.news_every == 0
+        tickers = self.universe or []
+        interval = self.cadence / len(tickers) if tickers else 0.0
+        started = self._clock()
+
+        for i, ticker in enumerate(tickers):
+            try:
+                self.refresh_ticker(ticker, day, refresh_news)
+            except Exception as e:
+                logger.error(f"Error refreshing {ticker}: {e}")
+
+            # Spread requests over the cycle instead of bursting
+            wait = started + (i + 1) * interval - self._clock()
+            if wait > 0:
+                self._sleep(wait)
+
+        elapsed = self._clock() - started
+        if elapsed > self.cadence * 1.1:
+            logger.warning(f"Cycle {self.cycle} took {elapsed:.0f}s (cadence {self.cadence:.0f}s)")
+
+        self.cycle += 1
+        ideas = self.ranking.top(Settings.MAX_PICKS)
+        logger.info(f"Cycle {self.cycle} complete: {len(self.ranking)} scored, top {len(ideas)} kept")
+
+        # Saved as live runs, far less often than the cadence, so they stay
+        # out of the scheduled scans' history
+        if Settings.PERSIST_SNAPSHOTS and self.snapshot_every > 0 and self.cycle % self.snapshot_every == 0:
+            b = self.baseline
+            save_scan_snapshot(self.scan_name, now, tickers, b.fundamentals, b.options, b.catalysts,
+                               self.ranking.top(), kind=LIVE_RUN)
+
+        notify_ideas(ideas, self.scan_name)
+        return ideas
+
+    def run(self, stop_event: Optional[threading.Event] = None, poll_interval: float = 60.0):
+        """
+        Cycle during market hours until stopped.
+
+        Args:
+            stop_event: Set to stop after the current ticker
+            poll_interval: Seconds between checks while the market is closed
+        """
+        stop_event = stop_event or threading.Event()
+        logger.info(f"Continuous mode: cadence {self.cadence:.0f}s, news every {self.news_every} cycles")
+
+        while not stop_event.is_set():
+            if not is_market_open():
+                stop_event.wait(poll_interval)
+                continue
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logger.error(f"Continuous cycle failed: {e}", exc_info=True)
+                stop_event.wait(poll_interval)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run continuous mode from the command line."""
+    parser = argparse.ArgumentParser(description="Continuous intraday options scan")
+    parser.add_argument('--cadence', type=float, help="Seconds per full universe cycle")
+    parser.add_argument('--news-every', type=int, help="Refetch news every N cycles")
+    args = parser.parse_args(argv)
+
+    Settings.validate()
+    Settings.ensure_directories()
+
+    scanner = ContinuousScanner(cadence=args.cadence, news_every=args.news_every)
+    try:
+        scanner.run()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Continuous mode stopped")
+    finally:
+        flush_notifications()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,686 @@
+"""
+Multi-node scans: a coordinator leasing tickers to remote workers.
+
+The coordinator speaks a small HTTP/JSON protocol:
+
+    POST /lease    {"worker": id, "max": n}
+                   -> {"lease": id, "tickers": [[index, ticker], ...], "timeout": s}
+                   -> {"lease": null, "retry": s}   every ticker is leased out
+                   -> {"done": true}                the scan is finished
+    POST /results  {"lease": id, "results": [row, ...], "complete": bool}
+                   -> {"accepted": n, "expired": bool}
+    POST /renew    {"lease": id} -> {"expired": bool}
+    GET  /status   -> progress counts
+
+Every request carries the shared token in an X-Coordinator-Token header
+(401 otherwise). Workers run the usual streaming pipeline (fetch -> sentiment -> score) over
+each lease and post one flat row per ticker (its feature-store row: inputs,
+signals and strategy) as they go. Posting extends the lease; a lease not
+extended within its timeout is dropped and its unreported tickers go back
+to the front of the queue; so is a lease whose heartbeat keeps renewing it
+without any results arriving. The first result for a ticker wins, so a worker
+that comes back late does no harm. Ranking, storage and notification
+happen once, on the coordinator.
+
+Run a worker on each node with:
+    COORDINATOR_TOKEN=<secret> python -m options_bot.runner.distributed --url http://coordinator:8900
+"""
+import argparse
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import requests
+
+from ..config import Settings
+from ..models import RankedIdea, SignalBundle
+from ..storage.feature_store import row_models, snapshot_row
+from .pipeline import TickerData, TopK, stream_scan
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while waiting for the scan to finish
+_POLL_SECONDS = 0.5
+# Rows per /results post (a partial batch is sent after _FLUSH_SECONDS)
+_RESULT_BATCH = 5
+_FLUSH_SECONDS = 2.0
+# Failed coordinator calls in a row before a worker gives up
+_MAX_FAILURES = 5
+# Header carrying the shared coordinator token
+TOKEN_HEADER = 'X-Coordinator-Token'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode_result(index: int, ticker: str, data: TickerData, idea: Optional[RankedIdea]) -> dict:
+    """
+    Flatten one scored ticker for the wire.
+
+    Args:
+        index: Position of the ticker in the coordinator's universe
+        ticker: Ticker symbol
+        data: Fetched (Fundamentals, OptionsSnapshot, Catalyst)
+        idea: RankedIdea or None if the ticker could not be scored
+
+    Returns:
+        JSON-ready row (the feature-store row plus its index)
+    """
+    row = snapshot_row('', None, ticker, *data, idea)
+    for name in ('run_id', 'scan_time', 'rank'):
+        row.pop(name, None)
+    row['index'] = index
+    return json.loads(json.dumps(row, default=_json_default))
+
+
+def decode_result(row: dict) -> Tuple[int, str, TickerData, Optional[RankedIdea]]:
+    """
+    Rebuild a ticker's inputs and idea from an encoded row.
+
+    Returns:
+        Tuple of (index, ticker, data, idea)
+    """
+    row = dict(row)
+    if row.get('next_earnings_date'):
+        row['next_earnings_date'] = date.fromisoformat(row['next_earnings_date'])
+    ticker = row['ticker']
+    fund, opts, cat = row_models(row)
+
+    idea = None
+    if row.get('score') is not None and fund and opts and cat:
+        signals = SignalBundle(ticker, row['fund_bias'], row['premium_bias'], row['catalyst_score'])
+        idea = RankedIdea(ticker, row['score'], signals, opts, fund, cat, row['strategy'], row['notes'] or "")
+    return int(row['index']), ticker, (fund, opts, cat), idea
+
+
+@dataclass
+class CoordinatorStats:
+    """Counts from one coordinated scan."""
+    tickers: int = 0
+    received: int = 0
+    scored: int = 0
+    leases: int = 0
+    expired: int = 0
+    duplicates: int = 0
+    abandoned: int = 0
+    workers: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class _Lease:
+    lease_id: str
+    worker: str
+    indices: Set[int]
+    deadline: float
+    renewals: int = 0  # Heartbeats since the last result
+
+
+class ScanCoordinator:
+    """Hands out ticker leases and merges reported results through a top-K reducer."""
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        sink: Optional[Callable[[str, TickerData, Optional[RankedIdea]], None]] = None,
+        top_k: Optional[int] = None,
+        lease_size: Optional[int] = None,
+        lease_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        max_renewals: Optional[int] = None
+    ):
+        """
+        Args:
+            tickers: Universe to scan
+            sink: Called with (ticker, data, idea) for every first result
+            top_k: Ideas to keep (MAX_PICKS if None)
+            lease_size: Most tickers per lease (LEASE_SIZE if None)
+            lease_timeout: Seconds a lease lives without a post (LEASE_TIMEOUT if None)
+            max_attempts: Leases per ticker before it is given up
+            max_renewals: Renewals in a row without results before a lease
+                is reassigned (LEASE_MAX_RENEWALS if None)
+        """
+        self.tickers = list(tickers)
+        self.sink = sink
+        self.lease_size = max(1, lease_size or Settings.LEASE_SIZE)
+        self.lease_timeout = lease_timeout or Settings.LEASE_TIMEOUT
+        self.max_attempts = max_attempts
+        self.max_renewals = Settings.LEASE_MAX_RENEWALS if max_renewals is None else max_renewals
+        self.stats = CoordinatorStats(tickers=len(self.tickers))
+        self._top = TopK(top_k or Settings.MAX_PICKS)
+        self._pending = deque(range(len(self.tickers)))
+        self._attempts = [0] * len(self.tickers)
+        self._done: Set[int] = set()
+        self._leases: Dict[str, _Lease] = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        if not self.tickers:
+            self._finished.set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def lease(self, worker: str, count: Optional[int] = None) -> dict:
+        """Lease up to count unfinished tickers to a worker."""
+        with self._lock:
+            self._expire()
+            self.stats.workers.add(worker)
+            if self.finished:
+                return {'done': True}
+
+            count = min(count or self.lease_size, self.lease_size)
+            indices = []
+            while self._pending and len(indices) < count:
+                index = self._pending.popleft()
+                if index not in self._done:
+                    indices.append(index)
+            if not indices:
+                return {'lease': None, 'retry': min(1.0, self.lease_timeout / 4)}
+
+            for index in indices:
+                self._attempts[index] += 1
+            lease = _Lease(uuid.uuid4().hex[:12], worker, set(indices), time.monotonic() + self.lease_timeout)
+            self._leases[lease.lease_id] = lease
+            self.stats.leases += 1
+
+        logger.debug(f"Lease {lease.lease_id}: {len(indices)} tickers to {worker}")
+        return {
+            'lease': lease.lease_id,
+            'tickers': [[index, self.tickers[index]] for index in indices],
+            'timeout': self.lease_timeout,
+        }
+
+    def submit(self, lease_id: Optional[str], rows: List[dict], complete: bool = False) -> dict:
+        """Merge reported rows and extend (or close) their lease."""
+        decoded = []
+        for row in rows:
+            try:
+                decoded.append(decode_result(row))
+            except Exception as e:
+                logger.error(f"Bad result row from lease {lease_id}: {e}")
+
+        with self._lock:
+            lease = self._leases.get(lease_id)
+            accepted = 0
+            for index, ticker, data, idea in decoded:
+                if not 0 <= index < len(self.tickers) or self.tickers[index] != ticker:
+                    logger.warning(f"Lease {lease_id} reported unknown ticker {ticker} at {index}")
+                    continue
+                if lease is not None:
+                    lease.indices.discard(index)
+                if index in self._done:
+                    self.stats.duplicates += 1
+                    continue
+                self._done.add(index)
+                accepted += 1
+                self._merge(index, ticker, data, idea)
+
+            if lease is not None:
+                lease.deadline = time.monotonic() + self.lease_timeout
+                if decoded:
+                    lease.renewals = 0
+                if complete or not lease.indices:
+                    del self._leases[lease_id]
+                    # Tickers the worker skipped go to the next lease
+                    self._requeue(lease.indices)
+            self._check_finished()
+
+        return {'accepted': accepted, 'expired': lease is None}
+
+    def renew(self, lease_id: Optional[str]) -> dict:
+        """
+        Extend a lease whose worker is still busy.
+
+        A worker stuck on a hung fetch keeps heartbeating, so a lease is
+        only renewed max_renewals times in a row without new results;
+        after that it is reassigned like an expired one.
+        """
+        with self._lock:
+            lease = self._leases.get(lease_id)
+            if lease is not None:
+                lease.renewals += 1
+                if lease.renewals > self.max_renewals:
+                    logger.warning(f"Lease {lease.lease_id} of {lease.worker} renewed {self.max_renewals} times "
+                                   f"without results")
+                    self._drop(lease)
+                    lease = None
+                else:
+                    lease.deadline = time.monotonic() + self.lease_timeout
+            self._check_finished()
+        return {'expired': lease is None}
+
+    def status(self) -> dict:
+        with self._lock:
+            self._expire()
+            return {
+                'tickers': self.stats.tickers,
+                'done': len(self._done),
+                'pending': len(self._pending),
+                'leased': sum(len(lease.indices) for lease in self._leases.values()),
+                'leases': len(self._leases),
+                'expired': self.stats.expired,
+                'workers': len(self.stats.workers),
+                'finished': self.finished,
+            }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every ticker is reported or given up."""
+        if self._finished.wait(timeout):
+            return True
+        # Nobody may be asking for work, so reap expired leases here too
+        with self._lock:
+            self._expire()
+            self._check_finished()
+        return self.finished
+
+    def results(self) -> Tuple[List[RankedIdea], CoordinatorStats]:
+        """Top ideas best first, and the scan's counts."""
+        return self._top.items(), self.stats
+
+    def _merge(self, index: int, ticker: str, data: TickerData, idea: Optional[RankedIdea]):
+        self.stats.received += 1
+        if idea is not None:
+            self.stats.scored += 1
+            # Universe position breaks ties, so ranking is independent of arrival order
+            self._top.push(idea, order=index)
+        if self.sink is not None:
+            try:
+                self.sink(ticker, data, idea)
+            except Exception as e:
+                logger.error(f"Error storing {ticker}: {e}")
+
+    def _expire(self):
+        now = time.monotonic()
+        for lease in [lease for lease in self._leases.values() if lease.deadline < now]:
+            self._drop(lease)
+
+    def _drop(self, lease: _Lease):
+        del self._leases[lease.lease_id]
+        self.stats.expired += 1
+        logger.warning(f"Lease {lease.lease_id} of {lease.worker} expired, "
+                       f"reassigning {len(lease.indices)} tickers")
+        self._requeue(lease.indices)
+
+    def _requeue(self, indices: Set[int]):
+        for index in sorted(indices, reverse=True):
+            if index in self._done:
+                continue
+            if self._attempts[index] >= self.max_attempts:
+                logger.error(f"Giving up on {self.tickers[index]} after {self._attempts[index]} leases")
+                self._done.add(index)
+                self.stats.abandoned += 1
+            else:
+                self._pending.appendleft(index)
+
+    def _check_finished(self):
+        if len(self._done) == len(self.tickers):
+            self._finished.set()
+
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    """Routes the lease protocol to the server's ScanCoordinator."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: 'CoordinatorServer'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _authorized(self) -> bool:
+        token = self.headers.get(TOKEN_HEADER, '')
+        if hmac.compare_digest(token.encode(), self.server.token.encode()):
+            return True
+        logger.warning(f"Rejected coordinator request from {self.address_string()} without a valid token")
+        self._send(401, {'error': "missing or invalid coordinator token"})
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip('/') == '/status':
+            return self._send(200, self.server.coordinator.status())
+        self._send(404, {'error': f"unknown route {self.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            return self._send(400, {'error': f"bad request body: {e}"})
+
+        coordinator = self.server.coordinator
+        route = self.path.rstrip('/')
+        try:
+            if route == '/lease':
+                reply = coordinator.lease(str(body.get('worker', self.address_string())), body.get('max'))
+            elif route == '/results':
+                reply = coordinator.submit(body.get('lease'), body.get('results', []), bool(body.get('complete')))
+            elif route == '/renew':
+                reply = coordinator.renew(body.get('lease'))
+            else:
+                return self._send(404, {'error': f"unknown route {self.path}"})
+        except Exception as e:
+            logger.error(f"Coordinator error on {route}: {e}")
+            return self._send(500, {'error': str(e)})
+        self._send(200, reply)
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class CoordinatorServer(ThreadingHTTPServer):
+    """HTTP front end for a ScanCoordinator."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], coordinator: ScanCoordinator, token: str):
+        super().__init__(address, _CoordinatorHandler)
+        self.coordinator = coordinator
+        self.token = token
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if host in ('0.0.0.0', ''):
+            host = socket.gethostname()
+        return f"http://{host}:{port}"
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve(coordinator: ScanCoordinator, host: str = '127.0.0.1', port: int = 0,
+          token: Optional[str] = None) -> CoordinatorServer:
+    """
+    Serve a coordinator on a background thread.
+
+    Args:
+        coordinator: Scan to hand out
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        token: Shared secret every request must carry (COORDINATOR_TOKEN if
+            None; a random one when that is unset and host is loopback)
+
+    Returns:
+        The running server (call shutdown() to stop it; its token is
+        server.token)
+    """
+    token = token or Settings.COORDINATOR_TOKEN
+    if not token:
+        if not _is_loopback(host):
+            raise ValueError(f"COORDINATOR_TOKEN must be set to listen on {host}")
+        token = secrets.token_urlsafe(16)
+    server = CoordinatorServer((host, port), coordinator, token)
+    threading.Thread(target=server.serve_forever, name='scan-coordinator', daemon=True).start()
+    return server
+
+
+def _parse_listen(listen: str) -> Tuple[str, int]:
+    host, _, port = listen.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def start_local_worker(url: str, token: str) -> subprocess.Popen:
+    """Launch a worker process on this machine, using this process's transport."""
+    from .sharded import _transport_args
+    mode, path, latency, standin_url = _transport_args()
+    env = dict(os.environ, TRANSPORT_MODE=mode, STANDIN_URL=standin_url or '', COORDINATOR_TOKEN=token)
+    if path is not None:
+        env['CASSETTE_PATH'] = str(path)
+    if latency is not None:
+        env['REPLAY_LATENCY'] = str(latency)
+    return subprocess.Popen([sys.executable, '-m', 'options_bot.runner.distributed', '--url', url], env=env)
+
+
+def distributed_scan(
+    tickers: Sequence[str],
+    listen: Optional[str] = None,
+    sink: Optional[Callable[[str, TickerData, Optional[RankedIdea]], None]] = None,
+    top_k: Optional[int] = None,
+    lease_size: Optional[int] = None,
+    lease_timeout: Optional[float] = None,
+    local_workers: int = 0,
+    timeout: Optional[float] = None
+) -> Tuple[List[RankedIdea], CoordinatorStats]:
+    """
+    Coordinate a scan across worker nodes and keep the top ideas.
+
+    Args:
+        tickers: Ticker symbols
+        listen: host:port to serve the lease protocol on (COORDINATOR_LISTEN if None)
+        sink: Called with (ticker, data, idea) per ticker, on this node
+        top_k: Ideas to keep (MAX_PICKS if None)
+        lease_size: Most tickers per lease (LEASE_SIZE if None)
+        lease_timeout: Seconds before an idle lease is reassigned (LEASE_TIMEOUT if None)
+        local_workers: Worker processes to start on this machine
+        timeout: Give up waiting after this many seconds and rank what was
+            reported (DISTRIBUTED_SCAN_TIMEOUT if None; 0 waits for every ticker)
+
+    Returns:
+        Tuple of (top ideas best first, CoordinatorStats)
+    """
+    coordinator = ScanCoordinator(tickers, sink=sink, top_k=top_k,
+                                  lease_size=lease_size, lease_timeout=lease_timeout)
+    server = serve(coordinator, *_parse_listen(listen or Settings.COORDINATOR_LISTEN))
+    logger.info(f"Coordinating {len(tickers)} tickers at {server.url}")
+    local_url = f"http://127.0.0.1:{server.server_address[1]}"
+    local = [start_local_worker(local_url, server.token) for _ in range(local_workers)]
+
+    timeout = Settings.DISTRIBUTED_SCAN_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout if timeout else None
+    try:
+        while not coordinator.wait(_POLL_SECONDS):
+            if deadline and time.monotonic() > deadline:
+                logger.error(f"Distributed scan timed out: {coordinator.status()}")
+                break
+        # Local workers exit once they are told the scan is done
+        for process in local:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    finally:
+        server.shutdown()
+        server.server_close()
+        for process in local:
+            if process.poll() is None:
+                process.kill()
+
+    ideas, stats = coordinator.results()
+    logger.info(f"Distributed scan: {len(stats.workers)} workers, {stats.leases} leases "
+                f"({stats.expired} expired), {stats.received} received, {stats.scored} scored, "
+                f"{stats.abandoned} abandoned")
+    return ideas, stats
+
+
+def _post(session: requests.Session, url: str, route: str, body: dict) -> Optional[dict]:
+    """POST to the coordinator, or None if it could not be reached."""
+    try:
+        response = session.post(f"{url}{route}", json=body, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logger.warning(f"Coordinator {route} failed: {e}")
+        return None
+
+
+def _work_lease(session: requests.Session, url: str, worker_id: str, lease: dict,
+                fetch: Callable, score: Callable, analyze: bool, fetch_workers: Optional[int],
+                fetch_many: Optional[Callable] = None) -> int:
+    """Run one lease through the pipeline, streaming rows back; returns rows sent."""
+    from ..ingestion.catalysts import apply_sentiment
+
+    lease_id = lease['lease']
+    positions: Dict[str, List[int]] = {}
+    lost = threading.Event()
+    stop = threading.Event()
+    buffer: List[dict] = []
+    sent = [0]
+    last_post = [time.monotonic()]
+
+    def pull():
+        for index, ticker in lease['tickers']:
+            if lost.is_set():
+                logger.warning(f"Lease {lease_id} expired, dropping its remaining tickers")
+                return
+            positions.setdefault(ticker, []).append(index)
+            yield ticker
+
+    def flush(complete: bool = False):
+        rows = buffer[:]
+        buffer.clear()
+        reply = _post(session, url, '/results',
+                      {'worker': worker_id, 'lease': lease_id, 'results': rows, 'complete': complete})
+        last_post[0] = time.monotonic()
+        if reply is None:
+            buffer[:0] = rows  # Retried with the next post
+            return
+        sent[0] += len(rows)
+        if reply.get('expired'):
+            lost.set()
+
+    def send(ticker: str, data: TickerData, idea: Optional[RankedIdea]):
+        buffer.append(encode_result(positions[ticker].pop(0), ticker, data, idea))
+        if len(buffer) >= _RESULT_BATCH or time.monotonic() - last_post[0] >= _FLUSH_SECONDS:
+            flush()
+
+    def heartbeat():
+        # Keeps the lease alive while a slow ticker produces no rows; the
+        # coordinator stops renewing it if no rows follow for too long
+        interval = max(0.1, float(lease['timeout']) / 3)
+        with requests.Session() as beat_session:
+            beat_session.headers.update(session.headers)
+            while not stop.wait(interval):
+                reply = _post(beat_session, url, '/renew', {'lease': lease_id})
+                if reply is not None and reply.get('expired'):
+                    lost.set()
+
+    beat = threading.Thread(target=heartbeat, name='lease-heartbeat', daemon=True)
+    beat.start()
+    try:
+        fetch_workers = fetch_workers or Settings.PIPELINE_FETCH_WORKERS
+        stream_scan(pull(), fetch, score, analyze=apply_sentiment if analyze else None, sink=send,
+                    top_k=1, fetch_workers=fetch_workers, queue_size=fetch_workers, fetch_many=fetch_many)
+    finally:
+        stop.set()
+        flush(complete=True)
+    return sent[0]
+
+
+def run_worker(
+    url: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    lease_size: Optional[int] = None,
+    fetch_workers: Optional[int] = None,
+    fetch: Optional[Callable[[str], TickerData]] = None,
+    score: Optional[Callable[[str, TickerData], Optional[RankedIdea]]] = None,
+    analyze: bool = True,
+    forever: bool = False,
+    token: Optional[str] = None
+) -> int:
+    """
+    Lease tickers from a coordinator until its scan is done.
+
+    Args:
+        url: Coordinator URL (COORDINATOR_URL if None)
+        worker_id: Name reported to the coordinator (host-pid if None)
+        lease_size: Tickers to ask for per lease (coordinator's LEASE_SIZE if None)
+        fetch_workers: Fetch threads (PIPELINE_FETCH_WORKERS if None)
+        fetch: Per-ticker fetch (fetch_ticker if None)
+        score: Per-ticker scorer (score_ticker if None)
+        analyze: Score headline sentiment before scoring
+        forever: Keep polling for the next scan instead of exiting
+        token: Shared coordinator secret (COORDINATOR_TOKEN if None)
+
+    Returns:
+        Number of ticker results reported
+    """
+    from . import scan
+
+    url = (url or Settings.COORDINATOR_URL).rstrip('/')
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    # The default fetch takes each lease through the planner a batch at a time
+    fetch_many = scan.fetch_tickers if fetch is None else None
+    fetch = fetch or scan.fetch_ticker
+    score = score or scan.score_ticker
+    session = requests.Session()
+    session.headers[TOKEN_HEADER] = token or Settings.COORDINATOR_TOKEN or ''
+    reported = 0
+    failures = 0
+
+    logger.info(f"Worker {worker_id} polling {url}")
+    while True:
+        reply = _post(session, url, '/lease', {'worker': worker_id, 'max': lease_size})
+        if reply is None:
+            failures += 1
+            if failures >= _MAX_FAILURES and not forever:
+                logger.error(f"Coordinator {url} unreachable, stopping")
+                break
+            time.sleep(min(30.0, 2.0 ** failures))
+            continue
+        failures = 0
+
+        if reply.get('done'):
+            if not forever:
+                break
+            time.sleep(5.0)
+            continue
+        if not reply.get('lease'):
+            time.sleep(float(reply.get('retry', 1.0)))
+            continue
+
+        reported += _work_lease(session, url, worker_id, reply, fetch, score, analyze, fetch_workers, fetch_many)
+
+    session.close()
+    logger.info(f"Worker {worker_id} reported {reported} tickers")
+    return reported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a distributed scan worker")
+    parser.add_argument('--url', help="Coordinator URL (default COORDINATOR_URL)")
+    parser.add_argument('--id', help="Worker name (default host-pid)")
+    parser.add_argument('--lease-size', type=int, help="Tickers per lease")
+    parser.add_argument('--fetch-workers', type=int, help="Fetch threads (default PIPELINE_FETCH_WORKERS)")
+    parser.add_argument('--forever', action='store_true', help="Keep serving scans instead of exiting")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, Settings.LOG_LEVEL),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    run_worker(args.url, args.id, args.lease_size, args.fetch_workers, forever=args.forever)
@@ -0,0 +1,233 @@
+"""
+Streaming scan pipeline.
+
+Tickers flow through bounded queues (fetch -> analyze -> score) and the
+best ideas are kept in a fixed-size heap, so a scan holds only what is in
+flight plus the top picks no matter how large the universe is. Each
+ticker's data is handed to an optional sink (feature store writer) once
+it is scored and then released.
+"""
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import Settings
+from ..models import Fundamentals, OptionsSnapshot, Catalyst, RankedIdea
+
+logger = logging.getLogger(__name__)
+
+# Fetched inputs for one ticker
+TickerData = Tuple[Optional[Fundamentals], Optional[OptionsSnapshot], Optional[Catalyst]]
+
+_DONE = object()
+
+
+class TopK:
+    """Best k ideas by score, kept in a min-heap."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+
+    def push(self, idea: RankedIdea, order: Optional[int] = None) -> bool:
+        """
+        Offer an idea.
+
+        Args:
+            idea: Scored idea
+            order: Position used to break ties (arrival order if None)
+
+        Returns:
+            True if it is currently among the best k
+        """
+        # Earlier arrivals win ties, like the stable sort in score_candidates
+        entry = (idea.score, -(next(self._seq) if order is None else order), idea)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def items(self) -> List[RankedIdea]:
+        """Kept ideas, best first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+@dataclass
+class PipelineStats:
+    """Counts from one streamed scan."""
+    tickers: int = 0
+    fetched: int = 0
+    scored: int = 0
+    errors: int = 0
+
+
+def stream_scan(
+    tickers: Iterable[str],
+    fetch: Callable[[str], TickerData],
+    score: Callable[[str, TickerData], Optional[RankedIdea]],
+    analyze: Optional[Callable[[Dict[str, Catalyst]], None]] = None,
+    sink: Optional[Callable[[str, TickerData, Optional[RankedIdea]], None]] = None,
+    top_k: Optional[int] = None,
+    fetch_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    analyze_headlines: Optional[int] = None,
+    analyze_wait: Optional[float] = None,
+    fetch_many: Optional[Callable[[List[str]], Dict[str, TickerData]]] = None,
+    fetch_batch: Optional[int] = None
+) -> Tuple[List[RankedIdea], PipelineStats]:
+    """
+    Run tickers through fetch -> analyze -> score and keep the top ideas.
+
+    Args:
+        tickers: Ticker symbols (may be a lazy iterable)
+        fetch: Ticker -> (fundamentals, options, catalyst); runs on worker threads
+            (unused when fetch_many is given)
+        score: (ticker, data) -> RankedIdea or None if it cannot be scored
+        analyze: Scores a batch of catalysts in place (e.g. apply_sentiment)
+        sink: Called with every ticker's data and idea after scoring
+        top_k: Ideas to keep (MAX_PICKS if None)
+        fetch_workers: Concurrent fetch threads (PIPELINE_FETCH_WORKERS if None)
+        queue_size: Capacity of each stage queue (PIPELINE_QUEUE_SIZE if None)
+        analyze_headlines: Headlines (and at most as many tickers) per analyze
+            call (FINBERT_BATCH_SIZE if None)
+        analyze_wait: Seconds a partial analyze batch waits for more tickers
+            (PIPELINE_ANALYZE_WAIT if None)
+        fetch_many: Tickers -> {ticker: data} for a whole batch; when given,
+            fetch threads take fetch_batch tickers at a time
+        fetch_batch: Tickers per fetch_many call (PIPELINE_FETCH_BATCH if None)
+
+    Returns:
+        Tuple of (top ideas best first, PipelineStats)
+    """
+    top = TopK(top_k or Settings.MAX_PICKS)
+    fetch_workers = max(1, fetch_workers or Settings.PIPELINE_FETCH_WORKERS)
+    queue_size = queue_size or Settings.PIPELINE_QUEUE_SIZE
+    analyze_headlines = max(1, analyze_headlines or Settings.FINBERT_BATCH_SIZE)
+    analyze_wait = Settings.PIPELINE_ANALYZE_WAIT if analyze_wait is None else analyze_wait
+    fetch_batch = max(1, fetch_batch or Settings.PIPELINE_FETCH_BATCH) if fetch_many is not None else 1
+    stats = PipelineStats()
+    lock = threading.Lock()
+
+    # Batches of (index, ticker); only a few whole batches wait ahead of the fetch threads
+    pending: queue.Queue = queue.Queue(maxsize=queue_size if fetch_many is None else fetch_workers)
+    fetched: queue.Queue = queue.Queue(maxsize=queue_size)
+    analyzed: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    def feed():
+        # Universe position travels with each ticker so ties rank in
+        # universe order whatever order the fetch threads finish in
+        batch = []
+        for index, ticker in enumerate(tickers):
+            batch.append((index, ticker))
+            stats.tickers += 1
+            if len(batch) >= fetch_batch:
+                pending.put(batch)
+                batch = []
+        if batch:
+            pending.put(batch)
+        for _ in range(fetch_workers):
+            pending.put(_DONE)
+
+    def fetch_worker():
+        try:
+            while True:
+                batch = pending.get()
+                if batch is _DONE:
+                    return
+                names = [ticker for _, ticker in batch]
+                try:
+                    found = fetch_many(names) if fetch_many is not None else {names[0]: fetch(names[0])}
+                except Exception as e:
+                    logger.error(f"Error fetching {', '.join(names)}: {e}")
+                    found = {}
+                with lock:
+                    stats.fetched += sum(ticker in found for ticker in names)
+                    stats.errors += sum(ticker not in found for ticker in names)
+                for index, ticker in batch:
+                    fetched.put((index, ticker, found.get(ticker, (None, None, None))))
+        finally:
+            fetched.put(_DONE)
+
+    def analyze_stage():
+        done = 0
+        batch, headlines, deadline = [], 0, None
+        while done < fetch_workers:
+            try:
+                item = fetched.get(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _DONE:
+                done += 1
+            elif item is not None:
+                if not batch:
+                    deadline = time.monotonic() + analyze_wait
+                batch.append(item)
+                catalyst = item[2][2]
+                headlines += len(catalyst.headlines) if catalyst is not None else 0
+            # Fetching is slower than scoring, so wait for a full batch of
+            # headlines unless it takes longer than analyze_wait
+            full = headlines >= analyze_headlines or len(batch) >= analyze_headlines
+            if batch and (analyze is None or full or done == fetch_workers or time.monotonic() >= deadline):
+                _analyze(batch)
+                for entry in batch:
+                    analyzed.put(entry)
+                batch, headlines, deadline = [], 0, None
+        analyzed.put(_DONE)
+
+    def _analyze(batch):
+        if analyze is None:
+            return
+        catalysts = {ticker: data[2] for _, ticker, data in batch if data[2] is not None}
+        if catalysts:
+            try:
+                analyze(catalysts)
+            except Exception as e:
+                logger.error(f"Error analyzing batch: {e}")
+
+    threads = [threading.Thread(target=feed, name='scan-feed', daemon=True)]
+    threads += [
+        threading.Thread(target=fetch_worker, name=f'scan-fetch-{i}', daemon=True)
+        for i in range(fetch_workers)
+    ]
+    threads.append(threading.Thread(target=analyze_stage, name='scan-analyze', daemon=True))
+    for thread in threads:
+        thread.start()
+
+    # Score on the calling thread so sinks need no locking
+    while True:
+        item = analyzed.get()
+        if item is _DONE:
+            break
+        index, ticker, data = item
+        try:
+            idea = score(ticker, data)
+        except Exception as e:
+            logger.error(f"Error scoring {ticker}: {e}")
+            idea = None
+        if idea is not None:
+            stats.scored += 1
+            top.push(idea, order=index)
+        if sink is not None:
+            try:
+                sink(ticker, data, idea)
+            except Exception as e:
+                logger.error(f"Error storing {ticker}: {e}")
+
+    for thread in threads:
+        thread.join()
+
+    logger.info(f"Pipeline: {stats.tickers} tickers, {stats.fetched} fetched, "
+                f"{stats.scored} scored, {stats.errors} errors")
+    return top.items(), stats
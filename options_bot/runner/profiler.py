@@ -0,0 +1,283 @@
+"""
+Scan profiler.
+
+Records wall and CPU time per stage (universe load, each ingestion source,
+sentiment, scoring, storage, notification) and per ticker, optionally
+under cProfile, and writes a JSON report plus a text summary to logs/.
+When profiling is off, instrumented code gets a shared no-op context so
+the overhead is one function call per stage.
+"""
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+_NULL_STAGE = nullcontext()
+
+
+class NullProfiler:
+    """Profiler used when profiling is off."""
+
+    enabled = False
+
+    def stage(self, name: str, ticker: Optional[str] = None):
+        return _NULL_STAGE
+
+
+class ScanProfiler:
+    """Collects per-stage and per-ticker timings for one scan."""
+
+    enabled = True
+
+    def __init__(self, scan_name: str = "", use_cprofile: bool = False):
+        """
+        Args:
+            scan_name: Name of the profiled scan
+            use_cprofile: Also record function-level stats with cProfile
+        """
+        self.scan_name = scan_name
+        self.use_cprofile = use_cprofile
+        self.started_at = datetime.now(Settings.TIMEZONE)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, dict] = defaultdict(lambda: {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'max_wall': 0.0})
+        self._tickers: Dict[str, dict] = defaultdict(lambda: {'wall': 0.0, 'cpu': 0.0, 'stages': defaultdict(float)})
+        self._profiles: List[cProfile.Profile] = []
+
+    def _thread_profile(self) -> Optional[cProfile.Profile]:
+        """This thread's cProfile (cProfile hooks are per thread)."""
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            profile = cProfile.Profile()
+            self._local.profile = profile
+            with self._lock:
+                self._profiles.append(profile)
+        return profile
+
+    @contextmanager
+    def stage(self, name: str, ticker: Optional[str] = None):
+        """
+        Time a block of work.
+
+        Args:
+            name: Stage name (e.g. 'fundamentals', 'score')
+            ticker: Ticker the work belongs to, if any
+        """
+        depth = getattr(self._local, 'depth', 0)
+        profile = None
+        if self.use_cprofile and depth == 0:
+            profile = self._thread_profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # Another profiler (e.g. an outer cProfile run) is active
+        self._local.depth = depth + 1
+
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            self._local.depth = depth
+            if profile is not None:
+                profile.disable()
+            self._record(name, ticker, wall, cpu)
+
+    def _record(self, name: str, ticker: Optional[str], wall: float, cpu: float):
+        with self._lock:
+            stage = self._stages[name]
+            stage['calls'] += 1
+            stage['wall'] += wall
+            stage['cpu'] += cpu
+            stage['max_wall'] = max(stage['max_wall'], wall)
+            if ticker:
+                entry = self._tickers[ticker]
+                entry['wall'] += wall
+                entry['cpu'] += cpu
+                entry['stages'][name] += wall
+
+    def finish(self):
+        """Stop the scan clocks."""
+        self.wall_time = time.perf_counter() - self._wall_start
+        self.cpu_time = time.process_time() - self._cpu_start
+
+    def slowest_tickers(self, n: int = 10) -> List[dict]:
+        """Tickers with the most wall time, slowest first."""
+        with self._lock:
+            items = sorted(self._tickers.items(), key=lambda item: item[1]['wall'], reverse=True)[:n]
+        return [
+            {'ticker': ticker, 'wall': round(entry['wall'], 4), 'cpu': round(entry['cpu'], 4),
+             'stages': {k: round(v, 4) for k, v in entry['stages'].items()}}
+            for ticker, entry in items
+        ]
+
+    def report(self) -> dict:
+        """
+        Machine-readable report.
+
+        Returns:
+            Dict with scan totals, per-stage and per-ticker timings
+        """
+        with self._lock:
+            stages = {
+                name: {k: round(v, 4) if isinstance(v, float) else v for k, v in stage.items()}
+                for name, stage in sorted(self._stages.items(), key=lambda item: item[1]['wall'], reverse=True)
+            }
+            tickers = {
+                ticker: {'wall': round(entry['wall'], 4), 'cpu': round(entry['cpu'], 4),
+                         'stages': {k: round(v, 4) for k, v in entry['stages'].items()}}
+                for ticker, entry in self._tickers.items()
+            }
+        return {
+            'scan_name': self.scan_name,
+            'started_at': self.started_at.isoformat(),
+            'wall_time': round(self.wall_time, 4),
+            'cpu_time': round(self.cpu_time, 4),
+            'stages': stages,
+            'tickers': tickers,
+            'slowest_tickers': self.slowest_tickers(),
+        }
+
+    def _cprofile_stats(self) -> Optional[pstats.Stats]:
+        profiles = [p for p in self._profiles if p.getstats()]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def summary(self, report: Optional[dict] = None, top_functions: int = 20) -> str:
+        """
+        Human-readable summary of the slowest stages and tickers.
+
+        Args:
+            report: Report from report() (built if None)
+            top_functions: cProfile functions to list by cumulative time
+
+        Returns:
+            Summary text
+        """
+        report = report or self.report()
+        lines = [
+            f"Scan profile: {self.scan_name}",
+            f"Started {report['started_at']}  wall {report['wall_time']:.2f}s  cpu {report['cpu_time']:.2f}s",
+            "",
+            "Stages (summed across threads):",
+            f"  {'stage':<16}{'calls':>7}{'wall s':>10}{'cpu s':>10}{'max s':>10}",
+        ]
+        for name, stage in report['stages'].items():
+            lines.append(f"  {name:<16}{stage['calls']:>7}{stage['wall']:>10.3f}{stage['cpu']:>10.3f}{stage['max_wall']:>10.3f}")
+
+        lines += ["", "Slowest tickers:"]
+        for entry in report['slowest_tickers']:
+            breakdown = ", ".join(f"{k} {v:.2f}s" for k, v in sorted(entry['stages'].items(), key=lambda kv: -kv[1]))
+            lines.append(f"  {entry['ticker']:<8}{entry['wall']:>8.2f}s  ({breakdown})")
+
+        stats = self._cprofile_stats() if self.use_cprofile else None
+        if stats is not None:
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats('cumulative').print_stats(top_functions)
+            lines += ["", f"Top {top_functions} functions by cumulative time:", out.getvalue().rstrip()]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Optional[Path] = None) -> Path:
+        """
+        Write the JSON report, text summary and (with cProfile) .prof stats.
+
+        Args:
+            directory: Output directory (PROFILE_DIR if None)
+
+        Returns:
+            Path of the JSON report
+        """
+        directory = Path(directory) if directory else Settings.resolve_path(Settings.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"scan_profile_{self.started_at.strftime('%Y%m%dT%H%M%S')}"
+
+        report = self.report()
+        stats = self._cprofile_stats() if self.use_cprofile else None
+        if stats is not None:
+            prof_path = directory / f"{stem}.prof"
+            stats.dump_stats(str(prof_path))
+            report['cprofile'] = str(prof_path)
+
+        json_path = directory / f"{stem}.json"
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        with open(directory / f"{stem}.txt", 'w') as f:
+            f.write(self.summary(report))
+
+        logger.info(f"Scan profile written to {json_path}")
+        return json_path
+
+
+_null = NullProfiler()
+_current = _null
+
+
+def get_profiler():
+    """Profiler of the running scan (a no-op profiler when off)."""
+    return _current
+
+
+def start_profiling(scan_name: str = "", use_cprofile: bool = False) -> ScanProfiler:
+    """
+    Make a new ScanProfiler current.
+
+    Args:
+        scan_name: Name of the profiled scan
+        use_cprofile: Also record function-level stats with cProfile
+
+    Returns:
+        The active ScanProfiler
+    """
+    global _current
+    _current = ScanProfiler(scan_name, use_cprofile)
+    return _current
+
+
+def stop_profiling(directory: Optional[Path] = None, write: bool = True) -> Optional[Path]:
+    """
+    Finish the current profile, write it and switch profiling off.
+
+    Args:
+        directory: Output directory (PROFILE_DIR if None)
+        write: Write the report files (False when the caller reads
+            the profiler's report() itself)
+
+    Returns:
+        Path of the JSON report, or None if nothing was written
+    """
+    global _current
+    profiler, _current = _current, _null
+    if not profiler.enabled:
+        return None
+    profiler.finish()
+    if not write:
+        return None
+    try:
+        return profiler.write(directory)
+    except Exception as e:
+        logger.error(f"Error writing scan profile: {e}")
+        return None
@@ -1,19 +1,33 @@
 """
 Main scan orchestration.
 """
+import argparse
 import csv
 import logging
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 from ..config import Settings
 from ..models import RankedIdea
-from ..ingestion import get_fundamentals, get_options_snapshot, get_catalyst
-from ..ranker import rank_candidates
-from ..notify.discord_notifier import send_ideas_to_discord
-from ..notify.email_notifier import send_email
-from ..notify.formatter import format_brief, format_html
+from ..ingestion import get_options_snapshot, get_catalyst
+from ..ingestion.catalysts import apply_sentiment, refresh_catalyst
+from ..ingestion.market_data import PERIOD_DAYS
+from ..ingestion.options import calculate_hv, refresh_options_snapshot, snapshot_from_chains
+from ..ingestion.providers import get_planner
+from ..ingestion.universe import get_universe_index, ticker_meta
+from ..ingestion import transport
+from ..ranker import score_candidates
+from ..storage import FeatureStore, new_run_id
+from .pipeline import stream_scan
+from .sharded import sharded_scan
+from .distributed import distributed_scan
+from .profiler import get_profiler, start_profiling, stop_profiling
+from .baseline import ScanBaseline, get_baseline, remember_baseline
+from ..notify.delta import DeltaTracker, IdeaDelta
+from ..notify.discord_notifier import ideas_discord_posts, delta_discord_posts
+from ..notify.formatter import format_html, format_delta_html
+from ..notify.outbox import queue_notifications, flush_notifications, delivery_status
 
 # Set up logging
 logging.basicConfig(
@@ -31,6 +45,10 @@ def load_universe() -> List[str]:
     """
     Load ticker universe from CSV.
     
+    Metadata index entries (name, CIK, sector, type, options listed) that
+    are missing or stale are refreshed in one batch unless
+    UNIVERSE_META_REFRESH is off.
+    
     Returns:
         List of enabled ticker symbols
     """
@@ -49,145 +67,446 @@ def load_universe() -> List[str]:
                     tickers.append(row['ticker'].strip().upper())
         
         logger.info(f"Loaded {len(tickers)} tickers from universe")
-        return tickers
         
     except Exception as e:
         logger.error(f"Error loading universe: {e}")
         return []
+    
+    if Settings.UNIVERSE_META_REFRESH:
+        try:
+            get_universe_index().refresh(tickers)
+        except Exception as e:
+            logger.error(f"Error refreshing universe metadata: {e}")
+    
+    return tickers
 
 
-def fetch_data(tickers: List[str]) -> tuple[dict, dict, dict]:
+def fetch_tickers(tickers: List[str]) -> Dict[str, tuple]:
     """
-    Fetch all data for tickers.
+    Fetch every input for a batch of tickers.
+    
+    Quotes, daily bars (for hv30), option chains and fundamentals are
+    requested for the whole batch through the market-data planner, so each
+    comes from the provider with the fewest round trips (bulk quotes, one
+    download of bars); news is fetched per ticker. Headline sentiment is
+    left unscored so it can be batched across tickers. Work the universe
+    index says does not apply is skipped: tickers without listed options
+    are not fetched at all, and funds take their fundamentals (size and
+    sector only) from the index.
     
     Args:
-        tickers: List of ticker symbols
+        tickers: Ticker symbols
         
     Returns:
-        Tuple of (fundamentals_dict, options_dict, catalysts_dict)
+        Dict mapping each ticker to (Fundamentals, OptionsSnapshot, Catalyst),
+        each possibly None
+    """
+    results = {}
+    metas = {ticker: ticker_meta(ticker) for ticker in tickers}
+    for ticker, meta in metas.items():
+        if meta is not None and meta.has_options is False:
+            logger.info(f"Skipping {ticker}: no listed options")
+            results[ticker] = (None, None, None)
+    live = [ticker for ticker in metas if ticker not in results]
+    if not live:
+        return results
+    
+    logger.info(f"Fetching data for {len(live)} tickers...")
+    profiler = get_profiler()
+    planner = get_planner()
+    funds = {ticker for ticker in live if metas[ticker] is not None and metas[ticker].is_fund}
+    
+    with profiler.stage('fundamentals'):
+        fundamentals = planner.get_fundamentals([ticker for ticker in live if ticker not in funds])
+        fundamentals.update({ticker: metas[ticker].fundamentals() for ticker in funds})
+    with profiler.stage('options'):
+        quotes = planner.get_quotes(live)
+        bars = planner.get_bars(live, date.today() - timedelta(days=PERIOD_DAYS['3mo']))
+        closes = {ticker: rows.sort_values('date')['close'].reset_index(drop=True)
+                  for ticker, rows in bars.groupby('ticker')}
+        chains = planner.get_chains([ticker for ticker in live if quotes.get(ticker) and ticker in closes])
+    
+    for ticker in live:
+        opts = None
+        with profiler.stage('options', ticker):
+            if ticker in chains:
+                opts = snapshot_from_chains(ticker, chains[ticker], quotes[ticker],
+                                            calculate_hv(closes[ticker], window=30))
+            else:
+                logger.warning(f"No quote, price history or option chain for {ticker}")
+        with profiler.stage('catalysts', ticker):
+            cat = get_catalyst(ticker, score_sentiment=False)
+        results[ticker] = (fundamentals.get(ticker), opts, cat)
+    
+    return results
+
+
+def fetch_ticker(ticker: str) -> tuple:
     """
+    Fetch every input for one ticker (a batch of one, see fetch_tickers).
+    
+    Args:
+        ticker: Ticker symbol
+        
+    Returns:
+        Tuple of (Fundamentals, OptionsSnapshot, Catalyst), each possibly None
+    """
+    return fetch_tickers([ticker])[ticker]
+
+
+def refresh_ticker(ticker: str, baseline: ScanBaseline) -> tuple:
+    """
+    Refresh only one ticker's intraday fields on top of an earlier full scan.
+    
+    Spot price, option chain metrics and news are refetched; fundamentals,
+    earnings dates and historical volatility come from the baseline.
+    Tickers missing from the baseline are fetched in full.
+    
+    Args:
+        ticker: Ticker symbol
+        baseline: Inputs from the day's full scan
+        
+    Returns:
+        Tuple of (Fundamentals, OptionsSnapshot, Catalyst), each possibly None
+    """
+    if ticker not in baseline.options and ticker not in baseline.fundamentals:
+        return fetch_ticker(ticker)
+    
+    logger.info(f"Refreshing data for {ticker}...")
+    profiler = get_profiler()
+    
+    with profiler.stage('options', ticker):
+        previous = baseline.options.get(ticker)
+        opts = refresh_options_snapshot(previous) if previous else get_options_snapshot(ticker)
+    
+    with profiler.stage('catalysts', ticker):
+        previous = baseline.catalysts.get(ticker)
+        cat = refresh_catalyst(previous, score_sentiment=False) if previous else get_catalyst(ticker, score_sentiment=False)
+    
+    return baseline.fundamentals.get(ticker), opts, cat
+
+
+def _collect(tickers: List[str], fetch) -> tuple[dict, dict, dict]:
+    """Run a per-ticker fetch over tickers into (fundamentals, options, catalysts) dicts."""
     fundamentals = {}
     options = {}
     catalysts = {}
     
     for ticker in tickers:
-        logger.info(f"Fetching data for {ticker}...")
-        
-        # Get fundamentals
-        fund = get_fundamentals(ticker)
+        fund, opts, cat = fetch(ticker)
         if fund:
             fundamentals[ticker] = fund
-        
-        # Get options snapshot
-        opts = get_options_snapshot(ticker)
         if opts:
             options[ticker] = opts
-        
-        # Get catalysts
-        cat = get_catalyst(ticker)
         if cat:
             catalysts[ticker] = cat
     
+    return fundamentals, options, catalysts
+
+
+def fetch_data(tickers: List[str], score_sentiment: bool = True) -> tuple[dict, dict, dict]:
+    """
+    Fetch all data for tickers.
+    
+    Args:
+        tickers: List of ticker symbols
+        score_sentiment: Batch-score headline sentiment after fetching
+        
+    Returns:
+        Tuple of (fundamentals_dict, options_dict, catalysts_dict)
+    """
+    fetched = {}
+    for i in range(0, len(tickers), Settings.PIPELINE_FETCH_BATCH):
+        fetched.update(fetch_tickers(tickers[i:i + Settings.PIPELINE_FETCH_BATCH]))
+    fundamentals, options, catalysts = _collect(tickers, fetched.get)
+    
+    # Batch headline sentiment across every ticker in one pass
+    if score_sentiment:
+        apply_sentiment(catalysts)
+    
     logger.info(f"Data fetched: {len(fundamentals)} fundamentals, {len(options)} options, {len(catalysts)} catalysts")
     return fundamentals, options, catalysts
 
 
-def send_notifications(ideas: List[RankedIdea], scan_name: str) -> bool:
+def fetch_data_incremental(tickers: List[str], baseline: ScanBaseline) -> tuple[dict, dict, dict]:
     """
-    Send notifications via configured channels.
+    Refresh only intraday fields on top of an earlier full scan.
+    
+    Args:
+        tickers: List of ticker symbols
+        baseline: Inputs from the day's full scan
+        
+    Returns:
+        Tuple of (fundamentals_dict, options_dict, catalysts_dict)
+    """
+    fundamentals, options, catalysts = _collect(tickers, lambda t: refresh_ticker(t, baseline))
+    
+    # Batch headline sentiment across every ticker in one pass
+    apply_sentiment(catalysts)
+    
+    logger.info(f"Data refreshed: {len(fundamentals)} fundamentals, {len(options)} options, {len(catalysts)} catalysts")
+    return fundamentals, options, catalysts
+
+
+def score_ticker(ticker: str, data: tuple) -> Optional[RankedIdea]:
+    """
+    Score one ticker's fetched inputs.
+    
+    Args:
+        ticker: Ticker symbol
+        data: Tuple of (Fundamentals, OptionsSnapshot, Catalyst)
+        
+    Returns:
+        RankedIdea or None if data is missing
+    """
+    fund, opts, cat = data
+    with get_profiler().stage('signals', ticker):
+        scored = score_candidates([ticker], {ticker: fund}, {ticker: opts}, {ticker: cat})
+    return scored[0] if scored else None
+
+
+def send_notifications(ideas: List[RankedIdea], scan_name: str, delta: Optional[IdeaDelta] = None) -> List[int]:
+    """
+    Queue notifications for the configured channels.
+    
+    Messages are rendered here and written to the durable outbox; the
+    background worker delivers them, so this returns without waiting on
+    Discord or SMTP.
     
     Args:
         ideas: List of RankedIdea objects
         scan_name: Name of the scan
+        delta: Send only these changes instead of the full list
         
     Returns:
-        True if at least one notification succeeded
+        Outbox ids of the queued notifications (empty if none were queued)
     """
-    success = False
+    messages = {}
     
     # Discord notification
     if Settings.USE_DISCORD and Settings.DISCORD_WEBHOOK_URL:
-        logger.info("Sending Discord notification...")
-        discord_success = send_ideas_to_discord(
-            Settings.DISCORD_WEBHOOK_URL,
-            ideas,
-            scan_name
-        )
-        success = success or discord_success
+        if delta is not None:
+            messages['discord'] = delta_discord_posts(delta, scan_name, Settings.DELTA_SHOW_UNCHANGED)
+        else:
+            messages['discord'] = ideas_discord_posts(ideas, scan_name)
     
     # Email notification
     if Settings.USE_EMAIL:
-        logger.info("Sending email notification...")
-        subject = f"Options Bot - {scan_name}"
-        text_body = format_brief(ideas, scan_name)
-        html_body = format_html(ideas, scan_name)
+        if delta is not None:
+            html_body = format_delta_html(delta, scan_name, Settings.DELTA_SHOW_UNCHANGED)
+        else:
+            html_body = format_html(ideas, scan_name)
         
-        email_success = send_email(
-            Settings.SMTP_HOST,
-            Settings.SMTP_PORT,
-            Settings.SMTP_USER,
-            Settings.SMTP_PASS,
-            Settings.EMAIL_TO,
-            subject,
-            html_body,
-            html=True
-        )
-        success = success or email_success
+        messages['email'] = [{
+            'to': Settings.EMAIL_TO,
+            'subject': f"Options Bot - {scan_name}",
+            'body': html_body,
+            'html': True
+        }]
     
-    return success
+    logger.info(f"Queueing notifications: {', '.join(f'{len(v)} {k}' for k, v in messages.items()) or 'none'}")
+    return queue_notifications(messages)
 
 
-def run_scan(scan_name: Optional[str] = None, universe: Optional[List[str]] = None) -> List[RankedIdea]:
+def notify_ideas(ideas: List[RankedIdea], scan_name: str) -> bool:
+    """
+    Notify ideas, sending only what changed since the last delivery.
+    
+    With DELTA_NOTIFICATIONS off every scan sends its full list. The
+    delta state is saved as pending with the queued message ids; it only
+    becomes the delivered state once the outbox reports them all sent.
+    
+    Args:
+        ideas: List of RankedIdea objects
+        scan_name: Name of the scan
+        
+    Returns:
+        True if notifications were queued (or nothing needed sending)
+    """
+    if not Settings.DELTA_NOTIFICATIONS:
+        return bool(send_notifications(ideas, scan_name))
+    
+    tracker = DeltaTracker(delivery_status=delivery_status)
+    delta = tracker.diff(ideas)
+    if not delta.has_changes:
+        logger.info(f"No changes since last delivery ({len(delta.unchanged)} unchanged), skipping notifications")
+        return True
+    
+    logger.info(f"Delta: {len(delta.new)} new, {len(delta.changed)} changed, {len(delta.dropped)} dropped")
+    message_ids = send_notifications(ideas, scan_name, delta)
+    if message_ids:
+        tracker.save(ideas, scan_name, message_ids)
+    return bool(message_ids)
+
+
+def run_scan(
+    scan_name: Optional[str] = None,
+    universe: Optional[List[str]] = None,
+    incremental: bool = False,
+    profile: bool = False,
+    use_cprofile: bool = False,
+    processes: Optional[int] = None,
+    coordinate: Optional[str] = None,
+    local_workers: int = 0
+) -> List[RankedIdea]:
     """
     Run a complete options scan.
     
     Args:
         scan_name: Optional name for the scan (e.g., "Premarket Scan")
         universe: Optional list of tickers (uses config if not provided)
+        incremental: Refresh only intraday fields on top of today's full
+            scan (falls back to a full fetch if there is none)
+        profile: Write a per-stage and per-ticker timing report to logs/
+        use_cprofile: With profile, also record cProfile function stats
+        processes: Shard the scan across this many worker processes
+            (SCAN_PROCESSES if None; 1 scans in this process)
+        coordinate: host:port to lease tickers to distributed workers from
+            (see runner.distributed); ranking and notification stay here
+        local_workers: With coordinate, worker processes to start locally
         
     Returns:
         List of RankedIdea objects
     """
+    if profile:
+        start_profiling(scan_name or "Options Scan", use_cprofile)
+    try:
+        return _run_scan(scan_name, universe, incremental, processes or Settings.SCAN_PROCESSES,
+                         coordinate, local_workers)
+    finally:
+        if profile:
+            stop_profiling()
+
+
+def _run_scan(scan_name: Optional[str], universe: Optional[List[str]], incremental: bool,
+              processes: int = 1, coordinate: Optional[str] = None, local_workers: int = 0) -> List[RankedIdea]:
+    """Body of run_scan (timed by the profiler when enabled)."""
+    profiler = get_profiler()
+    
     # Ensure directories exist
     Settings.ensure_directories()
     
     # Default scan name
+    now = datetime.now(Settings.TIMEZONE)
     if not scan_name:
-        now = datetime.now(Settings.TIMEZONE)
         scan_name = f"Options Scan - {now.strftime('%Y-%m-%d %H:%M')}"
     
     logger.info(f"Starting scan: {scan_name}")
+    coalescing = transport.coalescing_stats()
     
     # Load universe if not provided
     if not universe:
-        universe = load_universe()
+        with profiler.stage('universe'):
+            universe = load_universe()
     
     if not universe:
         logger.error("No tickers in universe")
         return []
     
-    # Fetch data
-    fundamentals, options, catalysts = fetch_data(universe)
+    baseline = get_baseline(now.date()) if incremental else None
+    if baseline and coordinate:
+        # The baseline lives in this process; remote workers cannot refresh from it
+        logger.info("Distributed scans fetch in full, ignoring today's baseline")
+        baseline = None
+    if baseline:
+        logger.info(f"Incremental scan on top of {baseline.scan_time.strftime('%H:%M')} baseline")
+        fetch = lambda ticker: refresh_ticker(ticker, baseline)
+    else:
+        if incremental:
+            logger.info("No baseline for today, running full fetch")
+        fetch = fetch_ticker
+    
+    # Rows are streamed to the feature store as tickers are scored. Without
+    # it, a full scan's inputs are kept in memory as the day's baseline.
+    writer = None
+    if Settings.PERSIST_SNAPSHOTS:
+        try:
+            writer = FeatureStore().run_writer(new_run_id(now), now, scan_name)
+        except Exception as e:
+            logger.error(f"Error opening feature store: {e}")
+    keep = ({}, {}, {}) if baseline is None and writer is None else None
+    
+    def analyze(catalysts: dict):
+        with profiler.stage('sentiment'):
+            apply_sentiment(catalysts)
+    
+    def sink(ticker: str, data: tuple, idea: Optional[RankedIdea]):
+        if writer is not None:
+            with profiler.stage('store', ticker):
+                writer.add(ticker, *data, idea)
+        if keep is not None:
+            for store, value in zip(keep, data):
+                if value:
+                    store[ticker] = value
+    
+    # Fetch, analyze and score in a streaming pipeline, keeping the top picks.
+    # Sharded and distributed scans run the same pipeline in worker processes
+    # (or on other nodes) and merge here.
+    if coordinate:
+        with profiler.stage('distributed'):
+            ideas, _ = distributed_scan(universe, coordinate, sink=sink, top_k=Settings.MAX_PICKS,
+                                        local_workers=local_workers)
+    elif processes > 1:
+        with profiler.stage('shards'):
+            ideas, _ = sharded_scan(universe, processes, baseline=baseline, sink=sink,
+                                    top_k=Settings.MAX_PICKS,
+                                    send_data=writer is not None or keep is not None)
+    else:
+        # Full fetches go through the planner a batch at a time
+        ideas, _ = stream_scan(universe, fetch, score_ticker, analyze=analyze, sink=sink,
+                               top_k=Settings.MAX_PICKS, fetch_many=None if baseline else fetch_tickers)
     
-    # Rank candidates
-    ideas = rank_candidates(universe, fundamentals, options, catalysts)
+    if writer is not None:
+        try:
+            with profiler.stage('store'):
+                writer.close()
+        except Exception as e:
+            logger.error(f"Error saving scan snapshot: {e}")
+            writer.abort()
+    if keep is not None:
+        remember_baseline(now, *keep)
     
     logger.info(f"Scan complete: {len(ideas)} ideas generated")
+    after = transport.coalescing_stats()
+    if after['coalesced'] > coalescing['coalesced']:
+        logger.info(f"Coalesced {after['coalesced'] - coalescing['coalesced']} of "
+                    f"{after['requests'] - coalescing['requests']} provider requests")
     
-    # Send notifications
-    if ideas:
-        send_notifications(ideas, scan_name)
+    # Send notifications (with deltas, an empty list still reports what dropped)
+    if ideas or Settings.DELTA_NOTIFICATIONS:
+        with profiler.stage('notify'):
+            notify_ideas(ideas, scan_name)
     else:
         logger.warning("No ideas to send")
     
     return ideas
 
 
-if __name__ == "__main__":
-    """Run scan from command line."""
+def main(argv: Optional[List[str]] = None):
+    """Run a scan from the command line and wait for its notifications."""
+    parser = argparse.ArgumentParser(description="Run an options scan")
+    parser.add_argument('--profile', action='store_true', help="Write a stage/ticker timing report to logs/")
+    parser.add_argument('--cprofile', action='store_true', help="With --profile, also record cProfile stats")
+    parser.add_argument('--processes', type=int, help="Shard the scan across N worker processes")
+    parser.add_argument('--coordinate', nargs='?', const=Settings.COORDINATOR_LISTEN, metavar='HOST:PORT',
+                        help="Lease tickers to distributed workers (default COORDINATOR_LISTEN)")
+    parser.add_argument('--local-workers', type=int, default=0, help="With --coordinate, start N local workers")
+    parser.add_argument('--record', metavar='CASSETTE', help="Record every provider response into a cassette")
+    parser.add_argument('--replay', metavar='CASSETTE', help="Serve provider responses from a cassette (offline)")
+    parser.add_argument('--replay-latency', help="Delay per replayed response: seconds or 'recorded'")
+    args = parser.parse_args(argv)
+    
     try:
         Settings.validate()
-        ideas = run_scan()
+        if args.record or args.replay:
+            latency = args.replay_latency
+            transport.configure(
+                'record' if args.record else 'replay', args.record or args.replay,
+                latency if latency in (None, 'recorded') else float(latency)
+            )
+        ideas = run_scan(profile=args.profile or args.cprofile, use_cprofile=args.cprofile,
+                         processes=args.processes, coordinate=args.coordinate,
+                         local_workers=args.local_workers)
         
         # Print summary
         print(f"\n{'='*60}")
@@ -197,7 +516,19 @@ if __name__ == "__main__":
         for idea in ideas[:5]:  # Show top 5
             print(f"{idea.ticker}: {idea.score:.1f}/10 - {idea.strategy}")
         
+        # Notifications are delivered in the background; wait before exiting
+        flush_notifications()
+        
+        if args.record or args.replay:
+            active = transport.get_transport()
+            print(f"Cassette {active.cassette.path}: {active.recorded} recorded, "
+                  f"{active.hits} replayed, {active.misses} missing")
+            active.close()
+        
     except Exception as e:
         logger.error(f"Error running scan: {e}", exc_info=True)
         raise
 
+
+if __name__ == "__main__":
+    main()
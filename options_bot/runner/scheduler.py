@@ -8,6 +8,7 @@ from datetime import datetime
 
 from ..config import Settings
 from .scan import run_scan
+from ..notify.outbox import flush_notifications
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ def premarket_scan():
 def midmorning_scan():
     """Run mid-morning scan."""
     logger.info("Starting mid-morning scan...")
-    run_scan(scan_name="Mid-Morning Scan")
+    run_scan(scan_name="Mid-Morning Scan", incremental=Settings.INCREMENTAL_MIDMORNING)
 
 
 def start_scheduler():
@@ -82,6 +83,7 @@ def start_scheduler():
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
         logger.info("Scheduler stopped")
+        flush_notifications()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+"""
+Sharded multi-process scan.
+
+The parent hands tickers out over a pipe per worker process, a few at a
+time, and sends a worker its next ticker whenever one of its results comes
+back; a shard stuck on a slow ticker simply takes fewer of them. Workers
+run the streaming pipeline (fetch -> sentiment -> score) with their own
+HTTP sessions and caches. Each scored ticker is sent back to the parent,
+which merges them through a single top-K reducer; storage and
+notification stay in the parent. Nothing is shared between workers, so a
+worker that dies only loses the tickers it was holding.
+"""
+import logging
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..config import Settings
+from ..models import RankedIdea
+from .baseline import ScanBaseline
+from .pipeline import PipelineStats, TickerData, TopK, stream_scan
+
+logger = logging.getLogger(__name__)
+
+# Tickers handed to a worker ahead of its results, per fetch thread
+_PREFETCH_PER_THREAD = 2
+
+
+def _shard_worker(shard: int, tasks, results, options: dict):
+    """Worker process: stream tickers sent by the parent and send back results."""
+    from ..ingestion import transport
+    from ..ingestion.catalysts import apply_sentiment
+    from . import scan
+
+    transport.configure(*options['transport'])
+    baseline = options['baseline']
+    fetch = options['fetch'] or (
+        (lambda ticker: scan.refresh_ticker(ticker, baseline)) if baseline else scan.fetch_ticker
+    )
+    score = options['score'] or scan.score_ticker
+    positions: Dict[str, List[int]] = {}
+
+    def pull():
+        # The parent sends the next ticker as each result comes back
+        for index, ticker in iter(tasks.recv, None):
+            positions.setdefault(ticker, []).append(index)
+            yield ticker
+
+    def send(ticker: str, data: TickerData, idea: Optional[RankedIdea]):
+        index = positions[ticker].pop(0)
+        results.send(('result', index, ticker, data if options['send_data'] else None, idea))
+
+    stats = PipelineStats()
+    try:
+        fetch_workers = options['fetch_workers'] or Settings.PIPELINE_FETCH_WORKERS
+        _, stats = stream_scan(
+            pull(), fetch, score, analyze=apply_sentiment if options['analyze'] else None, sink=send,
+            top_k=1, fetch_workers=fetch_workers, queue_size=fetch_workers
+        )
+    except Exception as e:
+        logger.error(f"Shard {shard} failed: {e}")
+    finally:
+        results.send(('done', shard, vars(stats)))
+        transport.get_transport().close()
+
+
+def _transport_args() -> tuple:
+    """Arguments recreating the parent's transport in a worker."""
+    from ..ingestion import transport
+    active = transport.get_transport()
+    path = active.cassette.path if active.cassette is not None else None
+    return active.mode, path, active.latency, active.standin_url
+
+
+def sharded_scan(
+    tickers: Sequence[str],
+    processes: int,
+    fetch: Optional[Callable[[str], TickerData]] = None,
+    score: Optional[Callable[[str, TickerData], Optional[RankedIdea]]] = None,
+    baseline: Optional[ScanBaseline] = None,
+    sink: Optional[Callable[[str, Optional[TickerData], Optional[RankedIdea]], None]] = None,
+    top_k: Optional[int] = None,
+    fetch_workers: Optional[int] = None,
+    send_data: bool = True,
+    analyze: bool = True
+) -> Tuple[List[RankedIdea], PipelineStats]:
+    """
+    Scan tickers across worker processes and keep the top ideas.
+
+    Args:
+        tickers: Ticker symbols
+        processes: Number of worker processes
+        fetch: Per-ticker fetch, a module-level function so workers can
+            import it (fetch_ticker, or refresh_ticker with a baseline, if None)
+        score: Per-ticker scorer, module-level (score_ticker if None)
+        baseline: Earlier full scan to refresh incrementally
+        sink: Called in the parent with (ticker, data, idea) per ticker
+        top_k: Ideas to keep (MAX_PICKS if None)
+        fetch_workers: Fetch threads per process (PIPELINE_FETCH_WORKERS if None)
+        send_data: Send fetched inputs back with each result (needed by
+            sinks that store them; data is None in the sink otherwise)
+        analyze: Score headline sentiment in the workers
+
+    Returns:
+        Tuple of (top ideas best first, combined PipelineStats)
+    """
+    context = mp.get_context('spawn')  # Fork is unsafe with the bot's background threads
+    options = {
+        'transport': _transport_args(),
+        'fetch': fetch,
+        'score': score,
+        'baseline': baseline,
+        'fetch_workers': fetch_workers,
+        'send_data': send_data,
+        'analyze': analyze,
+    }
+    processes = max(1, min(processes, len(tickers) or 1))
+    prefetch = _PREFETCH_PER_THREAD * max(1, fetch_workers or Settings.PIPELINE_FETCH_WORKERS)
+
+    workers, task_pipes, result_pipes = [], [], []
+    for shard in range(processes):
+        task_reader, task_writer = context.Pipe(duplex=False)
+        result_reader, result_writer = context.Pipe(duplex=False)
+        worker = context.Process(target=_shard_worker, args=(shard, task_reader, result_writer, options),
+                                 name=f'scan-shard-{shard}', daemon=True)
+        worker.start()
+        # The parent keeps only its own ends, so a dead worker shows up as EOF
+        task_reader.close()
+        result_writer.close()
+        workers.append(worker)
+        task_pipes.append(task_writer)
+        result_pipes.append(result_reader)
+
+    queued: Iterator[Tuple[int, str]] = iter(enumerate(tickers))
+    in_flight: List[Dict[int, str]] = [{} for _ in range(processes)]
+    finished = [False] * processes
+
+    def dispatch(shard: int):
+        """Send a worker its next ticker, or the end marker once none are left."""
+        if finished[shard]:
+            return
+        item = next(queued, None)
+        try:
+            task_pipes[shard].send(item)
+        except (BrokenPipeError, OSError):
+            return  # Noticed when its results pipe closes
+        if item is None:
+            finished[shard] = True
+        else:
+            in_flight[shard][item[0]] = item[1]
+
+    for shard in range(processes):
+        for _ in range(prefetch):
+            dispatch(shard)
+
+    top = TopK(top_k or Settings.MAX_PICKS)
+    stats = PipelineStats(tickers=len(tickers))
+    active = dict(enumerate(result_pipes))
+    received = 0
+    while active:
+        for conn in wait(list(active.values())):
+            shard = result_pipes.index(conn)
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                # Only this worker's tickers are lost; the others keep going
+                lost = in_flight[shard]
+                logger.error(f"Shard {shard} exited with code {workers[shard].exitcode} before finishing, "
+                             f"losing {len(lost)} tickers ({', '.join(sorted(lost.values()))})")
+                del active[shard]
+                continue
+
+            if message[0] == 'done':
+                _, shard, shard_stats = message
+                del active[shard]
+                stats.fetched += shard_stats['fetched']
+                stats.scored += shard_stats['scored']
+                stats.errors += shard_stats['errors']
+                continue
+
+            _, index, ticker, data, idea = message
+            in_flight[shard].pop(index, None)
+            dispatch(shard)
+            received += 1
+            if idea is not None:
+                # Universe position breaks ties, so the merge is independent of arrival order
+                top.push(idea, order=index)
+            if sink is not None:
+                try:
+                    sink(ticker, data, idea)
+                except Exception as e:
+                    logger.error(f"Error storing {ticker}: {e}")
+
+    for shard, worker in enumerate(workers):
+        worker.join(timeout=10)
+        task_pipes[shard].close()
+        result_pipes[shard].close()
+
+    if received < len(tickers):
+        logger.error(f"Sharded scan lost {len(tickers) - received} tickers to failed workers")
+    logger.info(f"Sharded scan: {processes} processes, {stats.tickers} tickers, {stats.fetched} fetched, "
+                f"{stats.scored} scored, {stats.errors} errors")
+    return top.items(), stats
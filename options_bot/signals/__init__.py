@@ -1,7 +1,10 @@
 """Signal generation modules."""
-from .fundamental import fundamental_bias
-from .premium import premium_bias
-from .catalyst import catalyst_score
+from .fundamental import fundamental_bias, fundamental_bias_vec
+from .premium import premium_bias, premium_bias_vec
+from .catalyst import catalyst_score, catalyst_score_vec
 
-__all__ = ['fundamental_bias', 'premium_bias', 'catalyst_score']
+__all__ = [
+    'fundamental_bias', 'premium_bias', 'catalyst_score',
+    'fundamental_bias_vec', 'premium_bias_vec', 'catalyst_score_vec'
+]
 
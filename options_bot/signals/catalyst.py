@@ -2,6 +2,7 @@
 Catalyst scoring.
 """
 import logging
+import numpy as np
 from ..models import Catalyst
 
 logger = logging.getLogger(__name__)
@@ -70,3 +71,34 @@ def catalyst_score(cat: Catalyst) -> float:
     logger.debug(f"Catalyst score for {cat.ticker}: {score:.2f} (Days to earnings: {cat.days_to_earnings})")
     return score
 
+
+def catalyst_score_vec(days_to_earnings, has_major_event_7d, sentiment_score, headline_count) -> np.ndarray:
+    """
+    Vectorized catalyst_score over arrays of any shape.
+    
+    Applies exactly the same thresholds as catalyst_score; missing values
+    are NaN and contribute nothing.
+    
+    Args:
+        days_to_earnings: Days until (or since) earnings
+        has_major_event_7d: 1/0 (or bool) major event flags
+        sentiment_score: Headline sentiment from -1 to 1
+        headline_count: Number of headlines
+        
+    Returns:
+        Array of catalyst scores from 0 to 10
+    """
+    days = np.abs(np.asarray(days_to_earnings, dtype=float))
+    major = np.asarray(has_major_event_7d, dtype=float)
+    sent = np.abs(np.asarray(sentiment_score, dtype=float))
+    count = np.asarray(headline_count, dtype=float)
+    
+    score = (
+        np.select([days <= 2, days <= 5, days <= 10, days <= 20], [5.0, 3.0, 1.5, 0.5], 0.0) +
+        np.where(major > 0, 2.0, 0.0) +
+        np.select([sent > 0.5, sent > 0.3], [2.0, 1.0], 0.0) +
+        np.select([count >= 5, count >= 3, count >= 1], [1.5, 1.0, 0.5], 0.0)
+    )
+    
+    return np.clip(score, 0.0, 10.0)
+
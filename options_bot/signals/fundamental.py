@@ -2,6 +2,7 @@
 Fundamental bias scoring.
 """
 import logging
+import numpy as np
 from ..models import Fundamentals
 
 logger = logging.getLogger(__name__)
@@ -94,3 +95,50 @@ def fundamental_bias(fund: Fundamentals) -> float:
     logger.debug(f"Fundamental bias for {fund.ticker}: {score:.2f}")
     return score
 
+
+def fundamental_bias_vec(
+    pe_ratio,
+    forward_pe,
+    profit_margins,
+    debt_to_equity,
+    revenue_growth,
+    earnings_growth
+) -> np.ndarray:
+    """
+    Vectorized fundamental_bias over arrays of any shape.
+    
+    Applies exactly the same thresholds as fundamental_bias; missing
+    values are NaN and contribute nothing, like None does there.
+    
+    Args:
+        pe_ratio: Trailing P/E values
+        forward_pe: Forward P/E values
+        profit_margins: Profit margin values
+        debt_to_equity: Debt-to-equity values
+        revenue_growth: Revenue growth values
+        earnings_growth: Earnings growth values
+        
+    Returns:
+        Array of bias scores from -10 to 10
+    """
+    pe = np.asarray(pe_ratio, dtype=float)
+    fpe = np.asarray(forward_pe, dtype=float)
+    pm = np.asarray(profit_margins, dtype=float)
+    de = np.asarray(debt_to_equity, dtype=float)
+    rg = np.asarray(revenue_growth, dtype=float)
+    eg = np.asarray(earnings_growth, dtype=float)
+    
+    # NaN compares False everywhere, so missing values fall through to 0
+    pe_ok = pe > 0
+    fpe_ok = fpe > 0
+    score = (
+        np.select([pe_ok & (pe < 15), pe_ok & (pe < 25), pe_ok & (pe > 40)], [3.0, 1.0, -2.0], 0.0) +
+        np.select([fpe_ok & (fpe < 15), fpe_ok & (fpe < 20), fpe_ok & (fpe > 35)], [2.0, 1.0, -2.0], 0.0) +
+        np.select([pm > 0.20, pm > 0.10, pm < 0, pm < 0.05], [2.0, 1.0, -3.0, -1.0], 0.0) +
+        np.select([de < 0.3, de < 0.5, de > 2.0], [1.5, 0.5, -2.0], 0.0) +
+        np.select([rg > 0.20, rg > 0.10, rg < -0.10], [2.0, 1.0, -2.0], 0.0) +
+        np.select([eg > 0.25, eg > 0.15, eg < -0.15], [1.5, 0.5, -1.5], 0.0)
+    )
+    
+    return np.clip(score, -10.0, 10.0)
+
@@ -2,6 +2,7 @@
 Premium structure bias scoring.
 """
 import logging
+import numpy as np
 from ..models import OptionsSnapshot
 
 logger = logging.getLogger(__name__)
@@ -82,3 +83,42 @@ def premium_bias(opts: OptionsSnapshot) -> float:
     logger.debug(f"Premium bias for {opts.ticker}: {score:.2f} (IV/HV: {iv_hv}, IVR: {opts.iv_rank_1y})")
     return score
 
+
+def premium_bias_vec(atm_iv, hv30, iv_rank, skew, term_slope) -> np.ndarray:
+    """
+    Vectorized premium_bias over arrays of any shape.
+    
+    Applies exactly the same thresholds as premium_bias; missing values
+    are NaN and contribute nothing.
+    
+    Args:
+        atm_iv: ATM implied volatility (~35 DTE)
+        hv30: 30-day historical volatility
+        iv_rank: IV rank (0-100)
+        skew: 25-delta risk reversal
+        term_slope: IV term structure slope
+        
+    Returns:
+        Array of premium bias scores from -10 to 10
+    """
+    iv = np.asarray(atm_iv, dtype=float)
+    hv = np.asarray(hv30, dtype=float)
+    ivr = np.asarray(iv_rank, dtype=float)
+    sk = np.asarray(skew, dtype=float)
+    ts = np.asarray(term_slope, dtype=float)
+    
+    # Same rule as OptionsSnapshot.iv_hv_ratio
+    valid = (iv != 0) & ~np.isnan(iv) & (hv > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(valid, iv / np.where(valid, hv, 1.0), np.nan)
+    
+    score = (
+        np.select([r > 1.5, r > 1.2, r > 1.0, r < 0.7, r < 0.85, r < 1.0],
+                  [4.0, 2.5, 1.0, -4.0, -2.5, -1.0], 0.0) +
+        np.select([ivr > 80, ivr > 60, ivr < 20, ivr < 40], [3.0, 1.5, -3.0, -1.5], 0.0) +
+        np.select([sk > 0.05, sk < -0.05], [1.0, -0.5], 0.0) +
+        np.select([ts > 0.05, ts < -0.05], [-1.0, 1.0], 0.0)
+    )
+    
+    return np.clip(score, -10.0, 10.0)
+
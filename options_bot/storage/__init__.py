@@ -0,0 +1,5 @@
+"""Persistent storage for scan history."""
+from .feature_store import FeatureStore, new_run_id, save_scan_snapshot, SCAN_RUN, LIVE_RUN
+from .bar_store import BarStore
+
+__all__ = ['FeatureStore', 'BarStore', 'new_run_id', 'save_scan_snapshot', 'SCAN_RUN', 'LIVE_RUN']
@@ -0,0 +1,158 @@
+"""
+Local store of daily OHLCV bars.
+
+Bars are appended as Parquet files under year partitions
+(``year=YYYY/<batch>.parquet``). A later write for the same
+(ticker, date) supersedes an earlier one when loading.
+"""
+import logging
+import threading
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import pandas as pd
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
+
+if HAS_PYARROW:
+    BAR_SCHEMA = pa.schema([
+        ('ticker', pa.string()),
+        ('date', pa.date32()),
+        ('open', pa.float64()),
+        ('high', pa.float64()),
+        ('low', pa.float64()),
+        ('close', pa.float64()),
+        ('volume', pa.float64()),
+        ('seq', pa.int64()),  # Write order, newest wins on load
+    ])
+else:
+    BAR_SCHEMA = None
+
+
+class BarStore:
+    """Year-partitioned Parquet store of daily bars."""
+
+    def __init__(self, root: Optional[Path] = None):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for the bar store (pip install pyarrow)")
+        self.root = Path(root) if root else Settings.resolve_path(Settings.BAR_STORE_DIR)
+        self._lock = threading.Lock()
+
+    def append(self, bars: pd.DataFrame, source: str = "bars") -> int:
+        """
+        Append bars in one write per year partition.
+
+        Args:
+            bars: DataFrame with columns ticker, date, open, high, low, close, volume
+            source: Short label included in the file name
+
+        Returns:
+            Number of rows written
+        """
+        if bars is None or bars.empty:
+            return 0
+
+        frame = bars[BAR_COLUMNS].copy()
+        frame['date'] = pd.to_datetime(frame['date']).dt.date
+        frame = frame.dropna(subset=['close'])
+
+        with self._lock:
+            # seq orders writes so re-fetched bars replace older ones
+            frame['seq'] = time.time_ns()
+            years = pd.to_datetime(frame['date']).dt.year
+            for year, chunk in frame.groupby(years.values):
+                partition = self.root / f"year={year}"
+                partition.mkdir(parents=True, exist_ok=True)
+                name = f"{source}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+                table = pa.Table.from_pandas(chunk, schema=BAR_SCHEMA, preserve_index=False)
+                tmp_path = partition / (name + '.tmp')
+                pq.write_table(table, tmp_path, compression='zstd')
+                tmp_path.replace(partition / name)
+
+        logger.debug(f"Stored {len(frame)} bars from {source}")
+        return len(frame)
+
+    def load(
+        self,
+        tickers: Optional[List[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load bars, keeping the newest write for each (ticker, date).
+
+        Args:
+            tickers: Restrict to these tickers
+            start: First date to include
+            end: Last date to include
+            columns: Bar columns to return (ticker and date are always included)
+
+        Returns:
+            DataFrame sorted by ticker and date
+        """
+        wanted = BAR_COLUMNS if columns is None else ['ticker', 'date'] + [
+            c for c in columns if c not in ('ticker', 'date')
+        ]
+        if not self.root.exists() or not any(self.root.glob('year=*/*.parquet')):
+            return pd.DataFrame(columns=wanted)
+
+        dataset = ds.dataset(
+            str(self.root),
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('year', pa.int32())]), flavor='hive'),
+            schema=BAR_SCHEMA.append(pa.field('year', pa.int32())),
+            exclude_invalid_files=True
+        )
+
+        expr = None
+        if start is not None:
+            expr = (ds.field('year') >= start.year) & (ds.field('date') >= pa.scalar(start, pa.date32()))
+        if end is not None:
+            cond = (ds.field('year') <= end.year) & (ds.field('date') <= pa.scalar(end, pa.date32()))
+            expr = cond if expr is None else expr & cond
+        if tickers:
+            cond = ds.field('ticker').isin(list(tickers))
+            expr = cond if expr is None else expr & cond
+
+        df = dataset.to_table(columns=wanted + ['seq'], filter=expr).to_pandas()
+        df = df.sort_values('seq').drop_duplicates(['ticker', 'date'], keep='last')
+        return df.drop(columns='seq').sort_values(['ticker', 'date']).reset_index(drop=True)
+
+    def close_panel(
+        self,
+        tickers: Optional[List[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> pd.DataFrame:
+        """
+        Closing prices as a (dates x tickers) frame.
+
+        Args:
+            tickers: Column order (and filter) for the panel
+            start: First date to include
+            end: Last date to include
+
+        Returns:
+            DataFrame indexed by date with one column per ticker
+        """
+        bars = self.load(tickers, start, end, columns=['close'])
+        panel = bars.pivot(index='date', columns='ticker', values='close').sort_index()
+        if tickers is not None:
+            panel = panel.reindex(columns=list(tickers))
+        return panel
@@ -0,0 +1,615 @@
+"""
+Columnar point-in-time store of per-ticker scan inputs and outputs.
+
+Each scan is written as one Parquet file under a date partition
+(``date=YYYY-MM-DD/<run_id>.parquet``) and recorded in a small CSV run
+index. Reads go through a pyarrow dataset so only the requested columns
+and date partitions are loaded.
+"""
+import csv
+import logging
+import threading
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import numpy as np
+import pandas as pd
+
+from ..config import Settings
+from ..models import Fundamentals, OptionsSnapshot, Catalyst, RankedIdea
+
+logger = logging.getLogger(__name__)
+
+
+def new_run_id(scan_time: datetime) -> str:
+    """
+    Run identifier: the scan time to the second plus a random suffix, so
+    runs started in the same second get their own file and index row.
+    """
+    return f"{scan_time.astimezone(Settings.TIMEZONE).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+RUN_INDEX_FIELDS = ['run_id', 'date', 'scan_time', 'scan_name', 'tickers', 'scored', 'path', 'kind']
+# Run kinds: full scans are decision points for the backtest and baseline;
+# live runs are periodic snapshots of continuous mode's ranking
+SCAN_RUN = 'scan'
+LIVE_RUN = 'live'
+
+if HAS_PYARROW:
+    SCHEMA = pa.schema([
+        ('run_id', pa.string()),
+        ('scan_time', pa.timestamp('us', tz='UTC')),
+        ('ticker', pa.string()),
+        # Fundamentals
+        ('market_cap', pa.float64()),
+        ('pe_ratio', pa.float64()),
+        ('forward_pe', pa.float64()),
+        ('profit_margins', pa.float64()),
+        ('debt_to_equity', pa.float64()),
+        ('sector', pa.string()),
+        ('revenue_growth', pa.float64()),
+        ('earnings_growth', pa.float64()),
+        # OptionsSnapshot
+        ('spot_price', pa.float64()),
+        ('hv30', pa.float64()),
+        ('atm_iv_dte35', pa.float64()),
+        ('iv_rank_1y', pa.float64()),
+        ('skew_25d_rr', pa.float64()),
+        ('term_slope_iv', pa.float64()),
+        ('liq_calls_score', pa.float64()),
+        ('liq_puts_score', pa.float64()),
+        ('avg_option_volume', pa.int64()),
+        ('open_interest', pa.int64()),
+        # Catalyst
+        ('next_earnings_date', pa.date32()),
+        ('earnings_bmo_amc', pa.string()),
+        ('days_to_earnings', pa.int32()),
+        ('has_major_event_7d', pa.bool_()),
+        ('event_description', pa.string()),
+        ('sentiment_score', pa.float64()),
+        ('headline_count', pa.int32()),
+        ('headlines', pa.list_(pa.string())),
+        # Signals and outputs
+        ('fund_bias', pa.float64()),
+        ('premium_bias', pa.float64()),
+        ('catalyst_score', pa.float64()),
+        ('score', pa.float64()),
+        ('rank', pa.int32()),
+        ('strategy', pa.string()),
+        ('notes', pa.string()),
+    ])
+else:
+    SCHEMA = None
+
+
+def _as_date(value) -> Optional[date]:
+    """Normalize earnings dates (datetime, date or Timestamp) to a date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return pd.Timestamp(value).date()
+    except Exception:
+        return None
+
+
+def snapshot_row(
+    run_id: str,
+    scan_time: datetime,
+    ticker: str,
+    fund: Optional[Fundamentals],
+    opts: Optional[OptionsSnapshot],
+    cat: Optional[Catalyst],
+    idea: Optional[RankedIdea] = None,
+    rank: Optional[int] = None
+) -> dict:
+    """
+    Flatten one ticker's scan inputs and outputs into a row.
+
+    Args:
+        run_id: Identifier of the scan run
+        scan_time: When the scan started (timezone-aware)
+        ticker: Ticker symbol
+        fund: Fundamentals or None
+        opts: OptionsSnapshot or None
+        cat: Catalyst or None
+        idea: RankedIdea if the ticker was scored
+        rank: Position of the idea in the scan (1 = best)
+
+    Returns:
+        Row dictionary matching SCHEMA
+    """
+    row = {'run_id': run_id, 'scan_time': scan_time, 'ticker': ticker}
+
+    if fund:
+        row.update(
+            market_cap=fund.market_cap,
+            pe_ratio=fund.pe_ratio,
+            forward_pe=fund.forward_pe,
+            profit_margins=fund.profit_margins,
+            debt_to_equity=fund.debt_to_equity,
+            sector=fund.sector,
+            revenue_growth=fund.revenue_growth,
+            earnings_growth=fund.earnings_growth
+        )
+
+    if opts:
+        row.update(
+            spot_price=opts.spot_price,
+            hv30=opts.hv30,
+            atm_iv_dte35=opts.atm_iv_dte35,
+            iv_rank_1y=opts.iv_rank_1y,
+            skew_25d_rr=opts.skew_25d_rr,
+            term_slope_iv=opts.term_slope_iv,
+            liq_calls_score=opts.liq_calls_score,
+            liq_puts_score=opts.liq_puts_score,
+            avg_option_volume=opts.avg_option_volume,
+            open_interest=opts.open_interest
+        )
+
+    if cat:
+        row.update(
+            next_earnings_date=_as_date(cat.next_earnings_date),
+            earnings_bmo_amc=cat.earnings_bmo_amc,
+            days_to_earnings=cat.days_to_earnings,
+            has_major_event_7d=cat.has_major_event_7d,
+            event_description=cat.event_description,
+            sentiment_score=cat.sentiment_score,
+            headline_count=len(cat.headlines),
+            headlines=list(cat.headlines)
+        )
+
+    if idea:
+        row.update(
+            fund_bias=idea.signals.fund_bias,
+            premium_bias=idea.signals.premium_bias,
+            catalyst_score=idea.signals.catalyst_score,
+            score=idea.score,
+            rank=rank,
+            strategy=idea.strategy,
+            notes=idea.notes
+        )
+
+    return row
+
+
+def snapshot_rows(
+    run_id: str,
+    scan_time: datetime,
+    tickers: Iterable[str],
+    fundamentals: Dict[str, Fundamentals],
+    options: Dict[str, OptionsSnapshot],
+    catalysts: Dict[str, Catalyst],
+    scored: List[RankedIdea]
+) -> List[dict]:
+    """
+    Flatten one scan into a row per ticker.
+
+    Tickers that could not be scored (missing data) are kept with null
+    signal columns so the store reflects the full universe.
+
+    Args:
+        run_id: Identifier of the scan run
+        scan_time: When the scan started (timezone-aware)
+        tickers: Every ticker in the scanned universe
+        fundamentals: Dict mapping ticker to Fundamentals
+        options: Dict mapping ticker to OptionsSnapshot
+        catalysts: Dict mapping ticker to Catalyst
+        scored: All scored ideas, best first
+
+    Returns:
+        List of row dictionaries matching SCHEMA
+    """
+    ideas = {idea.ticker: (rank, idea) for rank, idea in enumerate(scored, 1)}
+    rows = []
+
+    for ticker in tickers:
+        rank, idea = ideas.get(ticker, (None, None))
+        rows.append(snapshot_row(
+            run_id, scan_time, ticker,
+            fundamentals.get(ticker), options.get(ticker), catalysts.get(ticker), idea, rank
+        ))
+
+    return rows
+
+
+def _value(row: dict, name: str):
+    """Row value with NaN/NaT mapped to None."""
+    value = row.get(name)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return value
+    return None if value is None or pd.isna(value) else value
+
+
+def row_models(row: dict) -> Tuple[Optional[Fundamentals], Optional[OptionsSnapshot], Optional[Catalyst]]:
+    """
+    Rebuild one ticker's scan inputs from a stored row (inverse of snapshot_row).
+
+    Args:
+        row: Row dictionary; missing or null columns leave that input None
+
+    Returns:
+        Tuple of (Fundamentals, OptionsSnapshot, Catalyst), each possibly None
+    """
+    ticker = row['ticker']
+    get = lambda name: _value(row, name)
+    fund = opts = cat = None
+
+    if get('market_cap') is not None:
+        fund = Fundamentals(
+            ticker=ticker,
+            market_cap=get('market_cap'),
+            pe_ratio=get('pe_ratio'),
+            forward_pe=get('forward_pe'),
+            profit_margins=get('profit_margins'),
+            debt_to_equity=get('debt_to_equity'),
+            sector=get('sector'),
+            revenue_growth=get('revenue_growth'),
+            earnings_growth=get('earnings_growth')
+        )
+
+    if get('spot_price') is not None:
+        opts = OptionsSnapshot(
+            ticker=ticker,
+            spot_price=get('spot_price'),
+            hv30=get('hv30'),
+            atm_iv_dte35=get('atm_iv_dte35'),
+            iv_rank_1y=get('iv_rank_1y'),
+            skew_25d_rr=get('skew_25d_rr'),
+            term_slope_iv=get('term_slope_iv'),
+            liq_calls_score=get('liq_calls_score') or 0.0,
+            liq_puts_score=get('liq_puts_score') or 0.0,
+            avg_option_volume=int(get('avg_option_volume')) if get('avg_option_volume') is not None else None,
+            open_interest=int(get('open_interest')) if get('open_interest') is not None else None
+        )
+
+    if get('has_major_event_7d') is not None:
+        days = get('days_to_earnings')
+        cat = Catalyst(
+            ticker=ticker,
+            next_earnings_date=get('next_earnings_date'),
+            earnings_bmo_amc=get('earnings_bmo_amc'),
+            headlines=list(get('headlines') if get('headlines') is not None else []),
+            sentiment_score=get('sentiment_score'),
+            has_major_event_7d=bool(get('has_major_event_7d')),
+            event_description=get('event_description'),
+            days_to_earnings=int(days) if days is not None else None
+        )
+
+    return fund, opts, cat
+
+
+def snapshot_models(df: pd.DataFrame) -> Tuple[Dict[str, Fundamentals], Dict[str, OptionsSnapshot], Dict[str, Catalyst]]:
+    """
+    Rebuild scan inputs from stored rows (inverse of snapshot_rows).
+
+    Args:
+        df: Rows of a single run, e.g. from FeatureStore.load_run
+
+    Returns:
+        Tuple of (fundamentals_dict, options_dict, catalysts_dict)
+    """
+    fundamentals, options, catalysts = {}, {}, {}
+
+    for row in df.to_dict('records'):
+        ticker = row['ticker']
+        fund, opts, cat = row_models(row)
+        if fund is not None:
+            fundamentals[ticker] = fund
+        if opts is not None:
+            options[ticker] = opts
+        if cat is not None:
+            catalysts[ticker] = cat
+
+    return fundamentals, options, catalysts
+
+
+class FeatureStore:
+    """Date-partitioned Parquet store of scan snapshots."""
+
+    def __init__(self, root: Optional[Path] = None):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for the feature store (pip install pyarrow)")
+        self.root = Path(root) if root else Settings.resolve_path(Settings.FEATURE_STORE_DIR)
+        self.index_path = self.root / 'runs.csv'
+        self._lock = threading.Lock()
+
+    def write_run(self, run_id: str, scan_time: datetime, rows: List[dict], scan_name: str = "",
+                  kind: str = SCAN_RUN) -> Path:
+        """
+        Append one scan's rows as a single Parquet file and index it.
+
+        Args:
+            run_id: Identifier of the scan run (used as the file name)
+            scan_time: When the scan started (timezone-aware)
+            rows: Rows built by snapshot_rows
+            scan_name: Human-readable scan name for the index
+            kind: SCAN_RUN, or LIVE_RUN for continuous-mode snapshots
+
+        Returns:
+            Path of the written file
+        """
+        day = scan_time.astimezone(Settings.TIMEZONE).date().isoformat()
+        partition = self.root / f"date={day}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"{run_id}.parquet"
+
+        table = pa.Table.from_pylist(rows, schema=SCHEMA)
+        # Write to a temp name first so readers never see a partial file
+        tmp_path = path.with_suffix('.parquet.tmp')
+        pq.write_table(table, tmp_path, compression='zstd')
+        tmp_path.replace(path)
+
+        scored = sum(1 for r in rows if r.get('score') is not None)
+        self._index_run(run_id, day, scan_time, scan_name, len(rows), scored, path, kind)
+
+        logger.info(f"Saved {len(rows)} ticker snapshots to {path}")
+        return path
+
+    def _index_run(self, run_id: str, day: str, scan_time: datetime, scan_name: str,
+                   tickers: int, scored: int, path: Path, kind: str = SCAN_RUN):
+        """Append a written run to the run index."""
+        with self._lock:
+            new_index = not self.index_path.exists()
+            with open(self.index_path, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=RUN_INDEX_FIELDS)
+                if new_index:
+                    writer.writeheader()
+                writer.writerow({
+                    'run_id': run_id,
+                    'date': day,
+                    'scan_time': scan_time.isoformat(),
+                    'scan_name': scan_name,
+                    'tickers': tickers,
+                    'scored': scored,
+                    'path': str(path.relative_to(self.root)),
+                    'kind': kind
+                })
+
+    def run_writer(self, run_id: str, scan_time: datetime, scan_name: str = "",
+                   batch_size: int = 500) -> 'RunWriter':
+        """
+        Writer that streams one scan's rows to the store.
+
+        Args:
+            run_id: Identifier of the scan run (used as the file name)
+            scan_time: When the scan started (timezone-aware)
+            scan_name: Human-readable scan name for the index
+            batch_size: Rows buffered per Parquet row group
+
+        Returns:
+            RunWriter (call close() to publish the run)
+        """
+        return RunWriter(self, run_id, scan_time, scan_name, batch_size)
+
+    def runs(self, kinds: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Return the run index (one row per stored scan).
+
+        Args:
+            kinds: Only runs of these kinds (all if None)
+        """
+        if not self.index_path.exists():
+            return pd.DataFrame(columns=RUN_INDEX_FIELDS)
+        runs = pd.read_csv(self.index_path, dtype={'run_id': str, 'date': str})
+        if kinds is not None:
+            runs = runs[runs['kind'].isin(list(kinds))]
+        return runs
+
+    def load(
+        self,
+        columns: Optional[List[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        tickers: Optional[List[str]] = None,
+        kinds: Optional[Iterable[str]] = (SCAN_RUN,)
+    ) -> pd.DataFrame:
+        """
+        Load stored snapshots.
+
+        Only the requested columns are read from disk and date partitions
+        outside [start, end] are skipped entirely.
+
+        Args:
+            columns: Columns to load (all if None); 'date' is the partition key
+            start: First scan date to include
+            end: Last scan date to include
+            tickers: Restrict to these tickers
+            kinds: Only runs of these kinds (full scans by default; all if None)
+
+        Returns:
+            DataFrame with one row per (scan, ticker)
+        """
+        if not self.root.exists() or not any(self.root.glob('date=*/*.parquet')):
+            return pd.DataFrame(columns=columns or ['date'] + SCHEMA.names)
+
+        dataset = ds.dataset(
+            str(self.root),
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive'),
+            schema=SCHEMA.append(pa.field('date', pa.string())),
+            exclude_invalid_files=True
+        )
+
+        expr = None
+        if start is not None:
+            expr = ds.field('date') >= str(start)
+        if end is not None:
+            cond = ds.field('date') <= str(end)
+            expr = cond if expr is None else expr & cond
+        if tickers:
+            cond = ds.field('ticker').isin(list(tickers))
+            expr = cond if expr is None else expr & cond
+        if kinds is not None:
+            runs = self.runs()
+            excluded = runs[~runs['kind'].isin(list(kinds))]
+            if not excluded.empty:
+                cond = ~ds.field('run_id').isin(list(excluded['run_id']))
+                expr = cond if expr is None else expr & cond
+
+        table = dataset.to_table(columns=columns, filter=expr)
+        return table.to_pandas()
+
+    def load_run(self, day: Optional[date] = None, kind: str = SCAN_RUN) -> pd.DataFrame:
+        """
+        Load the most recent run, optionally restricted to one scan date.
+
+        Args:
+            day: Scan date (any date if None)
+            kind: Run kind to consider (full scans by default)
+
+        Returns:
+            DataFrame with one row per ticker (empty if no run matches)
+        """
+        runs = self.runs(kinds=[kind])
+        if day is not None:
+            runs = runs[runs['date'] == day.isoformat()]
+        if runs.empty:
+            return pd.DataFrame(columns=SCHEMA.names)
+
+        path = self.root / runs.iloc[-1]['path']
+        return pq.read_table(path, schema=SCHEMA).to_pandas()
+
+
+class RunWriter:
+    """
+    Streams a scan's rows to Parquet in row groups.
+
+    Rows arrive in completion order and only the current batch is held in
+    memory. Ranks are not known until every ticker is scored, so they are
+    filled in on close() while the row groups are copied to the final file.
+    """
+
+    def __init__(self, store: FeatureStore, run_id: str, scan_time: datetime,
+                 scan_name: str = "", batch_size: int = 500):
+        self.store = store
+        self.run_id = run_id
+        self.scan_time = scan_time
+        self.scan_name = scan_name
+        self.batch_size = batch_size
+        self.day = scan_time.astimezone(Settings.TIMEZONE).date().isoformat()
+        partition = store.root / f"date={self.day}"
+        partition.mkdir(parents=True, exist_ok=True)
+        self.path = partition / f"{run_id}.parquet"
+        self._part_path = self.path.with_suffix('.parquet.part')
+        self._writer = pq.ParquetWriter(self._part_path, SCHEMA, compression='zstd')
+        self._batch: List[dict] = []
+        self._scores: List[float] = []  # One per row, NaN if unscored
+
+    def add(
+        self,
+        ticker: str,
+        fund: Optional[Fundamentals],
+        opts: Optional[OptionsSnapshot],
+        cat: Optional[Catalyst],
+        idea: Optional[RankedIdea] = None
+    ):
+        """
+        Append one ticker's row.
+
+        Args:
+            ticker: Ticker symbol
+            fund: Fundamentals or None
+            opts: OptionsSnapshot or None
+            cat: Catalyst or None
+            idea: RankedIdea if the ticker was scored
+        """
+        self._batch.append(snapshot_row(self.run_id, self.scan_time, ticker, fund, opts, cat, idea))
+        self._scores.append(idea.score if idea else np.nan)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self._writer.write_table(pa.Table.from_pylist(self._batch, schema=SCHEMA))
+            self._batch = []
+
+    def close(self) -> Path:
+        """
+        Fill in ranks, publish the file and index the run.
+
+        Returns:
+            Path of the written file
+        """
+        self._flush()
+        self._writer.close()
+
+        scores = np.asarray(self._scores, dtype=float)
+        ranks = np.full(len(scores), -1, dtype=np.int64)
+        scored = np.flatnonzero(~np.isnan(scores))
+        order = scored[np.argsort(-scores[scored], kind='stable')]
+        ranks[order] = np.arange(1, len(order) + 1)
+
+        rank_index = SCHEMA.get_field_index('rank')
+        tmp_path = self.path.with_suffix('.parquet.tmp')
+        offset = 0
+        with pq.ParquetWriter(tmp_path, SCHEMA, compression='zstd') as writer:
+            source = pq.ParquetFile(self._part_path)
+            for i in range(source.num_row_groups):
+                table = source.read_row_group(i)
+                chunk = ranks[offset:offset + table.num_rows]
+                rank = pa.array(chunk, type=pa.int32(), mask=chunk < 0)
+                writer.write_table(table.set_column(rank_index, SCHEMA.field('rank'), rank))
+                offset += table.num_rows
+        tmp_path.replace(self.path)
+        self._part_path.unlink()
+
+        self.store._index_run(self.run_id, self.day, self.scan_time, self.scan_name,
+                              len(scores), len(scored), self.path)
+        logger.info(f"Saved {len(scores)} ticker snapshots to {self.path}")
+        return self.path
+
+    def abort(self):
+        """Discard the partially written run."""
+        if self._writer.is_open:
+            self._writer.close()
+        self._part_path.unlink(missing_ok=True)
+        self.path.with_suffix('.parquet.tmp').unlink(missing_ok=True)
+
+
+def save_scan_snapshot(
+    scan_name: str,
+    scan_time: datetime,
+    tickers: Iterable[str],
+    fundamentals: Dict[str, Fundamentals],
+    options: Dict[str, OptionsSnapshot],
+    catalysts: Dict[str, Catalyst],
+    scored: List[RankedIdea],
+    kind: str = SCAN_RUN
+) -> Optional[Path]:
+    """
+    Persist a scan to the feature store.
+
+    Args:
+        scan_name: Name of the scan
+        scan_time: When the scan started (timezone-aware)
+        tickers: Every ticker in the scanned universe
+        fundamentals: Dict mapping ticker to Fundamentals
+        options: Dict mapping ticker to OptionsSnapshot
+        catalysts: Dict mapping ticker to Catalyst
+        scored: All scored ideas, best first
+        kind: SCAN_RUN, or LIVE_RUN for continuous-mode snapshots
+
+    Returns:
+        Path of the written file or None on error
+    """
+    try:
+        run_id = new_run_id(scan_time)
+        rows = snapshot_rows(run_id, scan_time, tickers, fundamentals, options, catalysts, scored)
+        return FeatureStore().write_run(run_id, scan_time, rows, scan_name, kind)
+
+    except Exception as e:
+        logger.error(f"Error saving scan snapshot: {e}")
+        return None
@@ -1,5 +1,5 @@
 """Options strategy selection."""
-from .picker import pick_strategy
+from .picker import pick_strategy, pick_strategy_vec, pick_strategy_codes, STRATEGY_NAMES
 
-__all__ = ['pick_strategy']
+__all__ = ['pick_strategy', 'pick_strategy_vec', 'pick_strategy_codes', 'STRATEGY_NAMES']
 
@@ -2,6 +2,7 @@
 Options strategy picker based on signals and market conditions.
 """
 import logging
+import numpy as np
 from ..models import SignalBundle, OptionsSnapshot
 
 logger = logging.getLogger(__name__)
@@ -104,3 +105,60 @@ def pick_strategy(signals: SignalBundle, opts: OptionsSnapshot) -> tuple[str, st
     logger.debug(f"Strategy for {signals.ticker}: {strategy}")
     return strategy, notes
 
+
+# Strategy names in the order used by pick_strategy_codes
+STRATEGY_NAMES = (
+    "BULL PUT SPREAD", "LONG CALL", "CALL DEBIT SPREAD",
+    "BEAR CALL SPREAD", "LONG PUT", "PUT DEBIT SPREAD",
+    "IRON CONDOR", "SHORT STRANGLE", "LONG STRADDLE", "CALENDAR SPREAD",
+)
+
+
+def pick_strategy_codes(fund_bias, premium_bias, catalyst_score) -> np.ndarray:
+    """
+    Vectorized strategy selection as indexes into STRATEGY_NAMES.
+    
+    Follows the same decision tree as pick_strategy.
+    
+    Args:
+        fund_bias: Fundamental bias scores
+        premium_bias: Premium bias scores
+        catalyst_score: Catalyst scores
+        
+    Returns:
+        int8 array of strategy codes with the shape of the inputs
+    """
+    fb = np.asarray(fund_bias, dtype=float)
+    pb = np.asarray(premium_bias, dtype=float)
+    cs = np.asarray(catalyst_score, dtype=float)
+    
+    bull = fb > 2
+    bear = fb < -2
+    high = pb > 2
+    low = pb < -2
+    catalyst = cs > 5
+    
+    # Neutral with high premium + catalyst, and neutral/moderate, are both IRON CONDOR (6)
+    return np.select(
+        [bull & high, bull & low, bull,
+         bear & high, bear & low, bear,
+         high & catalyst, high, low & catalyst, low],
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+        6
+    ).astype(np.int8)
+
+
+def pick_strategy_vec(fund_bias, premium_bias, catalyst_score) -> np.ndarray:
+    """
+    Vectorized strategy selection (names only, no notes).
+    
+    Args:
+        fund_bias: Fundamental bias scores
+        premium_bias: Premium bias scores
+        catalyst_score: Catalyst scores
+        
+    Returns:
+        Array of strategy names with the shape of the inputs
+    """
+    codes = pick_strategy_codes(fund_bias, premium_bias, catalyst_score)
+    return np.asarray(STRATEGY_NAMES)[codes]
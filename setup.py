@@ -30,7 +30,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "options-bot-scan=options_bot.runner.scan:run_scan",
+            "options-bot-scan=options_bot.runner.scan:main",
             "options-bot-scheduler=options_bot.runner.scheduler:start_scheduler",
         ],
     },
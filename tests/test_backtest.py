@@ -0,0 +1,254 @@
+"""
+Tests for vectorized scoring and the backtest engine.
+"""
+import random
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+pytest.importorskip("pyarrow")
+
+from options_bot.models import Fundamentals, OptionsSnapshot, Catalyst, SignalBundle
+from options_bot.signals import (
+    fundamental_bias, premium_bias, catalyst_score,
+    fundamental_bias_vec, premium_bias_vec, catalyst_score_vec
+)
+from options_bot.ranker import score_candidates, calculate_overall_score_vec
+from options_bot.ranker.ranker import calculate_overall_score
+from options_bot.strategy import pick_strategy, pick_strategy_vec
+from options_bot.storage import FeatureStore, BarStore
+from options_bot.storage.feature_store import snapshot_rows
+from options_bot.backtest import engine, sweep, run_backtest, run_sweep, build_grid
+from options_bot.backtest.sweep import walk_forward_folds
+
+
+def maybe(rng, values):
+    """Pick a value, sometimes None, favouring threshold boundaries."""
+    return None if rng.random() < 0.15 else rng.choice(values)
+
+
+def nan(value):
+    return np.nan if value is None else value
+
+
+def random_inputs(rng, ticker):
+    fund = Fundamentals(
+        ticker=ticker,
+        market_cap=rng.choice([5e8, 1e9, 5e9]),
+        pe_ratio=maybe(rng, [-5, 0, 10, 15, 20, 25, 30, 40, 50, 70]),
+        forward_pe=maybe(rng, [-1, 10, 15, 18, 20, 30, 35, 40]),
+        profit_margins=maybe(rng, [-0.1, 0, 0.03, 0.05, 0.08, 0.1, 0.15, 0.2, 0.3]),
+        debt_to_equity=maybe(rng, [0.1, 0.3, 0.4, 0.5, 1.0, 2.0, 2.5, 4.0]),
+        sector=None,
+        revenue_growth=maybe(rng, [-0.2, -0.1, 0, 0.1, 0.15, 0.2, 0.3]),
+        earnings_growth=maybe(rng, [-0.2, -0.15, 0, 0.15, 0.2, 0.25, 0.4])
+    )
+    opts = OptionsSnapshot(
+        ticker=ticker,
+        spot_price=100.0,
+        hv30=maybe(rng, [0.0, 0.1, 0.2, 0.3]),
+        atm_iv_dte35=maybe(rng, [0.0, 0.1, 0.15, 0.2, 0.25, 0.3, 0.45]),
+        iv_rank_1y=maybe(rng, [0, 15, 20, 30, 40, 50, 60, 70, 80, 90]),
+        skew_25d_rr=maybe(rng, [-0.1, -0.05, 0, 0.05, 0.1]),
+        term_slope_iv=maybe(rng, [-0.1, -0.05, 0, 0.05, 0.1]),
+        liq_calls_score=rng.choice([1.0, 2.0, 4.0, 8.0]),
+        liq_puts_score=rng.choice([1.0, 2.0, 6.0, 10.0])
+    )
+    days = maybe(rng, [-25, -10, -3, 0, 2, 3, 5, 8, 10, 15, 20, 30])
+    cat = Catalyst(
+        ticker=ticker,
+        next_earnings_date=None,
+        earnings_bmo_amc=None,
+        headlines=["h"] * rng.choice([0, 1, 2, 3, 4, 5, 7]),
+        sentiment_score=maybe(rng, [-0.8, -0.5, -0.3, 0, 0.3, 0.4, 0.5, 0.9]),
+        has_major_event_7d=rng.random() < 0.3,
+        days_to_earnings=days
+    )
+    return fund, opts, cat
+
+
+@pytest.fixture(scope="module")
+def samples():
+    rng = random.Random(7)
+    return [random_inputs(rng, f"T{i}") for i in range(2000)]
+
+
+class TestVectorizedParity:
+    """Vectorized scoring must match the scalar functions exactly."""
+
+    def test_signals_and_score(self, samples):
+        funds, opts, cats = zip(*samples)
+
+        fb = fundamental_bias_vec(
+            [nan(f.pe_ratio) for f in funds], [nan(f.forward_pe) for f in funds],
+            [nan(f.profit_margins) for f in funds], [nan(f.debt_to_equity) for f in funds],
+            [nan(f.revenue_growth) for f in funds], [nan(f.earnings_growth) for f in funds]
+        )
+        pb = premium_bias_vec(
+            [nan(o.atm_iv_dte35) for o in opts], [nan(o.hv30) for o in opts],
+            [nan(o.iv_rank_1y) for o in opts], [nan(o.skew_25d_rr) for o in opts],
+            [nan(o.term_slope_iv) for o in opts]
+        )
+        cs = catalyst_score_vec(
+            [nan(c.days_to_earnings) for c in cats], [c.has_major_event_7d for c in cats],
+            [nan(c.sentiment_score) for c in cats], [len(c.headlines) for c in cats]
+        )
+        overall = calculate_overall_score_vec(
+            fb, pb, cs, [o.liquidity_score for o in opts], [f.market_cap for f in funds]
+        )
+        strategies = pick_strategy_vec(fb, pb, cs)
+
+        for i, (f, o, c) in enumerate(samples):
+            signals = SignalBundle(f.ticker, fundamental_bias(f), premium_bias(o), catalyst_score(c))
+            assert fb[i] == pytest.approx(signals.fund_bias)
+            assert pb[i] == pytest.approx(signals.premium_bias)
+            assert cs[i] == pytest.approx(signals.catalyst_score)
+            assert overall[i] == pytest.approx(calculate_overall_score(signals, o, f))
+            assert strategies[i] == pick_strategy(signals, o)[0]
+
+    def test_panel_shapes(self):
+        """The vectorized functions work on 2-D panels."""
+        panel = np.full((3, 4), 12.0)
+        out = fundamental_bias_vec(panel, panel, panel, panel, panel, panel)
+        assert out.shape == (3, 4)
+
+
+def build_history(tmp_path, days=6, tickers=("AAA", "BBB", "CCC", "DDD")):
+    """Archive synthetic scans and bars with known moves."""
+    feature_store = FeatureStore(tmp_path / "features")
+    bar_store = BarStore(tmp_path / "bars")
+    rng = random.Random(3)
+    start = date(2025, 3, 3)
+
+    scan_days = [start + timedelta(days=d) for d in range(days)]
+    for day in scan_days:
+        fundamentals, options, catalysts = {}, {}, {}
+        for t in tickers:
+            fundamentals[t], options[t], catalysts[t] = random_inputs(rng, t)
+            fundamentals[t].market_cap = 5e9
+        when = pytz.UTC.localize(datetime.combine(day, datetime.min.time()) + timedelta(hours=14))
+        scored = score_candidates(list(tickers), fundamentals, options, catalysts)
+        run_id = when.strftime('%Y%m%dT%H%M%S')
+        rows = snapshot_rows(run_id, when, tickers, fundamentals, options, catalysts, scored)
+        feature_store.write_run(run_id, when, rows)
+
+    # AAA rises 1%/day, BBB falls 1%/day, others are flat
+    bar_days = [start + timedelta(days=d) for d in range(days + 10)]
+    rows = []
+    for t, drift in zip(tickers, (0.01, -0.01, 0.0, 0.0)):
+        for i, day in enumerate(bar_days):
+            close = 100 * (1 + drift) ** i
+            rows.append((t, day, close, close, close, close, 1e6))
+    bar_store.append(pd.DataFrame(rows, columns=['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']))
+    return feature_store, bar_store, scan_days
+
+
+class TestBacktestEngine:
+    """End-to-end replay over a small archive."""
+
+    def test_replay_matches_live_ranker(self, tmp_path):
+        """Daily picks and strategies equal what the live ranker chose."""
+        feature_store, bar_store, _ = build_history(tmp_path)
+        result = run_backtest(horizon=2, top_k=2, feature_store=feature_store, bar_store=bar_store)
+        stored = feature_store.load(columns=['date', 'ticker', 'rank', 'strategy', 'score'])
+
+        assert len(result.trades) == 6 * 2
+        for _, trade in result.trades.iterrows():
+            live = stored[(stored['date'] == str(trade['date'])[:10]) & (stored['ticker'] == trade['ticker'])].iloc[0]
+            assert live['rank'] <= 2
+            assert live['strategy'] == trade['strategy']
+            assert live['score'] == pytest.approx(trade['score'])
+
+    def test_forward_returns_and_summary(self, tmp_path):
+        """Forward returns come from the bar store and feed the summary."""
+        feature_store, bar_store, _ = build_history(tmp_path)
+        result = run_backtest(horizon=2, top_k=0, feature_store=feature_store, bar_store=bar_store)
+        trades = result.trades
+
+        aaa = trades[trades['ticker'] == "AAA"]['forward_return']
+        bbb = trades[trades['ticker'] == "BBB"]['forward_return']
+        assert np.allclose(aaa, 1.01 ** 2 - 1)
+        assert np.allclose(bbb, 0.99 ** 2 - 1)
+
+        summary = result.summary()
+        assert "ALL" in summary.index
+        assert summary.loc["ALL", "trades"] == trades['strategy_return'].notna().sum()
+        assert 0.0 <= summary.loc["ALL", "hit_rate"] <= 1.0
+
+    def test_empty_archive(self, tmp_path):
+        """An empty archive yields no trades."""
+        result = run_backtest(feature_store=FeatureStore(tmp_path / "f"), bar_store=BarStore(tmp_path / "b"))
+        assert result.trades.empty
+        assert result.summary().empty
+
+
+class TestSweep:
+    """Parameter sweep over the prepared panel."""
+
+    def test_grid(self):
+        grid = build_grid(weight_step=0.5, min_liquidity_scores=(1.0, 3.0))
+        totals = [g['weight_fundamental'] + g['weight_premium'] + g['weight_catalyst'] for g in grid]
+        assert all(0 < t <= 1.0 for t in totals)
+        assert len(grid) == 9 * 2
+
+    def test_folds(self):
+        folds = walk_forward_folds(10, train_days=4, test_days=2)
+        assert [(f[0].start, f[1].start, f[1].stop) for f in folds] == [(0, 4, 6), (2, 6, 8), (4, 8, 10)]
+
+    def test_folds_purge_the_horizon(self):
+        """Test windows start horizon days after their training window ends."""
+        folds = walk_forward_folds(10, train_days=4, test_days=2, purge=2)
+        assert [(f[0].stop, f[1].start, f[1].stop) for f in folds] == [(4, 6, 8), (6, 8, 10)]
+
+    def test_folds_reject_empty_windows(self):
+        """Zero-length windows would never advance."""
+        with pytest.raises(ValueError):
+            walk_forward_folds(10, train_days=4, test_days=0)
+        with pytest.raises(ValueError):
+            walk_forward_folds(10, train_days=0, test_days=2)
+
+    def test_sweep_matches_backtest(self, tmp_path):
+        """Sweep totals agree with the engine; workers give the same answer as in-process."""
+        feature_store, bar_store, _ = build_history(tmp_path, days=8)
+        grid = build_grid(weight_step=0.5, min_liquidity_scores=(1.0, 10.0))
+        kwargs = dict(horizon=2, top_k=0, train_days=2, test_days=2,
+                      feature_store=feature_store, bar_store=bar_store)
+
+        serial = run_sweep(grid, workers=1, **kwargs)
+        parallel = run_sweep(grid, workers=2, chunk_size=3, **kwargs)
+        pd.testing.assert_frame_equal(serial.results, parallel.results)
+        assert len(serial.results) == len(grid)
+        assert len(serial.walk_forward) == 2
+
+        params = grid[0]
+        backtest = run_backtest(horizon=2, top_k=0, feature_store=feature_store, bar_store=bar_store, **params)
+        row = serial.results[
+            (serial.results['weight_fundamental'] == params['weight_fundamental']) &
+            (serial.results['weight_premium'] == params['weight_premium']) &
+            (serial.results['weight_catalyst'] == params['weight_catalyst']) &
+            (serial.results['min_liquidity_score'] == params['min_liquidity_score'])
+        ].iloc[0]
+        all_trades = backtest.summary().loc["ALL"]
+        assert row['trades'] == all_trades['trades']
+        assert row['hit_rate'] == pytest.approx(all_trades['hit_rate'])
+
+    def test_top_k_ties_match_backtest(self, tmp_path, monkeypatch):
+        """Ties at the top-K cut-off resolve the same way in the sweep and the engine."""
+        feature_store, bar_store, _ = build_history(tmp_path, days=8)
+        # AAA and BBB tie for the last of three picks every day
+        tied = lambda data, **params: np.tile([0.0, 0.0, 1.0, 1.0], (data.strategy_return.shape[0], 1))
+        monkeypatch.setattr(engine, 'score_panel', tied)
+        monkeypatch.setattr(sweep, 'score_panel', tied)
+        params = build_grid(weight_step=1.0, min_liquidity_scores=(1.0,))[0]
+
+        result = run_sweep([params], horizon=2, top_k=3, train_days=2, test_days=2, workers=1,
+                           feature_store=feature_store, bar_store=bar_store)
+        backtest = run_backtest(horizon=2, top_k=3, feature_store=feature_store, bar_store=bar_store, **params)
+        assert set(backtest.trades['ticker']) == {"AAA", "CCC", "DDD"}
+        assert result.results.loc[0, 'trades'] == len(backtest.trades.dropna(subset=['strategy_return']))
+        assert result.results.loc[0, 'mean_return'] == pytest.approx(backtest.trades['strategy_return'].mean())
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,40 @@
+"""
+Tests for the offline benchmark suite.
+"""
+import pytest
+
+from benchmarks.fixtures import build_universe, load_base
+from benchmarks.run import BENCHMARKS, compare, run_benchmarks
+from options_bot.ingestion.options import calculate_hv, summarize_chain
+
+
+class TestBenchmarkSuite:
+
+    def test_fixtures_tile_deterministically(self):
+        base = load_base()
+        small = build_universe(150, base)
+        again = build_universe(150, base)
+        assert len(small.tickers) == 150 and small.tickers[100] == "B000.1"
+        assert small.options == again.options
+
+        # Derived snapshots of copies match a direct summary of their chains
+        ticker = "B007.1"
+        bars = small.ohlcv[ticker]
+        direct = summarize_chain(ticker, *small.chains[ticker], float(bars['Close'].iloc[-1]),
+                                 calculate_hv(bars['Close'], window=30))
+        derived = small.options[ticker]
+        assert derived.spot_price == pytest.approx(direct.spot_price)
+        assert derived.hv30 == pytest.approx(direct.hv30)
+        assert derived.atm_iv_dte35 == pytest.approx(direct.atm_iv_dte35)
+        assert derived.open_interest == direct.open_interest
+
+    def test_run_and_compare(self):
+        report = run_benchmarks(sizes=[20], repeat=1)
+        assert {r['benchmark'] for r in report['results']} == set(BENCHMARKS)
+        assert all(r['best_s'] > 0 for r in report['results'])
+        assert report['environment']['ta_backend'] in ('talib', 'pandas_ta', 'pandas')
+        assert len(compare(report, report)) == len(BENCHMARKS) + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Tests for single-flight coalescing of concurrent identical requests.
+"""
+import threading
+import time
+
+import pytest
+
+from benchmarks.standin import start_server
+from options_bot.ingestion import transport
+from options_bot.ingestion.coalesce import SingleFlight
+from options_bot.ingestion.transport import Cassette, Transport
+
+
+def run_together(count, target):
+    """Start count threads on target at once and collect their results."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_request(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'price': 10.0}
+
+        results = run_together(8, lambda: flight.do('yfinance', ('AAPL', 'info'), fetch))
+        assert len(calls) == 1 and all(r is results[0] for r in results)
+        assert flight.stats.as_dict() == {'requests': 8, 'executed': 1, 'coalesced': 7, 'by_provider': {'yfinance': 7}}
+        assert flight.in_flight() == 0
+
+    def test_different_keys_and_later_calls_go_out(self):
+        flight = SingleFlight()
+        calls = []
+        fetch = lambda: calls.append(1) or time.sleep(0.05)
+
+        run_together(2, lambda: flight.do('yfinance', threading.current_thread().name, fetch))
+        flight.do('yfinance', 'same', fetch)
+        flight.do('yfinance', 'same', fetch)
+        assert len(calls) == 4 and flight.stats.coalesced == 0
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        def fetch():
+            time.sleep(0.1)
+            raise ConnectionError("reset by peer")
+
+        results = run_together(4, lambda: flight.do('finnhub.io', 'quote', fetch))
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert flight.stats.executed == 1 and flight.in_flight() == 0
+
+
+class TestTransportCoalescing:
+
+    @pytest.fixture
+    def server(self):
+        server = start_server(seed=3, latency_ms=300)
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def test_standin_ticker_and_http_requests(self, server):
+        routed = Transport('standin', standin_url=server.url, coalesce=True)
+        before = server.stats()['requests']
+
+        infos = run_together(6, lambda: routed.ticker("S00001").info)
+        assert all(info == infos[0] for info in infos)
+        news = run_together(4, lambda: routed.http_get("https://finnhub.io/api/v1/company-news",
+                                                       params={'symbol': "S00001", 'token': 'x'}).json())
+        assert all(n == news[0] for n in news)
+
+        assert server.stats()['requests'] - before == 2
+        assert routed.coalescing_stats()['by_provider'] == {'yfinance': 5, 'finnhub.io': 3}
+
+    def test_off_by_default_for_bare_transports(self, server):
+        routed = Transport('standin', standin_url=server.url)
+        before = server.stats()['requests']
+        run_together(3, lambda: routed.ticker("S00002").info)
+        assert server.stats()['requests'] - before == 3
+        assert routed.coalescing_stats()['coalesced'] == 0
+
+    def test_record_mode_records_once(self, tmp_path):
+        recorder = Transport('record', Cassette(tmp_path / 'c.db'), coalesce=True)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'symbol': 'SPY'}
+
+        run_together(5, lambda: recorder._call('yfinance', ['SPY', 'info'], fetch))
+        assert len(calls) == 1 and recorder.recorded == 1
+        recorder.close()
+
+    def test_replay_is_not_coalesced(self, tmp_path):
+        replay = Transport('replay', Cassette(tmp_path / 'c.db'), coalesce=True)
+        assert replay.singleflight is None and replay.coalescing_stats()['requests'] == 0
+        replay.close()
+
+    def test_configured_from_settings(self, server):
+        try:
+            assert transport.configure('standin', url=server.url).singleflight is not None
+            assert transport.coalescing_stats()['requests'] == 0
+        finally:
+            transport.configure('live')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
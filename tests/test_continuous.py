@@ -0,0 +1,118 @@
+"""
+Tests for continuous intraday mode.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_bot.config import Settings
+from options_bot.ingestion.freshness import merge_fresh
+from options_bot.ingestion.options import RollingHV, calculate_hv
+from options_bot.runner import baseline, continuous
+from options_bot.storage import LIVE_RUN
+from tests.test_incremental import make_fundamentals, make_options, make_catalyst
+
+
+class TestRollingHV:
+    """Incremental volatility matches the batch calculation."""
+
+    def test_matches_calculate_hv(self):
+        rng = np.random.default_rng(0)
+        closes = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60))))
+        state = RollingHV(closes, window=30)
+        for spot in (95.0, 100.0, 108.5):
+            expected = calculate_hv(pd.concat([closes, pd.Series([spot])], ignore_index=True), window=30)
+            assert state.value(spot) == pytest.approx(expected, rel=1e-9)
+
+    def test_short_history(self):
+        assert RollingHV(pd.Series([100.0, 101.0, 102.0]), window=30).value(103.0) is None
+
+
+class TestMarketHours:
+
+    def test_session_bounds(self):
+        tz = Settings.TIMEZONE
+        assert continuous.is_market_open(tz.localize(datetime(2024, 3, 5, 10, 0)))
+        assert not continuous.is_market_open(tz.localize(datetime(2024, 3, 5, 9, 0)))
+        assert not continuous.is_market_open(tz.localize(datetime(2024, 3, 5, 16, 0)))
+        assert not continuous.is_market_open(tz.localize(datetime(2024, 3, 9, 11, 0)))  # Saturday
+
+
+class TestContinuousScanner:
+    """Cycles re-score tickers from the baseline plus intraday refreshes."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = {'full': 0, 'refresh_options': 0, 'refresh_catalyst': 0, 'history': 0, 'notify': []}
+
+        def fetch_data(tickers, score_sentiment=True):
+            calls['full'] += 1
+            return ({t: make_fundamentals(t) for t in tickers},
+                    {t: make_options(t) for t in tickers},
+                    {t: make_catalyst(t) for t in tickers})
+
+        def refresh_options(prev, hv_state=None):
+            calls['refresh_options'] += 1
+            return merge_fresh(prev, make_options(prev.ticker, spot=prev.spot_price + 1, hv30=None))
+
+        def refresh_catalyst(prev, **kw):
+            calls['refresh_catalyst'] += 1
+            return prev
+
+        def history(ticker, period="1y"):
+            calls['history'] += 1
+            return None
+
+        monkeypatch.setattr(continuous, 'fetch_data', fetch_data)
+        monkeypatch.setattr(continuous, 'refresh_options_snapshot', refresh_options)
+        monkeypatch.setattr(continuous, 'refresh_catalyst', refresh_catalyst)
+        monkeypatch.setattr(continuous, 'get_price_history', history)
+        monkeypatch.setattr(continuous, 'notify_ideas', lambda ideas, name: calls['notify'].append(ideas))
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', False)
+        baseline.clear_baseline()
+        yield calls
+        baseline.clear_baseline()
+
+    def test_cycles_reuse_baseline(self, calls):
+        scanner = continuous.ContinuousScanner(["AAA", "BBB"], cadence=0, news_every=2)
+        now = Settings.TIMEZONE.localize(datetime(2024, 3, 5, 10, 0))
+
+        scanner.run_cycle(now)
+        scanner.run_cycle(now)
+        ideas = scanner.run_cycle(now)
+
+        assert calls['full'] == 1
+        assert calls['refresh_options'] == 6
+        assert calls['refresh_catalyst'] == 4  # Cycles 0 and 2
+        assert calls['history'] == 2  # HV seeded once per ticker
+        assert len(calls['notify']) == 3
+        assert {idea.ticker for idea in ideas} == {"AAA", "BBB"}
+        assert all(idea.options.spot_price == 103.0 for idea in ideas)
+        assert [idea.score for idea in ideas] == sorted((idea.score for idea in ideas), reverse=True)
+
+    def test_paces_tickers_across_cadence(self, calls):
+        sleeps = []
+        clock = iter(range(100)).__next__
+        scanner = continuous.ContinuousScanner(
+            ["AAA", "BBB", "CCC", "DDD"], cadence=40, sleep=sleeps.append, clock=lambda: float(clock())
+        )
+        scanner.run_cycle(Settings.TIMEZONE.localize(datetime(2024, 3, 5, 10, 0)))
+        assert len(sleeps) == 4
+        assert all(s > 0 for s in sleeps)
+
+    def test_live_snapshots_on_their_own_cadence(self, calls, monkeypatch):
+        saved = []
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', True)
+        monkeypatch.setattr(continuous, 'save_scan_snapshot', lambda *args, kind: saved.append(kind))
+        scanner = continuous.ContinuousScanner(["AAA", "BBB"], cadence=0, snapshot_every=2)
+        now = Settings.TIMEZONE.localize(datetime(2024, 3, 5, 10, 0))
+
+        for _ in range(5):
+            scanner.run_cycle(now)
+        assert saved == [LIVE_RUN, LIVE_RUN]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
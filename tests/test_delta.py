@@ -0,0 +1,147 @@
+"""
+Tests for delta notifications between scans.
+"""
+import pytest
+
+from options_bot.config import Settings
+from options_bot.models import Fundamentals, OptionsSnapshot, Catalyst, SignalBundle, RankedIdea
+from options_bot.notify.delta import DeltaTracker, compute_delta
+from options_bot.notify.formatter import format_delta_brief, format_delta_html
+from options_bot.notify.outbox import PENDING, SENT, FAILED
+from options_bot.runner import scan
+
+
+def make_idea(ticker, score=7.2, strategy="BULL PUT SPREAD"):
+    """Ranked idea with fixed signals."""
+    return RankedIdea(
+        ticker=ticker,
+        score=score,
+        signals=SignalBundle(ticker, 5.0, 4.0, 3.0),
+        options=OptionsSnapshot(ticker, 100.0, 0.2, 0.3, 70.0, 0.02, None, 8.0, 6.0),
+        fundamentals=Fundamentals(ticker, 5e9, 12.0, 11.0, 0.2, 0.4, "Technology"),
+        catalyst=Catalyst(ticker, None, None),
+        strategy=strategy,
+        notes="test"
+    )
+
+
+class TestComputeDelta:
+    """Comparison by ticker, strategy and score bucket."""
+
+    def test_first_scan_is_all_new(self):
+        """Without previous state every idea is new."""
+        delta = compute_delta([make_idea("AAA"), make_idea("BBB")], {}, 1.0)
+        assert [idea.ticker for _, idea in delta.new] == ["AAA", "BBB"]
+        assert delta.has_changes
+
+    def test_classification(self):
+        """Ideas are split into unchanged, changed, new and dropped."""
+        previous = {
+            "AAA": {'strategy': "BULL PUT SPREAD", 'score': 7.9, 'rank': 1},  # Same bucket
+            "BBB": {'strategy': "LONG CALL", 'score': 7.0, 'rank': 2},  # Strategy changed
+            "CCC": {'strategy': "BULL PUT SPREAD", 'score': 5.5, 'rank': 3},  # Score bucket changed
+            "DDD": {'strategy': "IRON CONDOR", 'score': 5.0, 'rank': 4},  # Dropped
+        }
+        ideas = [make_idea("AAA", 7.2), make_idea("BBB", 7.0), make_idea("CCC", 6.1), make_idea("EEE", 6.0)]
+        delta = compute_delta(ideas, previous, 1.0)
+
+        assert [idea.ticker for _, idea in delta.unchanged] == ["AAA"]
+        assert [idea.ticker for _, idea, _ in delta.changed] == ["BBB", "CCC"]
+        assert [idea.ticker for _, idea in delta.new] == ["EEE"]
+        assert [d['ticker'] for d in delta.dropped] == ["DDD"]
+        assert [rank for rank, _ in delta.changed_ideas] == [2, 3, 4]
+
+    def test_identical_scan_has_no_changes(self):
+        """Repeating the previous scan reports nothing."""
+        ideas = [make_idea("AAA"), make_idea("BBB", 6.4)]
+        previous = {i.ticker: {'strategy': i.strategy, 'score': i.score, 'rank': r} for r, i in enumerate(ideas, 1)}
+        assert not compute_delta(ideas, previous, 1.0).has_changes
+
+
+class TestDeltaTracker:
+    """State persists across tracker instances (restarts)."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved ideas compare as unchanged from a new tracker."""
+        path = tmp_path / "state.json"
+        ideas = [make_idea("AAA"), make_idea("BBB")]
+        DeltaTracker(path, 1.0).save(ideas, "Premarket")
+
+        delta = DeltaTracker(path, 1.0).diff(ideas)
+        assert not delta.has_changes
+        assert len(delta.unchanged) == 2
+
+    def test_corrupt_state_treated_as_empty(self, tmp_path):
+        """Unreadable state is treated as no previous scan."""
+        path = tmp_path / "state.json"
+        path.write_text("{not json")
+        assert DeltaTracker(path, 1.0).load() == {}
+
+    def test_formatting(self):
+        """Brief and HTML messages list new, dropped and unchanged ideas."""
+        delta = compute_delta(
+            [make_idea("AAA"), make_idea("EEE")],
+            {"AAA": {'strategy': "BULL PUT SPREAD", 'score': 7.2, 'rank': 1},
+             "DDD": {'strategy': "IRON CONDOR", 'score': 5.0, 'rank': 2}},
+            1.0
+        )
+        text = format_delta_brief(delta, "Mid-Morning Scan")
+        assert "EEE" in text and "Dropped: DDD (IRON CONDOR)" in text and "Unchanged: 1. AAA" in text
+        assert "AAA -" not in text
+        assert "Unchanged" not in format_delta_brief(delta, "Mid-Morning Scan", show_unchanged=False)
+        assert "EEE" in format_delta_html(delta, "Mid-Morning Scan")
+
+
+class TestNotifyIdeas:
+    """Only changes reach the channels, and state advances on success."""
+
+    @pytest.fixture
+    def sent(self, monkeypatch, tmp_path):
+        """Deltas passed to send_notifications, with state in tmp_path and every message delivered."""
+        sent = []
+        monkeypatch.setattr(Settings, 'DELTA_NOTIFICATIONS', True)
+        monkeypatch.setattr(Settings, 'DELTA_STATE_PATH', str(tmp_path / "state.json"))
+        monkeypatch.setattr(scan, 'send_notifications', lambda ideas, name, delta=None: sent.append(delta) or [len(sent)])
+        monkeypatch.setattr(scan, 'delivery_status', lambda ids: SENT)
+        return sent
+
+    def test_repeat_scan_is_skipped(self, sent):
+        """An unchanged scan sends nothing; a changed one sends the delta."""
+        ideas = [make_idea("AAA"), make_idea("BBB")]
+        assert scan.notify_ideas(ideas, "Scan 1")
+        assert scan.notify_ideas(ideas, "Scan 2")
+        assert len(sent) == 1
+
+        assert scan.notify_ideas([make_idea("AAA")], "Scan 3")
+        assert len(sent) == 2
+        assert [d['ticker'] for d in sent[-1].dropped] == ["BBB"]
+
+    def test_failed_delivery_is_retried(self, sent, monkeypatch):
+        """State is not saved when nothing could be queued."""
+        monkeypatch.setattr(scan, 'send_notifications', lambda ideas, name, delta=None: [])
+        assert not scan.notify_ideas([make_idea("AAA")], "Scan 1")
+        assert DeltaTracker(delivery_status=lambda ids: SENT).load() == {}
+
+    def test_state_advances_only_after_delivery(self, sent, monkeypatch):
+        """Queued ideas wait for the outbox; messages given up on are sent again."""
+        status = {'value': PENDING}
+        monkeypatch.setattr(scan, 'delivery_status', lambda ids: status['value'])
+        ideas = [make_idea("AAA")]
+
+        assert scan.notify_ideas(ideas, "Scan 1")
+        # Still queued: the same changes are not queued twice
+        assert scan.notify_ideas(ideas, "Scan 2")
+        assert len(sent) == 1
+
+        status['value'] = FAILED
+        assert scan.notify_ideas(ideas, "Scan 3")
+        assert len(sent) == 2 and [i.ticker for _, i in sent[-1].new] == ["AAA"]
+
+        status['value'] = SENT
+        assert scan.notify_ideas(ideas, "Scan 4")
+        assert len(sent) == 2
+        assert set(DeltaTracker(delivery_status=lambda ids: SENT).load()) == {"AAA"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Tests for the rate-limit aware Discord webhook client.
+"""
+import pytest
+
+from options_bot.notify.discord_client import DiscordWebhookClient, pack_embeds, embed_size
+
+
+class FakeResponse:
+    def __init__(self, status_code=204, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+        self.text = str(body or "")
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no body")
+        return self._body
+
+
+class FakeSession:
+    """Replays canned responses and records posted payloads."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.payloads = []
+        self.timeouts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.payloads.append(json)
+        self.timeouts.append(timeout)
+        return self.responses.pop(0) if self.responses else FakeResponse()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_client(responses, max_retries=3):
+    clock = FakeClock()
+    session = FakeSession(responses)
+    client = DiscordWebhookClient("https://example/webhook", session=session, timeout=5,
+                                  max_retries=max_retries, sleep=clock.sleep, clock=clock)
+    return client, session, clock
+
+
+def embed(chars):
+    return {"title": "", "description": "x" * chars}
+
+
+class TestPackEmbeds:
+    """Packing respects both the embed-count and character limits."""
+
+    def test_count_limit(self):
+        batches = pack_embeds([embed(10) for _ in range(23)])
+        assert [len(b) for b in batches] == [10, 10, 3]
+
+    def test_character_limit(self):
+        batches = pack_embeds([embed(2500) for _ in range(5)])
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert all(sum(embed_size(e) for e in b) <= 6000 for b in batches)
+
+    def test_order_preserved(self):
+        embeds = [{"title": str(i), "description": "x" * (i * 300)} for i in range(15)]
+        flat = [e for b in pack_embeds(embeds) for e in b]
+        assert flat == embeds
+
+    def test_size_counts_fields(self):
+        e = {"title": "ab", "description": "cde", "fields": [{"name": "f", "value": "gh"}],
+             "footer": {"text": "ij"}}
+        assert embed_size(e) == 10
+
+
+class TestRateLimits:
+    """Bucket headers pace requests; 429s are retried after retry_after."""
+
+    def test_waits_for_exhausted_bucket(self):
+        exhausted = FakeResponse(204, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '1.5'})
+        client, session, clock = make_client([exhausted, FakeResponse()])
+        assert client.post("one")
+        assert clock.sleeps == []
+        assert client.post("two")
+        assert clock.sleeps == [1.5]
+        assert session.timeouts == [5, 5]
+
+    def test_no_wait_while_bucket_has_room(self):
+        room = FakeResponse(204, {'X-RateLimit-Remaining': '3', 'X-RateLimit-Reset-After': '2'})
+        client, _, clock = make_client([room, room, room])
+        for _ in range(3):
+            assert client.post("msg")
+        assert clock.sleeps == []
+
+    def test_429_retry_after(self):
+        limited = FakeResponse(429, {}, {'retry_after': 0.75, 'global': False})
+        client, session, clock = make_client([limited, FakeResponse()])
+        assert client.post("msg")
+        assert clock.sleeps == [0.75]
+        assert len(session.payloads) == 2
+
+    def test_client_error_not_retried(self):
+        client, session, _ = make_client([FakeResponse(400, body={'message': 'bad'})])
+        assert not client.post("msg")
+        assert len(session.payloads) == 1
+
+    def test_gives_up_after_retries(self):
+        client, session, _ = make_client([FakeResponse(503)] * 5, max_retries=2)
+        assert not client.post("msg")
+        assert len(session.payloads) == 3
+
+    def test_failed_batch_does_not_abort_rest(self):
+        client, session, _ = make_client([FakeResponse(400), FakeResponse(), FakeResponse()])
+        assert not client.send_embeds("first", [embed(10) for _ in range(25)], "cont")
+        assert len(session.payloads) == 3
+        assert [p['content'] for p in session.payloads] == ["first", "cont", "cont"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+"""
+Tests for the multi-node scan coordinator and workers.
+"""
+import threading
+from datetime import datetime
+
+import pytest
+import requests
+
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import transport
+from options_bot.ingestion.catalysts import apply_sentiment
+from options_bot.runner import baseline, scan
+from options_bot.runner.distributed import ScanCoordinator, decode_result, encode_result, run_worker, serve
+from options_bot.runner.pipeline import stream_scan
+from tests.test_pipeline import fake_fetch
+
+TOKEN = "test-token"
+AUTH = {'X-Coordinator-Token': TOKEN}
+
+
+@pytest.fixture
+def coordinated():
+    servers = []
+
+    def start(tickers, **kwargs):
+        stored = {}
+        coordinator = ScanCoordinator(tickers, sink=lambda t, data, idea: stored.__setitem__(t, data), **kwargs)
+        server = serve(coordinator, token=TOKEN)
+        servers.append(server)
+        return coordinator, server.url, stored
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def start_workers(url, count, **kwargs):
+    threads = [
+        threading.Thread(target=run_worker, args=(url, f"w{i}"), kwargs=dict(fetch=fake_fetch, token=TOKEN, **kwargs),
+                         daemon=True)
+        for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+class TestResultRows:
+
+    def test_round_trip(self):
+        data = fake_fetch("T3")
+        idea = scan.score_ticker("T3", data)
+        index, ticker, decoded, copy = decode_result(encode_result(7, "T3", data, idea))
+        assert (index, ticker) == (7, "T3")
+        assert decoded[1] == data[1] and decoded[0] == data[0]
+        assert decoded[2].next_earnings_date == data[2].next_earnings_date
+        assert (copy.score, copy.strategy, copy.signals) == (idea.score, idea.strategy, idea.signals)
+
+    def test_unscored_ticker(self):
+        _, _, decoded, idea = decode_result(encode_result(0, "X", (None, None, None), None))
+        assert decoded == (None, None, None) and idea is None
+
+
+class TestCoordinator:
+
+    def test_workers_rank_like_single_process(self, coordinated):
+        tickers = [f"T{i}" for i in range(30)]
+        coordinator, url, stored = coordinated(tickers, top_k=8, lease_size=4)
+        threads = start_workers(url, 3, fetch_workers=2)
+
+        assert coordinator.wait(30)
+        for thread in threads:
+            thread.join(timeout=10)
+        ideas, stats = coordinator.results()
+
+        expected, _ = stream_scan(tickers, fake_fetch, scan.score_ticker, analyze=apply_sentiment, top_k=8)
+        assert [(i.ticker, i.score) for i in ideas] == [(i.ticker, i.score) for i in expected]
+        assert stats.received == 30 and stats.scored == 30 and stats.expired == 0
+        assert set(stored) == set(tickers) and stored["T7"][1].spot_price == 57.0
+        assert not any(thread.is_alive() for thread in threads)
+
+    def test_expired_lease_is_reassigned(self, coordinated):
+        tickers = [f"T{i}" for i in range(12)]
+        coordinator, url, stored = coordinated(tickers, top_k=5, lease_size=5, lease_timeout=0.5)
+
+        # A worker takes a lease and disappears
+        lost = requests.post(f"{url}/lease", json={'worker': 'gone'}, headers=AUTH).json()
+        assert [t for _, t in lost['tickers']] == tickers[:5]
+
+        start_workers(url, 1, fetch_workers=2)
+        assert coordinator.wait(30)
+        ideas, stats = coordinator.results()
+        assert stats.expired == 1 and stats.received == 12 and stats.abandoned == 0
+        assert set(stored) == set(tickers)
+
+        # Its late results are ignored
+        late = [encode_result(i, t, fake_fetch(t), None) for i, t in lost['tickers']]
+        reply = requests.post(f"{url}/results", json={'lease': lost['lease'], 'results': late}, headers=AUTH).json()
+        assert reply == {'accepted': 0, 'expired': True}
+        assert coordinator.stats.duplicates == 5
+        assert requests.post(f"{url}/lease", json={'worker': 'late'}, headers=AUTH).json() == {'done': True}
+
+    def test_requests_need_the_token(self, coordinated):
+        coordinator, url, _ = coordinated(["A", "B"])
+        assert requests.post(f"{url}/lease", json={'worker': 'x'}).status_code == 401
+        assert requests.get(f"{url}/status", headers={'X-Coordinator-Token': "wrong"}).status_code == 401
+        assert coordinator.stats.leases == 0 and not coordinator.stats.workers
+        assert requests.get(f"{url}/status", headers=AUTH).json()['pending'] == 2
+
+    def test_remote_listen_requires_a_token(self, monkeypatch):
+        monkeypatch.setattr(Settings, 'COORDINATOR_TOKEN', None)
+        with pytest.raises(ValueError):
+            serve(ScanCoordinator(["A"]), host='0.0.0.0')
+
+    def test_renewals_without_results_are_capped(self):
+        coordinator = ScanCoordinator(["T0", "T1", "T2"], lease_size=2, max_renewals=2, max_attempts=1)
+        lease = coordinator.lease('stuck', 1)
+        assert [coordinator.renew(lease['lease'])['expired'] for _ in range(3)] == [False, False, True]
+        assert coordinator.stats.expired == 1 and coordinator.stats.abandoned == 1
+
+        # A result resets the count
+        other = coordinator.lease('busy')
+        assert [t for _, t in other['tickers']] == ["T1", "T2"]
+        coordinator.renew(other['lease'])
+        coordinator.renew(other['lease'])
+        coordinator.submit(other['lease'], [encode_result(1, "T1", fake_fetch("T1"), None)])
+        assert not coordinator.renew(other['lease'])['expired']
+
+    def test_gives_up_after_max_attempts(self):
+        coordinator = ScanCoordinator(["A", "B"], lease_size=2, lease_timeout=0.05, max_attempts=2)
+        for _ in range(2):
+            assert coordinator.lease('flaky')['tickers'] == [[0, "A"], [1, "B"]]
+            threading.Event().wait(0.1)
+        assert coordinator.wait(0.1)
+        assert coordinator.stats.abandoned == 2
+
+class TestDistributedRunScan:
+
+    @pytest.fixture
+    def standin(self, monkeypatch):
+        server = start_server(seed=9)
+        transport.configure('standin', url=server.url)
+        monkeypatch.setattr(scan, 'notify_ideas', lambda ideas, name: True)
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', False)
+        monkeypatch.setattr(Settings, 'LEASE_SIZE', 4)
+        baseline.clear_baseline()
+        yield server
+        baseline.clear_baseline()
+        transport.configure('live')
+        server.shutdown()
+        server.server_close()
+
+    def test_local_worker_processes(self, standin):
+        tickers = [f"S{i:05d}" for i in range(20)]
+        single = scan.run_scan("Single", tickers)
+        distributed = scan.run_scan("Distributed", tickers, coordinate='127.0.0.1:0', local_workers=3)
+        assert [(i.ticker, i.score, i.strategy) for i in distributed] == [(i.ticker, i.score, i.strategy) for i in single]
+        # Inputs come back with the results, so the day's baseline is still kept
+        today = datetime.now(Settings.TIMEZONE).date()
+        assert set(baseline.get_baseline(today).options) == set(tickers)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
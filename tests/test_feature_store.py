@@ -0,0 +1,164 @@
+"""
+Tests for the scan snapshot feature store.
+"""
+from datetime import datetime, date, timedelta
+import pytest
+import pytz
+
+pytest.importorskip("pyarrow")
+
+from options_bot.models import Fundamentals, OptionsSnapshot, Catalyst
+from options_bot.ranker import score_candidates
+from options_bot.config import Settings
+from options_bot.storage.feature_store import (
+    FeatureStore, save_scan_snapshot, snapshot_rows, snapshot_models, SCAN_RUN, LIVE_RUN
+)
+
+
+def make_inputs(tickers):
+    """Build complete inputs for all but the last ticker."""
+    fundamentals, options, catalysts = {}, {}, {}
+    for i, t in enumerate(tickers[:-1]):
+        fundamentals[t] = Fundamentals(
+            ticker=t, market_cap=5e9 + i, pe_ratio=12.0 + i, forward_pe=11.0,
+            profit_margins=0.2, debt_to_equity=0.4, sector="Technology"
+        )
+        options[t] = OptionsSnapshot(
+            ticker=t, spot_price=100.0 + i, hv30=0.2, atm_iv_dte35=0.3, iv_rank_1y=70.0,
+            skew_25d_rr=0.02, term_slope_iv=None, liq_calls_score=8.0, liq_puts_score=6.0,
+            avg_option_volume=1000, open_interest=5000
+        )
+        catalysts[t] = Catalyst(
+            ticker=t, next_earnings_date=date.today() + timedelta(days=3), earnings_bmo_amc=None,
+            headlines=["Shares surge"], sentiment_score=0.4, days_to_earnings=3
+        )
+    return fundamentals, options, catalysts
+
+
+def write_scan(store, tickers, when):
+    """Score and store one synthetic scan."""
+    fundamentals, options, catalysts = make_inputs(tickers)
+    scored = score_candidates(tickers, fundamentals, options, catalysts)
+    run_id = when.strftime('%Y%m%dT%H%M%S')
+    rows = snapshot_rows(run_id, when, tickers, fundamentals, options, catalysts, scored)
+    return store.write_run(run_id, when, rows, "Test Scan")
+
+
+class TestFeatureStore:
+    """Tests for FeatureStore writes and pruned reads."""
+
+    def test_round_trip_keeps_every_ticker(self, tmp_path):
+        """All tickers are stored, including ones that could not be scored."""
+        store = FeatureStore(tmp_path)
+        when = pytz.UTC.localize(datetime(2025, 3, 3, 15, 0))
+        write_scan(store, ["AAA", "BBB", "CCC"], when)
+
+        df = store.load()
+        assert sorted(df['ticker']) == ["AAA", "BBB", "CCC"]
+        missing = df[df['ticker'] == "CCC"].iloc[0]
+        assert missing['score'] != missing['score']  # NaN
+        scored = df[df['ticker'] != "CCC"]
+        assert set(scored['rank']) == {1, 2}
+        assert scored['strategy'].notna().all()
+        assert list(df[df['ticker'] == "AAA"]['headlines'].iloc[0]) == ["Shares surge"]
+
+    def test_column_and_date_pruning(self, tmp_path):
+        """Reads return only requested columns within the date range."""
+        store = FeatureStore(tmp_path)
+        for day in (3, 4, 5):
+            write_scan(store, ["AAA", "BBB"], pytz.UTC.localize(datetime(2025, 3, day, 15, 0)))
+
+        df = store.load(columns=['date', 'ticker', 'score'], start=date(2025, 3, 4), end=date(2025, 3, 5))
+        assert list(df.columns) == ['date', 'ticker', 'score']
+        assert sorted(df['date'].unique()) == ["2025-03-04", "2025-03-05"]
+
+        df = store.load(columns=['ticker'], tickers=["BBB"])
+        assert set(df['ticker']) == {"BBB"}
+        assert len(df) == 3
+
+    def test_run_index(self, tmp_path):
+        """Each write appends one row to the run index."""
+        store = FeatureStore(tmp_path)
+        write_scan(store, ["AAA", "BBB"], pytz.UTC.localize(datetime(2025, 3, 3, 15, 0)))
+        write_scan(store, ["AAA", "BBB"], pytz.UTC.localize(datetime(2025, 3, 4, 15, 0)))
+
+        runs = store.runs()
+        assert len(runs) == 2
+        assert list(runs['tickers']) == [2, 2]
+        assert list(runs['scored']) == [1, 1]
+
+    def test_runs_in_the_same_second_are_kept_apart(self, tmp_path, monkeypatch):
+        """Two scans started in the same second get their own file and index row."""
+        monkeypatch.setattr(Settings, "FEATURE_STORE_DIR", str(tmp_path))
+        when = pytz.UTC.localize(datetime(2025, 3, 3, 15, 0))
+        tickers = ["AAA", "BBB"]
+        fundamentals, options, catalysts = make_inputs(tickers)
+        scored = score_candidates(tickers, fundamentals, options, catalysts)
+        paths = {save_scan_snapshot(name, when, tickers, fundamentals, options, catalysts, scored)
+                 for name in ("Scheduled", "Continuous")}
+
+        runs = FeatureStore(tmp_path).runs()
+        assert len(paths) == 2 and all(path.exists() for path in paths)
+        assert sorted(runs['scan_name']) == ["Continuous", "Scheduled"] and runs['run_id'].is_unique
+
+    def test_live_runs_are_kept_apart(self, tmp_path):
+        """Continuous-mode snapshots are indexed as live and skipped by the default loaders."""
+        store = FeatureStore(tmp_path)
+        tickers = ["AAA", "BBB"]
+        write_scan(store, tickers, pytz.UTC.localize(datetime(2025, 3, 3, 15, 0)))
+        live_time = pytz.UTC.localize(datetime(2025, 3, 3, 16, 0))
+        rows = snapshot_rows("live-1", live_time, tickers, *make_inputs(tickers), [])
+        store.write_run("live-1", live_time, rows, "Live Scan", kind=LIVE_RUN)
+
+        assert list(store.runs()['kind']) == [SCAN_RUN, LIVE_RUN]
+        assert set(store.load_run(date(2025, 3, 3))['run_id']) == {"20250303T150000"}
+        assert set(store.load_run(date(2025, 3, 3), kind=LIVE_RUN)['run_id']) == {"live-1"}
+        assert set(store.load(columns=['run_id'])['run_id']) == {"20250303T150000"}
+        assert len(store.load(columns=['run_id'], kinds=None)) == 4
+
+    def test_latest_run_rebuilds_models(self, tmp_path):
+        """The latest run of a day converts back into scan inputs."""
+        store = FeatureStore(tmp_path)
+        tickers = ["AAA", "BBB", "CCC"]
+        write_scan(store, tickers, pytz.UTC.localize(datetime(2025, 3, 3, 15, 0)))
+        write_scan(store, tickers, pytz.UTC.localize(datetime(2025, 3, 3, 16, 0)))
+
+        df = store.load_run(date(2025, 3, 3))
+        assert set(df['run_id']) == {"20250303T160000"}
+        assert store.load_run(date(2025, 3, 4)).empty
+
+        fundamentals, options, catalysts = snapshot_models(df)
+        expected = make_inputs(tickers)
+        assert fundamentals == expected[0]
+        assert options == expected[1]
+        assert catalysts == expected[2]
+
+    def test_streamed_run_matches_batch_write(self, tmp_path):
+        """A run written row by row stores the same rows and ranks."""
+        tickers = ["AAA", "BBB", "CCC", "DDD"]
+        fundamentals, options, catalysts = make_inputs(tickers)
+        scored = score_candidates(tickers, fundamentals, options, catalysts)
+        ideas = {idea.ticker: idea for idea in scored}
+        when = pytz.UTC.localize(datetime(2025, 3, 3, 15, 0))
+
+        write_scan(FeatureStore(tmp_path / "batch"), tickers, when)
+        store = FeatureStore(tmp_path / "stream")
+        writer = store.run_writer("20250303T150000", when, "Test Scan", batch_size=2)
+        for t in tickers:
+            writer.add(t, fundamentals.get(t), options.get(t), catalysts.get(t), ideas.get(t))
+        writer.close()
+
+        columns = ['ticker', 'score', 'rank', 'strategy']
+        batch = FeatureStore(tmp_path / "batch").load(columns=columns).sort_values('ticker')
+        stream = store.load(columns=columns).sort_values('ticker')
+        assert batch.reset_index(drop=True).equals(stream.reset_index(drop=True))
+        assert list(store.runs()['scored']) == [3]
+        assert not list(store.root.rglob('*.part'))
+
+    def test_empty_store(self, tmp_path):
+        """Loading from an empty store returns an empty frame."""
+        assert FeatureStore(tmp_path / "missing").load().empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
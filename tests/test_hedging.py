@@ -0,0 +1,133 @@
+"""
+Tests for hedged requests across redundant providers.
+"""
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import hedging, market_data, transport
+from options_bot.ingestion.hedging import Hedger, LatencyTracker
+
+
+def slow(value, seconds, calls=None, name=None):
+    def fetch():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def failing():
+    raise ConnectionError("provider down")
+
+
+class TestLatencyTracker:
+
+    def test_quantile_needs_samples(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record('quote', 'yfinance', ms / 1000)
+        assert tracker.quantile('quote', 'yfinance', 0.95) == pytest.approx(0.096)
+        assert tracker.quantile('quote', 'yfinance', 0.95, min_samples=101) is None
+        assert tracker.quantile('quote', 'finnhub', 0.95) is None
+
+
+class TestHedger:
+
+    def test_fast_primary_is_not_hedged(self):
+        hedger = Hedger(default_delay=0.5)
+        calls = []
+        value = hedger.fetch('quote', [('yfinance', slow(10.0, 0.01, calls, 'yfinance')),
+                                       ('finnhub', slow(11.0, 0.01, calls, 'finnhub'))], valid=bool)
+        assert value == 10.0 and calls == ['yfinance']
+        assert hedger.stats.hedged == 0 and hedger.stats.wins == {'yfinance': 1}
+
+    def test_slow_primary_is_hedged_at_its_p95(self):
+        hedger = Hedger(min_samples=5, default_delay=5.0)
+        for _ in range(5):
+            hedger.latency.record('quote', 'yfinance', 0.05)
+        assert hedger.delay('quote', 'yfinance') == 0.05
+
+        start = time.perf_counter()
+        value = hedger.fetch('quote', [('yfinance', slow(10.0, 1.0)), ('finnhub', slow(11.0, 0.01))])
+        assert value == 11.0 and time.perf_counter() - start < 0.5
+        assert hedger.stats.hedged == 1 and hedger.stats.wins == {'finnhub': 1}
+
+    def test_failed_or_invalid_primary_hedges_immediately(self):
+        hedger = Hedger(default_delay=5.0)
+        start = time.perf_counter()
+        assert hedger.fetch('quote', [('yfinance', failing), ('finnhub', slow(11.0, 0.01))]) == 11.0
+        assert hedger.fetch('news', [('yfinance', lambda: []), ('polygon', lambda: ["Headline"])]) == ["Headline"]
+        assert time.perf_counter() - start < 1.0
+        assert hedger.stats.wins == {'finnhub': 1, 'polygon': 1}
+
+    def test_primary_answering_first_after_hedge_still_wins(self):
+        hedger = Hedger(default_delay=0.05)
+        assert hedger.fetch('quote', [('yfinance', slow(10.0, 0.15)), ('finnhub', slow(11.0, 1.0))]) == 10.0
+        assert hedger.stats.hedged == 1 and hedger.stats.wins == {'yfinance': 1}
+
+    def test_no_valid_answer(self):
+        hedger = Hedger(default_delay=0.01)
+        assert hedger.fetch('quote', [('yfinance', failing), ('finnhub', lambda: None)]) is None
+        assert hedger.fetch('quote', [('yfinance', failing)]) is None
+        assert hedger.stats.failed == 2 and hedger.stats.wins == {}
+
+    def test_only_valid_answers_count_towards_latency(self):
+        hedger = Hedger()
+        hedger.fetch('quote', [('yfinance', lambda: 0)])
+        hedger.fetch('quote', [('yfinance', lambda: 5)])
+        assert len(hedger.latency._samples['quote', 'yfinance']) == 1
+
+
+class TestAlternateProviders:
+
+    @pytest.fixture
+    def standin(self, monkeypatch):
+        server = start_server(seed=6)
+        transport.configure('standin', url=server.url)
+        monkeypatch.setattr(hedging, '_hedger', Hedger(default_delay=0.05))
+        for key in ('FINNHUB_API_KEY', 'TRADIER_API_KEY', 'ALPHA_VANTAGE_API_KEY', 'POLYGON_API_KEY'):
+            monkeypatch.setattr(Settings, key, None)
+        yield server
+        transport.configure('live')
+        server.shutdown()
+        server.server_close()
+
+    def test_without_keys_only_yfinance_is_asked(self, standin):
+        assert market_data.get_quote("S00001", lambda: 12.5) == 12.5
+        assert market_data.get_quote("S00001", failing) is None
+        assert hedging.get_hedger().stats.hedged == 0
+
+    def test_finnhub_quote_hedges_slow_yahoo(self, standin, monkeypatch):
+        monkeypatch.setattr(Settings, 'FINNHUB_API_KEY', 'key')
+        price = market_data.get_quote("S00001", slow(1.0, 1.0))
+        assert price == pytest.approx(standin.market.spot("S00001"))
+        assert hedging.get_hedger().stats.wins == {'finnhub': 1}
+
+    def test_polygon_history_matches_yahoo_shape(self, standin, monkeypatch):
+        monkeypatch.setattr(Settings, 'POLYGON_API_KEY', 'key')
+        yahoo = transport.ticker("S00002").history(period='3mo')
+        bars = market_data.get_history("S00002", '3mo', slow(pd.DataFrame(), 0.2))
+        assert list(bars.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert bars.index[-1].date() == yahoo.index[-1].date()
+        assert bars['Close'].iloc[-1] == pytest.approx(yahoo['Close'].iloc[-1])
+        assert len(bars) >= len(yahoo)
+
+    def test_news_hedges_to_finnhub(self, standin, monkeypatch):
+        monkeypatch.setattr(Settings, 'FINNHUB_API_KEY', 'key')
+        ticker = next(f"S{i:05d}" for i in range(100) if standin.market.headlines(f"S{i:05d}", 'finnhub'))
+        headlines = market_data.get_headlines(ticker, 3, lambda: [])
+        assert headlines == standin.market.headlines(ticker, 'finnhub')[:3]
+
+    def test_hedging_can_be_disabled(self, standin, monkeypatch):
+        monkeypatch.setattr(Settings, 'FINNHUB_API_KEY', 'key')
+        monkeypatch.setattr(Settings, 'HEDGE_REQUESTS', False)
+        assert market_data.get_quote("S00001", failing) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,158 @@
+"""
+Tests for incremental (intraday refresh) scans.
+"""
+from collections import Counter
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from options_bot.config import Settings
+from options_bot.ingestion.providers import METHODS, MarketDataPlanner, MarketDataProvider, OptionChain
+from options_bot.models import Fundamentals, OptionsSnapshot, Catalyst
+from options_bot.ingestion.freshness import merge_fresh, fields_with_freshness, DAILY, INTRADAY, FIELD_FRESHNESS
+from options_bot.runner import scan, baseline
+
+
+def make_fundamentals(ticker):
+    return Fundamentals(
+        ticker=ticker, market_cap=5e9, pe_ratio=12.0, forward_pe=11.0,
+        profit_margins=0.2, debt_to_equity=0.4, sector="Technology"
+    )
+
+
+def make_options(ticker, spot=100.0, hv30=0.2):
+    return OptionsSnapshot(
+        ticker=ticker, spot_price=spot, hv30=hv30, atm_iv_dte35=0.3, iv_rank_1y=70.0,
+        skew_25d_rr=0.02, term_slope_iv=None, liq_calls_score=8.0, liq_puts_score=6.0
+    )
+
+
+def make_catalyst(ticker, headlines=("Shares surge",)):
+    return Catalyst(
+        ticker=ticker, next_earnings_date=date.today() + timedelta(days=3), earnings_bmo_amc=None,
+        headlines=list(headlines), has_major_event_7d=True, days_to_earnings=3
+    )
+
+
+class StubMarket(MarketDataProvider):
+    """Answers every bulk request for any ticker; counts requests and the tickers in them."""
+
+    name = 'stub'
+    batch_sizes = {method: None for method in METHODS}
+
+    def __init__(self, fundamentals=make_fundamentals):
+        self.make_fundamentals = fundamentals
+        self.requests = Counter()
+        self.asked = Counter()
+
+    def _served(self, method, tickers):
+        self.requests[method] += 1
+        self.asked[method] += len(tickers)
+
+    def get_quotes(self, tickers):
+        self._served('quotes', tickers)
+        return {t: 100.0 for t in tickers}
+
+    def get_bars(self, tickers, start, end=None):
+        self._served('bars', tickers)
+        return pd.DataFrame([
+            {'ticker': t, 'date': start + timedelta(days=d), 'open': 100.0, 'high': 101.0,
+             'low': 99.0, 'close': 100.0 + d % 3, 'volume': 1e6}
+            for t in tickers for d in range(40)
+        ])
+
+    def get_chains(self, tickers, expirations=None):
+        self._served('chains', tickers)
+        empty = pd.DataFrame({'strike': []})
+        return {t: [OptionChain(t, '2030-01-18', empty, empty)] for t in tickers}
+
+    def get_fundamentals(self, tickers):
+        self._served('fundamentals', tickers)
+        return {t: self.make_fundamentals(t) for t in tickers}
+
+
+def use_stub_market(monkeypatch, options=make_options, fundamentals=make_fundamentals) -> StubMarket:
+    """Serve full scan fetches from a StubMarket, with options(ticker) as each snapshot."""
+    market = StubMarket(fundamentals)
+    monkeypatch.setattr(scan, 'get_planner', lambda: MarketDataPlanner([market]))
+    monkeypatch.setattr(scan, 'snapshot_from_chains', lambda ticker, chains, price, hv30: options(ticker))
+    return market
+
+
+class TestFreshness:
+    """Field freshness classes and merging."""
+
+    def test_every_model_field_has_a_class(self):
+        for cls, fields in FIELD_FRESHNESS.items():
+            assert set(fields) == set(cls.__dataclass_fields__)
+            assert set(fields.values()) <= {DAILY, INTRADAY}
+
+    def test_merge_keeps_daily_fields(self):
+        previous = make_options("AAA", spot=100.0, hv30=0.2)
+        fresh = replace(make_options("AAA", spot=105.0, hv30=None), atm_iv_dte35=0.35)
+        merged = merge_fresh(previous, fresh)
+        assert merged.spot_price == 105.0
+        assert merged.atm_iv_dte35 == 0.35
+        assert merged.hv30 == 0.2
+        assert "hv30" in fields_with_freshness(OptionsSnapshot, DAILY)
+
+
+class TestIncrementalScan:
+    """Mid-morning scans reuse the premarket baseline."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = {'fundamentals': 0, 'options': 0, 'catalyst': 0, 'refresh_options': 0, 'refresh_catalyst': 0}
+
+        def counted(name, fn):
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                return fn(*args, **kwargs)
+            return wrapper
+
+        use_stub_market(monkeypatch, counted('options', make_options), counted('fundamentals', make_fundamentals))
+        monkeypatch.setattr(scan, 'get_catalyst', counted('catalyst', lambda t, **kw: make_catalyst(t)))
+        monkeypatch.setattr(scan, 'refresh_options_snapshot', counted(
+            'refresh_options', lambda prev: merge_fresh(prev, make_options(prev.ticker, spot=110.0, hv30=None))
+        ))
+        monkeypatch.setattr(scan, 'refresh_catalyst', counted(
+            'refresh_catalyst', lambda prev, **kw: merge_fresh(prev, make_catalyst(prev.ticker, ["New headline"]))
+        ))
+        monkeypatch.setattr(scan, 'apply_sentiment', lambda catalysts: None)
+        monkeypatch.setattr(scan, 'notify_ideas', lambda ideas, name: True)
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', False)
+        baseline.clear_baseline()
+        yield calls
+        baseline.clear_baseline()
+
+    def test_refreshes_only_intraday_sources(self, calls):
+        universe = ["AAA", "BBB", "CCC"]
+        scan.run_scan("Premarket", universe)
+        assert calls['fundamentals'] == 3 and calls['options'] == 3 and calls['catalyst'] == 3
+
+        ideas = scan.run_scan("Mid-Morning", universe, incremental=True)
+        assert calls['fundamentals'] == 3 and calls['options'] == 3 and calls['catalyst'] == 3
+        assert calls['refresh_options'] == 3 and calls['refresh_catalyst'] == 3
+
+        for idea in ideas:
+            assert idea.options.spot_price == 110.0
+            assert idea.options.hv30 == 0.2
+            assert idea.catalyst.headlines == ["New headline"]
+            assert idea.catalyst.days_to_earnings == 3
+
+    def test_new_tickers_fetched_in_full(self, calls):
+        scan.run_scan("Premarket", ["AAA"])
+        scan.run_scan("Mid-Morning", ["AAA", "DDD"], incremental=True)
+        assert calls['fundamentals'] == 2
+        assert calls['refresh_options'] == 1
+
+    def test_without_baseline_runs_full(self, calls):
+        scan.run_scan("Mid-Morning", ["AAA", "BBB"], incremental=True)
+        assert calls['fundamentals'] == 2
+        assert calls['refresh_options'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
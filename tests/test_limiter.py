@@ -0,0 +1,192 @@
+"""
+Tests for the adaptive Yahoo concurrency limiter.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.standin import start_server
+from options_bot.ingestion import transport
+from options_bot.ingestion.limiter import AdaptiveLimiter, is_throttle
+from options_bot.ingestion.transport import Transport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+def complete(limiter, clock, count, latency=0.1, ok=True):
+    """Run count requests one at a time, each taking latency seconds."""
+    for _ in range(count):
+        started = limiter.acquire()
+        clock.now += latency
+        limiter.release(started, ok=ok)
+
+
+def saturate(limiter, clock, latency=0.1):
+    """Fill every slot, then complete them all: one window at full concurrency."""
+    slots = limiter.slots
+    starts = [limiter.acquire() for _ in range(slots)]
+    clock.now += latency
+    for started in starts:
+        limiter.release(started)
+
+
+class TestAdaptiveLimiter:
+
+    def make(self, **kwargs):
+        clock = FakeClock()
+        options = dict(initial=4, min_limit=1, max_limit=10, latency_target=1.0, clock=clock)
+        options.update(kwargs)
+        return AdaptiveLimiter(**options), clock
+
+    def test_additive_increase_when_saturated_and_healthy(self):
+        limiter, clock = self.make()
+        for expected in (5, 6, 7):
+            saturate(limiter, clock)
+            assert limiter.slots == expected
+        assert limiter.stats.increases == 3
+
+    def test_no_growth_below_the_limit(self):
+        # One request at a time never tests whether more would be safe
+        limiter, clock = self.make()
+        complete(limiter, clock, 40)
+        assert limiter.slots == 4
+
+    def test_slow_or_failing_windows_hold(self):
+        limiter, clock = self.make()
+        saturate(limiter, clock, latency=2.0)
+        assert limiter.slots == 4
+
+        starts = [limiter.acquire() for _ in range(4)]
+        for i, started in enumerate(starts):
+            limiter.release(started, ok=i > 0)  # 25% errors, none of them throttling
+        assert limiter.slots == 4 and limiter.stats.decreases == 0
+
+    def test_throttle_halves_once_per_burst(self):
+        limiter, clock = self.make(initial=8)
+        starts = [limiter.acquire() for _ in range(8)]
+        clock.now += 0.5
+        # Every in-flight request hits the same 429 burst
+        for started in starts:
+            limiter.release(started, ok=False, throttled=True)
+        assert limiter.slots == 4 and limiter.stats.decreases == 1 and limiter.stats.throttled == 8
+
+        # A request started after the back-off that is throttled backs off again
+        started = limiter.acquire()
+        clock.now += 0.1
+        limiter.release(started, ok=False, throttled=True)
+        assert limiter.slots == 2
+
+    def test_bounds(self):
+        limiter, clock = self.make(initial=1.5, max_limit=2)
+        for _ in range(5):
+            saturate(limiter, clock)
+        assert limiter.limit == 2.0
+        for _ in range(3):
+            started = limiter.acquire()
+            limiter.release(started, ok=False, throttled=True)
+        assert limiter.limit == 1.0
+
+    def test_learned_limit_persists(self, tmp_path):
+        path = tmp_path / 'limiter.json'
+        limiter, clock = self.make(state_path=path)
+        saturate(limiter, clock)
+        saturate(limiter, clock)
+        assert limiter.slots == 6 and path.exists()
+
+        restarted, _ = self.make(initial=2, state_path=path)
+        assert restarted.slots == 6
+        # Saved limits outside the current bounds are clamped
+        assert self.make(max_limit=3, state_path=path)[0].slots == 3
+
+    def test_caps_concurrent_requests(self):
+        limiter = AdaptiveLimiter(initial=3, min_limit=1, max_limit=3, latency_target=10)
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def request():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=limiter.call, args=(request,)) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert active[1] == 3 and limiter.stats.peak_in_flight == 3 and limiter.in_flight == 0
+
+    def test_call_classifies_failures(self):
+        limiter, clock = self.make()
+        with pytest.raises(requests.HTTPError):
+            limiter.call(lambda: (_ for _ in ()).throw(http_error(429)))
+        with pytest.raises(KeyError):
+            limiter.call(lambda: {}['missing'])
+        assert limiter.stats.errors == 2 and limiter.stats.throttled == 1 and limiter.slots == 2
+
+
+class TestThrottleClassification:
+
+    @pytest.mark.parametrize('error, throttled', [
+        (http_error(429), True),
+        (http_error(503), True),
+        (http_error(404), False),
+        (requests.Timeout("read timed out"), True),
+        (Exception("Invalid Crumb"), True),
+        (Exception("Too Many Requests. Rate limited. Try after a while."), True),
+        (Exception("No data found, symbol may be delisted"), False),
+    ])
+    def test_is_throttle(self, error, throttled):
+        assert is_throttle(error) is throttled
+
+
+class TestTransportLimiter:
+
+    def test_standin_requests_back_off_on_errors(self):
+        server = start_server(seed=2, error_rate=0.3)
+        limiter = AdaptiveLimiter(initial=8, min_limit=1, max_limit=16, latency_target=5)
+        routed = Transport('standin', standin_url=server.url, limiter=limiter)
+        try:
+            for i in range(30):
+                try:
+                    routed.ticker(f"S{i:05d}").info
+                except requests.HTTPError:
+                    pass
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert limiter.stats.calls == 30 and limiter.stats.throttled == server.stats()['injected_errors'] > 0
+        assert limiter.slots < 8
+
+    def test_replay_is_not_limited(self, tmp_path):
+        limiter = AdaptiveLimiter(initial=2)
+        replay = Transport('replay', transport.Cassette(tmp_path / 'c.db'), limiter=limiter)
+        assert replay.limiter is None
+        replay.close()
+
+    def test_live_tickers_go_through_the_limiter(self):
+        limiter = AdaptiveLimiter(initial=2)
+        live = Transport('live', limiter=limiter)
+        stock = live.ticker("SPY")
+        live._call('yfinance', ["SPY", 'info'], lambda: {'symbol': 'SPY'})
+        assert not isinstance(stock, transport.yf.Ticker) and limiter.stats.calls == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+"""
+Tests for the stand-in market server and the load-test driver.
+"""
+import logging
+from datetime import timedelta
+
+import pytest
+
+from benchmarks.load_test import latency_summary, run_load
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import transport
+from options_bot.ingestion.bars import download_bars
+from options_bot.ingestion.news_fetcher import NewsAggregator
+from options_bot.ingestion.sec_filings import SECFilingsTracker
+from options_bot.runner import scan
+
+
+@pytest.fixture
+def standin():
+    server = start_server(seed=3)
+    transport.configure('standin', url=server.url)
+    yield server
+    transport.configure('live')
+    server.shutdown()
+    server.server_close()
+
+
+class TestStandInServer:
+
+    def test_scan_inputs_are_synthesized(self, standin):
+        fund, opts, cat = scan.fetch_ticker("S00042")
+        assert fund.sector and fund.market_cap > 0
+        assert opts.spot_price > 0 and opts.hv30 > 0 and opts.atm_iv_dte35 > 0
+        assert cat.days_to_earnings is not None
+        # Same symbol, same data
+        assert scan.fetch_ticker("S00042")[1] == opts
+
+    def test_provider_endpoints(self, standin):
+        assert SECFilingsTracker().get_recent_filings("S00001")
+        news = NewsAggregator(news_api_key="key").fetch_newsapi("S00001")
+        assert [n['title'] for n in news] == standin.market.headlines("S00001", 'newsapi')
+        bars = download_bars(["S00001", "S00002"], start=standin.market.today - timedelta(days=14))
+        assert set(bars['ticker']) == {"S00001", "S00002"}
+
+    def test_injected_errors(self, standin):
+        standin.error_rate = 1.0
+        fund, opts, cat = scan.fetch_ticker("S00007")
+        assert fund is None and opts is None
+        assert cat.next_earnings_date is None and cat.headlines == []
+        assert standin.stats()['injected_errors'] >= 3
+
+
+class TestLoadDriver:
+
+    def test_run_load_reports(self, standin, monkeypatch):
+        for name in ('USE_DISCORD', 'USE_EMAIL', 'DELTA_NOTIFICATIONS', 'PERSIST_SNAPSHOTS',
+                     'PIPELINE_FETCH_WORKERS', 'OUTBOX_PATH', 'FEATURE_STORE_DIR'):
+            monkeypatch.setattr(Settings, name, getattr(Settings, name))
+        monkeypatch.setattr(scan, 'notify_ideas', lambda ideas, name: True)
+        level = logging.getLogger('options_bot').level
+
+        result = run_load(30, standin.url, workers=4, persist=True)
+        logging.getLogger('options_bot').setLevel(level)
+
+        assert result['size'] == 30 and result['ideas'] > 0
+        assert result['tickers_per_s'] > 0
+        assert result['ticker_latency']['p99_ms'] >= result['ticker_latency']['p50_ms'] > 0
+        assert {'fundamentals', 'options', 'catalysts'} <= set(result['stages'])
+
+    def test_latency_summary(self):
+        summary = latency_summary([0.01] * 98 + [0.5, 1.0])
+        assert summary['p50_ms'] == 10.0
+        assert summary['max_ms'] == 1000.0
+        assert summary['p99_ms'] > summary['p95_ms']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
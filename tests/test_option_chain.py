@@ -0,0 +1,103 @@
+"""
+Tests for option chain pruning and the chain memory benchmark.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from benchmarks.chain_memory import measure, yahoo_chain
+from options_bot.config import Settings
+from options_bot.ingestion import options
+from options_bot.ingestion.options import CHAIN_DTYPES, chain_totals, nearest_expiration, prune_chain, summarize_chain
+
+
+class FakeStock:
+    def __init__(self, expirations, calls, puts):
+        self.options = expirations
+        self._chain = SimpleNamespace(calls=calls, puts=puts)
+        self.requested = []
+
+    def option_chain(self, expiration):
+        self.requested.append(expiration)
+        return self._chain
+
+
+class TestPruneChain:
+
+    def test_window_columns_and_dtypes(self):
+        calls, _ = yahoo_chain(100.0, 281)
+        pruned = prune_chain(calls, 100.0, 0.25)
+        assert list(pruned.columns) == list(CHAIN_DTYPES)
+        assert dict(pruned.dtypes) == {name: np.dtype(dtype) for name, dtype in CHAIN_DTYPES.items()}
+        assert pruned['strike'].min() >= 75.0 and pruned['strike'].max() <= 125.0
+        assert len(pruned) == ((calls['strike'] >= 75.0) & (calls['strike'] <= 125.0)).sum()
+        # Untraded strikes count as zero volume, as the pandas sums did
+        assert pruned['volume'].sum() == int(calls.loc[calls['strike'].between(75, 125), 'volume'].sum())
+        # The input frame is left alone
+        assert calls['volume'].isna().any() and len(calls.columns) == 14
+
+    def test_zero_moneyness_keeps_every_strike(self):
+        calls, _ = yahoo_chain(100.0, 50)
+        assert len(prune_chain(calls, 100.0, 0)) == 50
+
+    def test_summary_matches_full_chain(self):
+        calls, puts = yahoo_chain(80.0, 400)
+        full = summarize_chain("X", calls, puts, 80.0, 0.3)
+        pruned = summarize_chain("X", prune_chain(calls, 80.0), prune_chain(puts, 80.0), 80.0, 0.3)
+        assert pruned.atm_iv_dte35 == pytest.approx(full.atm_iv_dte35, rel=1e-6)
+        assert pruned.skew_25d_rr == pytest.approx(full.skew_25d_rr, rel=1e-5)
+        assert isinstance(pruned.atm_iv_dte35, float) and isinstance(pruned.skew_25d_rr, float)
+
+    def test_liquidity_covers_far_strikes(self):
+        calls, puts = yahoo_chain(80.0, 400)
+        # Heavy trading in far wings (e.g. index hedges)
+        for chain in (calls, puts):
+            far = (chain['strike'] - 80.0).abs() > 20.0
+            chain.loc[far, 'volume'] = 5000.0
+            chain.loc[far, 'openInterest'] = 40000.0
+        full = summarize_chain("X", calls, puts, 80.0, 0.3)
+        pruned = summarize_chain("X", prune_chain(calls, 80.0), prune_chain(puts, 80.0), 80.0, 0.3,
+                                 chain_totals(calls), chain_totals(puts))
+        assert (pruned.avg_option_volume, pruned.open_interest) == (full.avg_option_volume, full.open_interest)
+        assert (pruned.liq_calls_score, pruned.liq_puts_score) == (full.liq_calls_score, full.liq_puts_score)
+        assert chain_totals(calls.drop(columns=['volume']))[0] == 0.0
+
+
+class TestExpirationWindow:
+
+    def test_nearest_inside_window(self):
+        today = datetime(2025, 6, 2)
+        expirations = ['2025-06-04', '2025-07-03', '2025-12-19']
+        assert nearest_expiration(expirations, today=today) == '2025-07-03'
+        assert nearest_expiration(expirations, today=today, min_dte=40, max_dte=365) == '2025-12-19'
+        assert nearest_expiration(expirations, today=today, min_dte=40, max_dte=90) is None
+
+    def test_chain_snapshot_prunes_and_respects_window(self, monkeypatch):
+        calls, puts = yahoo_chain(50.0, 200)
+        far = datetime.now().strftime('%Y') + '-12-31'
+        stock = FakeStock([far], calls, puts)
+        monkeypatch.setattr(Settings, 'CHAIN_MAX_DTE', 0)
+        assert options._chain_snapshot(stock, "X", 50.0, 0.3) is None
+        assert stock.requested == []
+
+        monkeypatch.setattr(Settings, 'CHAIN_MIN_DTE', -1000)
+        monkeypatch.setattr(Settings, 'CHAIN_MAX_DTE', 1000)
+        snapshot = options._chain_snapshot(stock, "X", 50.0, 0.3)
+        full = summarize_chain("X", calls, puts, 50.0, 0.3)
+        assert snapshot.atm_iv_dte35 == pytest.approx(full.atm_iv_dte35)
+        assert (snapshot.avg_option_volume, snapshot.open_interest) == (full.avg_option_volume, full.open_interest)
+
+
+class TestChainMemoryBenchmark:
+
+    def test_pruned_chain_uses_less_memory(self):
+        result = measure(600)
+        assert result['after']['peak_kb'] < result['before']['peak_kb']
+        assert result['after']['held_kb'] < result['before']['held_kb']
+        assert result['same_atm_iv'] and result['same_skew']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
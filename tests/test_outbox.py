@@ -0,0 +1,150 @@
+"""
+Tests for the durable notification outbox and delivery worker.
+"""
+import smtplib
+import time
+import pytest
+
+from options_bot.notify import email_notifier
+from options_bot.notify.outbox import Outbox, NotificationWorker, PENDING, SENT, FAILED
+
+
+class Recorder:
+    """Sender that records payloads and fails on demand."""
+
+    def __init__(self, fail_times=0, delay=0.0):
+        self.fail_times = fail_times
+        self.delay = delay
+        self.sent = []
+
+    def __call__(self, payload):
+        time.sleep(self.delay)
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("boom")
+        self.sent.append(payload['n'])
+        return True
+
+
+class TestOutbox:
+    """Queued messages survive restarts and are retried with backoff."""
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "outbox.db"
+        Outbox(path).enqueue('discord', [{'n': 1}, {'n': 2}])
+        reopened = Outbox(path)
+        assert [m.payload['n'] for m in reopened.pending('discord')] == [1, 2]
+
+    def test_delivers_in_order(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        outbox.enqueue('discord', [{'n': i} for i in range(5)])
+        discord = Recorder()
+        NotificationWorker(outbox, {'discord': discord}, max_attempts=3, retry_base=0).run_once()
+        assert discord.sent == [0, 1, 2, 3, 4]
+        assert outbox.count(SENT) == 5
+
+    def test_failure_blocks_channel_and_backs_off(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        outbox.enqueue('discord', [{'n': 1}, {'n': 2}])
+        outbox.enqueue('email', [{'n': 3}])
+        discord, email = Recorder(fail_times=1), Recorder()
+        worker = NotificationWorker(outbox, {'discord': discord, 'email': email}, max_attempts=5, retry_base=60)
+
+        worker.run_once()
+        assert discord.sent == [] and email.sent == [3]
+        head = outbox.pending('discord')[0]
+        assert head.attempts == 1
+        assert head.next_attempt_at > time.time() + 50
+
+        worker.run_once()  # Not due yet
+        assert discord.sent == []
+
+    def test_gives_up_after_max_attempts(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        outbox.enqueue('discord', [{'n': 1}, {'n': 2}])
+        discord = Recorder(fail_times=2)
+        worker = NotificationWorker(outbox, {'discord': discord}, max_attempts=2, retry_base=0)
+        worker.run_once()
+        worker.run_once()
+        assert outbox.count(FAILED) == 1
+        assert discord.sent == [2]
+
+    def test_group_status(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        first, second = outbox.enqueue('discord', [{'n': 1}, {'n': 2}])
+        assert outbox.status([first, second]) == PENDING
+        outbox.mark_sent(first)
+        outbox.mark_sent(second)
+        assert outbox.status([first, second]) == SENT
+        outbox.mark_failed(second, "boom")
+        assert outbox.status([first, second]) == FAILED
+        assert outbox.status([]) == SENT
+
+    def test_channels_deliver_concurrently(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        outbox.enqueue('discord', [{'n': 1}])
+        outbox.enqueue('email', [{'n': 2}])
+        worker = NotificationWorker(outbox, {'discord': Recorder(delay=0.3), 'email': Recorder(delay=0.3)})
+        start = time.monotonic()
+        worker.run_once()
+        assert time.monotonic() - start < 0.55
+        assert outbox.count(PENDING) == 0
+
+    def test_background_flush(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        discord = Recorder()
+        worker = NotificationWorker(outbox, {'discord': discord}, poll_interval=10)
+        worker.start()
+        outbox.enqueue('discord', [{'n': 1}])
+        assert worker.flush(timeout=5)
+        assert discord.sent == [1]
+        worker.stop()
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP and counts connections."""
+    connections = 0
+
+    def __init__(self, host, port, timeout=None):
+        FakeSMTP.connections += 1
+        self.open = True
+        self.messages = []
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        if not self.open:
+            raise smtplib.SMTPServerDisconnected()
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        self.messages.append(msg)
+
+    def quit(self):
+        self.open = False
+
+
+class TestSmtpSession:
+    """One login serves many messages; a dropped connection reconnects."""
+
+    def test_reuses_connection(self, monkeypatch):
+        FakeSMTP.connections = 0
+        monkeypatch.setattr(email_notifier.smtplib, 'SMTP', FakeSMTP)
+        session = email_notifier.SmtpSession("smtp.example", 587, "bot@example", "pw")
+
+        for i in range(3):
+            session.send("to@example", f"subject {i}", "body")
+        assert FakeSMTP.connections == 1
+
+        session._server.open = False
+        session.send("to@example", "after drop", "body")
+        assert FakeSMTP.connections == 2
+        session.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+"""
+Tests for the streaming scan pipeline.
+"""
+import random
+import threading
+import time
+
+import pytest
+
+from options_bot.ranker import score_candidates
+from options_bot.runner import scan
+from options_bot.runner.pipeline import TopK, stream_scan
+from tests.test_incremental import make_fundamentals, make_options, make_catalyst
+
+
+def fake_fetch(ticker):
+    i = int(ticker[1:])
+    fund = make_fundamentals(ticker)
+    fund.pe_ratio = 5.0 + (i * 7) % 40
+    return fund, make_options(ticker, spot=50.0 + i), make_catalyst(ticker)
+
+
+class TestTopK:
+
+    def test_keeps_best_in_order(self):
+        rng = random.Random(1)
+        ideas = []
+        for i in range(200):
+            fund, opts, cat = fake_fetch(f"T{i}")
+            idea = scan.score_ticker(f"T{i}", (fund, opts, cat))
+            idea.score = rng.uniform(0, 10)
+            ideas.append(idea)
+
+        top = TopK(10)
+        for idea in ideas:
+            top.push(idea)
+        expected = sorted(ideas, key=lambda idea: idea.score, reverse=True)[:10]
+        assert [i.ticker for i in top.items()] == [i.ticker for i in expected]
+
+
+class TestStreamScan:
+
+    def test_matches_staged_ranking(self):
+        tickers = [f"T{i}" for i in range(60)]
+        ideas, stats = stream_scan(tickers, fake_fetch, scan.score_ticker, top_k=10,
+                                   fetch_workers=4, queue_size=4)
+
+        data = {t: fake_fetch(t) for t in tickers}
+        staged = score_candidates(tickers, {t: d[0] for t, d in data.items()},
+                                  {t: d[1] for t, d in data.items()}, {t: d[2] for t, d in data.items()})
+        assert [i.score for i in ideas] == pytest.approx([i.score for i in staged[:10]])
+        assert stats.tickers == 60 and stats.scored == 60 and stats.errors == 0
+
+    def test_bounded_in_flight(self):
+        """Fetched but unscored tickers never exceed the queue capacity."""
+        lock = threading.Lock()
+        state = {'fetched': 0, 'scored': 0, 'max_in_flight': 0}
+
+        def fetch(ticker):
+            with lock:
+                state['fetched'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['fetched'] - state['scored'])
+            return fake_fetch(ticker)
+
+        def score(ticker, data):
+            with lock:
+                state['scored'] += 1
+            return scan.score_ticker(ticker, data)
+
+        stream_scan((f"T{i}" for i in range(300)), fetch, score, top_k=5,
+                    fetch_workers=2, queue_size=3, analyze_headlines=2)
+        # Two queues of 3, a pending analyze batch and one item per worker/stage
+        assert state['max_in_flight'] <= 3 * 2 + 2 + 2 + 1
+
+    def test_errors_and_sink(self):
+        def fetch(ticker):
+            if ticker == "T3":
+                raise RuntimeError("boom")
+            return fake_fetch(ticker)
+
+        seen = {}
+        analyzed = []
+        ideas, stats = stream_scan(
+            [f"T{i}" for i in range(6)], fetch, scan.score_ticker,
+            analyze=lambda cats: analyzed.extend(cats),
+            sink=lambda ticker, data, idea: seen.__setitem__(ticker, idea)
+        )
+        assert stats.errors == 1 and stats.scored == 5
+        assert set(seen) == {f"T{i}" for i in range(6)}
+        assert seen["T3"] is None
+        assert sorted(analyzed) == sorted(f"T{i}" for i in range(6) if i != 3)
+        assert len(ideas) == 5
+
+    def test_fetch_many_in_batches(self):
+        batches = []
+
+        def fetch_many(names):
+            batches.append(names)
+            if "T7" in names:
+                raise RuntimeError("provider down")
+            return {t: fake_fetch(t) for t in names if t != "T2"}
+
+        seen = {}
+        ideas, stats = stream_scan([f"T{i}" for i in range(10)], None, scan.score_ticker,
+                                   sink=lambda ticker, data, idea: seen.__setitem__(ticker, data),
+                                   fetch_workers=2, fetch_many=fetch_many, fetch_batch=4)
+        assert sorted(batches) == [["T0", "T1", "T2", "T3"], ["T4", "T5", "T6", "T7"], ["T8", "T9"]]
+        assert stats.fetched == 5 and stats.errors == 5 and stats.scored == 5
+        assert set(seen) == {f"T{i}" for i in range(10)} and seen["T2"] == (None, None, None)
+
+    def test_analyze_gets_full_headline_batches(self):
+        """Slow fetches still reach sentiment in full batches, not one ticker at a time."""
+        def fetch(ticker):
+            time.sleep(0.02)
+            fund, opts, _ = fake_fetch(ticker)
+            return fund, opts, make_catalyst(ticker, headlines=("Shares surge", "Guidance raised"))
+
+        batches = []
+        stream_scan([f"T{i}" for i in range(20)], fetch, scan.score_ticker,
+                    analyze=lambda cats: batches.append(sorted(cats)), fetch_workers=2,
+                    analyze_headlines=8, analyze_wait=10)
+        assert [len(batch) for batch in batches] == [4] * 5
+        assert sorted(t for batch in batches for t in batch) == sorted(f"T{i}" for i in range(20))
+
+    def test_partial_batch_flushed_after_wait(self):
+        def fetch(ticker):
+            time.sleep(0.03)
+            return fake_fetch(ticker)
+
+        batches = []
+        stream_scan([f"T{i}" for i in range(20)], fetch, scan.score_ticker,
+                    analyze=lambda cats: batches.append(len(cats)), fetch_workers=1,
+                    analyze_headlines=100, analyze_wait=0.15)
+        assert len(batches) > 1 and max(batches) > 1 and sum(batches) == 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Tests for the scan profiler.
+"""
+import json
+import time
+
+import pytest
+
+from options_bot.config import Settings
+from options_bot.runner import scan, baseline, profiler
+from tests.test_incremental import make_options, make_catalyst, use_stub_market
+
+
+class TestScanProfiler:
+
+    def test_records_stages_and_tickers(self):
+        prof = profiler.ScanProfiler("Test")
+        with prof.stage('options', 'AAA'):
+            time.sleep(0.02)
+        with prof.stage('options', 'BBB'):
+            pass
+        with prof.stage('notify'):
+            pass
+        prof.finish()
+
+        report = prof.report()
+        assert report['stages']['options']['calls'] == 2
+        assert report['stages']['options']['wall'] >= 0.02
+        assert list(report['stages'])[0] == 'options'  # Slowest first
+        assert report['slowest_tickers'][0]['ticker'] == 'AAA'
+        assert 'notify' not in report['tickers']['AAA']['stages']
+
+    def test_disabled_is_shared_noop(self):
+        assert not profiler.get_profiler().enabled
+        null = profiler.get_profiler()
+        assert null.stage('a', 'AAA') is null.stage('b')
+        assert profiler.stop_profiling() is None
+
+
+class TestProfiledScan:
+
+    @pytest.fixture
+    def fake_sources(self, monkeypatch, tmp_path):
+        def slow_options(ticker):
+            time.sleep(0.03 if ticker == "BBB" else 0.0)
+            return make_options(ticker)
+
+        use_stub_market(monkeypatch, slow_options)
+        monkeypatch.setattr(scan, 'get_catalyst', lambda t, **kw: make_catalyst(t))
+        monkeypatch.setattr(scan, 'apply_sentiment', lambda catalysts: None)
+        monkeypatch.setattr(scan, 'notify_ideas', lambda ideas, name: True)
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', False)
+        monkeypatch.setattr(Settings, 'PROFILE_DIR', str(tmp_path))
+        baseline.clear_baseline()
+        yield tmp_path
+        baseline.clear_baseline()
+
+    def test_writes_report(self, fake_sources):
+        scan.run_scan("Profiled", ["AAA", "BBB", "CCC"], profile=True, use_cprofile=True)
+
+        reports = list(fake_sources.glob("scan_profile_*.json"))
+        assert len(reports) == 1
+        report = json.loads(reports[0].read_text())
+        assert {'fundamentals', 'options', 'catalysts', 'sentiment', 'signals', 'notify'} <= set(report['stages'])
+        assert report['slowest_tickers'][0]['ticker'] == "BBB"
+        assert report['cprofile'].endswith('.prof')
+
+        summary = reports[0].with_suffix('.txt').read_text()
+        assert "Slowest tickers" in summary and "cumulative" in summary
+        assert not profiler.get_profiler().enabled
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,298 @@
+"""
+Tests for the market-data provider interface and planner.
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import bars as bar_loader
+from options_bot.ingestion import transport
+from options_bot.ingestion.bars import backfill_bars, seed_bars_grouped
+from options_bot.ingestion.providers import (
+    FakeProvider, MarketDataPlanner, MarketDataProvider, OptionChain, PolygonGroupedProvider, YFinanceProvider,
+    empty_bars, trading_days
+)
+from options_bot.models import Fundamentals
+from options_bot.runner import scan
+from options_bot.storage.bar_store import HAS_PYARROW, BarStore
+from tests.test_incremental import make_catalyst, use_stub_market
+
+
+def make_bars(tickers, start, days):
+    return pd.DataFrame([
+        {'ticker': t, 'date': start + timedelta(days=d), 'open': 10.0, 'high': 11.0,
+         'low': 9.0, 'close': 10.5, 'volume': 1000.0}
+        for t in tickers for d in range(days)
+    ])
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    for key in ('FINNHUB_API_KEY', 'TRADIER_API_KEY', 'ALPHA_VANTAGE_API_KEY', 'POLYGON_API_KEY'):
+        monkeypatch.setattr(Settings, key, None)
+    server = start_server(seed=5)
+    transport.configure('standin', url=server.url)
+    yield server
+    transport.configure('live')
+    server.shutdown()
+    server.server_close()
+
+
+class TestPlanner:
+
+    def test_cheapest_provider_first(self):
+        single = FakeProvider('single', batch_sizes={'quotes': 1, 'bars': 1})
+        bulk = FakeProvider('bulk', batch_sizes={'quotes': 100})
+        planner = MarketDataPlanner([single, bulk])
+
+        assert [(p.name, trips) for p, trips in planner.plan('quotes', 250)] == [('bulk', 3), ('single', 250)]
+        assert [p.name for p, _ in planner.plan('bars', 10)] == ['single']
+        assert planner.plan('chains', 10) == []
+
+    def test_ties_keep_preference_order(self):
+        first, second = FakeProvider('first'), FakeProvider('second')
+        assert [p.name for p, _ in MarketDataPlanner([first, second]).plan('fundamentals', 5)] == ['first', 'second']
+
+    def test_only_implemented_methods_supported(self):
+        class BarsOnly(MarketDataProvider):
+            name = 'bars-only'
+            batch_sizes = {'bars': None, 'quotes': 10}
+
+            def get_bars(self, tickers, start, end=None):
+                return make_bars(tickers, start, 1)
+
+        assert BarsOnly().supports('bars') and not BarsOnly().supports('quotes')
+        assert MarketDataPlanner([BarsOnly()]).get_quotes(['A']) == {}
+        assert not PolygonGroupedProvider().supports('chains')
+
+    def test_batches_and_fallback_for_missing_tickers(self):
+        bulk = FakeProvider('bulk', batch_sizes={'quotes': 2}, quotes={'A': 1.0, 'B': 2.0, 'C': 3.0})
+        backup = FakeProvider('backup', batch_sizes={'quotes': 1}, quotes={'D': 4.0})
+        quotes = MarketDataPlanner([backup, bulk]).get_quotes(['A', 'B', 'C', 'D', 'A'])
+
+        assert quotes == {'A': 1.0, 'B': 2.0, 'C': 3.0, 'D': 4.0}
+        assert bulk.requests == [('quotes', ('A', 'B')), ('quotes', ('C', 'D'))]
+        assert backup.requests == [('quotes', ('D',))]
+
+    def test_failing_provider_falls_through(self):
+        class Broken(FakeProvider):
+            def get_fundamentals(self, tickers):
+                raise ConnectionError("reset by peer")
+
+        fund = Fundamentals('A', 1e9, 20.0, 18.0, 0.1, 50.0, 'Technology')
+        planner = MarketDataPlanner([Broken('broken'), FakeProvider('backup', batch_sizes={'fundamentals': 1},
+                                                                   fundamentals={'A': fund})])
+        assert planner.get_fundamentals(['A']) == {'A': fund}
+
+    def test_bars_and_chains(self):
+        start = date(2024, 1, 2)
+        chain = OptionChain('A', '2024-02-16', pd.DataFrame({'strike': [10.0]}), pd.DataFrame({'strike': [10.0]}))
+        fake = FakeProvider(bars=make_bars(['A', 'B'], start, 5), chains={'A': [chain]})
+        planner = MarketDataPlanner([fake])
+
+        bars = planner.get_bars(['A', 'C'], start + timedelta(days=2))
+        assert set(bars['ticker']) == {'A'} and len(bars) == 3
+        assert planner.get_chains(['A', 'B']) == {'A': [chain]}
+        assert planner.get_chains(['A'], {'A': ['2024-03-15']}) == {}
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+    def test_backfill_uses_planner(self, tmp_path):
+        start = date(2024, 1, 2)
+        fake = FakeProvider('fake', bars=make_bars(['A', 'B', 'C'], start, 4))
+        store = BarStore(tmp_path / 'bars')
+
+        assert backfill_bars(['A', 'B', 'C'], start, store=store, planner=MarketDataPlanner([fake])) == 12
+        assert fake.requests == [('bars', ('A', 'B', 'C'))]
+        assert next((tmp_path / 'bars').rglob('*.parquet')).name.startswith('fake')
+
+
+class TestScanFetch:
+
+    def test_one_planner_request_per_batch(self, monkeypatch):
+        market = use_stub_market(monkeypatch)
+        monkeypatch.setattr(scan, 'get_catalyst', lambda t, **kw: make_catalyst(t))
+        tickers = [f"T{i}" for i in range(5)]
+
+        fetched = scan.fetch_tickers(tickers)
+        assert set(fetched) == set(tickers) and all(fund and opts and cat for fund, opts, cat in fetched.values())
+        assert market.requests == {method: 1 for method in ('quotes', 'bars', 'chains', 'fundamentals')}
+        assert market.asked['quotes'] == 5
+
+    def test_scan_fetches_through_planner_in_batches(self, monkeypatch):
+        market = use_stub_market(monkeypatch)
+        monkeypatch.setattr(scan, 'get_catalyst', lambda t, **kw: make_catalyst(t))
+        monkeypatch.setattr(Settings, 'PIPELINE_FETCH_BATCH', 4)
+
+        fundamentals, options, catalysts = scan.fetch_data([f"T{i}" for i in range(10)], score_sentiment=False)
+        assert len(fundamentals) == len(options) == 10
+        assert market.requests['quotes'] == 3 and market.asked['quotes'] == 10
+
+
+class TestYFinanceProvider:
+
+    def test_round_trips(self):
+        provider = YFinanceProvider()
+        assert provider.round_trips('quotes', 50) == 50
+        assert provider.round_trips('bars', 500) == 500
+        assert provider.round_trips('chains', 10, expirations=2) == 30
+
+    def test_bulk_methods_against_standin(self, standin):
+        provider = YFinanceProvider()
+        tickers = ["S00001", "S00002"]
+
+        before = standin.stats()['requests']
+        quotes = provider.get_quotes(tickers)
+        assert set(quotes) == set(tickers) and all(price > 0 for price in quotes.values())
+        # The latest daily close, from one download of the batch
+        assert quotes["S00001"] == pytest.approx(standin.market.history("S00001", 1)['Close'].iloc[-1])
+        assert standin.stats()['requests'] - before == len(tickers)
+
+        bars = provider.get_bars(tickers, standin.market.today - timedelta(days=14))
+        assert set(bars['ticker']) == set(tickers)
+
+        chains = provider.get_chains(["S00001"])
+        assert len(chains["S00001"]) == 1 and not chains["S00001"][0].calls.empty
+
+        assert set(provider.get_fundamentals(tickers)) == set(tickers)
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+class TestGroupedBars:
+
+    @pytest.fixture
+    def polygon(self, standin, tmp_path, monkeypatch):
+        monkeypatch.setattr(Settings, 'POLYGON_API_KEY', 'test-key')
+        monkeypatch.setattr(Settings, 'POLYGON_REQUESTS_PER_MINUTE', 0)
+        monkeypatch.setattr(Settings, 'BAR_SEED_PROGRESS', str(tmp_path / 'progress.json'))
+        return standin
+
+    def test_planner_picks_grouped_days_for_wide_universes(self):
+        planner = MarketDataPlanner([YFinanceProvider(), PolygonGroupedProvider()])
+        assert planner.plan('bars', 5000, days=252)[0][0].name == 'polygon'
+        assert planner.plan('bars', 20, days=252)[0][0].name == 'yfinance'
+
+    def test_one_request_per_trading_day(self, polygon, tmp_path):
+        tickers = ["S00001", "S00002", "S00003"]
+        start = polygon.market.today - timedelta(days=13)
+        days = trading_days(start, polygon.market.today)
+        store = BarStore(tmp_path / 'bars')
+
+        before = polygon.stats()['requests']
+        assert seed_bars_grouped(tickers, start, store=store) == 3 * len(days)
+        assert polygon.stats()['requests'] - before == len(days)
+
+        loaded = store.load(["S00002"])
+        expected = polygon.market.history("S00002", len(days))
+        assert list(loaded['date']) == days
+        assert loaded['close'].tolist() == pytest.approx(expected['Close'].tolist())
+
+        # Finished days are not requested again; today's bars are not final yet
+        again = [day for day in days if day >= date.today()]
+        before = polygon.stats()['requests']
+        assert seed_bars_grouped(tickers, start, store=store) == 3 * len(again)
+        assert polygon.stats()['requests'] - before == len(again)
+        assert list(store.load(["S00002"])['date']) == days
+
+    def test_holidays_are_not_requested_again(self, polygon, tmp_path, monkeypatch):
+        start = polygon.market.today - timedelta(days=13)
+        end = polygon.market.today - timedelta(days=1)
+        days = trading_days(start, end)
+        fetch, requested = bar_loader.polygon_grouped_daily, []
+
+        def holiday(day):
+            requested.append(day)
+            return empty_bars() if day == days[2] else fetch(day)
+
+        monkeypatch.setattr(bar_loader, 'polygon_grouped_daily', holiday)
+        store = BarStore(tmp_path / 'bars')
+        assert seed_bars_grouped(["S00003"], start, end, store=store) == len(days) - 1
+        assert seed_bars_grouped(["S00003"], start, end, store=store) == 0
+        assert requested == days
+
+    def test_universe_changes_keep_progress(self, polygon, tmp_path, monkeypatch):
+        start = polygon.market.today - timedelta(days=13)
+        end = polygon.market.today - timedelta(days=1)
+        days = trading_days(start, end)
+        fetch, requested = bar_loader.polygon_grouped_daily, []
+        monkeypatch.setattr(bar_loader, 'polygon_grouped_daily', lambda day: requested.append(day) or fetch(day))
+        store = BarStore(tmp_path / 'bars')
+
+        assert seed_bars_grouped(["S00001", "S00002"], start, end, store=store) == 2 * len(days)
+        # A removed ticker needs nothing new
+        assert seed_bars_grouped(["S00001"], start, end, store=store) == 0
+        assert len(requested) == len(days)
+        # An added ticker requests each day once more, writing only its own bars
+        assert seed_bars_grouped(["S00001", "S00002", "S00003"], start, end, store=store) == len(days)
+        assert len(requested) == 2 * len(days)
+        assert seed_bars_grouped(["S00003", "S00002"], start, end, store=store) == 0
+        assert list(store.load(["S00003"])['date']) == days and len(store.load()) == 3 * len(days)
+
+    def test_resumes_after_a_failed_day(self, polygon, tmp_path, monkeypatch):
+        start = polygon.market.today - timedelta(days=6)
+        days = trading_days(start, polygon.market.today)
+        fetch, requested = bar_loader.polygon_grouped_daily, []
+
+        def flaky(day):
+            requested.append(day)
+            if day == days[1] and len(requested) <= len(days):
+                raise ConnectionError("reset by peer")
+            return fetch(day)
+
+        monkeypatch.setattr(bar_loader, 'polygon_grouped_daily', flaky)
+        store = BarStore(tmp_path / 'bars')
+        again = [days[1]] + [day for day in days if day >= date.today()]
+        assert seed_bars_grouped(["S00004"], start, store=store) == len(days) - 1
+        assert seed_bars_grouped(["S00004"], start, store=store) == len(again)
+        assert requested[len(days):] == again
+
+    def test_paced_requests(self, polygon, tmp_path, monkeypatch):
+        # A clock that advances 0.1s per request and by every wait
+        clock, slept = [0.0], []
+
+        def monotonic():
+            clock[0] += 0.1
+            return clock[0]
+
+        def sleep(seconds):
+            slept.append(seconds)
+            clock[0] += seconds
+
+        monkeypatch.setattr(bar_loader, 'time', SimpleNamespace(monotonic=monotonic))
+        start = polygon.market.today - timedelta(days=6)
+        seed_bars_grouped(["S00001"], start, store=BarStore(tmp_path / 'bars'),
+                          requests_per_minute=120, sleep=sleep)
+        assert len(slept) == len(trading_days(start, polygon.market.today)) - 1
+        # Each wait tops the time since the previous request up to 0.5s
+        assert slept == pytest.approx([0.4] * len(slept))
+
+    def test_backfill_hands_wide_universes_to_grouped_loader(self, polygon, tmp_path):
+        tickers = [f"S{i:05d}" for i in range(40)]
+        start = polygon.market.today - timedelta(days=13)
+        planner = MarketDataPlanner([YFinanceProvider(), PolygonGroupedProvider()])
+
+        before = polygon.stats()['requests']
+        written = backfill_bars(tickers, start, store=BarStore(tmp_path / 'bars'), planner=planner)
+        days = len(trading_days(start, polygon.market.today))
+        assert written == 40 * days and polygon.stats()['requests'] - before == days
+        assert next((tmp_path / 'bars').rglob('*.parquet')).name.startswith('polygon')
+
+    def test_backfill_fetches_tickers_missing_from_grouped_days(self, polygon, tmp_path):
+        # S00600 is not in the stand-in's grouped responses
+        tickers = [f"S{i:05d}" for i in range(40)] + ["S00600"]
+        start = polygon.market.today - timedelta(days=13)
+        planner = MarketDataPlanner([YFinanceProvider(), PolygonGroupedProvider()])
+        store = BarStore(tmp_path / 'bars')
+
+        backfill_bars(tickers, start, store=store, planner=planner)
+        days = trading_days(start, polygon.market.today)
+        assert set(store.load()['ticker']) == set(tickers)
+        assert list(store.load(["S00600"])['date']) == days
+        assert {path.name.split('-')[0] for path in (tmp_path / 'bars').rglob('*.parquet')} == {'polygon', 'yfinance'}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,209 @@
+"""
+Tests for headline sentiment scoring.
+"""
+import time
+import pytest
+from options_bot.config import Settings
+from options_bot.models import Catalyst
+from options_bot.ingestion import catalysts, sentiment
+from options_bot.ingestion.catalysts import apply_sentiment, analyze_sentiment
+from options_bot.ingestion.lexicon_sentiment import LexiconSentiment
+from options_bot.ingestion.sentiment import FinBertSentiment, SentimentCache, headline_hash
+
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+         "shares", "stock", "beats", "misses", "profit", "loss", "rally", "guidance"]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """Build a tiny randomly initialised BERT classifier on disk."""
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("torch")
+
+    path = tmp_path_factory.mktemp("tiny_finbert")
+    (path / "vocab.txt").write_text("\n".join(VOCAB))
+    tokenizer = transformers.BertTokenizer(str(path / "vocab.txt"))
+    config = transformers.BertConfig(
+        vocab_size=len(VOCAB),
+        hidden_size=8,
+        num_hidden_layers=1,
+        num_attention_heads=1,
+        intermediate_size=16,
+        max_position_embeddings=64,
+        id2label={0: "positive", 1: "negative", 2: "neutral"},
+        label2id={"positive": 0, "negative": 1, "neutral": 2}
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(str(path))
+    tokenizer.save_pretrained(str(path))
+    return str(path)
+
+
+class CountingService(FinBertSentiment):
+    """FinBERT service that records how many headlines reach the model."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inference_calls = []
+
+    def _infer(self, headlines):
+        self.inference_calls.append(list(headlines))
+        return super()._infer(headlines)
+
+
+class TestFinBertSentiment:
+    """Tests for the batched FinBERT service."""
+
+    def test_scores_in_range(self, tiny_model, tmp_path):
+        """Scores are P(positive) - P(negative) and aligned with input."""
+        service = CountingService(model=tiny_model, num_threads=1,
+                                  cache=SentimentCache(tmp_path / "cache.db"))
+        scores = service.score_headlines(["stock beats guidance", "shares loss", "stock beats guidance"])
+
+        assert len(scores) == 3
+        assert all(-1.0 <= s <= 1.0 for s in scores)
+        assert scores[0] == scores[2]
+        # Duplicates are scored once, in a single call
+        assert len(service.inference_calls) == 1
+        assert len(service.inference_calls[0]) == 2
+
+    def test_cache_persists_across_instances(self, tiny_model, tmp_path):
+        """A new process reuses scores from the persistent cache."""
+        db = tmp_path / "cache.db"
+        first = CountingService(model=tiny_model, cache=SentimentCache(db))
+        expected = first.score_headlines(["profit rally", "stock misses"])
+        first.cache.close()
+
+        second = CountingService(model=tiny_model, cache=SentimentCache(db))
+        assert second.score_headlines(["profit rally", "stock misses"]) == expected
+        assert second.inference_calls == []
+        assert second._pipeline is None  # Model never loaded
+
+    def test_apply_sentiment_batches_scan(self, tiny_model, tmp_path, monkeypatch):
+        """Headlines from every ticker go to the model in one pass."""
+        service = CountingService(model=tiny_model, cache=SentimentCache(tmp_path / "cache.db"))
+        monkeypatch.setattr(sentiment, "_service", service)
+        monkeypatch.setattr(Settings, "USE_FINBERT", True)
+
+        catalysts = {
+            t: Catalyst(ticker=t, next_earnings_date=None, earnings_bmo_amc=None, headlines=h)
+            for t, h in {
+                "AAA": ["stock beats guidance", "profit rally"],
+                "BBB": ["stock beats guidance"],
+                "CCC": [],
+            }.items()
+        }
+        apply_sentiment(catalysts)
+
+        assert len(service.inference_calls) == 1
+        assert catalysts["AAA"].sentiment_score is not None
+        assert catalysts["BBB"].sentiment_score is not None
+        assert catalysts["CCC"].sentiment_score is None
+
+
+class TestSentimentCache:
+    """Tests for the headline hash cache."""
+
+    def test_hash_normalizes_whitespace_and_includes_model(self):
+        """Whitespace differences share a key, models do not."""
+        assert headline_hash("Stock  beats ", "m") == headline_hash("Stock beats", "m")
+        assert headline_hash("Stock beats", "m1") != headline_hash("Stock beats", "m2")
+
+    def test_round_trip(self, tmp_path):
+        """Stored scores are returned and misses are omitted."""
+        cache = SentimentCache(tmp_path / "cache.db")
+        cache.put_many({"a": 0.5, "b": -0.25})
+        assert cache.get_many(["a", "b", "c"]) == {"a": 0.5, "b": -0.25}
+
+
+class TestLexiconSentiment:
+    """Tests for the vectorized lexicon scorer."""
+
+    def test_polarity(self):
+        """Bullish and bearish headlines score with the right sign."""
+        scores = LexiconSentiment().score_headlines([
+            "Apple beats estimates, shares surge to record",
+            "Tesla shares plunge after recall and downgrade",
+            "Company to present at conference",
+        ])
+        assert scores[0] > 0.5
+        assert scores[1] < -0.5
+        assert scores[2] == 0.0
+        assert all(-1.0 <= s <= 1.0 for s in scores)
+
+    def test_negation_flips_polarity(self):
+        """A negator within the window flips the words after it."""
+        engine = LexiconSentiment()
+        plain, negated, distant = engine.score_headlines([
+            "Quarter shows strong growth",
+            "Quarter shows no strong growth",
+            "No comment from company on quarter results so far strong",
+        ])
+        assert plain > 0
+        assert negated < 0
+        assert distant > 0  # Negator is outside the window
+
+    def test_fails_is_counted_once(self):
+        """'fails to beat' negates the beat without also scoring the failure."""
+        engine = LexiconSentiment()
+        fails_to_beat, misses = engine.score_headlines(["Company fails to beat estimates", "Company misses estimates"])
+        assert fails_to_beat == pytest.approx(misses)
+
+    def test_negation_does_not_cross_headlines(self):
+        """A trailing negator does not affect the next headline."""
+        scores = LexiconSentiment().score_headlines(["Analysts say no", "Shares surge"])
+        assert scores[1] > 0
+
+    def test_empty_input(self):
+        """Empty lists and token-less headlines are handled."""
+        engine = LexiconSentiment()
+        assert len(engine.score_headlines([])) == 0
+        assert list(engine.score_headlines(["", "!!!"])) == [0.0, 0.0]
+
+
+class SlowService:
+    """Stand-in FinBERT service that never answers within budget."""
+
+    def score_headlines(self, headlines):
+        time.sleep(0.5)
+        return [1.0] * len(headlines)
+
+
+class TestSentimentFallback:
+    """Tests for choosing between FinBERT and the lexicon."""
+
+    def test_lexicon_when_finbert_disabled(self, monkeypatch):
+        """Sentiment is scored even with USE_FINBERT off."""
+        monkeypatch.setattr(Settings, "USE_FINBERT", False)
+        assert analyze_sentiment(["Shares surge on strong profit"]) > 0
+        assert analyze_sentiment([]) is None
+
+    def test_lexicon_when_finbert_over_budget(self, monkeypatch):
+        """A slow model is abandoned in favour of the lexicon."""
+        monkeypatch.setattr(Settings, "USE_FINBERT", True)
+        monkeypatch.setattr(Settings, "SENTIMENT_TIME_BUDGET", 0.05)
+        monkeypatch.setattr(sentiment, "_service", SlowService())
+        score = analyze_sentiment(["Shares plunge after downgrade"])
+        assert score is not None and score < 0
+
+    def test_abandoned_run_is_not_queued_behind(self, monkeypatch):
+        """While an abandoned FinBERT run is still going, calls skip straight to the lexicon."""
+        monkeypatch.setattr(Settings, "USE_FINBERT", True)
+        monkeypatch.setattr(Settings, "SENTIMENT_TIME_BUDGET", 0.05)
+        service = SlowService()
+        calls = []
+        monkeypatch.setattr(service, "score_headlines", lambda h: calls.append(h) or SlowService.score_headlines(service, h))
+        monkeypatch.setattr(sentiment, "_service", service)
+        if catalysts._finbert_running is not None:
+            catalysts._finbert_running.result()  # Left running by an earlier test
+
+        analyze_sentiment(["Shares plunge after downgrade"])
+        start = time.perf_counter()
+        assert analyze_sentiment(["Shares surge"]) > 0
+        assert time.perf_counter() - start < 0.05
+        assert len(calls) == 1
+        catalysts._finbert_running.result()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for the sharded multi-process scan.
+"""
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import transport
+from options_bot.ingestion.catalysts import apply_sentiment
+from options_bot.runner import baseline, scan
+from options_bot.runner.pipeline import stream_scan
+from options_bot.runner.sharded import sharded_scan
+from tests.test_pipeline import fake_fetch
+
+
+def slow_fetch(ticker):
+    # One slow ticker must not hold back the tickers queued behind it
+    if ticker == "T0":
+        time.sleep(1.0)
+    return fake_fetch(ticker)
+
+
+def dying_fetch(ticker):
+    if ticker == "T5":
+        os._exit(3)
+    return fake_fetch(ticker)
+
+
+class TestShardedScan:
+
+    def test_merge_matches_single_process(self):
+        tickers = [f"T{i}" for i in range(40)]
+        stored = {}
+        ideas, stats = sharded_scan(tickers, 3, fetch=slow_fetch, top_k=10, fetch_workers=2,
+                                    sink=lambda ticker, data, idea: stored.__setitem__(ticker, data))
+
+        expected, _ = stream_scan(tickers, fake_fetch, scan.score_ticker, analyze=apply_sentiment, top_k=10)
+        assert [(i.ticker, i.score) for i in ideas] == [(i.ticker, i.score) for i in expected]
+        assert stats.tickers == 40 and stats.fetched == 40 and stats.scored == 40
+        assert set(stored) == set(tickers) and stored["T7"][1].spot_price == 57.0
+
+    def test_dead_worker_does_not_hang(self):
+        tickers = [f"T{i}" for i in range(30)]
+        seen = []
+        ideas, stats = sharded_scan(tickers, 2, fetch=dying_fetch, top_k=5, fetch_workers=1,
+                                    send_data=False, sink=lambda ticker, data, idea: seen.append((ticker, data)))
+        assert "T5" not in {t for t, _ in seen}
+        assert len(seen) >= 15 and all(data is None for _, data in seen)
+        assert len(ideas) == 5
+
+
+class TestShardedRunScan:
+
+    @pytest.fixture
+    def standin(self, monkeypatch):
+        server = start_server(seed=5)
+        transport.configure('standin', url=server.url)
+        monkeypatch.setattr(scan, 'notify_ideas', lambda ideas, name: True)
+        monkeypatch.setattr(Settings, 'PERSIST_SNAPSHOTS', False)
+        baseline.clear_baseline()
+        yield server
+        baseline.clear_baseline()
+        transport.configure('live')
+        server.shutdown()
+        server.server_close()
+
+    def test_processes_rank_like_in_process(self, standin):
+        tickers = [f"S{i:05d}" for i in range(24)]
+        single = scan.run_scan("Single", tickers)
+        sharded = scan.run_scan("Sharded", tickers, processes=2)
+        assert [(i.ticker, i.score, i.strategy) for i in sharded] == [(i.ticker, i.score, i.strategy) for i in single]
+        # Full sharded scans still leave the day's baseline in the parent
+        today = datetime.now(Settings.TIMEZONE).date()
+        assert set(baseline.get_baseline(today).options) == set(tickers)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
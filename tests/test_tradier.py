@@ -0,0 +1,159 @@
+"""
+Tests for the Tradier chain provider, replayed from recorded responses.
+"""
+import json
+import re
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from options_bot.config import Settings
+from options_bot.ingestion import options, providers, tradier, transport
+from options_bot.ingestion.tradier import TradierOptionsProvider, chain_frames
+from options_bot.ingestion.transport import Cassette, RecordedResponse
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'tradier_chains.json'
+
+
+def load_fixture(path: Path) -> Cassette:
+    """
+    Cassette of the recorded Tradier responses, with every date moved
+    forward so the recording is as many days old as it was when made.
+    """
+    recording = json.loads(FIXTURE.read_text())
+    offset = date.today() - date.fromisoformat(recording['recorded_on'])
+    shift = lambda match: (date.fromisoformat(match.group(0)) + offset).isoformat()
+    responses = json.loads(re.sub(r'\d{4}-\d{2}-\d{2}', shift, json.dumps(recording['responses'])))
+
+    cassette = Cassette(path)
+    for response in responses:
+        body = json.dumps(response['body']).encode()
+        cassette.put('http', [response['url'], response['params']],
+                     RecordedResponse(response['url'], 200, body, {'content-type': 'application/json'}), 0.05)
+    cassette.flush()
+    return cassette
+
+
+def expiration(days: int) -> str:
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    for key in ('FINNHUB_API_KEY', 'ALPHA_VANTAGE_API_KEY', 'POLYGON_API_KEY'):
+        monkeypatch.setattr(Settings, key, None)
+    monkeypatch.setattr(Settings, 'TRADIER_API_KEY', 'test-key')
+    monkeypatch.setattr(Settings, 'TRADIER_SANDBOX', True)
+    load_fixture(tmp_path / 'tradier.db').close()
+    yield transport.configure('replay', tmp_path / 'tradier.db')
+    transport.configure('live')
+
+
+class TestChainFrames:
+
+    def test_contracts_split_with_greeks(self):
+        frames = chain_frames([
+            {'symbol': 'X1C', 'strike': 10, 'option_type': 'call', 'volume': 5, 'open_interest': 50,
+             'greeks': {'delta': 0.5, 'mid_iv': 0.3, 'smv_vol': 0.31}},
+            {'symbol': 'X1P', 'strike': 10, 'option_type': 'put', 'volume': None, 'open_interest': 20,
+             'greeks': None},
+        ])
+        call, put = frames['call'].iloc[0], frames['put'].iloc[0]
+        assert call['impliedVolatility'] == 0.3 and call['delta'] == 0.5 and call['openInterest'] == 50
+        assert pd.isna(put['delta']) and pd.isna(put['impliedVolatility']) and pd.isna(put['volume'])
+
+    def test_no_contracts(self):
+        frames = chain_frames([])
+        assert frames['call'].empty and 'delta' in frames['put']
+
+
+class TestTradierProvider:
+
+    def test_snapshot_chains_front_and_back_month(self, replay):
+        provider = TradierOptionsProvider(workers=2)
+        assert provider.expirations('AAPL')[0] == expiration(2)
+
+        front, back = provider.snapshot_chains('AAPL')
+        assert (front.expiration, back.expiration) == (expiration(37), expiration(79))
+        assert front.has_greeks and len(front.calls) == len(front.puts) == 17
+        assert front.calls['delta'].is_monotonic_decreasing
+        assert replay.hits == 4 and replay.misses == 0
+
+    def test_expirations_fetched_concurrently(self, replay, tmp_path):
+        transport.configure('replay', tmp_path / 'tradier.db', latency=0.3)
+        provider = TradierOptionsProvider(workers=2)
+
+        start = time.perf_counter()
+        chains = provider.chains('AAPL', [expiration(37), expiration(79)])
+        assert time.perf_counter() - start < 0.55
+        assert [c.expiration for c in chains] == [expiration(37), expiration(79)]
+
+    def test_pooled_session(self):
+        provider = TradierOptionsProvider(workers=6)
+        assert provider.session.get_adapter('https://api.tradier.com')._pool_maxsize == 6
+
+    def test_single_expiration_and_empty_chain(self, replay):
+        provider = TradierOptionsProvider(workers=2)
+        assert provider.expirations('ONEX') == [expiration(37)]
+        assert provider.get_chains(['ONEX']) == {}
+
+    def test_bulk_quotes_in_one_request(self, replay):
+        assert TradierOptionsProvider().get_quotes(['AAPL', 'MSFT']) == {'AAPL': 169.3, 'MSFT': 394.94}
+        assert replay.hits == 1
+
+    def test_preferred_by_planner_when_enabled(self, replay, monkeypatch):
+        monkeypatch.setattr(Settings, 'USE_PAID_OPTIONS_API', False)
+        assert [p.name for p in providers.configured_providers()] == ['yfinance']
+
+        monkeypatch.setattr(Settings, 'USE_PAID_OPTIONS_API', True)
+        planner = providers.MarketDataPlanner()
+        assert [p.name for p, _ in planner.plan('quotes', 150)] == ['tradier', 'yfinance']
+        assert [p.name for p, _ in planner.plan('chains', 1)] == ['tradier', 'yfinance']
+
+
+class TestVendorSnapshot:
+
+    @pytest.fixture
+    def market(self, monkeypatch):
+        closes = pd.Series([170.0 * (1 + 0.01 * ((i % 3) - 1)) for i in range(60)])
+        monkeypatch.setattr(options, 'get_quote', lambda ticker, primary=None: 170.0)
+        monkeypatch.setattr(options, 'get_history', lambda ticker, period, primary=None: pd.DataFrame({'Close': closes}))
+
+    def test_snapshot_uses_vendor_iv_and_deltas(self, replay, market, monkeypatch):
+        monkeypatch.setattr(Settings, 'USE_PAID_OPTIONS_API', True)
+        snapshot = options.get_options_snapshot('AAPL')
+
+        # Only the recorded Tradier responses were used (no yfinance chain)
+        assert replay.misses == 0
+        assert snapshot.atm_iv_dte35 == pytest.approx(0.24, abs=0.005)
+        assert snapshot.term_slope_iv == pytest.approx(0.03, abs=0.005)
+        assert 0 < snapshot.skew_25d_rr < 0.05
+        assert snapshot.open_interest > 0
+
+    def test_falls_back_to_yfinance_chain(self, replay, market, monkeypatch):
+        monkeypatch.setattr(Settings, 'USE_PAID_OPTIONS_API', True)
+        fallback = []
+        chain = options.OptionsSnapshot('ONEX', 170.0, 0.2, 0.3, None, 0.01, None, 5.0, 5.0, 100, 1000)
+        monkeypatch.setattr(options, '_chain_snapshot',
+                            lambda stock, ticker, price, hv30: fallback.append(ticker) or chain)
+
+        # ONEX has an empty Tradier chain: the yfinance chain is used instead
+        assert options.get_options_snapshot('ONEX') is chain
+        assert options.refresh_options_snapshot(chain).atm_iv_dte35 == 0.3
+        assert fallback == ['ONEX', 'ONEX']
+
+        # A Tradier snapshot is used as it is
+        assert options.get_options_snapshot('AAPL').ticker == 'AAPL' and fallback == ['ONEX', 'ONEX']
+
+    def test_off_without_flag(self, replay, market, monkeypatch):
+        monkeypatch.setattr(Settings, 'USE_PAID_OPTIONS_API', False)
+        assert not tradier.enabled()
+        # The yfinance chain is not in the cassette
+        assert options.get_options_snapshot('AAPL') is None and replay.misses > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,201 @@
+"""
+Tests for the record/replay transport.
+"""
+from collections import namedtuple
+
+import pandas as pd
+import pytest
+import requests
+
+from options_bot.ingestion import transport
+from options_bot.ingestion.news_fetcher import NewsAggregator
+from options_bot.ingestion.options import get_options_snapshot
+from options_bot.ingestion.transport import Cassette, CassetteMiss, Transport
+
+
+class FakeResponse:
+
+    def __init__(self, url, payload, status_code=200):
+        self.url = url
+        self.status_code = status_code
+        self.content = payload
+        self.headers = {'Content-Type': 'application/json', 'Date': 'today'}
+        self.encoding = 'utf-8'
+
+
+class FakeTicker:
+    """Minimal yf.Ticker with the members the ingestion code uses."""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    @property
+    def info(self):
+        return {'currentPrice': 100.0, 'longName': f"{self.ticker} Corp"}
+
+    @property
+    def fast_info(self):
+        return {'lastPrice': 101.5}
+
+    @property
+    def options(self):
+        return ('2030-01-18',)
+
+    def history(self, period="1mo"):
+        closes = [100 + (i % 5) for i in range(63)]
+        return pd.DataFrame({'Close': closes}, index=pd.date_range('2026-01-01', periods=63))
+
+    def option_chain(self, date=None):
+        calls = pd.DataFrame({
+            'strike': [95.0, 100.0, 105.0], 'impliedVolatility': [0.3, 0.28, 0.27],
+            'volume': [100, 200, 50], 'openInterest': [1000, 2000, 500],
+            'bid': [6.0, 3.0, 1.0], 'ask': [6.2, 3.1, 1.1],
+        })
+        puts = calls.assign(impliedVolatility=[0.31, 0.3, 0.29])
+        return namedtuple('Options', ['calls', 'puts', 'underlying'])(calls, puts, {})
+
+
+class OfflineTicker:
+
+    def __init__(self, ticker):
+        raise AssertionError("replay must not construct a live Ticker")
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return tmp_path / "cassette.db"
+
+
+class TestHttpReplay:
+
+    def test_records_then_replays(self, monkeypatch, cassette_path):
+        calls = []
+
+        def fake_get(url, params=None, headers=None, timeout=10):
+            calls.append(params)
+            return FakeResponse(url, b'{"articles": [{"title": "Beat"}]}')
+
+        monkeypatch.setattr(transport.requests, 'get', fake_get)
+        recorder = Transport('record', Cassette(cassette_path))
+        params = {'q': 'AAA', 'from': '2026-01-05', 'apiKey': 'secret-1'}
+        assert recorder.http_get("https://newsapi.org/v2/everything", params).json()['articles'][0]['title'] == "Beat"
+        recorder.close()
+
+        def offline(*args, **kwargs):
+            raise AssertionError("replay must not touch the network")
+
+        monkeypatch.setattr(transport.requests, 'get', offline)
+        player = Transport('replay', Cassette(cassette_path))
+        # Different key and a later lookback date still match the recording
+        replayed = player.http_get("https://newsapi.org/v2/everything",
+                                   {'q': 'AAA', 'from': '2026-02-09', 'apiKey': 'secret-2'})
+        assert replayed.json() == {'articles': [{'title': 'Beat'}]}
+        assert replayed.headers == {'Content-Type': 'application/json'}
+
+        with pytest.raises(CassetteMiss):
+            player.http_get("https://newsapi.org/v2/everything", {'q': 'BBB'})
+        assert (player.hits, player.misses, len(calls)) == (1, 1, 1)
+
+    def test_errors_and_latency(self, monkeypatch, cassette_path):
+        def failing_get(url, **kwargs):
+            raise ConnectionError("reset by peer")
+
+        monkeypatch.setattr(transport.requests, 'get', failing_get)
+        recorder = Transport('record', Cassette(cassette_path))
+        with pytest.raises(ConnectionError):
+            recorder.http_get("https://api.fda.gov/drug/event.json", {'limit': 10})
+        monkeypatch.setattr(transport.requests, 'get',
+                            lambda url, **kwargs: FakeResponse(url, b'{}', status_code=404))
+        recorder.http_get("https://api.fda.gov/drug/drugsfda.json", {'limit': 10})
+        recorder.close()
+
+        slept = []
+        player = Transport('replay', Cassette(cassette_path), latency=0.25, sleep=slept.append)
+        with pytest.raises(transport.RecordedError, match="reset by peer"):
+            player.http_get("https://api.fda.gov/drug/event.json", {'limit': 10})
+        response = player.http_get("https://api.fda.gov/drug/drugsfda.json", {'limit': 10})
+        assert response.status_code == 404 and not response.ok
+        assert slept == [0.25, 0.25]
+
+    def test_errors_recorded_without_keys(self, monkeypatch, cassette_path):
+        def failing_get(url, params=None, **kwargs):
+            query = '&'.join(f"{k}={v}" for k, v in params.items())
+            if 'polygon' in url:
+                raise ConnectionError(f"Max retries exceeded with url: /v2/aggs?{query} (Caused by timeout)")
+            raise requests.HTTPError(f"429 Client Error: Too Many Requests for url: {url}?{query}")
+
+        monkeypatch.setattr(transport.requests, 'get', failing_get)
+        recorder = Transport('record', Cassette(cassette_path))
+        with pytest.raises(ConnectionError):
+            recorder.http_get("https://api.polygon.io/v2/aggs", {'apiKey': 'polygon-secret', 'adjusted': 'true'})
+        with pytest.raises(requests.HTTPError):
+            recorder.http_get("https://finnhub.io/api/v1/quote", {'symbol': 'AAA', 'token': 'finnhub-secret'})
+        recorder.close()
+
+        assert b'secret' not in cassette_path.read_bytes()
+        player = Transport('replay', Cassette(cassette_path))
+        with pytest.raises(transport.RecordedError, match=r"symbol=AAA&token=\*\*\*$"):
+            player.http_get("https://finnhub.io/api/v1/quote", {'symbol': 'AAA'})
+
+
+class TestYfinanceReplay:
+
+    def test_ticker_members(self, monkeypatch, cassette_path):
+        monkeypatch.setattr(transport.yf, 'Ticker', FakeTicker)
+        recorder = Transport('record', Cassette(cassette_path))
+        stock = recorder.ticker("AAA")
+        info = stock.info
+        assert stock.info is info  # Properties are read once per Ticker
+        assert stock.fast_info.get('lastPrice') == 101.5
+        chain = stock.option_chain(stock.options[0])
+        recorder.close()
+
+        monkeypatch.setattr(transport.yf, 'Ticker', OfflineTicker)
+        slept = []
+        player = Transport('replay', Cassette(cassette_path), latency='recorded', sleep=slept.append)
+        stock = player.ticker("AAA")
+        assert stock.info == info
+        assert stock.fast_info.get('lastPrice') == 101.5
+        assert stock.fast_info.get('previousClose', 7) == 7
+        replayed = stock.option_chain('2030-01-18')
+        pd.testing.assert_frame_equal(replayed.calls, chain.calls)
+        assert len(slept) == player.hits == 3 and player.misses == 1
+        with pytest.raises(CassetteMiss):
+            stock.history(period="1y")
+
+    def test_snapshot_replays_identically(self, monkeypatch, cassette_path):
+        monkeypatch.setattr(transport.yf, 'Ticker', FakeTicker)
+        with transport.cassette('record', cassette_path) as active:
+            recorded = get_options_snapshot("AAA")
+            assert active.recorded > 0
+
+        monkeypatch.setattr(transport.yf, 'Ticker', OfflineTicker)
+        with transport.cassette('replay', cassette_path) as active:
+            assert get_options_snapshot("AAA") == recorded
+            assert active.misses == 0
+        assert transport.get_transport().mode == 'live'
+
+    def test_live_mode_is_passthrough(self, monkeypatch):
+        monkeypatch.setattr(transport.yf, 'Ticker', FakeTicker)
+        assert isinstance(Transport().ticker("AAA"), FakeTicker)
+        with pytest.raises(ValueError):
+            Transport('replay')
+
+
+class TestCassetteStats:
+
+    def test_stats_and_secret_free_keys(self, monkeypatch, cassette_path):
+        monkeypatch.setattr(transport.requests, 'get', lambda url, **kwargs: FakeResponse(url, b'[]'))
+        news = NewsAggregator(finnhub_api_key="fh-secret")
+        with transport.cassette('record', cassette_path):
+            assert news.fetch_finnhub("AAA") == []
+
+        store = Cassette(cassette_path)
+        assert store.stats()['http']['responses'] == 1
+        rows = store._conn.execute("SELECT request FROM responses").fetchall()
+        assert "fh-secret" not in rows[0][0]
+        store.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+"""
+Tests for the universe metadata index and the work it lets scans skip.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.standin import start_server
+from options_bot.config import Settings
+from options_bot.ingestion import catalysts, fda_tracker, sec_filings, transport, universe
+from options_bot.ingestion.universe import TickerMeta, UniverseIndex
+from options_bot.runner import scan
+from tests.test_incremental import use_stub_market
+
+
+@pytest.fixture
+def standin():
+    server = start_server(seed=4)
+    transport.configure('standin', url=server.url)
+    yield server
+    transport.configure('live')
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    """A process-wide index backed by a temporary file."""
+    monkeypatch.setattr(Settings, 'UNIVERSE_META_PATH', str(tmp_path / 'universe_meta.csv'))
+    universe.reset_universe_index()
+    yield universe.get_universe_index()
+    universe.reset_universe_index()
+
+
+class TestUniverseIndex:
+
+    def test_bulk_refresh_and_persistence(self, standin, tmp_path):
+        tickers = [f"S{i:05d}" for i in range(6)]
+        index = UniverseIndex(tmp_path / 'meta.csv')
+        assert index.refresh(tickers, workers=3) == 6
+
+        meta = index.get("S00002")
+        info = standin.market.info("S00002")
+        assert meta.name == "S00002 Holdings Inc." and meta.quote_type == 'EQUITY'
+        assert meta.sector == info['sector'] and meta.market_cap == pytest.approx(info['marketCap'])
+        assert meta.cik == f"{standin.market.cik('S00002'):010d}" and meta.has_options is True
+
+        reloaded = UniverseIndex(tmp_path / 'meta.csv')
+        assert reloaded.get("S00002") == TickerMeta(**{**meta.__dict__, 'updated': meta.updated.replace(microsecond=0)})
+
+        # Fresh entries are not looked up again
+        before = standin.stats()['requests']
+        assert reloaded.refresh(tickers) == 0
+        assert standin.stats()['requests'] == before
+
+    def test_only_stale_entries_refresh(self, standin, tmp_path):
+        index = UniverseIndex(tmp_path / 'meta.csv', max_age_days=7)
+        index.refresh(["S00000", "S00001"])
+        index.get("S00000").updated = datetime.now() - timedelta(days=8)
+        assert index.stale(["S00000", "S00001", "S00002"]) == ["S00000", "S00002"]
+        assert index.refresh(["S00000", "S00001", "S00002"]) == 2
+        assert index.stale(["S00000", "S00001", "S00002"]) == []
+
+    def test_failed_lookup_keeps_old_entry(self, tmp_path, monkeypatch):
+        index = UniverseIndex(tmp_path / 'meta.csv', max_age_days=0)
+        old = TickerMeta("SPY", name="SPDR S&P 500", quote_type='ETF', updated=datetime(2020, 1, 1))
+        index._entries["SPY"] = old
+        monkeypatch.setattr(universe, 'fetch_sec_tickers', lambda: {})
+        monkeypatch.setattr(universe, 'lookup_ticker', lambda ticker, sec, previous: None)
+        assert index.refresh(["SPY"]) == 0
+        assert index.get("SPY") is old
+
+    def test_options_marked_missing_after_two_empty_lookups(self, tmp_path, monkeypatch):
+        class Quote:
+            info = {'quoteType': 'EQUITY', 'longName': "Berkshire Hathaway Inc."}
+            options = ()
+
+        monkeypatch.setattr(universe, 'fetch_sec_tickers', lambda: {})
+        monkeypatch.setattr(transport, 'ticker', lambda ticker: Quote())
+        index = UniverseIndex(tmp_path / 'meta.csv')
+
+        # One empty expiration list may be throttling: unknown, and looked up again
+        assert index.refresh(["BRKA"]) == 1 and index.get("BRKA").has_options is None
+        assert index.stale(["BRKA"]) == ["BRKA"]
+        index.refresh(["BRKA"])
+        assert index.get("BRKA").has_options is False and index.stale(["BRKA"]) == []
+
+        # Expirations listed again
+        Quote.options = ('2024-02-16',)
+        index.refresh(["BRKA"], force=True)
+        assert index.get("BRKA").has_options is True
+
+    def test_listed_options_survive_one_empty_lookup(self, monkeypatch):
+        class Quote:
+            info = {'quoteType': 'EQUITY'}
+            options = ()
+
+        monkeypatch.setattr(transport, 'ticker', lambda ticker: Quote())
+        previous = TickerMeta("AAPL", has_options=True, updated=datetime.now())
+        assert universe.lookup_ticker("AAPL", previous=previous).has_options is None
+
+    def test_load_universe_refreshes_index(self, standin, index, tmp_path, monkeypatch):
+        csv_path = tmp_path / 'universe.csv'
+        csv_path.write_text("ticker,enabled\nS00010,true\nS00011,false\ns00012,true\n")
+        monkeypatch.setattr(Settings, 'UNIVERSE_CSV', str(csv_path))
+        assert scan.load_universe() == ["S00010", "S00012"]
+        assert index.get("S00010").quote_type == 'EQUITY' and index.get("S00011") is None
+        assert UniverseIndex(index.path).get("S00012") is not None
+
+
+class TestSkippedWork:
+
+    def test_fund_skips_fundamentals_and_earnings(self, index, monkeypatch):
+        index._entries["SPY"] = TickerMeta("SPY", name="SPDR S&P 500 ETF Trust", quote_type='ETF',
+                                           market_cap=5.5e11, has_options=True)
+        calls = []
+        market = use_stub_market(monkeypatch, options=lambda t: 'chain')
+        monkeypatch.setattr(catalysts, 'get_earnings_date', lambda t: calls.append(('earnings', t)))
+        monkeypatch.setattr(catalysts, 'get_news_headlines', lambda t: ["Index hits record"])
+
+        fund, opts, cat = scan.fetch_ticker("SPY")
+        assert calls == [] and market.asked['fundamentals'] == 0
+        assert fund.market_cap == 5.5e11 and fund.pe_ratio is None and opts == 'chain'
+        assert cat.next_earnings_date is None and cat.headlines == ["Index hits record"]
+
+    def test_ticker_without_options_is_not_fetched(self, index, monkeypatch):
+        index._entries["BRKA"] = TickerMeta("BRKA", quote_type='EQUITY', has_options=False)
+        market = use_stub_market(monkeypatch)
+        assert scan.fetch_ticker("BRKA") == (None, None, None)
+        assert not market.requests
+
+    def test_fda_only_for_healthcare(self, index, monkeypatch):
+        index._entries["AAPL"] = TickerMeta("AAPL", name="Apple Inc.", sector='Technology')
+        index._entries["MRNA"] = TickerMeta("MRNA", name="Moderna, Inc.", sector='Healthcare')
+        searched = []
+        monkeypatch.setattr(fda_tracker.FDATracker, 'check_drug_approvals', lambda self, name: searched.append(name) or [])
+        monkeypatch.setattr(fda_tracker.FDATracker, 'check_recalls', lambda self, name: [])
+        monkeypatch.setattr(fda_tracker.FDATracker, 'search_drug_events', lambda self, name, limit=10: [])
+
+        skipped = fda_tracker.get_fda_catalysts("AAPL")
+        assert skipped['catalyst_score'] == 0 and skipped['company_name'] == "Apple Inc."
+        assert fda_tracker.get_fda_catalysts("MRNA")['note'] == "No recent FDA activity"
+        assert searched == ["Moderna, Inc."]
+
+    def test_sec_cik_from_index(self, index, monkeypatch):
+        index._entries["MSFT"] = TickerMeta("MSFT", cik="0000789019")
+        monkeypatch.setattr(transport, 'http_get', lambda *a, **k: pytest.fail("looked up CIK"))
+        assert sec_filings.SECFilingsTracker()._get_cik("MSFT") == "0000789019"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])